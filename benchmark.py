@@ -4,7 +4,7 @@ import json
 import os
 import time
 from data import nfl_client as nfl_data_py
-from main import get_models
+from main import get_models, PBP_COLUMNS
 from data import loader
 from stats import injuries
 from evaluation import calibration
@@ -38,11 +38,11 @@ def run_benchmark(simulations=50, version="benchmark"):
     print(f"Loading data for years: {sorted(list(years_needed))}")
     loader.clean_and_save_data(list(years_needed))
     injuries.clean_and_save_data(list(years_needed))
-    pbp_data = loader.load_data(list(years_needed))
+    pbp_data = loader.load_data(list(years_needed), columns=PBP_COLUMNS, downcast=config.runtime.compact_pbp)
     snap_data = loader.load_snap_counts(list(years_needed))
     
     all_results = []
-    models = get_models()
+    models = get_models(config.runtime.use_lookup_tables, config.runtime.use_compiled_trees, seed=config.runtime.seed)
     
     from main import project_week, calculate_fantasy_leaders
     
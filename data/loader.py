@@ -1,12 +1,65 @@
+import numpy as np
 import pandas as pd
+import polars as pl
 from data import nfl_client as nfl_data_py
+from data import pbp_store
 
+# Columns load_data itself needs (REG filter and the receiver position merge).
+LOADER_COLUMNS = ["season", "season_type", "receiver_player_id"]
+# String columns holding team or player ids, stored as categoricals with categorical_ids.
+TEAM_COLUMNS = ["posteam", "defteam", "home_team", "away_team"]
 
-# Load a year range of pbp data.
-def load_data(years):
-    # Load PBP data directly from nfl_client (which uses nflreadpy's cache)
-    data = nfl_data_py.load_pbp_data(years)
-    
+
+def _is_id_column(column):
+    return column in TEAM_COLUMNS or column == "game_id" or column.endswith("_player_id") or column == "passer_id"
+
+
+def downcast_columns(data, categorical_ids=False):
+    """Shrinks PBP columns in place of their float64/int64/object defaults.
+
+    0/1 flags become int8 and other whole-number columns the smallest of int16/int32/int64
+    that holds them (at least int16, so sums and differences of scores or yards don't
+    overflow). Columns with missing or fractional values become float32. With
+    `categorical_ids`, team and player id columns become categoricals; groupbys on them
+    then include unobserved ids unless they pass observed=True, so only use it for code
+    that doesn't group by ids.
+    """
+    for column in data.columns:
+        values = data[column]
+        if values.dtype.kind in "fiu":
+            array = values.to_numpy()
+            whole = array.dtype.kind != "f" or np.array_equal(array, np.floor(array))  # False with any NaN
+            if not whole:
+                data[column] = values.astype(np.float32)
+            elif len(array) and array.min() >= 0 and array.max() <= 1:
+                data[column] = values.astype(np.int8)
+            else:
+                smallest = pd.to_numeric(values.astype(np.int64), downcast="integer").dtype
+                data[column] = values.astype(np.promote_types(smallest, np.int16))
+        elif categorical_ids and values.dtype == object and _is_id_column(column):
+            data[column] = values.astype("category")
+    return data
+
+
+def load_data(years, columns=None, downcast=False, categorical_ids=False):
+    """Loads a year range of REG season PBP data, with each receiver's position.
+
+    Args:
+        years: Seasons to load.
+        columns: Columns the caller uses (e.g. teams.PBP_COLUMNS); only these (plus
+            LOADER_COLUMNS) are read from the store. All columns if None.
+        downcast: Shrink dtypes with downcast_columns.
+        categorical_ids: Also store team and player ids as categoricals (see
+            downcast_columns).
+    """
+    if columns is not None:
+        columns = list(dict.fromkeys(LOADER_COLUMNS + list(columns)))
+    # Load PBP data from the local season store (fetching seasons it doesn't have yet)
+    data = pbp_store.load(years, columns)
+    return _prepare(data, years, downcast, categorical_ids)
+
+
+def _prepare(data, years, downcast, categorical_ids):
     # Apply the same column filtering and roster merge logic as clean_and_save_data
     # (The following code is copied from clean_and_save_data to ensure consistent processing)
     if 'season_type' not in data.columns:
@@ -85,9 +138,42 @@ def load_data(years):
     data = data.merge(receiver_roster_data, on=["receiver_player_id", "season"], how="left")
 
     data.reset_index(drop=True, inplace=True)
+    if downcast:
+        data = downcast_columns(data, categorical_ids)
     return data
 
 
+class PbpScan:
+    """A lazy load_data: REG season PBP kept as a polars query over the store.
+
+    Nothing is read until `collect`, which pushes its filter down into the Parquet scan
+    and materializes only the matching plays as pandas, prepared as load_data prepares
+    them (receiver positions, downcasting).
+
+    Attributes:
+        years (List[int]): Seasons scanned.
+        query (pl.LazyFrame): REG season plays of `years`.
+        downcast (bool): Shrink dtypes of collected plays with downcast_columns.
+        categorical_ids (bool): Also store ids as categoricals (see downcast_columns).
+    """
+
+    def __init__(self, years, columns=None, downcast=False, categorical_ids=False):
+        if columns is not None:
+            columns = list(dict.fromkeys(LOADER_COLUMNS + list(columns)))
+        self.years = list(years)
+        self.query = pbp_store.scan(self.years, columns)
+        if "season_type" in self.query.collect_schema():
+            self.query = self.query.filter(pl.col("season_type") == "REG")
+        self.downcast = downcast
+        self.categorical_ids = categorical_ids
+
+    def collect(self, predicate=None):
+        """The plays matching a polars expression (all plays if None), as pandas."""
+        query = self.query if predicate is None else self.query.filter(predicate)
+        data = nfl_data_py.to_pandas(query.collect())
+        return _prepare(data, self.years, self.downcast, self.categorical_ids)
+
+
 def load_snap_counts(years):
     """Loads snap count data via nfl_client."""
     return nfl_data_py.import_snap_counts(years)
@@ -1,14 +1,73 @@
+import os
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
 import nflreadpy as nfl
 import pandas as pd
 
+# Local snapshots of the reference tables (rosters, players, depth charts, schedules),
+# so a cold start reads a pickle instead of downloading and converting them again. Set
+# FFP_REFERENCE_DIR to move them, or to an empty string to turn them off.
+SNAPSHOT_DIR = os.environ.get("FFP_REFERENCE_DIR", os.path.join("data", "reference"))
+# Seconds before a snapshot of a table that can still change (the current season, the
+# player table) is downloaded again. Past seasons are kept for good.
+SNAPSHOT_MAX_AGE = 12 * 60 * 60
+
+# (table, seasons) -> the table as loaded, shared by every caller in the process.
+_TABLES: Dict[Tuple[Hashable, ...], pd.DataFrame] = {}
+# (view, args) -> indexed views built from the tables.
+_VIEWS: Dict[Tuple[Hashable, ...], Any] = {}
+
 def to_pandas(df):
     """Helper to ensure we return Pandas DataFrames."""
     if hasattr(df, "to_pandas"):
         return df.to_pandas()
     return df
 
-def import_seasonal_rosters(years, columns=None):
-    """Mimics nfl_data_py.import_seasonal_rosters"""
+def _snapshot_path(name, years):
+    suffix = "_" + "-".join(str(year) for year in years) if years else ""
+    return os.path.join(SNAPSHOT_DIR, "%s%s.pkl" % (name, suffix))
+
+def _is_fresh(path, years):
+    if not os.path.exists(path):
+        return False
+    if years and max(years) < nfl.get_current_season():
+        return True
+    return time.time() - os.path.getmtime(path) < SNAPSHOT_MAX_AGE
+
+def _table(name: str, years: Optional[Sequence[int]], loader: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """Loads a reference table once per process, from its snapshot if there's a fresh one.
+
+    The returned frame is shared, so callers must copy it before changing it.
+    """
+    years = tuple(sorted([years] if isinstance(years, int) else years)) if years is not None else ()
+    key = (name, years)
+    if key in _TABLES:
+        return _TABLES[key]
+    path = _snapshot_path(name, years) if SNAPSHOT_DIR else None
+    if path and _is_fresh(path, years):
+        df = pd.read_pickle(path)
+    else:
+        df = loader()
+        if path:
+            try:
+                os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+                df.to_pickle(path)
+            except OSError as e:
+                print(f"Warning: Could not write reference snapshot {path}: {e}")
+    _TABLES[key] = df
+    return df
+
+def _view(key: Tuple[Hashable, ...], build: Callable[[], Any]) -> Any:
+    if key not in _VIEWS:
+        _VIEWS[key] = build()
+    return _VIEWS[key]
+
+def clear():
+    """Drops the loaded tables and views (snapshots on disk are kept)."""
+    _TABLES.clear()
+    _VIEWS.clear()
+
+def _load_rosters(years):
     df = to_pandas(nfl.load_rosters(years))
     
     # MAPPING: nflreadpy uses 'gsis_id', legacy uses 'player_id'
@@ -20,29 +79,33 @@ def import_seasonal_rosters(years, columns=None):
         
     if rename_map:
         df = df.rename(columns=rename_map)
+    return df
+
+def import_seasonal_rosters(years, columns=None):
+    """Mimics nfl_data_py.import_seasonal_rosters"""
+    df = _table("rosters", years, lambda: _load_rosters(years))
         
     if columns:
         # Ensure filtered columns exist (handle renames first)
         available_cols = [c for c in columns if c in df.columns]
-        df = df[available_cols]
+        return df[available_cols]
         
-    return df
+    return df.copy()
 
 def import_schedules(years):
-    return to_pandas(nfl.load_schedules(years))
+    return _table("schedules", years, lambda: to_pandas(nfl.load_schedules(years))).copy()
 
 def import_depth_charts(years):
     """Mimics nfl_data_py.import_depth_charts"""
-    df = to_pandas(nfl.load_depth_charts(years))
+    df = _table("depth_charts", years, lambda: to_pandas(nfl.load_depth_charts(years)))
     # nflreadpy already has 'depth_team' and 'position', which matches
     # what stats/players.py expects in its "modern" block.
-    return df
+    return df.copy()
 
 def import_injuries(years):
     return to_pandas(nfl.load_injuries(years))
 
-def import_ids(columns=None, ids=None):
-    """Mimics nfl_data_py.import_ids"""
+def _load_players():
     df = to_pandas(nfl.load_players())
     
     # MAPPING: Fix column mismatches for stats/injuries.py
@@ -51,26 +114,45 @@ def import_ids(columns=None, ids=None):
         'latest_team': 'team',
         # 'gsis_id': 'player_id' # Removed: Legacy library keeps gsis_id here
     }
-    df = df.rename(columns=rename_map)
+    return df.rename(columns=rename_map)
+
+def import_ids(columns=None, ids=None):
+    """Mimics nfl_data_py.import_ids"""
+    df = _table("players", None, _load_players)
     
     if columns:
          # Strict filtering like legacy lib
          available_cols = [c for c in columns if c in df.columns]
-         df = df[available_cols]
-    return df
+         return df[available_cols]
+    return df.copy()
+
+def season_roster(season):
+    """player_id -> position, player_name and team for a season, one row per player.
+
+    Built once per season from import_seasonal_rosters. Shared; copy before changing it.
+    """
+    return _view(("season_roster", season), lambda: import_seasonal_rosters(
+        [season], columns=["player_id", "position", "player_name", "team"]
+    ).drop_duplicates(subset="player_id").set_index("player_id"))
 
-def load_pbp_data(years):
-    """New helper for loader.py"""
-    return to_pandas(nfl.load_pbp(years))
+def gsis_ids(source):
+    """Series mapping another site's id (e.g. "pfr_id", "mfl_id") to the GSIS player id.
 
-def import_ftn_data(years):
-    """Wraps nflreadpy.load_ftn_data"""
-    return to_pandas(nfl.load_ftn_data(years))
+    Built once per source from import_ids. Shared; copy before changing it.
+    """
+    return _view(("gsis_ids", source), lambda: import_ids(columns=["gsis_id", source]).dropna().set_index(source).gsis_id)
 
-def import_participation_data(years):
-    """Wraps nflreadpy.load_participation"""
-    return to_pandas(nfl.load_participation(years))
+def depth_chart(season, week):
+    """A season's depth chart rows for `week` (empty if the week has none), or all of
+    them for the live format without a week column.
 
-def import_snap_counts(years):
-    """Wraps nflreadpy.load_snap_counts"""
-    return to_pandas(nfl.load_snap_counts(years))
+    The season is grouped by week once, from import_depth_charts. Shared; copy before
+    changing it.
+    """
+    def build():
+        depth_charts = import_depth_charts([season])
+        if "week" not in depth_charts.columns:
+            return None, depth_charts
+        return dict(tuple(depth_charts.groupby("week", sort=False))), depth_charts.iloc[:0]
+    weeks, rows = _view(("depth_chart", season), build)
+    return rows if weeks is None else weeks.get(week, rows)
@@ -0,0 +1,143 @@
+import argparse
+import os
+import time
+from typing import Callable, List, Optional, Sequence
+import nflreadpy as nfl
+import pandas as pd
+import polars as pl
+from data import nfl_client
+
+# Local store of play-by-play data: one Parquet file per season, pbp_<season>.parquet.
+# Every PBP reader (loader.load_data, the receiver and INT return models) goes through
+# it. Set FFP_PBP_DIR to move it, and refresh seasons with
+# `python -m data.pbp_store 2023 2024 [--source DIR]`.
+STORE_DIR = os.environ.get("FFP_PBP_DIR", os.path.join("data", "pbp"))
+# Seasons at or after the current one are fetched again once their file is this old.
+MAX_AGE = nfl_client.SNAPSHOT_MAX_AGE
+
+# season -> that season's plays (polars or pandas).
+PbpSource = Callable[[int], object]
+
+
+def nflreadpy_source(season: int) -> pl.DataFrame:
+    """Downloads a season's plays with nflreadpy."""
+    return nfl.load_pbp([season])
+
+
+class DirectorySource:
+    """Reads seasons from a local directory, for tests and runs without network access.
+
+    Each season is `pbp_<season>.parquet`, or the legacy `pbp_<season>.csv.gz` written by
+    the old clean_and_save_data.
+
+    Attributes:
+        path (str): Directory holding the season files.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __call__(self, season: int) -> pl.DataFrame:
+        parquet_path = os.path.join(self.path, "pbp_%d.parquet" % season)
+        if os.path.exists(parquet_path):
+            return pl.read_parquet(parquet_path)
+        csv_path = os.path.join(self.path, "pbp_%d.csv.gz" % season)
+        if os.path.exists(csv_path):
+            return pl.read_csv(csv_path, infer_schema_length=None)
+        raise FileNotFoundError("No PBP file for %d in %s" % (season, self.path))
+
+
+_source: PbpSource = nflreadpy_source
+
+
+def set_source(source: PbpSource):
+    """Sets where seasons missing from (or stale in) the store are fetched from."""
+    global _source
+    _source = source
+
+
+def season_path(season: int) -> str:
+    return os.path.join(STORE_DIR, "pbp_%d.parquet" % season)
+
+
+def _is_fresh(path: str, season: int) -> bool:
+    if not os.path.exists(path):
+        return False
+    if season < nfl.get_current_season():
+        return True
+    return time.time() - os.path.getmtime(path) < MAX_AGE
+
+
+def refresh(seasons: Sequence[int], source: Optional[PbpSource] = None) -> List[str]:
+    """Fetches seasons from the source and rewrites their files in the store.
+
+    Args:
+        seasons: Seasons to fetch.
+        source: Where to fetch them from; defaults to the source set with set_source
+            (nflreadpy unless changed).
+
+    Returns:
+        List[str]: Paths of the written files.
+    """
+    source = source or _source
+    os.makedirs(STORE_DIR, exist_ok=True)
+    paths = []
+    for season in seasons:
+        plays = source(season)
+        if not isinstance(plays, pl.DataFrame):
+            plays = pl.from_pandas(plays)
+        path = season_path(season)
+        # Written next to the old file and swapped in, so readers never see half a file.
+        plays.write_parquet(path + ".tmp")
+        os.replace(path + ".tmp", path)
+        paths.append(path)
+    return paths
+
+
+def _scan_season(season: int, columns: Optional[Sequence[str]]) -> pl.LazyFrame:
+    plays = pl.scan_parquet(season_path(season))
+    if columns is not None:
+        # Only the requested columns are read; ones a season lacks are left out.
+        schema = plays.collect_schema()
+        plays = plays.select([column for column in columns if column in schema])
+    return plays
+
+
+def scan(seasons: Sequence[int], columns: Optional[Sequence[str]] = None) -> pl.LazyFrame:
+    """The plays of `seasons` as a lazy polars query, fetching seasons the store lacks.
+
+    Filters and column selections added to the query are pushed down into the Parquet
+    scan, so only the matching row groups and columns are read when it is collected.
+
+    Args:
+        seasons: Seasons to scan.
+        columns: Columns to read (all if None). Requested columns a season doesn't have
+            are skipped, or null if other seasons have them.
+    """
+    missing = [season for season in seasons if not _is_fresh(season_path(season), season)]
+    if missing:
+        refresh(missing)
+    return pl.concat([_scan_season(season, columns) for season in seasons], how="diagonal_relaxed")
+
+
+def load_polars(seasons: Sequence[int], columns: Optional[Sequence[str]] = None) -> pl.DataFrame:
+    """The plays of `seasons` as one polars frame; see scan."""
+    return scan(seasons, columns).collect()
+
+
+def load(seasons: Sequence[int], columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """The plays of `seasons` as one pandas frame; see load_polars."""
+    return nfl_client.to_pandas(load_polars(seasons, columns))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Refresh the local PBP store")
+    parser.add_argument("seasons", type=int, nargs="+", help="Seasons to fetch")
+    parser.add_argument("--source", type=str, default=None, help="Directory of pbp_<season>.parquet/.csv.gz files (default: nflreadpy)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    for path in refresh(args.seasons, DirectorySource(args.source) if args.source else None):
+        print(f"Wrote {path}")
@@ -0,0 +1,885 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Optional
+from enums import Position
+from settings import ScoringSettings
+from engine.game import get_qbs, get_kickers, get_carriers, get_targets
+
+# Integer play codes used in the state arrays (PlayType enums cannot live in NumPy arrays).
+PASS, RUN, PUNT, FIELD_GOAL = 0, 1, 2, 3
+_PLAYCALL_CODES = {"pass": PASS, "run": RUN, "punt": PUNT, "field_goal": FIELD_GOAL}
+
+# Clock model buckets, in the same order as GameState.advance_clock.
+_QTR_BUCKETS = ["regulation", "Q4", "OT"]
+_TIME_BUCKETS = ["high", "mid", "low"]
+_SCORE_BUCKETS = ["leading_big", "leading_close", "tied", "trailing_close", "trailing_big"]
+_PLAY_DETAILS = ["pass_complete", "pass_incomplete", "run", "punt", "field_goal"]
+
+# Carrier zones, indexed by distance to goal (see GameState.choose_carrier).
+_ZONES = ["standard", "redzone", "goal_line"]
+# Receiver sample buffers, indexed by target position.
+_TARGET_POSITIONS = [Position.RB, Position.TE, Position.WR, "ALL"]
+
+
+class BatchGameState:
+    """Lockstep vectorized engine that simulates N games of a single matchup at once.
+
+    Down, distance, field position, clock, score and possession are stored as NumPy
+    arrays with one entry per simulation. Each call to `advance_snap` plays one snap in
+    every live game, and finished games are masked out. The game rules mirror
+    `engine.game.GameState` exactly (overtime, two-minute warning, safeties, turnovers,
+    punts and field goals not running the clock), so the batch engine is a drop-in
+    replacement for calling `GameState.play_game()` N times.
+
+    Model inference is batched: the playcall, completion and field goal models are
+    called once per snap with one row per live game.
+
+    Attributes:
+        n (int): Number of simulations.
+        player_ids (List[str]): Column labels of the fantasy point matrix.
+        fantasy_points (np.ndarray): (n, n_players) accumulator for fantasy points.
+        touched (np.ndarray): (n, n_players) mask of entries that received points, so that
+            players who never recorded a stat in a simulation export as NaN like the
+            scalar engine's defaultdict.
+    """
+
+    def __init__(
+        self,
+        models: Dict[str, Any],
+        home_team: str,
+        away_team: str,
+        home_player_stats: pd.DataFrame,
+        away_player_stats: pd.DataFrame,
+        home_team_stats: pd.DataFrame,
+        away_team_stats: pd.DataFrame,
+        rules: ScoringSettings,
+        n_simulations: int,
+        game_info: Dict[str, Any] = {},
+        seed: Optional[int] = None,
+    ):
+        """Initializes N copies of the game state with teams, stats, and models.
+
+        Args:
+            models: Dictionary of loaded ML models and pre-sampled KDE buffers.
+            home_team: Home team abbreviation.
+            away_team: Away team abbreviation.
+            home_player_stats: DataFrame of home player stats/estimators.
+            away_player_stats: DataFrame of away player stats/estimators.
+            home_team_stats: Single-row DataFrame of home team stats.
+            away_team_stats: Single-row DataFrame of away team stats.
+            rules: ScoringSettings object defining fantasy point values.
+            n_simulations: Number of games to simulate in lockstep.
+            game_info: Dictionary containing game-specific context (wind, roof, etc).
+            seed: Optional seed for the NumPy random generator.
+        """
+        self.n = n_simulations
+        self.rng = np.random.default_rng(seed)
+        self.rules = rules
+        self.teams = [home_team, away_team]
+        self.home_team = home_team
+        self.away_team = away_team
+
+        self.wind = game_info.get("wind", 0.0)
+        self.is_outdoors = game_info.get("is_outdoors", 1)
+        self.vegas_total = game_info.get("total_line", 45.0)
+        self.vegas_spread = game_info.get("spread_line", 0.0)
+
+        self.completion_model = models["completion_model"]
+        self.field_goal_model = models["field_goal_model"]
+        self.playcall_model = models["playcall_model"]
+        self._build_clock_table(models.get("clock_model", {}))
+
+        # Sample buffers
+        self.air_yards_samples = [
+            np.asarray(models["air_yards_RB_samples"]),
+            np.asarray(models["air_yards_TE_samples"]),
+            np.asarray(models["air_yards_WR_samples"]),
+            np.asarray(models["air_yards_ALL_samples"]),
+        ]
+        self.yac_samples = [
+            np.asarray(models["yac_%s_open_samples" % (p if p == "ALL" else p.name)])
+            for p in _TARGET_POSITIONS
+        ]
+        self.rush_open_samples = np.asarray(models["rush_open_samples"])
+        self.rush_rz_samples = np.asarray(models["rush_rz_samples"])
+        default_scramble = np.asarray(models.get("scramble_samples", []))
+        self.scramble_samples = {}
+        for key, model_key in [("mobile", "scramble_samples_mobile"), ("pocket", "scramble_samples_pocket")]:
+            samples = np.asarray(models.get(model_key, []))
+            self.scramble_samples[key] = samples if len(samples) > 0 else default_scramble
+        self.int_return_samples = np.asarray(models["int_return_samples"])
+
+        # Player columns. Order of registration only affects the export order.
+        self.player_ids: List[str] = []
+        self._columns: Dict[str, int] = {}
+
+        self._build_team_arrays([home_team_stats, away_team_stats])
+        self._build_roster_arrays([home_player_stats, away_player_stats])
+        self.team_col = np.array([self._col(home_team), self._col(away_team)])
+        # GameState uses a "Team" id when a run play has no eligible carrier.
+        self.no_carrier_col = self._col("Team")
+
+        n = self.n
+        self.fantasy_points = np.zeros((n, len(self.player_ids)))
+        self.touched = np.zeros((n, len(self.player_ids)), dtype=bool)
+
+        # Game state arrays
+        self.pos_home = np.ones(n, dtype=bool)
+        self.second_half_pos_home = np.zeros(n, dtype=bool)
+        self.quarter = np.zeros(n, dtype=np.int64)
+        self.down = np.ones(n, dtype=np.int64)
+        self.yds_to_go = np.full(n, 10.0)
+        self.sec_remaining = np.full(n, 15.0 * 60)
+        self.home_score = np.zeros(n, dtype=np.int64)
+        self.away_score = np.zeros(n, dtype=np.int64)
+        self.yard_line = np.full(n, 50.0)
+        self.drive_play_count = np.ones(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.in_overtime = np.zeros(n, dtype=bool)
+        self.ot_possession_count = np.zeros(n, dtype=np.int64)
+        self.ot_first_drive_score = np.zeros(n, dtype=np.int64)
+
+    # --- Setup ---
+
+    def _col(self, player_id: str) -> int:
+        if player_id not in self._columns:
+            self._columns[player_id] = len(self.player_ids)
+            self.player_ids.append(player_id)
+        return self._columns[player_id]
+
+    def _build_clock_table(self, clock_model: Dict[tuple, float]) -> None:
+        shape = (len(_QTR_BUCKETS), len(_TIME_BUCKETS), len(_SCORE_BUCKETS), len(_PLAY_DETAILS))
+        self.clock_table = np.full(shape, np.nan)
+        for key, runoff in clock_model.items():
+            try:
+                index = (
+                    _QTR_BUCKETS.index(key[0]),
+                    _TIME_BUCKETS.index(key[1]),
+                    _SCORE_BUCKETS.index(key[2]),
+                    _PLAY_DETAILS.index(key[3]),
+                )
+            except ValueError:
+                # Buckets the engine never asks for (e.g. 'pass_intercepted').
+                continue
+            self.clock_table[index] = runoff
+
+    def _build_team_arrays(self, team_stats: List[pd.DataFrame]) -> None:
+        dicts = [{} if df.empty else df.iloc[0].to_dict() for df in team_stats]
+
+        def stat(key: str, default: float) -> np.ndarray:
+            return np.array([d.get(key, default) for d in dicts], dtype=float)
+
+        self.offense_pass_oe = stat("offense_pass_oe_est", 0.0)
+        self.defense_pass_oe = stat("defense_pass_oe_est", 0.0)
+        self.offense_go_for_it = stat("offense_go_for_it_rate_est", 0.0)
+        self.offense_sack_rate = stat("offense_sack_rate_est", 0.06)
+        self.defense_sack_rate = stat("defense_sack_rate_est", 0.06)
+        self.lg_sack_rate = stat("lg_sack_rate", 0.06)
+        self.defense_int_rate = stat("defense_int_rate_est", 0.02)
+        self.defense_relative_air_yards = stat("defense_relative_air_yards", 1.0)
+        self.defense_relative_yac = stat("defense_relative_yac_est", 1.0)
+        self.defense_relative_ypc = stat("defense_relative_ypc_est", 1.0)
+        self.defense_cpoe = stat("defense_cpoe_est", 0.0)
+
+    def _build_roster_arrays(self, player_stats: List[pd.DataFrame]) -> None:
+        self.qb_col = np.zeros(2, dtype=np.int64)
+        self.has_qb = np.zeros(2, dtype=bool)
+        self.qb_scramble_rate = np.zeros(2)
+        self.qb_is_mobile = np.zeros(2, dtype=bool)
+        self.qb_relative_scramble = np.ones(2)
+        self.qb_cpoe = np.zeros(2)
+        self.k_col = np.zeros(2, dtype=np.int64)
+        self.has_k = np.zeros(2, dtype=bool)
+        self.k_fgoe = np.zeros(2)
+
+        # Carriers: [side][zone] -> (columns, cumulative probabilities)
+        self.carriers = [[None] * len(_ZONES) for _ in range(2)]
+        # Targets: [side] -> dict of per-candidate arrays
+        self.targets = [None, None]
+
+        for side, df in enumerate(player_stats):
+            team = self.teams[side]
+            qbs = get_qbs(df)
+            if qbs:
+                qb = qbs[0]
+                self.has_qb[side] = True
+                self.qb_col[side] = self._col(qb["player_id"])
+                self.qb_scramble_rate[side] = qb.get("scramble_rate_est", 0)
+                self.qb_is_mobile[side] = qb.get("is_mobile", 0) == 1
+                self.qb_relative_scramble[side] = qb.get("relative_yards_per_scramble_est", 1.0)
+                self.qb_cpoe[side] = qb.get("cpoe_est", 0.0) / 100.0
+            else:
+                self.qb_col[side] = self._col("QB_%s" % team)
+
+            kickers = get_kickers(df)
+            if kickers:
+                k = kickers[0]
+                self.has_k[side] = True
+                self.k_col[side] = self._col(k["player_id"])
+                self.k_fgoe[side] = k.get("fgoe_est", 0.0)
+            else:
+                self.k_col[side] = self._col("Kicker_%s" % team)
+
+            for z, zone in enumerate(_ZONES):
+                records, weights = get_carriers(df, zone)
+                if not records:
+                    continue
+                # Same NaN and zero-sum handling as GameState.choose_carrier
+                weights = np.array([0.0 if pd.isna(w) else w for w in weights], dtype=float)
+                if weights.sum() == 0:
+                    weights = np.ones(len(weights))
+                self.carriers[side][z] = (
+                    np.array([self._col(r["player_id"]) for r in records]),
+                    _cumulative(weights),
+                )
+
+            records, weights = get_targets(df)
+            if records:
+                positions = []
+                for r in records:
+                    pos = r["position"]
+                    positions.append(
+                        _TARGET_POSITIONS.index(pos) if pos in [Position.WR, Position.RB, Position.TE] else 3
+                    )
+                self.targets[side] = {
+                    "cols": np.array([self._col(r["player_id"]) for r in records]),
+                    "cum": _cumulative(np.array(weights, dtype=float)),
+                    "position": np.array(positions),
+                    "relative_air_yards": np.array([r.get("relative_air_yards_est", 1.0) for r in records], dtype=float),
+                    "relative_yac": np.array([r.get("relative_yac_est", 1.0) for r in records], dtype=float),
+                    "receiver_cpoe": np.array([r.get("receiver_cpoe_est", 0.0) for r in records], dtype=float) / 100.0,
+                }
+
+    # --- Game flow ---
+
+    def play_games(self) -> pd.DataFrame:
+        """Simulates every game from kickoff to end.
+
+        Returns:
+            pd.DataFrame: Fantasy points with one row per player id and one column per
+                simulation. Players without points in a simulation are NaN, matching
+                `pd.DataFrame([game.play_game()[0] for ...]).transpose()`.
+        """
+        self.opening_kickoff()
+        while not self.game_over.all():
+            self.advance_snap()
+        # Give end-of-game point adjustments for defenses.
+        all_games = np.ones(self.n, dtype=bool)
+        self._add_points(all_games, self.team_col[0], self.get_defense_score_points(self.away_score))
+        self._add_points(all_games, self.team_col[1], self.get_defense_score_points(self.home_score))
+        return self.points_frame()
+
+    def points_frame(self) -> pd.DataFrame:
+        """Exports the fantasy point matrix as a players x simulations DataFrame."""
+        points = np.where(self.touched, self.fantasy_points, np.nan)
+        keep = self.touched.any(axis=0)
+        return pd.DataFrame(
+            points[:, keep].T,
+            index=[pid for pid, k in zip(self.player_ids, keep) if k],
+        )
+
+    def get_defense_score_points(self, score: np.ndarray) -> np.ndarray:
+        """Vectorized version of GameState.get_defense_score_points."""
+        r = self.rules
+        return np.select(
+            [score == 0, score < 7, score < 14, score < 21, score < 28, score < 35],
+            [r.pa_0, r.pa_1_6, r.pa_7_13, r.pa_14_20, r.pa_21_27, r.pa_28_34],
+            default=r.pa_35_plus,
+        )
+
+    def opening_kickoff(self) -> None:
+        """Initializes every game for the opening kickoff."""
+        self.down[:] = 1
+        self.quarter[:] = 1
+        self.pos_home = self.rng.random(self.n) < 0.5
+        self.second_half_pos_home = ~self.pos_home
+        self.yard_line[:] = 75
+
+    def advance_snap(self) -> None:
+        """Executes a single snap in every live game and updates the state arrays."""
+        live = ~self.game_over
+        if not live.any():
+            return
+        n = self.n
+        pos = np.where(self.pos_home, 0, 1)
+        dfn = 1 - pos
+
+        playcall = np.full(n, -1)
+        playcall[live] = self.choose_playcall(live, pos, dfn)
+
+        # Field goals and punts end the snap without touching the clock (as in GameState).
+        punts = playcall == PUNT
+        if punts.any():
+            self.punt(punts)
+        field_goals = playcall == FIELD_GOAL
+        if field_goals.any():
+            self.field_goal(field_goals, pos)
+
+        run = playcall == RUN
+        pass_ = playcall == PASS
+        plays = run | pass_
+        if not plays.any():
+            return
+
+        yards = np.zeros(n)
+        air_yards = np.zeros(n)
+        is_complete = np.zeros(n, dtype=bool)
+        fumble = np.zeros(n, dtype=bool)
+        sack = np.zeros(n, dtype=bool)
+        scramble = np.zeros(n, dtype=bool)
+        interception = np.zeros(n, dtype=bool)
+        carrier_col = np.full(n, -1)
+        target_col = np.full(n, -1)
+
+        # --- Run plays ---
+        if run.any():
+            carrier_col[run] = self.choose_carrier(run, pos)
+            has_carrier = run & (carrier_col >= 0)
+            yards[has_carrier] = self.compute_carry_yards(has_carrier, dfn)
+            fumble[run] = self.rng.random(run.sum()) < 0.008
+
+        # --- Pass plays ---
+        if pass_.any():
+            sack_rate = compute_odds_ratio(
+                self.offense_sack_rate[pos], self.defense_sack_rate[dfn], self.lg_sack_rate[pos]
+            )
+            sack = pass_ & (self.rng.random(n) < sack_rate)
+            yards[sack] = -7
+            fumble |= sack & (self.rng.random(n) < 0.008)
+
+            scramble = pass_ & ~sack & self.has_qb[pos] & (self.rng.random(n) < self.qb_scramble_rate[pos])
+            if scramble.any():
+                yards[scramble] = self.compute_scramble_yards(scramble, pos)
+
+            dropback = pass_ & ~sack & ~scramble
+            interception = dropback & (self.rng.random(n) < self.defense_int_rate[dfn])
+            target_idx = np.full(n, -1)
+            target_idx[dropback] = self.choose_target(dropback, pos)
+            targeted = dropback & (target_idx >= 0)
+            if targeted.any():
+                target_col[targeted] = self._target_attr(targeted, pos, target_idx, "cols")
+                air_yards[targeted] = self.compute_air_yards(targeted, pos, dfn, target_idx)
+                attempt = targeted & ~interception
+                if attempt.any():
+                    is_complete[attempt] = self.is_complete(attempt, pos, dfn, target_idx, air_yards)
+                if is_complete.any():
+                    yac = self.compute_yac(is_complete, pos, dfn, target_idx)
+                    yards[is_complete] = air_yards[is_complete] + yac
+
+        k_col = self.k_col[pos]
+        td = np.zeros(n, dtype=bool)
+
+        # --- Resolve the play (mutually exclusive branches, in GameState order) ---
+        resolved = ~plays
+        branch = plays & interception
+        if branch.any():
+            # Advance the ball the point of the air yards, then return the interception.
+            self.yard_line[branch] -= air_yards[branch]
+            self.change_possession(branch)
+            self._check_ot_stop(branch)
+            self.yard_line[branch] -= self.rng.choice(self.int_return_samples, branch.sum())
+            self.yard_line[branch & (self.yard_line >= 100)] = 75
+            pick_six = branch & (self.yard_line <= 0)
+            if pick_six.any():
+                self.touchdown(pick_six)
+                self._add_points(pick_six, self.team_col[np.where(self.pos_home, 0, 1)], self.rules.def_td)
+                td |= pick_six
+                good = self.extra_point(pick_six)
+                self._add_points(good, k_col, self.rules.pat_made)
+            self.first_down(branch & ~pick_six)
+        resolved |= branch
+
+        branch = ~resolved & fumble
+        if branch.any():
+            self.yard_line[branch] -= yards[branch]
+            self.change_possession(branch)
+            self._check_ot_stop(branch)
+            self.yard_line[branch] = 100 - self.yard_line[branch]
+            self.first_down(branch)
+        resolved |= branch
+
+        # If more yards were gained than remaining yards, touchdown.
+        branch = ~resolved & (yards > self.yard_line)
+        if branch.any():
+            yards[branch] = self.yard_line[branch]
+            self.touchdown(branch)
+            td |= branch
+        resolved |= branch
+
+        # Tackled for loss into endzone should result in safety.
+        branch = ~resolved & (self.yard_line - yards > 100)
+        if branch.any():
+            # GameState.defteam() returns the possessing team, so the safety credit follows it.
+            self._add_points(branch, self.team_col[np.where(self.pos_home, 0, 1)], self.rules.def_safety)
+            self.safety(branch)
+        resolved |= branch
+
+        branch = ~resolved & (self.yds_to_go <= yards)
+        if branch.any():
+            self.yard_line[branch] -= yards[branch]
+            self.first_down(branch)
+        resolved |= branch
+
+        branch = ~resolved
+        if branch.any():
+            self.yard_line[branch] -= yards[branch]
+            on_downs = branch & (self.down == 4)
+            self.turnover_on_downs(on_downs)
+            advance = branch & ~on_downs
+            self.down[advance] += 1
+            self.yds_to_go[advance] -= yards[advance]
+
+        # --- Count the fantasy points for this play ---
+        rules = self.rules
+        qb_col = self.qb_col[pos]
+
+        credited = run & (carrier_col >= 0)
+        if credited.any():
+            self._add_points(credited, carrier_col, rules.rush_yard * yards)
+            scored = credited & td
+            self._add_points(scored, carrier_col, rules.rush_td)
+            self._add_points(self.extra_point(scored), k_col, rules.pat_made)
+
+        credited = pass_ & ~sack & ~scramble & is_complete & (target_col >= 0)
+        if credited.any():
+            self._add_points(credited, qb_col, rules.pass_yard * yards)
+            target_fpts = rules.reception + rules.rec_yard * yards
+            scored = credited & td
+            self._add_points(scored, qb_col, rules.pass_td)
+            target_fpts = np.where(scored, target_fpts + rules.rec_td, target_fpts)
+            self._add_points(self.extra_point(scored), k_col, rules.pat_made)
+            self._add_points(credited, target_col, target_fpts)
+
+        if scramble.any():
+            self._add_points(scramble, qb_col, rules.rush_yard * yards)
+            scored = scramble & td
+            self._add_points(scored, qb_col, rules.rush_td)
+            self._add_points(self.extra_point(scored), k_col, rules.pat_made)
+
+        # Team credits go to GameState.defteam(), i.e. whoever holds the ball after the play.
+        team_col = self.team_col[np.where(self.pos_home, 0, 1)]
+        if interception.any():
+            self._add_points(interception, qb_col, rules.intercept)
+            self._add_points(interception, team_col, rules.def_int)
+
+        if sack.any():
+            self._add_points(sack, team_col, rules.def_sack)
+            self._add_points(sack, qb_col, rules.sack)
+
+        fumble &= plays
+        if fumble.any():
+            fumbler_col = np.where(run, np.where(carrier_col >= 0, carrier_col, self.no_carrier_col), qb_col)
+            self._add_points(fumble, fumbler_col, rules.fumble_lost)
+            self._add_points(fumble, team_col, rules.def_fumble_rec)
+
+        self.advance_clock(plays, playcall, sack, is_complete, scramble)
+        self.drive_play_count[plays] += 1
+
+    def _add_points(self, mask: np.ndarray, cols: np.ndarray, points: Any) -> None:
+        """Adds points to player columns for the games selected by mask."""
+        if not mask.any():
+            return
+        rows = np.flatnonzero(mask)
+        cols = np.broadcast_to(cols, mask.shape)[rows]
+        self.fantasy_points[rows, cols] += np.broadcast_to(points, mask.shape)[rows]
+        self.touched[rows, cols] = True
+
+    # --- State transitions (mirroring GameState) ---
+
+    def score_differential(self) -> np.ndarray:
+        """Score differential from the perspective of the team with possession."""
+        diff = self.home_score - self.away_score
+        return np.where(self.pos_home, diff, -diff)
+
+    def change_possession(self, mask: np.ndarray) -> None:
+        self.ot_possession_count[mask & self.in_overtime] += 1
+        self.pos_home[mask] = ~self.pos_home[mask]
+
+    def _check_ot_stop(self, mask: np.ndarray) -> None:
+        # Second OT possession ends the game if the first drive only kicked a field goal
+        # and the chasing team turned it over.
+        stop = mask & self.in_overtime & (self.ot_possession_count == 2) & (self.ot_first_drive_score == 3)
+        self.game_over[stop] = True
+
+    def first_down(self, mask: np.ndarray) -> None:
+        self.down[mask] = 1
+        self.yds_to_go[mask] = np.where(self.yard_line[mask] >= 10, 10, self.yard_line[mask])
+        self.drive_play_count[mask] = 1
+
+    def kickoff(self, mask: np.ndarray) -> None:
+        self.change_possession(mask)
+        self.yard_line[mask] = 75
+        self.first_down(mask)
+
+    def touchdown(self, mask: np.ndarray) -> None:
+        self.home_score[mask & self.pos_home] += 6
+        self.away_score[mask & ~self.pos_home] += 6
+        self.game_over[mask & self.in_overtime] = True
+
+    def safety(self, mask: np.ndarray) -> None:
+        # Give 2 points to the team that does not have the ball.
+        self.away_score[mask & self.pos_home] += 2
+        self.home_score[mask & ~self.pos_home] += 2
+        self.game_over[mask & self.in_overtime] = True
+        self.kickoff(mask)
+
+    def extra_point(self, mask: np.ndarray) -> np.ndarray:
+        """Attempts an extra point in the masked games; returns the mask of good kicks."""
+        good = mask & (self.rng.random(self.n) < 0.93)
+        self.home_score[good & self.pos_home] += 1
+        self.away_score[good & ~self.pos_home] += 1
+        self.kickoff(mask)
+        return good
+
+    def turnover_on_downs(self, mask: np.ndarray) -> None:
+        self.change_possession(mask)
+        self._check_ot_stop(mask)
+        self.yard_line[mask] = 100 - self.yard_line[mask]
+        self.first_down(mask)
+
+    def half_time(self, mask: np.ndarray) -> None:
+        self.pos_home[mask] = self.second_half_pos_home[mask]
+        self.yard_line[mask] = 75
+        self.first_down(mask)
+
+    def start_overtime(self, mask: np.ndarray) -> None:
+        self.in_overtime[mask] = True
+        self.pos_home[mask] = self.rng.random(mask.sum()) < 0.5
+        self.yard_line[mask] = 75
+        self.first_down(mask)
+
+    def punt(self, mask: np.ndarray) -> None:
+        new_yardline = self.yard_line[mask] - 45
+        self.yard_line[mask] = np.where(new_yardline < 0, 75, 100 - new_yardline)
+        self.change_possession(mask)
+        self.down[mask] = 1
+        self.yds_to_go[mask] = 10
+
+    def advance_clock(
+        self,
+        mask: np.ndarray,
+        playcall: np.ndarray,
+        sack: np.ndarray,
+        is_complete: np.ndarray,
+        scramble: np.ndarray,
+    ) -> None:
+        """Vectorized GameState.advance_clock for the masked games."""
+        original_sec_remaining = self.sec_remaining.copy()
+
+        qtr_bucket = np.where(self.quarter >= 5, 2, np.where(self.quarter == 4, 1, 0))
+        time_bucket = np.where(self.sec_remaining > 300, 0, np.where(self.sec_remaining > 120, 1, 2))
+        diff = self.score_differential()
+        score_bucket = np.select([diff >= 9, diff > 0, diff == 0, diff > -9], [0, 1, 2, 3], default=4)
+        play_detail = np.select(
+            [playcall == PASS, playcall == PUNT, playcall == FIELD_GOAL],
+            [np.where(sack | is_complete, 0, 1), 3, 4],
+            default=2,
+        )
+        runoff = self.clock_table[qtr_bucket, time_bucket, score_bucket, play_detail]
+
+        # Fallback (Original Logic) where the clock model has no entry
+        incomplete = (playcall == PASS) & ~is_complete & ~sack & ~scramble
+        winning = diff > 0
+        fallback = np.where(
+            incomplete | (playcall == PUNT) | (playcall == FIELD_GOAL),
+            5,
+            np.where(
+                self.quarter == 4,
+                np.where(winning, 45, np.where(self.sec_remaining < 5 * 60, 10, 30)),
+                35,
+            ),
+        )
+        runoff = np.where(np.isnan(runoff), fallback, runoff)
+        self.sec_remaining[mask] -= runoff[mask]
+
+        # Check for the 2 minute warning.
+        two_minute = (
+            mask
+            & ((self.quarter == 2) | (self.quarter == 4))
+            & (self.sec_remaining < 120)
+            & (original_sec_remaining > 120)
+        )
+        self.sec_remaining[two_minute] = 120
+
+        # Check for the end of quarters.
+        expired = mask & (self.sec_remaining <= 0)
+        if not expired.any():
+            return
+        self.half_time(expired & (self.quarter == 2))
+        end_of_regulation = expired & (self.quarter == 4)
+        self.game_over[end_of_regulation & (self.home_score != self.away_score)] = True
+        self.start_overtime(end_of_regulation & (self.home_score == self.away_score))
+        self.game_over[expired & (self.quarter >= 5)] = True
+
+        next_quarter = expired & ~self.game_over
+        self.quarter[next_quarter] += 1
+        self.sec_remaining[next_quarter] = np.where(self.quarter[next_quarter] <= 4, 15 * 60, 10 * 60)
+
+    # --- Play outcomes ---
+
+    def choose_playcall(self, mask: np.ndarray, pos: np.ndarray, dfn: np.ndarray) -> np.ndarray:
+        """Vectorized GameState.choose_playcall for the masked games; returns play codes."""
+        PASS_INDEX = 1
+        RUN_INDEX = 3
+        model_input = np.column_stack([
+            self.down,
+            self.yds_to_go,
+            self.score_differential(),
+            self.sec_remaining,
+            self.quarter,
+            self.yard_line,
+            np.full(self.n, self.vegas_total),
+            np.full(self.n, self.vegas_spread),
+            self.drive_play_count,
+        ])[mask]
+        base_probs = np.array(self.playcall_model.predict_proba(model_input), dtype=float)
+        pos, dfn = pos[mask], dfn[mask]
+
+        defense_pass_oe = self.defense_pass_oe[dfn] / 100.0
+        offense_pass_oe = self.offense_pass_oe[pos] / 100.0
+        base_probs[:, PASS_INDEX] += defense_pass_oe
+        base_probs[:, PASS_INDEX] += offense_pass_oe
+        base_probs[:, RUN_INDEX] -= defense_pass_oe
+        base_probs[:, RUN_INDEX] -= offense_pass_oe
+
+        classes = list(self.playcall_model.classes_)
+        fourth = self.down[mask] == 4
+        if fourth.any():
+            base_probs[fourth] = self._fourth_down_adjustment(base_probs[fourth], classes, pos[fourth])
+
+        choice = _choices(base_probs, self.rng.random(len(base_probs)))
+        codes = np.array([_PLAYCALL_CODES.get(c, RUN) for c in classes])
+        return codes[choice]
+
+    def _fourth_down_adjustment(self, probs: np.ndarray, classes: List[str], pos: np.ndarray) -> np.ndarray:
+        fg_idx = classes.index('field_goal')
+        pass_idx = classes.index('pass')
+        punt_idx = classes.index('punt')
+        run_idx = classes.index('run')
+        scaled_shift_amount = self.offense_go_for_it[pos] * 0.2
+
+        p_run_pass_combined = probs[:, run_idx] + probs[:, pass_idx]
+        p_fg_punt_combined = probs[:, fg_idx] + probs[:, punt_idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            run_pass_ratio = np.where(p_run_pass_combined > 0, probs[:, run_idx] / p_run_pass_combined, 0.5)
+            pass_run_ratio = np.where(p_run_pass_combined > 0, probs[:, pass_idx] / p_run_pass_combined, 0.5)
+            fg_punt_ratio_fg = np.where(p_fg_punt_combined > 0, probs[:, fg_idx] / p_fg_punt_combined, 0.5)
+            fg_punt_ratio_punt = np.where(p_fg_punt_combined > 0, probs[:, punt_idx] / p_fg_punt_combined, 0.5)
+
+        # Positive shift moves mass from FG/Punt to Run/Pass, negative the other way.
+        shift = np.where(
+            scaled_shift_amount > 0,
+            np.minimum(scaled_shift_amount, p_fg_punt_combined),
+            np.where(scaled_shift_amount < 0, -np.minimum(np.abs(scaled_shift_amount), p_run_pass_combined), 0.0),
+        )
+        probs[:, run_idx] += shift * run_pass_ratio
+        probs[:, pass_idx] += shift * pass_run_ratio
+        probs[:, fg_idx] -= shift * fg_punt_ratio_fg
+        probs[:, punt_idx] -= shift * fg_punt_ratio_punt
+
+        probs = np.clip(probs, 0, None)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+    def choose_carrier(self, mask: np.ndarray, pos: np.ndarray) -> np.ndarray:
+        """Picks a ball carrier column for each masked game (-1 when none is eligible)."""
+        dist_to_goal = np.where(self.pos_home, 100 - self.yard_line, self.yard_line)
+        zone = np.where(dist_to_goal <= 3, 2, np.where(dist_to_goal <= 20, 1, 0))
+        result = np.full(self.n, -1)
+        for side in range(2):
+            for z in range(len(_ZONES)):
+                group = mask & (pos == side) & (zone == z)
+                if not group.any() or self.carriers[side][z] is None:
+                    continue
+                cols, cum = self.carriers[side][z]
+                result[group] = cols[_draw(cum, self.rng.random(group.sum()))]
+        return result[mask]
+
+    def compute_carry_yards(self, mask: np.ndarray, dfn: np.ndarray) -> np.ndarray:
+        dist_to_goal = np.where(self.pos_home, 100 - self.yard_line, self.yard_line)[mask]
+        yards = np.where(
+            dist_to_goal <= 20,
+            self.rng.choice(self.rush_rz_samples, len(dist_to_goal)),
+            self.rng.choice(self.rush_open_samples, len(dist_to_goal)),
+        )
+        return yards * self.defense_relative_ypc[dfn[mask]]
+
+    def compute_scramble_yards(self, mask: np.ndarray, pos: np.ndarray) -> np.ndarray:
+        side = pos[mask]
+        mobile = self.qb_is_mobile[side]
+        yards = np.where(
+            mobile,
+            self.rng.choice(self.scramble_samples["mobile"], len(side)),
+            self.rng.choice(self.scramble_samples["pocket"], len(side)),
+        )
+        return yards * self.qb_relative_scramble[side]
+
+    def choose_target(self, mask: np.ndarray, pos: np.ndarray) -> np.ndarray:
+        """Picks a target index (into the side's candidate arrays) for each masked game."""
+        result = np.full(self.n, -1)
+        for side in range(2):
+            group = mask & (pos == side)
+            if not group.any() or self.targets[side] is None:
+                continue
+            result[group] = _draw(self.targets[side]["cum"], self.rng.random(group.sum()))
+        return result[mask]
+
+    def _target_attr(self, mask: np.ndarray, pos: np.ndarray, target_idx: np.ndarray, attr: str) -> np.ndarray:
+        values = None
+        for side in range(2):
+            group = mask & (pos == side)
+            if group.any():
+                candidates = self.targets[side][attr]
+                if values is None:
+                    values = np.zeros(self.n, dtype=candidates.dtype)
+                values[group] = candidates[target_idx[group]]
+        return values[mask]
+
+    def compute_air_yards(self, mask: np.ndarray, pos: np.ndarray, dfn: np.ndarray, target_idx: np.ndarray) -> np.ndarray:
+        AIR_YARDS_SHIFT = 15.0
+        position = self._target_attr(mask, pos, target_idx, "position")
+        base = np.empty(len(position))
+        for p in range(len(_TARGET_POSITIONS)):
+            group = position == p
+            if group.any():
+                base[group] = self.rng.choice(self.air_yards_samples[p], group.sum())
+
+        player_multiplier = self._target_attr(mask, pos, target_idx, "relative_air_yards")
+        defense_relative_air_yards = self.defense_relative_air_yards[dfn[mask]]
+        yard_line = self.yard_line[mask]
+        # Shifted Multiplicative Scaling (see GameState.compute_air_yards)
+        shiftable = (base + AIR_YARDS_SHIFT) > 0
+        scaled = ((base + AIR_YARDS_SHIFT) * player_multiplier) - AIR_YARDS_SHIFT
+        scaled = np.where(yard_line >= 20, scaled * defense_relative_air_yards, scaled)
+        base = np.where(shiftable, scaled, base)
+        # Cap at the back of the end zone.
+        return np.where(yard_line - base <= -10, yard_line + 10, base)
+
+    def is_complete(
+        self, mask: np.ndarray, pos: np.ndarray, dfn: np.ndarray, target_idx: np.ndarray, air_yards: np.ndarray
+    ) -> np.ndarray:
+        COMPLETE_INDEX = 1
+        m = mask.sum()
+        model_input = np.column_stack([
+            self.down[mask],
+            self.yds_to_go[mask],
+            self.yard_line[mask],
+            air_yards[mask],
+            np.full(m, self.wind),
+            np.full(m, self.is_outdoors),
+        ])
+        base_probs = np.array(self.completion_model.predict_proba(model_input), dtype=float)
+        p_complete = base_probs[:, COMPLETE_INDEX]
+
+        defense_cpoe = self.defense_cpoe[dfn[mask]] / 100.0
+        qb_cpoe = self.qb_cpoe[pos[mask]]
+        target_cpoe = self._target_attr(mask, pos, target_idx, "receiver_cpoe")
+        offense_cpoe = 0.75 * qb_cpoe + 0.25 * target_cpoe
+        est_comp = compute_odds_ratio(p_complete + offense_cpoe, p_complete + defense_cpoe, p_complete)
+
+        weights = np.column_stack([1 - est_comp, est_comp])
+        classes = np.asarray(self.completion_model.classes_)
+        return classes[_choices(weights, self.rng.random(m))].astype(int) == 1
+
+    def compute_yac(self, mask: np.ndarray, pos: np.ndarray, dfn: np.ndarray, target_idx: np.ndarray) -> np.ndarray:
+        position = self._target_attr(mask, pos, target_idx, "position")
+        yac = np.empty(len(position))
+        for p in range(len(_TARGET_POSITIONS)):
+            group = position == p
+            if group.any():
+                yac[group] = self.rng.choice(self.yac_samples[p], group.sum())
+        relative_yac_est = self._target_attr(mask, pos, target_idx, "relative_yac")
+        defense_relative_yac = self.defense_relative_yac[dfn[mask]]
+        return np.where(yac > 0, yac * defense_relative_yac * relative_yac_est, yac)
+
+    def field_goal(self, mask: np.ndarray, pos: np.ndarray) -> None:
+        """Vectorized GameState.field_goal for the masked games."""
+        kicking_yards = self.yard_line[mask] + 17
+        m = mask.sum()
+        model_input = np.column_stack([
+            (self.home_score - self.away_score)[mask],
+            self.sec_remaining[mask],
+            self.quarter[mask],
+            kicking_yards,
+            np.full(m, self.wind),
+            np.full(m, self.is_outdoors),
+        ])
+        base_probs = np.array(self.field_goal_model.predict_proba(model_input), dtype=float)
+        side = pos[mask]
+
+        classes = list(self.field_goal_model.classes_)
+        if 'made' in classes:
+            made_idx = classes.index('made')
+            # FGOE Adjustment
+            p_made = base_probs[:, made_idx]
+            new_p_made = _py_clip(p_made + self.k_fgoe[side], 0.0, 1.0)
+            adjust = self.has_k[side] & (p_made < 1.0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                factor = (1 - new_p_made) / (1 - p_made)
+            base_probs[adjust] *= factor[adjust, None]
+            base_probs[adjust, made_idx] = new_p_made[adjust]
+
+        choice = np.asarray(classes)[_choices(base_probs, self.rng.random(m))]
+        made = np.zeros(self.n, dtype=bool)
+        made[mask] = choice == 'made'
+        missed = mask & ~made
+
+        if made.any():
+            distance = np.zeros(self.n)
+            distance[mask] = kicking_yards
+            kicker = made & self.has_k[pos]
+            fg_points = np.where(
+                distance <= 39, self.rules.fg_0_39, np.where(distance <= 49, self.rules.fg_40_49, self.rules.fg_50_plus)
+            )
+            self._add_points(kicker, self.k_col[pos], fg_points)
+            self.home_score[made & self.pos_home] += 3
+            self.away_score[made & ~self.pos_home] += 3
+
+            ot = made & self.in_overtime
+            first_drive = ot & (self.ot_possession_count == 0)
+            self.ot_first_drive_score[first_drive] = 3
+            # Tied again after matching a first-drive field goal (sudden death next).
+            answered = ot & (self.ot_possession_count == 1) & (self.ot_first_drive_score == 3)
+            self.game_over[ot & ~first_drive & ~answered] = True
+            self.kickoff((made & ~self.in_overtime) | first_drive | answered)
+
+        if missed.any():
+            chasing = missed & self.in_overtime & (self.ot_possession_count == 1) & (self.ot_first_drive_score == 3)
+            self.game_over[chasing] = True
+            self.turnover_on_downs(missed)
+
+
+def compute_odds_ratio(p1: np.ndarray, p2: np.ndarray, lg: np.ndarray) -> np.ndarray:
+    """Vectorized engine.game.compute_odds_ratio (including its NaN clamping behaviour)."""
+    epsilon = 1e-4
+    p1 = _py_clip(p1, epsilon, 1 - epsilon)
+    p2 = _py_clip(p2, epsilon, 1 - epsilon)
+    lg = _py_clip(lg, epsilon, 1 - epsilon)
+
+    odds_ratio_p1 = p1 / (1 - p1)
+    odds_ratio_p2 = p2 / (1 - p2)
+    odds_ratio_lg = lg / (1 - lg)
+    or_factor = odds_ratio_p1 * odds_ratio_p2 / odds_ratio_lg
+    return or_factor / (1 + or_factor)
+
+
+def _py_clip(x: np.ndarray, low: float, high: float) -> np.ndarray:
+    """Clips like `max(low, min(high, x))` in Python, which maps NaN to `high`."""
+    x = np.asarray(x, dtype=float)
+    return np.where(np.isnan(x), high, np.clip(x, low, high))
+
+
+def _cumulative(weights: np.ndarray) -> np.ndarray:
+    cum = np.cumsum(weights)
+    return cum / cum[-1]
+
+
+def _draw(cum: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """Inverse-CDF draw from normalized cumulative weights."""
+    return np.minimum(np.searchsorted(cum, u, side="right"), len(cum) - 1)
+
+
+def _choices(weights: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """Row-wise equivalent of `random.choices(range(k), weights=row)` for a weight matrix."""
+    cum = np.cumsum(weights, axis=1)
+    x = u * cum[:, -1]
+    return np.minimum((cum <= x[:, None]).sum(axis=1), weights.shape[1] - 1)
@@ -0,0 +1,97 @@
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+# Models entries holding pre-sampled KDE draws (rush_open_samples, scramble_samples_mobile, ...).
+SAMPLE_KEY = "_samples"
+
+# Shared memory segments this process has mapped. Views into a segment do not keep its
+# SharedMemory object alive (and closing it unmaps them), so segments stay mapped until exit.
+_SEGMENTS: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def sample_keys(models: Dict[str, Any]) -> List[str]:
+    """Keys of the pre-sampled buffers in a models dict, in insertion order."""
+    return [key for key, value in models.items() if SAMPLE_KEY in key and isinstance(value, np.ndarray)]
+
+
+class SampleBuffers:
+    """The read-only KDE sample buffers packed into one contiguous block.
+
+    Every `*_samples` array from get_models is cast to `dtype` and copied into a single
+    block, either a `multiprocessing.shared_memory` segment or (with `path`) an on-disk
+    memmap. Other processes attach to it by name from the small, picklable `spec`. They
+    get read-only views into the same pages instead of their own copy, so N workers
+    share one copy of the buffers and attaching does not unpickle any data.
+
+    Attributes:
+        spec (Dict[str, Any]): Block name or path, dtype and the (offset, length) of every
+            buffer. Pass it to `attach`.
+        arrays (Dict[str, np.ndarray]): Read-only view of each buffer, by models key.
+    """
+
+    def __init__(self, spec: Dict[str, Any], owner: bool):
+        self.spec = spec
+        self._owner = owner
+        if spec["path"] is not None:
+            block = np.memmap(spec["path"], dtype=spec["dtype"], mode="r", shape=(spec["size"],))
+        else:
+            if spec["name"] not in _SEGMENTS:
+                _SEGMENTS[spec["name"]] = shared_memory.SharedMemory(name=spec["name"])
+            block = np.ndarray((spec["size"],), dtype=spec["dtype"], buffer=_SEGMENTS[spec["name"]].buf)
+        block.flags.writeable = False
+        self.arrays = {key: block[offset:offset + length] for key, (offset, length) in spec["layout"].items()}
+
+    @classmethod
+    def create(cls, models: Dict[str, Any], dtype: str = "float32", path: Optional[str] = None) -> "SampleBuffers":
+        """Packs the sample buffers of a models dict.
+
+        Args:
+            models: Models dictionary as returned by main.get_models().
+            dtype: Storage dtype. float32 halves the block; samples are read back as
+                scalars, so engine arithmetic stays in float64.
+            path: If set, back the block with a memmap file at this path instead of shared
+                memory.
+
+        Returns:
+            SampleBuffers: The owning handle.
+        """
+        layout, offset = {}, 0
+        for key in sample_keys(models):
+            layout[key] = (offset, len(models[key]))
+            offset += len(models[key])
+        size = max(offset, 1)
+        spec = {"name": None, "path": path, "dtype": np.dtype(dtype).str, "size": size, "layout": layout}
+
+        if path is not None:
+            block = np.memmap(path, dtype=dtype, mode="w+", shape=(size,))
+        else:
+            shm = shared_memory.SharedMemory(create=True, size=size * np.dtype(dtype).itemsize)
+            spec["name"] = shm.name
+            _SEGMENTS[shm.name] = shm
+            block = np.ndarray((size,), dtype=dtype, buffer=shm.buf)
+        for key, (start, length) in layout.items():
+            block[start:start + length] = models[key]
+        if path is not None:
+            block.flush()
+        return cls(spec, owner=True)
+
+    @classmethod
+    def attach(cls, spec: Dict[str, Any]) -> "SampleBuffers":
+        """Attaches to a block created in another process."""
+        return cls(spec, owner=False)
+
+    @property
+    def nbytes(self) -> int:
+        return self.spec["size"] * np.dtype(self.spec["dtype"]).itemsize
+
+    def close(self):
+        """Drops the views, and unlinks the shared memory if this handle created it.
+
+        Other processes' mappings stay valid, and the memory is freed once every process
+        has exited. A memmap file is left in place.
+        """
+        self.arrays = {}
+        if self._owner and self.spec["name"] is not None:
+            _SEGMENTS[self.spec["name"]].unlink()
+        self._owner = False
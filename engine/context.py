@@ -0,0 +1,231 @@
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from engine.game import (
+    CARRY_SHARE_COLUMNS,
+    GameState,
+    normalize_target_weights,
+    team_stats_dict,
+)
+from engine.players import PlayerTable
+from engine.sampling import build_samplers
+from enums import Position
+from settings import ScoringSettings
+
+# Probabilistic injury logic: questionable players are scratched 25% of the time, and
+# otherwise play with a 20% volume reduction (limited/decoy risk).
+QUESTIONABLE_SCRATCH_RATE = 0.25
+QUESTIONABLE_VOLUME_FACTOR = 0.8
+_LIMITED_COLUMNS = ["target_share_est", "carry_share_est"]
+
+# Roster attribute prefixes on GameState for each carrier zone.
+_ZONE_ATTRS = {"standard": "", "redzone": "rz_", "goal_line": "gl_"}
+
+
+def scenario_matrix(seeds: Sequence[Any], n_questionable: int) -> np.ndarray:
+    """Scratch flags for every simulation of a game, as a (sims, questionable) bool matrix.
+
+    Row i holds the draws `simulate_matchup(context, seeds[i])` makes: the first uniforms
+    of the simulation's SimRandom stream. A simulation therefore sits out the same
+    players whichever engine plays it, and any row can be reproduced from its seed.
+
+    Args:
+        seeds: Per-simulation seeds (see engine.rng.sim_seed).
+        n_questionable: Number of questionable players.
+    """
+    draws = np.array([np.random.default_rng(seed).random(n_questionable) for seed in seeds])
+    return draws.reshape(len(seeds), n_questionable) < QUESTIONABLE_SCRATCH_RATE
+
+
+class _TeamRoster:
+    """One team's player records with candidate lists for every role, in frame order.
+
+    Candidates are positions in the team's frame; `offset` turns them into PlayerTable
+    indices when a roster is built. Carry and target shares are kept as arrays, so an
+    injury scenario is a scratch mask and a volume multiplier rather than edited records.
+    """
+
+    def __init__(self, player_stats: pd.DataFrame, offset: int = 0):
+        self.index = player_stats.index
+        self.offset = offset
+        self.records = player_stats.to_dict('records')
+        self.qbs = self._where(player_stats["position"] == Position.QB)
+        self.kickers = self._where(player_stats["position"] == Position.K)
+        self.carriers = {
+            zone: self._where(player_stats[column] > 0) for zone, column in CARRY_SHARE_COLUMNS.items()
+        }
+        self.targets = self._where(player_stats["target_percentage"] > 0)
+        self.shares = {
+            column: player_stats[column].to_numpy(dtype=np.float64)
+            for column in list(CARRY_SHARE_COLUMNS.values()) + ["target_share_est"]
+        }
+
+    def _where(self, mask: pd.Series) -> List[int]:
+        return [i for i, keep in enumerate(mask.to_numpy()) if keep]
+
+    def roster(self, side: str, scratched: Sequence[int], limited: Sequence[int]) -> Dict[str, Any]:
+        """Builds the GameState roster attributes for one side under an injury scenario."""
+        active_mask = np.ones(len(self.records), dtype=bool)
+        active_mask[list(scratched)] = False
+        factor = np.ones(len(self.records))
+        factor[list(limited)] = QUESTIONABLE_VOLUME_FACTOR
+
+        def active(candidates):
+            return [i for i in candidates if active_mask[i]]
+
+        def players(candidates):
+            return [self.offset + i for i in candidates]
+
+        def shares(column, candidates):
+            values = self.shares[column] * factor if column in _LIMITED_COLUMNS else self.shares[column]
+            return values[candidates].tolist()
+
+        roster = {
+            "%s_qbs" % side: players(_pick_starter(self.records, active(self.qbs), "starting_qb", "pass_attempts")),
+            "%s_kickers" % side: players(_pick_starter(self.records, active(self.kickers), "starting_k", "kick_attempts")),
+        }
+        for zone, column in CARRY_SHARE_COLUMNS.items():
+            carriers = active(self.carriers[zone])
+            roster["%s_%scarriers" % (side, _ZONE_ATTRS[zone])] = players(carriers)
+            roster["%s_%scarry_weights" % (side, _ZONE_ATTRS[zone])] = shares(column, carriers)
+        targets = active(self.targets)
+        roster["%s_targets" % side] = players(targets)
+        roster["%s_target_weights" % side] = normalize_target_weights(shares("target_share_est", targets))
+        return roster
+
+
+class MatchupContext:
+    """Everything GameState needs for one matchup, compiled once per schedule row.
+
+    Building a GameState from DataFrames filters, sorts and converts the rosters to
+    records on every simulation. The context does that work once: it keeps the player
+    records, the QB/K candidates, the carrier candidates for every zone, the target
+    candidates, the team stat dicts and the PlayerTable shared by every simulation. A
+    simulation's injury scenario then only picks which questionable players are
+    scratched or limited. Rosters are cached per scenario, so most simulations are
+    built with no roster work at all.
+
+    Attributes:
+        models (Dict[str, Any]): Loaded models and sample buffers.
+        home_team (str): Home team abbreviation.
+        away_team (str): Away team abbreviation.
+        rules (ScoringSettings): Fantasy scoring rules.
+        game_info (Dict[str, Any]): Wind, roof and Vegas lines for the game.
+        record_stats (bool): Whether games built from the context record stat lines.
+        home_team_stats (Dict[str, Any]): Home team estimators.
+        away_team_stats (Dict[str, Any]): Away team estimators.
+        players (PlayerTable): Index of the matchup's players. Scratched players keep
+            their index, so every simulation's points array lines up.
+        questionable (List[Tuple[str, int]]): (side, roster position) of each questionable
+            player, in the order their scratch draws are made.
+    """
+
+    def __init__(
+        self,
+        models: Dict[str, Any],
+        home_team: str,
+        away_team: str,
+        player_stats: pd.DataFrame,
+        team_stats: pd.DataFrame,
+        rules: ScoringSettings,
+        game_info: Dict[str, Any] = {},
+        record_stats: bool = False,
+    ):
+        """Compiles the matchup.
+
+        Args:
+            models: Dictionary of loaded ML models and sample buffers.
+            home_team: Home team abbreviation.
+            away_team: Away team abbreviation.
+            player_stats: Player estimators for both teams, with a `status` column.
+            team_stats: Team estimators (may include other teams).
+            rules: ScoringSettings object defining fantasy point values.
+            game_info: Dictionary containing game-specific context (wind, roof, etc).
+            record_stats: If True, every GameState also records per-player stat lines.
+        """
+        self.models = models
+        self.home_team = home_team
+        self.away_team = away_team
+        self.rules = rules
+        self.game_info = game_info
+        self.record_stats = record_stats
+        self.home_team_stats = team_stats_dict(team_stats[team_stats["team"].isin([home_team])])
+        self.away_team_stats = team_stats_dict(team_stats[team_stats["team"].isin([away_team])])
+
+        home_stats = player_stats[player_stats["team"].isin([home_team])]
+        away_stats = player_stats[player_stats["team"].isin([away_team])]
+        self.players = PlayerTable(home_stats, away_stats, home_team, away_team)
+        self._teams = {
+            "home": _TeamRoster(home_stats, self.players.home_offset),
+            "away": _TeamRoster(away_stats, self.players.away_offset),
+        }
+        self.questionable: List[Tuple[str, int]] = []
+        if "status" in player_stats:
+            for label in player_stats.index[player_stats["status"] == "Questionable"]:
+                for side, team in self._teams.items():
+                    if label in team.index:
+                        self.questionable.append((side, team.index.get_loc(label)))
+        self._rosters: Dict[Tuple[bool, ...], Dict[str, Any]] = {}
+
+    def roster(self, scratched: Optional[Sequence[bool]] = None) -> Dict[str, Any]:
+        """GameState roster attributes for an injury scenario.
+
+        Args:
+            scratched: One flag per questionable player (see `questionable`). Scratched
+                players are removed; the rest play with reduced target and carry shares.
+                None means no questionable player is scratched.
+
+        Returns:
+            Dict[str, Any]: home_/away_ qbs, kickers, carriers and targets (as indices into
+                `players`) with their weights and alias samplers.
+        """
+        key = tuple(bool(s) for s in scratched) if scratched is not None else (False,) * len(self.questionable)
+        if key not in self._rosters:
+            roster = {}
+            for side, team in self._teams.items():
+                out = [i for (s, i), flag in zip(self.questionable, key) if s == side and flag]
+                limited = [i for (s, i), flag in zip(self.questionable, key) if s == side and not flag]
+                roster.update(team.roster(side, out, limited))
+            # Alias tables are only rebuilt when the roster mask changes.
+            roster.update(build_samplers(roster))
+            self._rosters[key] = roster
+        return self._rosters[key]
+
+    def sample_scenario(self, rng: Any = random) -> List[bool]:
+        """Draws which questionable players are scratched for one simulation."""
+        return [rng.random() < QUESTIONABLE_SCRATCH_RATE for _ in self.questionable]
+
+    def sample_scenarios(self, seeds: Sequence[Any]) -> np.ndarray:
+        """Scratch flags for one simulation per seed, as a (sims, questionable) matrix.
+
+        Row i is the scenario `sample_game_state(rng=SimRandom(seeds[i]))` draws (see
+        scenario_matrix).
+        """
+        return scenario_matrix(seeds, len(self.questionable))
+
+    def game_state(self, scratched: Optional[Sequence[bool]] = None, trace: bool = False, rng: Any = None) -> GameState:
+        """Builds a fresh GameState for an injury scenario."""
+        return GameState.from_context(self, scratched, trace, rng)
+
+    def sample_game_state(self, trace: bool = False, rng: Any = None) -> GameState:
+        """Builds a fresh GameState with a newly drawn injury scenario.
+
+        Args:
+            trace: If True, records a log of every play.
+            rng: Random stream for the scenario draw and the game (e.g. an
+                engine.rng.SimRandom). Defaults to the global `random` module.
+        """
+        rng = rng if rng is not None else random
+        return self.game_state(self.sample_scenario(rng), trace, rng)
+
+
+def _pick_starter(records: List[Dict[str, Any]], candidates: List[int], flag: str, volume: str) -> List[int]:
+    # Same rule as get_qbs/get_kickers: the flagged starter if exactly one, else the most volume.
+    starting = [i for i in candidates if records[i][flag] == 1]
+    if len(starting) == 1:
+        return starting
+    if not candidates:
+        return []
+    ranked = sorted(candidates, key=lambda i: -records[i][volume] if pd.notna(records[i][volume]) else float("inf"))
+    return ranked[:1]
@@ -1,12 +1,38 @@
 import pandas as pd
 import random
-from collections import defaultdict
-from typing import Dict, List, Optional, Any, Tuple
-from enums import PlayType, Position
+from typing import Dict, Generator, List, NamedTuple, Optional, Any, Sequence, Tuple
+from enums import PlayType, Position, StatLine
 from settings import ScoringSettings
+from engine.players import PlayerTable, TEAM_CARRIER_ID
+from engine.sampling import build_samplers
 import pandas as pd
 import numpy as np # Added
 
+
+class ModelRequest(NamedTuple):
+    """A one-row predict_proba call that a game step is waiting on.
+
+    Attributes:
+        model (str): GameState attribute holding the model (e.g. "playcall_model").
+        features (List[float]): The model input row.
+    """
+    model: str
+    features: List[float]
+
+
+# Generator protocol of the *_steps methods: yields ModelRequests, is sent probability rows.
+GameSteps = Generator[ModelRequest, np.ndarray, Any]
+
+# Number of stat-line counters recorded per player.
+N_STATS = len(StatLine)
+
+# Carry share estimator used to weight ball carriers in each field zone.
+CARRY_SHARE_COLUMNS = {
+    "standard": "carry_share_est",
+    "redzone": "redzone_carry_share_est",
+    "goal_line": "goal_line_carry_share_est",
+}
+
 # I think the API I want is something like: result = advance_snap(game_state)
 # The gamestate would itself be update, a synthetic play would be generated, and this can be used in
 # any sort of projection model we want.
@@ -30,7 +56,12 @@ class GameState:
         yard_line (int): Distance from the home team's endzone (0-100). 
                          0 = Home Endzone, 100 = Away Endzone.
         rules (ScoringSettings): Configuration for fantasy point scoring.
-        fantasy_points (DefaultDict[str, float]): Accumulator for fantasy points by player ID.
+        players (PlayerTable): Integer index and estimator arrays for the matchup's players.
+            Rosters (e.g. home_targets) hold indices into it.
+        points (np.ndarray): Fantasy points by player index; NaN until a player scores.
+        fantasy_points (Dict[str, float]): Points by player ID for every player who scored.
+        stats (Optional[np.ndarray]): float32 (players, StatLine) counters (yards, TDs,
+            receptions, ...) when constructed with record_stats=True, else None.
         play_log (List[Dict]): History of executed plays for auditing/debugging.
     """
 
@@ -45,7 +76,9 @@ class GameState:
         away_team_stats: pd.DataFrame,
         rules: ScoringSettings,
         game_info: Dict[str, Any] = {},
-        trace: bool = False
+        trace: bool = False,
+        rng: Any = None,
+        record_stats: bool = False,
     ):
         """Initializes the GameState with teams, stats, and models.
 
@@ -60,7 +93,91 @@ class GameState:
             rules: ScoringSettings object defining fantasy point values.
             game_info: Dictionary containing game-specific context (wind, roof, etc).
             trace: If True, records a log of every play.
+            rng: Random stream for this game, e.g. an engine.rng.SimRandom. Defaults to
+                the global `random` module.
+            record_stats: If True, also records per-player stat lines in `stats`.
+        """
+        self._init_state(models, home_team, away_team, rules, game_info, trace, rng, record_stats)
+
+        # --- OPTIMIZATION: Pre-cache stats to avoid Pandas overhead in loop ---
+        
+        # Convert Team Stats DF to Dict for O(1) lookup
+        # Expected format: { 'offense_pass_oe_est': val, ... }
+        # We assume home_team_stats and away_team_stats are single-row DFs
+        self.home_team_stats_dict = team_stats_dict(home_team_stats)
+        self.away_team_stats_dict = team_stats_dict(away_team_stats)
+
+        # Players are referred to by index; their estimators live in contiguous arrays.
+        self.players = PlayerTable(home_player_stats, away_player_stats, home_team, away_team)
+        index = self.players.indices
+
+        # Pre-filter players by team and position
+        self.home_qbs = index(get_qbs(home_player_stats))
+        self.away_qbs = index(get_qbs(away_player_stats))
+        
+        self.home_kickers = index(get_kickers(home_player_stats))
+        self.away_kickers = index(get_kickers(away_player_stats))
+        
+        for side, stats in [("home", home_player_stats), ("away", away_player_stats)]:
+            for zone, prefix in [("standard", ""), ("redzone", "rz_"), ("goal_line", "gl_")]:
+                carriers, weights = get_carriers(stats, zone)
+                setattr(self, "%s_%scarriers" % (side, prefix), index(carriers))
+                setattr(self, "%s_%scarry_weights" % (side, prefix), weights)
+            targets, weights = get_targets(stats)
+            setattr(self, "%s_targets" % side, index(targets))
+            setattr(self, "%s_target_weights" % side, weights)
+
+        # Alias tables for O(1) carrier and target draws, one per team and zone.
+        self.__dict__.update(build_samplers(vars(self)))
+
+        self.reset_points()
+
+    @classmethod
+    def from_context(
+        cls,
+        context: Any,
+        scratched: Optional[Sequence[bool]] = None,
+        trace: bool = False,
+        rng: Any = None,
+    ) -> "GameState":
+        """Builds a GameState from a compiled MatchupContext without touching pandas.
+
+        Args:
+            context: engine.context.MatchupContext for the matchup.
+            scratched: Which of the context's questionable players sit out. None means
+                everyone plays.
+            trace: If True, records a log of every play.
+            rng: Random stream for this game. Defaults to the global `random` module.
+
+        Returns:
+            GameState: Equivalent to constructing one from the scenario's DataFrames.
         """
+        game = cls.__new__(cls)
+        game._init_state(
+            context.models, context.home_team, context.away_team, context.rules, context.game_info, trace, rng,
+            context.record_stats,
+        )
+        game.home_team_stats_dict = context.home_team_stats
+        game.away_team_stats_dict = context.away_team_stats
+        game.players = context.players
+        game.__dict__.update(context.roster(scratched))
+        game.reset_points()
+        return game
+
+    def _init_state(
+        self,
+        models: Dict[str, Any],
+        home_team: str,
+        away_team: str,
+        rules: ScoringSettings,
+        game_info: Dict[str, Any],
+        trace: bool,
+        rng: Any = None,
+        record_stats: bool = False,
+    ) -> None:
+        """Sets the models, game info, random stream and pre-kickoff game state."""
+        # Every draw in the game goes through self.rng (random/choice/choices).
+        self.rng = rng if rng is not None else random
         # Names of the participating teams
         self.home_team = home_team
         self.away_team = away_team
@@ -130,91 +247,50 @@ class GameState:
         # Diagnostics
         self.trace = trace
         self.play_log = []
+        self.record_stats = record_stats
+
+    def reset_points(self) -> None:
+        """Starts fresh points (and stat-line) arrays, e.g. for a copy of a template GameState."""
+        self.points = np.full(len(self.players), np.nan)
+        # A flat list is several times cheaper to update per event than a 2-D array.
+        self._stat_counts = [0.0] * (len(self.players) * len(StatLine)) if self.record_stats else None
+
+    def _add_points(self, player: int, points: float) -> None:
+        """Adds fantasy points for the player at index `player`."""
+        current = self.points[player]
+        # NaN marks a player who has not scored yet, so exports can tell them apart from 0.
+        self.points[player] = points if current != current else current + points
+
+    def _add_team_points(self, team: str, points: float) -> None:
+        """Adds fantasy points for a team defense."""
+        self._add_points(self.players.index[team], points)
+
+    def _add_stat(self, player: int, stat: StatLine, value: float = 1.0) -> None:
+        """Adds to one stat-line counter for the player at index `player`, if recording."""
+        if self._stat_counts is not None:
+            self._stat_counts[player * N_STATS + stat] += value
+
+    def _add_team_stat(self, team: str, stat: StatLine, value: float = 1.0) -> None:
+        """Adds to one stat-line counter for a team defense, if recording."""
+        if self._stat_counts is not None:
+            self._stat_counts[self.players.index[team] * N_STATS + stat] += value
+
+    @property
+    def stats(self) -> Optional[np.ndarray]:
+        """float32 (players, StatLine) stat-line counters, or None if not recording."""
+        if self._stat_counts is None:
+            return None
+        return np.array(self._stat_counts, dtype=np.float32).reshape(len(self.players), N_STATS)
 
-        # --- OPTIMIZATION: Pre-cache stats to avoid Pandas overhead in loop ---
-        
-        # Convert Team Stats DF to Dict for O(1) lookup
-        # Expected format: { 'offense_pass_oe_est': val, ... }
-        # We assume home_team_stats and away_team_stats are single-row DFs
-        
-        def df_to_dict(df):
-            if df.empty: return {}
-            return df.iloc[0].to_dict()
-
-        self.home_team_stats_dict = df_to_dict(home_team_stats)
-        self.away_team_stats_dict = df_to_dict(away_team_stats)
-
-        # Pre-filter players by team and position
-        
-        def get_qbs(df):
-            qbs = df.loc[df["position"] == Position.QB]
-            # Sort logic from choose_quarterback
-            starting = qbs.loc[qbs.starting_qb == 1]
-            if len(starting) == 1:
-                return starting.to_dict('records')
-            return qbs.sort_values(by="pass_attempts", ascending=False).head(1).to_dict('records')
-
-        def get_kickers(df):
-            ks = df.loc[df["position"] == Position.K]
-            starting = ks.loc[ks.starting_k == 1]
-            if len(starting) == 1:
-                return starting.to_dict('records')
-            return ks.sort_values(by="kick_attempts", ascending=False).head(1).to_dict('records')
-
-        def get_carriers(df, zone="standard"):
-            if zone == "goal_line":
-                est_col = "goal_line_carry_share_est"
-            elif zone == "redzone":
-                est_col = "redzone_carry_share_est"
-            else:
-                est_col = "carry_share_est"
-                
-            eligible = df.loc[df[est_col] > 0]
-            if eligible.empty: return [], []
-            # Return list of dicts and list of weights
-            records = eligible.to_dict('records')
-            weights = [p[est_col] for p in records]
-            return records, weights
-
-        def get_targets(df):
-            eligible = df.loc[df["target_percentage"] > 0]
-            if eligible.empty: return [], []
-            records = eligible.to_dict('records')
-            weights = [p["target_share_est"] for p in records]
-            
-            total = sum(weights)
-            if total == 0:
-                # Fallback if all estimates are 0
-                weights = [1.0 for _ in weights]
-                total = len(weights)
-                
-            weights = [w / total for w in weights]
-            return records, weights
-
-        self.home_qbs = get_qbs(home_player_stats)
-        self.away_qbs = get_qbs(away_player_stats)
-        
-        self.home_kickers = get_kickers(home_player_stats)
-        self.away_kickers = get_kickers(away_player_stats)
-        
-        self.home_carriers, self.home_carry_weights = get_carriers(home_player_stats, "standard")
-        self.away_carriers, self.away_carry_weights = get_carriers(away_player_stats, "standard")
-        
-        self.home_rz_carriers, self.home_rz_carry_weights = get_carriers(home_player_stats, "redzone")
-        self.away_rz_carriers, self.away_rz_carry_weights = get_carriers(away_player_stats, "redzone")
-        
-        self.home_gl_carriers, self.home_gl_carry_weights = get_carriers(home_player_stats, "goal_line")
-        self.away_gl_carriers, self.away_gl_carry_weights = get_carriers(away_player_stats, "goal_line")
-        
-        self.home_targets, self.home_target_weights = get_targets(home_player_stats)
-        self.away_targets, self.away_target_weights = get_targets(away_player_stats)
-
-        self.fantasy_points = defaultdict(float)
+    @property
+    def fantasy_points(self) -> Dict[str, float]:
+        """Fantasy points by player ID for every player who has scored."""
+        return self.players.to_dict(self.points)
 
     def _get_sample(self, samples: Any) -> float:
         """Fast random access from pre-calculated buffer."""
         # random.choice on numpy array is fast enough for our needs compared to KDE tree traversal
-        return random.choice(samples)
+        return self.rng.choice(samples)
 
     def play_game(self) -> Tuple[Dict[str, float], List[Dict[str, Any]]]:
         """Simulates an entire game from kickoff to end.
@@ -227,18 +303,42 @@ class GameState:
                 - fantasy_points (Dict[str, float]): Map of player_id to total fantasy points.
                 - play_log (List[Dict]): Detailed log of plays (if trace=True).
         """
+        return self._run(self.play_game_steps())
+
+    def play_game_steps(self) -> GameSteps:
+        """Generator version of play_game for batched model inference.
+
+        Yields a ModelRequest whenever the game needs class probabilities, and expects the
+        matching predict_proba row to be sent back. This lets engine/scheduler.py advance
+        many games together with one predict_proba call per model per tick.
+
+        Returns:
+            The same (fantasy_points, play_log) tuple as play_game, via StopIteration.
+        """
         self.opening_kickoff()
         while not self.game_over:
-            self.advance_snap()
+            yield from self.advance_snap_steps()
         # Give end-of-game point adjustments for defenses.
-        self.fantasy_points[self.home_team] += self.get_defense_score_points(
-            self.away_score
-        )
-        self.fantasy_points[self.away_team] += self.get_defense_score_points(
-            self.home_score
-        )
+        self._add_team_points(self.home_team, self.get_defense_score_points(self.away_score))
+        self._add_team_points(self.away_team, self.get_defense_score_points(self.home_score))
+        self._add_team_stat(self.home_team, StatLine.POINTS_ALLOWED, self.away_score)
+        self._add_team_stat(self.away_team, StatLine.POINTS_ALLOWED, self.home_score)
         return self.fantasy_points, self.play_log
 
+    def _run(self, steps: GameSteps) -> Any:
+        """Drives a step generator, answering each request with a one-row predict_proba."""
+        try:
+            request = next(steps)
+            while True:
+                try:
+                    probs = getattr(self, request.model).predict_proba([request.features])[0]
+                except ValueError as e:
+                    request = steps.throw(e)
+                    continue
+                request = steps.send(probs)
+        except StopIteration as stop:
+            return stop.value
+
     def get_defense_score_points(self, score: int) -> float:
         """Calculates fantasy points for a defense based on opponent's final score.
         
@@ -277,7 +377,7 @@ class GameState:
         """Initializes the game state for the opening kickoff."""
         self.down = 1
         self.quarter = 1
-        self.posteam = random.choice([self.home_team, self.away_team])
+        self.posteam = self.rng.choice([self.home_team, self.away_team])
         self.second_half_posteam = (
             self.home_team if self.posteam == self.away_team else self.away_team
         )
@@ -287,7 +387,7 @@ class GameState:
         """Initializes the game state for the start of overtime."""
         self.in_overtime = True
         # self.quarter will be incremented to 5 in advance_clock immediately after this returns
-        self.posteam = random.choice([self.home_team, self.away_team])
+        self.posteam = self.rng.choice([self.home_team, self.away_team])
         self.yard_line = 75
         self.first_down()
 
@@ -305,7 +405,11 @@ class GameState:
         simulates the outcome (yards, turnover, score), updates field position/clock,
         and accumulates fantasy points.
         """
-        playcall = self.choose_playcall()
+        self._run(self.advance_snap_steps())
+
+    def advance_snap_steps(self) -> GameSteps:
+        """Generator version of advance_snap (see play_game_steps)."""
+        playcall = yield from self.choose_playcall_steps()
         is_complete = 0
         yards = 0.0
         air_yards = 0.0
@@ -323,23 +427,23 @@ class GameState:
 
         if playcall == PlayType.RUN:
             carrier = self.choose_carrier()
-            if carrier:
-                carrier_id = carrier["player_id"]
+            if carrier is not None:
+                carrier_id = carrier
                 yards = self.compute_carry_yards(carrier)
             else:
                 yards = 0 # Should not happen if carriers exist
-                carrier_id = "Team" # Fallback
+                carrier_id = self.players.index[TEAM_CARRIER_ID] # Fallback
             
             # Fumble Logic (Run) - ~0.8% chance
-            if random.random() < 0.008:
+            if self.rng.random() < 0.008:
                 fumble = True
 
         if playcall == PlayType.PASS:
             qb = self.choose_quarterback()
-            if qb:
-                qb_id = qb["player_id"]
+            if qb is not None:
+                qb_id = qb
             else:
-                qb_id = "QB_%s" % self.posteam
+                qb_id = self.players.index["QB_%s" % self.posteam]
             
             # Average the offensive and defensive sack rates.
             offense_sack_rate = pos_stats.get("offense_sack_rate_est", 0.06)
@@ -352,11 +456,11 @@ class GameState:
 
             defense_int_rate = def_stats.get("defense_int_rate_est", 0.02)
             
-            if random.random() < sack_rate:
+            if self.rng.random() < sack_rate:
                 sack = True
                 yards = -7
                 # Fumble Logic (Sack) - ~0.8% chance
-                if random.random() < 0.008:
+                if self.rng.random() < 0.008:
                     fumble = True
 
             scramble = not sack and self.is_scramble(qb)
@@ -364,14 +468,17 @@ class GameState:
                 yards = self.compute_scramble_yards(qb)
 
             if not sack and not scramble:
-                if random.random() < defense_int_rate:
+                self._add_stat(qb_id, StatLine.PASS_ATTEMPTS)
+                if self.rng.random() < defense_int_rate:
                     interception = True
 
                 target = self.choose_target()
-                if target:
-                    target_id = target["player_id"]
+                if target is not None:
+                    target_id = target
+                    self._add_stat(target_id, StatLine.TARGETS)
                     air_yards = self.compute_air_yards(target)
-                    is_complete = int(not interception and self.is_complete(air_yards, target))
+                    if not interception:
+                        is_complete = int((yield from self.is_complete_steps(air_yards, target)))
 
                     if is_complete:
                         yac = self.compute_yac(target)
@@ -384,14 +491,14 @@ class GameState:
             return
 
         if playcall == PlayType.FIELD_GOAL:
-            self.field_goal()
+            yield from self.field_goal_steps()
             return
 
         k = self.choose_kicker()
-        if k:
-            k_id = k["player_id"]
+        if k is not None:
+            k_id = k
         else:
-            k_id = "Kicker_%s" % self.posteam
+            k_id = self.players.index["Kicker_%s" % self.posteam]
 
         if interception:
             # Advance the ball the point of the air yards.
@@ -411,11 +518,13 @@ class GameState:
 
             if self.yard_line <= 0:
                 self.touchdown()
-                self.fantasy_points[self.posteam] += self.rules.def_td
+                self._add_team_points(self.posteam, self.rules.def_td)
+                self._add_team_stat(self.posteam, StatLine.DEF_TDS)
                 td = True
                 # Have to do this here because elsewise the kickoff doesn't happen.
                 if self.extra_point():
-                    self.fantasy_points[k_id] += self.rules.pat_made
+                    self._add_points(k_id, self.rules.pat_made)
+                    self._add_stat(k_id, StatLine.PAT_MADE)
 
             else:
                 self.first_down()
@@ -439,7 +548,8 @@ class GameState:
 
         # Tackled for loss into endzone should result in safety.
         elif self.yard_line - yards > 100:
-            self.fantasy_points[self.defteam()] += self.rules.def_safety
+            self._add_team_points(self.defteam(), self.rules.def_safety)
+            self._add_team_stat(self.defteam(), StatLine.DEF_SAFETIES)
             self.safety()
 
         # If more yards were gained than remaining yards
@@ -455,64 +565,85 @@ class GameState:
                 self.yds_to_go -= yards
 
         # Count the fantasy points for this play.
-        if playcall == PlayType.RUN and carrier:
-            self.fantasy_points[carrier_id] += self.rules.rush_yard * yards
+        if playcall == PlayType.RUN and carrier is not None:
+            self._add_points(carrier_id, self.rules.rush_yard * yards)
+            self._add_stat(carrier_id, StatLine.CARRIES)
+            self._add_stat(carrier_id, StatLine.RUSH_YARDS, yards)
             
             if td:
-                self.fantasy_points[carrier_id] += self.rules.rush_td
+                self._add_points(carrier_id, self.rules.rush_td)
+                self._add_stat(carrier_id, StatLine.RUSH_TDS)
                 if self.extra_point():
-                    self.fantasy_points[k_id] += self.rules.pat_made
-        if (playcall == PlayType.PASS) and (not sack) and (not scramble) and (is_complete) and target:
-            self.fantasy_points[qb_id] += self.rules.pass_yard * yards
+                    self._add_points(k_id, self.rules.pat_made)
+                    self._add_stat(k_id, StatLine.PAT_MADE)
+        if (playcall == PlayType.PASS) and (not sack) and (not scramble) and (is_complete) and target is not None:
+            self._add_points(qb_id, self.rules.pass_yard * yards)
+            self._add_stat(qb_id, StatLine.COMPLETIONS)
+            self._add_stat(qb_id, StatLine.PASS_YARDS, yards)
+            self._add_stat(target_id, StatLine.RECEPTIONS)
+            self._add_stat(target_id, StatLine.REC_YARDS, yards)
             target_fpts = self.rules.reception
             target_fpts += self.rules.rec_yard * yards
             
             if td:
-                self.fantasy_points[qb_id] += self.rules.pass_td
+                self._add_points(qb_id, self.rules.pass_td)
+                self._add_stat(qb_id, StatLine.PASS_TDS)
+                self._add_stat(target_id, StatLine.REC_TDS)
                 target_fpts += self.rules.rec_td
                 if self.extra_point():
-                    self.fantasy_points[k_id] += self.rules.pat_made
+                    self._add_points(k_id, self.rules.pat_made)
+                    self._add_stat(k_id, StatLine.PAT_MADE)
 
-            self.fantasy_points[target_id] += target_fpts
+            self._add_points(target_id, target_fpts)
 
         if scramble:
-            self.fantasy_points[qb_id] += self.rules.rush_yard * yards
+            self._add_points(qb_id, self.rules.rush_yard * yards)
+            self._add_stat(qb_id, StatLine.CARRIES)
+            self._add_stat(qb_id, StatLine.RUSH_YARDS, yards)
             if td:
-                self.fantasy_points[qb_id] += self.rules.rush_td
+                self._add_points(qb_id, self.rules.rush_td)
+                self._add_stat(qb_id, StatLine.RUSH_TDS)
                 if self.extra_point():
-                    self.fantasy_points[k_id] += self.rules.pat_made
+                    self._add_points(k_id, self.rules.pat_made)
+                    self._add_stat(k_id, StatLine.PAT_MADE)
 
         if interception:
-            self.fantasy_points[qb_id] += self.rules.intercept # usually negative
-            self.fantasy_points[self.defteam()] += self.rules.def_int
+            self._add_points(qb_id, self.rules.intercept) # usually negative
+            self._add_stat(qb_id, StatLine.INTERCEPTIONS)
+            self._add_team_points(self.defteam(), self.rules.def_int)
+            self._add_team_stat(self.defteam(), StatLine.DEF_INTS)
 
         if sack:
-            self.fantasy_points[self.defteam()] += self.rules.def_sack
-            self.fantasy_points[qb_id] += self.rules.sack
+            self._add_team_points(self.defteam(), self.rules.def_sack)
+            self._add_team_stat(self.defteam(), StatLine.DEF_SACKS)
+            self._add_points(qb_id, self.rules.sack)
+            self._add_stat(qb_id, StatLine.SACKS)
 
         if fumble:
             # Identify fumbler
-            if playcall == PlayType.RUN and carrier_id:
+            if playcall == PlayType.RUN and carrier_id is not None:
                 fumbler_id = carrier_id
             elif playcall == PlayType.PASS:
                 fumbler_id = qb_id
             else:
                 fumbler_id = None # Should be handled if needed, but generic flow covers run/pass
 
-            if fumbler_id:
-                self.fantasy_points[fumbler_id] += self.rules.fumble_lost
+            if fumbler_id is not None:
+                self._add_points(fumbler_id, self.rules.fumble_lost)
+                self._add_stat(fumbler_id, StatLine.FUMBLES_LOST)
             
             # Award defense points (defteam here refers to the team ON DEFENSE when fumble occurred? 
             # NO. change_possession was called.
             # self.posteam is now the RECOVERING team (Old Defense).
             # self.defteam() is now the FUMBLING team (Old Offense).
             # So we want to award points to self.posteam.
-            self.fantasy_points[self.posteam] += self.rules.def_fumble_rec
+            self._add_team_points(self.posteam, self.rules.def_fumble_rec)
+            self._add_team_stat(self.posteam, StatLine.DEF_FUMBLE_RECS)
 
         if self.trace:
             pid = None
-            if playcall == PlayType.PASS and target_id: pid = target_id
-            if playcall == PlayType.RUN and carrier_id: pid = carrier_id
+            if playcall == PlayType.PASS and target_id is not None: pid = self.players.ids[target_id]
+            if playcall == PlayType.RUN and carrier_id is not None: pid = self.players.ids[carrier_id]
             
             self.play_log.append({
                 'qtr': self.quarter,
@@ -539,7 +670,7 @@ class GameState:
         # Arbitrary value chosen from google. In future, compute this from lg avg or model.
         chance = 0.93
         good = False
-        if random.random() < chance:
+        if self.rng.random() < chance:
             if self.posteam == self.home_team:
                 self.home_score += 1
             else:
@@ -558,7 +689,7 @@ class GameState:
         # Arbitrary value chosen from google. In future, compute this from lg avg or model.
         chance = 0.93
         good = False
-        if random.random() < chance:
+        if self.rng.random() < chance:
             if self.posteam == self.home_team:
                 self.home_score += 1
             else:
@@ -745,6 +876,10 @@ class GameState:
         Returns:
             PlayType: The selected play type enum.
         """
+        return self._run(self.choose_playcall_steps())
+
+    def choose_playcall_steps(self) -> GameSteps:
+        """Generator version of choose_playcall (see play_game_steps)."""
         PASS_INDEX = 1
         RUN_INDEX = 3
         # Baseline -- Use a logistic regression model to choose a playtype.
@@ -761,7 +896,7 @@ class GameState:
             self.drive_play_count,
         ]
         try:
-            base_probs = self.playcall_model.predict_proba([model_input])[0]
+            base_probs = yield ModelRequest("playcall_model", model_input)
         except ValueError:
             print("posteam: %s\ninput: %s" % (self.posteam, model_input))
         # Adjust probabilities for team trends
@@ -835,7 +970,7 @@ class GameState:
             base_probs = np.clip(base_probs, 0, None) # Ensure no negative probabilities
             base_probs = base_probs / np.sum(base_probs) # Re-normalize
             
-        playcall_str = random.choices(
+        playcall_str = self.rng.choices(
             self.playcall_model.classes_,
             weights=base_probs,
             k=1
@@ -848,43 +983,42 @@ class GameState:
         
         return PlayType.RUN
 
-    def choose_target(self) -> Optional[Dict[str, Any]]:
+    def choose_target(self) -> Optional[int]:
         """Selects a receiver to target based on their target share.
 
         Returns:
-            Optional[Dict[str, Any]]: Dictionary of the chosen target's stats, or None if no candidates.
+            Optional[int]: Index of the chosen target in self.players, or None if no candidates.
         """
         if self.posteam == self.home_team:
             candidates = self.home_targets
-            weights = self.home_target_weights
+            sampler = self.home_target_sampler
         else:
             candidates = self.away_targets
-            weights = self.away_target_weights
+            sampler = self.away_target_sampler
             
         if not candidates:
             return None
 
-        target = random.choices(candidates, weights=weights, k=1)[0]
-        return target
+        return candidates[sampler.draw(self.rng)]
 
-    def is_scramble(self, qb: Optional[Dict[str, Any]]) -> bool:
+    def is_scramble(self, qb: Optional[int]) -> bool:
         """Determines if the quarterback scrambles on a pass play.
 
         Args:
-            qb (Optional[Dict[str, Any]]): Dictionary of the quarterback's stats.
+            qb (Optional[int]): Index of the quarterback in self.players.
 
         Returns:
             bool: True if the QB scrambles, False otherwise.
         """
-        if not qb: return False
-        scramble_rate = qb.get("scramble_rate_est", 0)
-        return random.random() < scramble_rate
+        if qb is None: return False
+        scramble_rate = self.players.scramble_rate_est[qb]
+        return self.rng.random() < scramble_rate
 
-    def choose_carrier(self):
+    def choose_carrier(self) -> Optional[int]:
         """Selects a ball carrier based on their carry share.
 
         Returns:
-            Optional[Dict[str, Any]]: Dictionary of the chosen carrier's stats, or None if no candidates.
+            Optional[int]: Index of the chosen carrier in self.players, or None if no candidates.
         """
         # Determine dist to goal to check Red Zone / Goal Line
         if self.posteam == self.home_team:
@@ -895,42 +1029,35 @@ class GameState:
         if self.posteam == self.home_team:
             if dist_to_goal <= 3:
                 candidates = self.home_gl_carriers
-                weights = self.home_gl_carry_weights
+                sampler = self.home_gl_carry_sampler
             elif dist_to_goal <= 20:
                 candidates = self.home_rz_carriers
-                weights = self.home_rz_carry_weights
+                sampler = self.home_rz_carry_sampler
             else:
                 candidates = self.home_carriers
-                weights = self.home_carry_weights
+                sampler = self.home_carry_sampler
         else:
             if dist_to_goal <= 3:
                 candidates = self.away_gl_carriers
-                weights = self.away_gl_carry_weights
+                sampler = self.away_gl_carry_sampler
             elif dist_to_goal <= 20:
                 candidates = self.away_rz_carriers
-                weights = self.away_rz_carry_weights
+                sampler = self.away_rz_carry_sampler
             else:
                 candidates = self.away_carriers
-                weights = self.away_carry_weights
+                sampler = self.away_carry_sampler
             
         if not candidates:
             return None
 
-        # If all weights are zero, use equal weights to prevent ValueError
-        # Replace NaN weights with 0 before summing
-        weights = [0.0 if pd.isna(w) else w for w in weights]
+        # The alias table already maps NaN weights to 0 and all-zero weights to equal odds.
+        return candidates[sampler.draw(self.rng)]
 
-        if sum(weights) == 0:
-            weights = [1.0 for _ in weights]
-            
-        carrier = random.choices(candidates, weights=weights, k=1)[0]
-        return carrier
-
-    def choose_quarterback(self) -> Optional[Dict[str, Any]]:
+    def choose_quarterback(self) -> Optional[int]:
         """Selects the starting quarterback for the current possession.
 
         Returns:
-            Optional[Dict[str, Any]]: Dictionary of the chosen quarterback's stats, or None if no QBs.
+            Optional[int]: Index of the quarterback in self.players, or None if no QBs.
         """
         if self.posteam == self.home_team:
             qbs = self.home_qbs
@@ -941,11 +1068,11 @@ class GameState:
             return None
         return qbs[0] # Assuming we pre-filtered to 1 QB
 
-    def choose_kicker(self) -> Optional[Dict[str, Any]]:
+    def choose_kicker(self) -> Optional[int]:
         """Selects the starting kicker for the current possession.
 
         Returns:
-            Optional[Dict[str, Any]]: Dictionary of the chosen kicker's stats, or None if no kickers.
+            Optional[int]: Index of the kicker in self.players, or None if no kickers.
         """
         if self.posteam == self.home_team:
             ks = self.home_kickers
@@ -956,19 +1083,19 @@ class GameState:
             return None
         return ks[0]
 
-    def compute_air_yards(self, target: Dict[str, Any]) -> float:
+    def compute_air_yards(self, target: int) -> float:
         """Simulates air yards for a pass play.
 
         Adjusts the sampled air yards based on player skill (relative air yards estimator)
         and defensive scheme (relative air yards allowed).
 
         Args:
-            target (Dict[str, Any]): Dictionary of the target player's stats.
+            target (int): Index of the target player in self.players.
 
         Returns:
             float: Simulated air yards for the play.
         """
-        pos = target["position"]
+        pos = self.players.position[target]
         # Use special position trained models at first, before adjusting.
 
         if pos in [Position.WR, Position.RB, Position.TE]:
@@ -987,7 +1114,7 @@ class GameState:
         # without flipping positive samples into massive negatives.
         
         if (base + AIR_YARDS_SHIFT) > 0:
-            player_multiplier = target.get("relative_air_yards_est", 1.0)
+            player_multiplier = self.players.relative_air_yards_est[target]
             base = ((base + AIR_YARDS_SHIFT) * player_multiplier) - AIR_YARDS_SHIFT
             
             # In red zone offense, stop applying team air yards multipliers.
@@ -1000,19 +1127,19 @@ class GameState:
 
         return base
 
-    def compute_yac(self, target: Dict[str, Any]) -> float:
+    def compute_yac(self, target: int) -> float:
         """Simulates yards after catch (YAC) for a pass completion.
 
         Adjusts the sampled YAC based on player skill (relative YAC estimator)
         and defensive scheme (relative YAC allowed).
 
         Args:
-            target (Dict[str, Any]): Dictionary of the chosen target's stats.
+            target (int): Index of the chosen target in self.players.
 
         Returns:
             float: Simulated yards after catch.
         """
-        pos = target["position"]
+        pos = self.players.position[target]
         if pos not in [Position.WR, Position.RB, Position.TE]:
             pos = "ALL"
             
@@ -1021,7 +1148,7 @@ class GameState:
         yac = self._get_sample(self.yac_samples[pos]["open"])
         
         # Come up with a way to handle small sample high yac players
-        relative_yac_est = target.get("relative_yac_est", 1.0)
+        relative_yac_est = self.players.relative_yac_est[target]
         defense_relative_yac = self.get_def_team_stats().get(
             "defense_relative_yac_est", 1.0
         )
@@ -1030,7 +1157,7 @@ class GameState:
             yac *= relative_yac_est
         return yac
 
-    def compute_carry_yards(self, carrier: Dict[str, Any]) -> float:
+    def compute_carry_yards(self, carrier: int) -> float:
         """Simulates rushing yards for a run play.
 
         Adjusts the sampled rushing yards based on player skill (relative YPC estimator)
@@ -1038,7 +1165,7 @@ class GameState:
         and red zone carries.
 
         Args:
-            carrier (Dict[str, Any]): Dictionary of the ball carrier's stats.
+            carrier (int): Index of the ball carrier in self.players.
 
         Returns:
             float: Simulated rushing yards.
@@ -1055,7 +1182,7 @@ class GameState:
         else:
             yards = self._get_sample(self.rush_open_samples)
         
-        relative_ypc_est = carrier.get("relative_ypc_est", 1.0)
+        relative_ypc_est = self.players.relative_ypc_est[carrier]
         defense_relative_ypc = self.get_def_team_stats().get(
             "defense_relative_ypc_est", 1.0
         )
@@ -1063,19 +1190,19 @@ class GameState:
         
         return yards
 
-    def compute_scramble_yards(self, qb: Dict[str, Any]) -> float:
+    def compute_scramble_yards(self, qb: int) -> float:
         """Simulates rushing yards for a quarterback scramble.
 
         Adjusts the sampled scramble yards based on the QB's relative scramble efficiency.
         Uses split KDEs (mobile vs pocket) if available.
 
         Args:
-            qb (Dict[str, Any]): Dictionary of the quarterback's stats.
+            qb (int): Index of the quarterback in self.players.
 
         Returns:
             float: Simulated scramble yards.
         """
-        is_mobile = qb.get("is_mobile", 0) == 1
+        is_mobile = self.players.is_mobile[qb] == 1
         key = "mobile" if is_mobile else "pocket"
         samples = self.scramble_samples.get(key)
         
@@ -1084,7 +1211,7 @@ class GameState:
              samples = self.scramble_samples.get("default")
 
         yards = self._get_sample(samples)
-        multiplier = qb.get("relative_yards_per_scramble_est", 1.0)
+        multiplier = self.players.relative_yards_per_scramble_est[qb]
         yards *= multiplier
         return yards
 
@@ -1105,6 +1232,10 @@ class GameState:
 
         Determines outcome (good/no good) using a field goal model and updates score/possession.
         """
+        self._run(self.field_goal_steps())
+
+    def field_goal_steps(self) -> GameSteps:
+        """Generator version of field_goal (see play_game_steps)."""
         kicking_yards = self.yard_line + 17
         
         model_input = [
@@ -1115,7 +1246,7 @@ class GameState:
             self.wind,
             self.is_outdoors
         ]
-        base_probs = self.field_goal_model.predict_proba([model_input])[0]
+        base_probs = yield ModelRequest("field_goal_model", model_input)
         
         # FGOE Adjustment
         k = self.choose_kicker()
@@ -1123,8 +1254,8 @@ class GameState:
             classes = list(self.field_goal_model.classes_)
             made_idx = classes.index('made')
             
-            if k:
-                fgoe = k.get("fgoe_est", 0.0)
+            if k is not None:
+                fgoe = self.players.fgoe_est[k]
                 # Add fgoe to 'made' probability
                 p_made = base_probs[made_idx]
                 new_p_made = max(0.0, min(1.0, p_made + fgoe))
@@ -1137,22 +1268,20 @@ class GameState:
         except ValueError:
             pass # 'made' not found in classes
 
-        good = random.choices(self.field_goal_model.classes_, weights=base_probs, k=1)[
+        good = self.rng.choices(self.field_goal_model.classes_, weights=base_probs, k=1)[
             0
         ]
         if good == 'made':
-            if k:
-                try:
-                    k_id = k["player_id"]
-                except (IndexError, TypeError):
-                    k_id = "Kicker_%s" % self.posteam
-                
+            if k is not None:
                 if kicking_yards <= 39:
-                    self.fantasy_points[k_id] += self.rules.fg_0_39
+                    self._add_points(k, self.rules.fg_0_39)
+                    self._add_stat(k, StatLine.FG_0_39)
                 elif kicking_yards <= 49:
-                    self.fantasy_points[k_id] += self.rules.fg_40_49
+                    self._add_points(k, self.rules.fg_40_49)
+                    self._add_stat(k, StatLine.FG_40_49)
                 else:
-                    self.fantasy_points[k_id] += self.rules.fg_50_plus
+                    self._add_points(k, self.rules.fg_50_plus)
+                    self._add_stat(k, StatLine.FG_50_PLUS)
 
             if self.posteam == self.home_team:
                 self.home_score += 3
@@ -1216,7 +1345,7 @@ class GameState:
         else:
             return self.home_team_stats_dict
 
-    def is_complete(self, air_yards: float, target: Dict[str, Any]) -> int:
+    def is_complete(self, air_yards: float, target: int) -> int:
         """Determines if a pass is complete or incomplete.
 
         Uses a completion model, adjusted by quarterback and receiver CPOE estimators,
@@ -1224,17 +1353,21 @@ class GameState:
 
         Args:
             air_yards (float): The air yards simulated for the pass.
-            target (Dict[str, Any]): Dictionary of the target player's stats.
+            target (int): Index of the target player in self.players.
 
         Returns:
             int: 1 if the pass is complete, 0 if incomplete.
         """
+        return self._run(self.is_complete_steps(air_yards, target))
+
+    def is_complete_steps(self, air_yards: float, target: int) -> GameSteps:
+        """Generator version of is_complete (see play_game_steps)."""
         COMPLETE_INDEX = 1
         INCOMPLETE_INDEX = 0
         # Baseline -- Use a logistic regression model to choose a playtype.
         model_input = [self.down, self.yds_to_go, self.yard_line, air_yards, self.wind, self.is_outdoors]
 
-        base_probs = self.completion_model.predict_proba([model_input])[0]
+        base_probs = yield ModelRequest("completion_model", model_input)
 
         # Adjust probabilities for team trends
         defense_cpoe = self.get_def_team_stats().get("defense_cpoe_est", 0.0) / 100.0
@@ -1243,12 +1376,12 @@ class GameState:
 
         # Adjust the completion probability for the active quarterback.
         qb = self.choose_quarterback()
-        if qb:
-            qb_cpoe = qb.get("cpoe_est", 0.0) / 100.0
+        if qb is not None:
+            qb_cpoe = self.players.cpoe_est[qb] / 100.0
         else:
             qb_cpoe = 0
 
-        target_cpoe = target.get("receiver_cpoe_est", 0.0) / 100.0
+        target_cpoe = self.players.receiver_cpoe_est[target] / 100.0
         # TODO: Find a less arbitrary way of assigning credit to qb and receiver
         offense_cpoe = 0.75 * qb_cpoe + 0.25 * target_cpoe
         offense_comp = base_probs[COMPLETE_INDEX] + offense_cpoe
@@ -1259,7 +1392,7 @@ class GameState:
         base_probs[COMPLETE_INDEX] = est_comp
         base_probs[INCOMPLETE_INDEX] = 1 - est_comp
 
-        complete = random.choices(
+        complete = self.rng.choices(
             self.completion_model.classes_,
             weights=base_probs,
             k=1
@@ -1304,3 +1437,59 @@ def compute_odds_ratio(p1: float, p2: float, lg: float) -> float:
     odds_ratio_lg = lg / (1 - lg)
     or_factor = odds_ratio_p1 * odds_ratio_p2 / odds_ratio_lg
     return or_factor / (1 + or_factor)
+
+
+def team_stats_dict(df: pd.DataFrame) -> Dict[str, Any]:
+    """Returns the first row of a single-team stats DataFrame as a dict."""
+    if df.empty: return {}
+    return df.iloc[0].to_dict()
+
+
+def get_qbs(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Returns the starting quarterback record (at most one) for a team's player stats."""
+    qbs = df.loc[df["position"] == Position.QB]
+    # Sort logic from choose_quarterback
+    starting = qbs.loc[qbs.starting_qb == 1]
+    if len(starting) == 1:
+        return starting.to_dict('records')
+    return qbs.sort_values(by="pass_attempts", ascending=False).head(1).to_dict('records')
+
+
+def get_kickers(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Returns the starting kicker record (at most one) for a team's player stats."""
+    ks = df.loc[df["position"] == Position.K]
+    starting = ks.loc[ks.starting_k == 1]
+    if len(starting) == 1:
+        return starting.to_dict('records')
+    return ks.sort_values(by="kick_attempts", ascending=False).head(1).to_dict('records')
+
+
+def get_carriers(df: pd.DataFrame, zone: str = "standard") -> Tuple[List[Dict[str, Any]], List[float]]:
+    """Returns eligible ball carriers and their raw carry-share weights for a field zone."""
+    est_col = CARRY_SHARE_COLUMNS.get(zone, "carry_share_est")
+    eligible = df.loc[df[est_col] > 0]
+    if eligible.empty: return [], []
+    # Return list of dicts and list of weights
+    records = eligible.to_dict('records')
+    weights = [p[est_col] for p in records]
+    return records, weights
+
+
+def get_targets(df: pd.DataFrame) -> Tuple[List[Dict[str, Any]], List[float]]:
+    """Returns eligible pass targets and their normalized target-share weights."""
+    eligible = df.loc[df["target_percentage"] > 0]
+    if eligible.empty: return [], []
+    records = eligible.to_dict('records')
+    weights = [p["target_share_est"] for p in records]
+    return records, normalize_target_weights(weights)
+
+
+def normalize_target_weights(weights: List[float]) -> List[float]:
+    """Scales target shares to sum to one, falling back to equal weights if all are zero."""
+    total = sum(weights)
+    if total == 0:
+        # Fallback if all estimates are 0
+        weights = [1.0 for _ in weights]
+        total = len(weights)
+        
+    return [w / total for w in weights]
@@ -0,0 +1,129 @@
+from typing import Dict, List, Sequence
+import numpy as np
+import pandas as pd
+from enums import StatLine
+
+# Per-player estimators read during a game, with the value used when the column is missing.
+PLAYER_PARAMETERS = {
+    "relative_air_yards_est": 1.0,
+    "relative_yac_est": 1.0,
+    "relative_ypc_est": 1.0,
+    "receiver_cpoe_est": 0.0,
+    "cpoe_est": 0.0,
+    "scramble_rate_est": 0.0,
+    "relative_yards_per_scramble_est": 1.0,
+    "fgoe_est": 0.0,
+    "is_mobile": 0.0,
+}
+
+# Fallback carrier id for a run with no eligible carriers.
+TEAM_CARRIER_ID = "Team"
+
+# Quantiles exported for each stat line, the same ones compute_stats_and_export uses.
+STAT_QUANTILES = [0.125, 0.25, 0.5, 0.75, 0.875]
+
+
+class PlayerTable:
+    """Dense integer index over one matchup's players.
+
+    Players are numbered home roster first, then away roster, in frame order. After
+    them come the two team defenses and the fallback ids the engine scores when a side
+    has no quarterback ("QB_<team>"), kicker ("Kicker_<team>") or carrier ("Team").
+    Every estimator in PLAYER_PARAMETERS is held as a float array over that index, so
+    the engine reads `table.cpoe_est[i]` instead of a record's `.get("cpoe_est", 0.0)`.
+    Missing columns get the default; NaN values stay NaN, as with a record lookup.
+
+    Attributes:
+        ids (np.ndarray): Player id of each index (object array).
+        index (Dict[str, int]): Player id to index. A repeated id maps to its first row.
+        position (List[Any]): Position of each index (None for team and fallback ids).
+        home_offset (int): Index of the first home player (always 0).
+        away_offset (int): Index of the first away player.
+        defense (np.ndarray): Boolean mask marking the two team defenses.
+    """
+
+    def __init__(self, home_player_stats: pd.DataFrame, away_player_stats: pd.DataFrame, home_team: str, away_team: str):
+        """Builds the index and the parameter arrays.
+
+        Args:
+            home_player_stats: Home player estimators, with `player_id` and `position`.
+            away_player_stats: Away player estimators.
+            home_team: Home team abbreviation.
+            away_team: Away team abbreviation.
+        """
+        frames = [home_player_stats, away_player_stats]
+        extra = [home_team, away_team]
+        extra += ["QB_%s" % team for team in [home_team, away_team]]
+        extra += ["Kicker_%s" % team for team in [home_team, away_team]]
+        extra += [TEAM_CARRIER_ID]
+
+        ids: List[str] = []
+        self.position: List = []
+        for frame in frames:
+            ids.extend(frame["player_id"].tolist())
+            self.position.extend(frame["position"].tolist())
+        self.home_offset = 0
+        self.away_offset = len(home_player_stats)
+        ids.extend(extra)
+        self.position.extend([None] * len(extra))
+
+        self.ids = np.array(ids, dtype=object)
+        self.defense = np.zeros(len(ids), dtype=bool)
+        self.defense[len(ids) - len(extra):len(ids) - len(extra) + 2] = True
+        self.index: Dict[str, int] = {}
+        for i, player_id in enumerate(ids):
+            self.index.setdefault(player_id, i)
+
+        for column, default in PLAYER_PARAMETERS.items():
+            parts = [
+                frame[column].to_numpy(dtype=np.float64) if column in frame else np.full(len(frame), default)
+                for frame in frames
+            ]
+            parts.append(np.full(len(extra), default))
+            setattr(self, column, np.concatenate(parts))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def indices(self, records: Sequence[Dict]) -> List[int]:
+        """Maps player records (e.g. from get_targets) to their indices."""
+        return [self.index[p["player_id"]] for p in records]
+
+    def to_dict(self, points: np.ndarray) -> Dict[str, float]:
+        """Maps a points array back to player ids, skipping players who never scored (NaN)."""
+        return {self.ids[i]: float(points[i]) for i in np.flatnonzero(~np.isnan(points))}
+
+    def to_frame(self, points: np.ndarray) -> pd.DataFrame:
+        """Fantasy points as players x simulations, from a (simulations, players) array.
+
+        Players who did not score in any simulation are dropped, and a player who did not
+        score in one simulation is NaN there, as with a frame built from per-sim dicts.
+        """
+        points = np.asarray(points).reshape(-1, len(self))
+        keep = ~np.isnan(points).all(axis=0)
+        return pd.DataFrame(points[:, keep].T, index=pd.Index(self.ids[keep]))
+
+    def stat_frame(self, stats: np.ndarray, quantiles: Sequence[float] = STAT_QUANTILES) -> pd.DataFrame:
+        """Per-player mean and quantiles of every stat line.
+
+        Args:
+            stats: float32 (simulations, players, StatLine) array, e.g. stacked GameState.stats.
+            quantiles: Quantiles to export for each stat.
+
+        Returns:
+            pd.DataFrame: One row per player with any recorded stat, and columns
+                `<stat>_mean` and `<stat>_p<percentile>` (e.g. `rush_yards_p12`).
+        """
+        stats = np.asarray(stats, dtype=np.float32).reshape(-1, len(self), len(StatLine))
+        keep = (stats != 0).any(axis=(0, 2))
+        stats = stats[:, keep]
+        names = [stat.name.lower() for stat in StatLine]
+        columns = {}
+        means = stats.mean(axis=0)
+        # One quantile call for every player and stat at once.
+        values = np.quantile(stats, quantiles, axis=0)
+        for j, name in enumerate(names):
+            columns["%s_mean" % name] = means[:, j]
+            for q, value in zip(quantiles, values):
+                columns["%s_p%d" % (name, round(q * 100))] = value[:, j]
+        return pd.DataFrame(columns, index=pd.Index(self.ids[keep], name="player_id"))
@@ -0,0 +1,209 @@
+import copy
+import itertools
+import math
+import os
+import pickle
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from engine.buffers import SampleBuffers
+from engine.context import MatchupContext
+from engine.rng import SimRandom
+from engine.sketch import QuantileSketch
+
+# Per-worker state, set up by _init_worker: the loaded models and recent matchups.
+_WORKER: Dict[str, Any] = {}
+
+# Matchup contexts a worker keeps unpickled. Slate runs interleave chunks of many games.
+CONTEXT_CACHE_SIZE = 32
+
+
+def _init_worker(model_loader: Callable[[], Dict[str, Any]], buffer_spec: Optional[Dict[str, Any]] = None):
+    models = model_loader()
+    if buffer_spec is not None:
+        _WORKER["buffers"] = SampleBuffers.attach(buffer_spec)
+        models.update(_WORKER["buffers"].arrays)
+    _WORKER["models"] = models
+    _WORKER["contexts"] = OrderedDict()
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+def _simulate_chunk(
+    key: Tuple[int, int], payload: bytes, seeds: Sequence[Any], sketch_compression: Optional[int] = None
+) -> Tuple[Any, Optional[np.ndarray], float]:
+    start = time.perf_counter()
+    # A context (and its per-scenario roster cache) is only unpickled once per game and
+    # worker, however many of the game's chunks the worker runs.
+    contexts = _WORKER["contexts"]
+    if key not in contexts:
+        context = pickle.loads(payload)
+        context.models = _WORKER["models"]
+        contexts[key] = context
+        if len(contexts) > CONTEXT_CACHE_SIZE:
+            contexts.popitem(last=False)
+    contexts.move_to_end(key)
+    context = contexts[key]
+    points, stats = [], []
+    for seed in seeds:
+        game = context.sample_game_state(rng=SimRandom(seed))
+        game.play_game()
+        points.append(game.points)
+        stats.append(game.stats)
+    points = np.array(points).reshape(len(seeds), len(context.players))
+    stats = np.stack(stats) if context.record_stats and seeds else None
+    if sketch_compression is not None:
+        # Only the chunk's sketch goes back to the parent, not its raw points.
+        keep = ~np.isnan(points).all(axis=0)
+        sketch = QuantileSketch(sketch_compression)
+        sketch.update(context.players.ids[keep].tolist(), points[:, keep])
+        points = sketch
+    return points, stats, time.perf_counter() - start
+
+
+class PendingGame:
+    """The submitted chunks of one game; `result` waits for them and stitches them together."""
+
+    def __init__(self, pool: "SimulationPool", futures: List[Future], record_stats: bool):
+        self._pool = pool
+        self._futures = futures
+        self._record_stats = record_stats
+        self._result: Optional[Tuple[Any, Optional[np.ndarray]]] = None
+
+    def done(self) -> bool:
+        return all(future.done() for future in self._futures)
+
+    def result(self) -> Tuple[Any, Optional[np.ndarray]]:
+        """(sims, players) points (or their merged QuantileSketch) and, if recorded, stat lines."""
+        if self._result is None:
+            results = [future.result() for future in self._futures]
+            self._pool.busy_seconds += sum(busy for _, _, busy in results)
+            if isinstance(results[0][0], QuantileSketch):
+                points = results[0][0]
+                for sketch, _, _ in results[1:]:
+                    points.merge(sketch)
+            else:
+                points = np.concatenate([points for points, _, _ in results])
+            stats = [stats for _, stats, _ in results if stats is not None]
+            self._result = points, np.concatenate(stats) if self._record_stats and stats else None
+        return self._result
+
+
+class SimulationPool:
+    """Long-lived worker processes that each load the models once.
+
+    Running `Parallel(...)(delayed(simulate_matchup)(context, seed) ...)` pickles the
+    context, and with it every model and 100k-sample buffer, for each simulation. The
+    pool instead calls `model_loader` once in every worker (e.g. `get_models`) and keeps
+    the workers for the whole run, so every game, week and backtest slice reuses them.
+    A game is sent as its context without models, split into chunks of seeds, and each
+    chunk comes back as one points array (and stat-line array).
+
+    With `sample_buffers`, workers attach the parent's shared KDE sample buffers instead
+    of drawing their own, so the loader should skip the sampling (get_models with
+    presample=False).
+
+    Attributes:
+        processes (int): Number of worker processes.
+        chunk_size (Optional[int]): Simulations per task. None splits each game evenly
+            across the workers.
+        startup_seconds (float): Time until every worker had loaded its models.
+        sample_buffers (Optional[SampleBuffers]): Shared sample buffers, closed with the pool.
+        busy_seconds (float): Time workers spent running the chunks of collected games,
+            summed over workers.
+    """
+
+    def __init__(
+        self,
+        model_loader: Callable[[], Dict[str, Any]],
+        processes: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        sample_buffers: Optional[SampleBuffers] = None,
+    ):
+        """Starts the workers and waits until they are ready.
+
+        Args:
+            model_loader: Picklable callable returning the models dict (e.g. a
+                functools.partial of main.get_models).
+            processes: Number of workers. Defaults to os.cpu_count().
+            chunk_size: Simulations per task.
+            sample_buffers: Sample buffers every worker attaches and adds to its models.
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.sample_buffers = sample_buffers
+        self.busy_seconds = 0.0
+        spec = sample_buffers.spec if sample_buffers is not None else None
+        self._games = itertools.count()
+        start = time.perf_counter()
+        self._executor = ProcessPoolExecutor(self.processes, initializer=_init_worker, initargs=(model_loader, spec))
+        # Idle workers may answer for one still loading its models, so ask until all have.
+        ready = set()
+        while len(ready) < self.processes:
+            ready.update(future.result() for future in [self._executor.submit(_worker_ready) for _ in range(self.processes)])
+        self.startup_seconds = time.perf_counter() - start
+
+    def submit(self, context: MatchupContext, seeds: Sequence[Any], sketch_compression: Optional[int] = None) -> PendingGame:
+        """Queues one simulation per seed of a compiled matchup without waiting for them.
+
+        Args:
+            context: MatchupContext for the game. Its models are not sent; workers use
+                their own.
+            seeds: Per-simulation seeds (see engine.rng.sim_seed).
+            sketch_compression: If set, each worker folds its chunk's points into a
+                QuantileSketch with this many centroids per player and the game's result
+                is the merged sketch instead of the points.
+
+        Returns:
+            PendingGame: Handle whose `result()` gives the game's arrays.
+        """
+        seeds = list(seeds)
+        detached = copy.copy(context)
+        detached.models = None
+        detached._rosters = {}
+        payload = pickle.dumps(detached, protocol=pickle.HIGHEST_PROTOCOL)
+        key = (os.getpid(), next(self._games))
+
+        size = self.chunk_size or max(1, math.ceil(len(seeds) / self.processes))
+        chunks = [seeds[i:i + size] for i in range(0, len(seeds), size)] or [[]]
+        futures = [self._executor.submit(_simulate_chunk, key, payload, chunk, sketch_compression) for chunk in chunks]
+        return PendingGame(self, futures, context.record_stats)
+
+    def simulate(
+        self, context: MatchupContext, seeds: Sequence[Any], sketch_compression: Optional[int] = None
+    ) -> Tuple[Any, Optional[np.ndarray]]:
+        """Plays one simulation per seed of a compiled matchup across the workers.
+
+        Args:
+            context: MatchupContext for the game. Its models are not sent; workers use
+                their own.
+            seeds: Per-simulation seeds (see engine.rng.sim_seed). Results are the same
+                as simulate_matchup(context, seed) in this process when the workers'
+                sample buffers come from the same draw as this process' models (as
+                main.start_pool does) and are stored as float64. The default float32
+                runtime.sample_buffer_dtype rounds the samples, so results can then
+                differ slightly.
+            sketch_compression: As for submit.
+
+        Returns:
+            Tuple[Any, Optional[np.ndarray]]: (sims, players) fantasy points (or their
+                QuantileSketch), and (sims, players, StatLine) stat lines if the context
+                records them.
+        """
+        return self.submit(context, seeds, sketch_compression).result()
+
+    def close(self):
+        """Shuts the workers down and releases the sample buffers."""
+        self._executor.shutdown()
+        if self.sample_buffers is not None:
+            self.sample_buffers.close()
+
+    def __enter__(self) -> "SimulationPool":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,98 @@
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from engine.players import PlayerTable
+
+# Rows reserved up front: a week is 16 games of roughly 30-40 players who score.
+DEFAULT_CAPACITY = 1024
+
+
+class SimulationResults:
+    """Fantasy points of a week's (or any set of games') players as one float32 matrix.
+
+    Rows are players, in the order their games were added, and columns are simulations.
+    Only players who scored in at least one simulation get a row; NaN marks simulations
+    where they did not score, as in PlayerTable.to_frame. The matrix is allocated once
+    (and doubled if a run outgrows it), and each game's points are written into it as
+    the game's results come in, instead of building one frame per game and
+    concatenating them at the end.
+
+    Attributes:
+        n_sims (Optional[int]): Simulations per game, set by the first game added.
+        points (np.ndarray): (players, sims) view of the rows filled so far.
+        player_ids (np.ndarray): Player id of each row (object array).
+        game_ids (np.ndarray): Game id of each row (object array).
+        games (Dict[Hashable, slice]): Rows of each game.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, dtype: str = "float32"):
+        """Creates an empty result set; the matrix is allocated by the first game.
+
+        Args:
+            capacity: Rows to allocate when the first game is added.
+            dtype: Storage dtype of the points.
+        """
+        self.n_sims: Optional[int] = None
+        self.games: Dict[Hashable, slice] = {}
+        self._capacity = max(capacity, 1)
+        self._dtype = np.dtype(dtype)
+        self._points = np.empty((0, 0), dtype=self._dtype)
+        self._ids: List[Any] = []
+        self._game_ids: List[Hashable] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def points(self) -> np.ndarray:
+        return self._points[:len(self)]
+
+    @property
+    def player_ids(self) -> np.ndarray:
+        return np.array(self._ids, dtype=object)
+
+    @property
+    def game_ids(self) -> np.ndarray:
+        return np.array(self._game_ids, dtype=object)
+
+    def _reserve(self, game_id: Hashable, ids: Sequence[Any], n_sims: int) -> slice:
+        if self.n_sims is None:
+            self.n_sims = n_sims
+            self._points = np.empty((self._capacity, n_sims), dtype=self._dtype)
+        elif n_sims != self.n_sims:
+            raise ValueError("Game %s has %d simulations, expected %d" % (game_id, n_sims, self.n_sims))
+        start = len(self)
+        if start + len(ids) > len(self._points):
+            grown = np.empty((max(2 * len(self._points), start + len(ids)), self.n_sims), dtype=self._dtype)
+            grown[:start] = self._points[:start]
+            self._points = grown
+        self._ids.extend(ids)
+        self._game_ids.extend([game_id] * len(ids))
+        self.games[game_id] = slice(start, len(self))
+        return self.games[game_id]
+
+    def add_game(self, game_id: Hashable, players: PlayerTable, points: np.ndarray):
+        """Writes a game's (sims, players) points, e.g. from simulate_seeds or SimulationPool."""
+        points = np.asarray(points).reshape(-1, len(players))
+        keep = ~np.isnan(points).all(axis=0)
+        rows = self._reserve(game_id, players.ids[keep].tolist(), len(points))
+        self._points[rows] = points[:, keep].T
+
+    def add_frame(self, game_id: Hashable, frame: pd.DataFrame):
+        """Writes a players x sims frame, e.g. a batch engine projection."""
+        rows = self._reserve(game_id, frame.index.tolist(), frame.shape[1])
+        self._points[rows] = frame.to_numpy()
+
+    def frame(self) -> pd.DataFrame:
+        """The points as a players x sims DataFrame, indexed by player id.
+
+        The frame shares memory with the matrix, so it is what project_week hands to the
+        exporters without another copy.
+        """
+        if self.n_sims is None:
+            return pd.DataFrame()
+        return pd.DataFrame(self.points, index=pd.Index(self._ids), copy=False)
+
+    def quantiles(self, quantiles: Sequence[float]) -> np.ndarray:
+        """(len(quantiles), players) quantiles of every player's points, skipping NaN, in one call."""
+        return np.nanquantile(self.points, quantiles, axis=1)
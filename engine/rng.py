@@ -0,0 +1,106 @@
+import math
+import zlib
+from bisect import bisect
+from itertools import accumulate, chain
+from typing import Any, Iterator, List, Optional, Sequence, Union
+import numpy as np
+
+# Uniforms drawn from the Generator per refill; a typical game uses a few thousand.
+DEFAULT_BLOCK_SIZE = 4096
+
+
+class SimRandom:
+    """Random stream for one simulated game, backed by a NumPy Generator.
+
+    Implements the parts of the `random` module API the engine uses (`random`, `choice`
+    and `choices`, with the same semantics), so a GameState can use either. Uniforms
+    come from the Generator in blocks of `block_size`. `random` is the C-level
+    `__next__` of an iterator over those blocks, so the hot path only advances a cursor,
+    and the Generator runs once per block. Sample-buffer indices are derived from the
+    same uniforms.
+
+    Seeding from `sim_seed` makes each simulation's stream depend only on (season,
+    week, game, sim). That holds regardless of which joblib worker runs the
+    simulation or in what order, so any single simulation can be replayed.
+
+    Attributes:
+        generator (np.random.Generator): Source of the uniform blocks.
+        block_size (int): Number of uniforms drawn per refill.
+    """
+
+    def __init__(self, seed: Any = None, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.generator = np.random.default_rng(seed)
+        self.block_size = block_size
+        # random() -> next uniform in [0, 1). The first block is drawn on the first call.
+        self.random = chain.from_iterable(self._blocks()).__next__
+
+    @classmethod
+    def for_sim(cls, season: int, week: int, game: Union[int, str], sim: int, seed: int = 0) -> "SimRandom":
+        """Stream for one simulation (see sim_seed)."""
+        return cls(sim_seed(season, week, game, sim, seed))
+
+    def _blocks(self) -> Iterator[List[float]]:
+        while True:
+            yield self.generator.random(self.block_size).tolist()
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        """Uniformly chosen element of a non-empty sequence."""
+        return seq[int(self.random() * len(seq))]
+
+    def choices(self, population: Sequence[Any], weights: Optional[Sequence[float]] = None, k: int = 1) -> List[Any]:
+        """k weighted draws with replacement, like random.choices."""
+        if weights is None:
+            return [self.choice(population) for _ in range(k)]
+        cum_weights = list(accumulate(weights))
+        if len(cum_weights) != len(population):
+            raise ValueError("The number of weights does not match the population")
+        total = cum_weights[-1] + 0.0
+        if total <= 0.0:
+            raise ValueError("Total of weights must be greater than zero")
+        if not math.isfinite(total):
+            raise ValueError("Total of weights must be finite")
+        hi = len(cum_weights) - 1
+        return [population[bisect(cum_weights, self.random() * total, 0, hi)] for _ in range(k)]
+
+
+def sim_seed(season: int, week: int, game: Union[int, str], sim: int, seed: int = 0) -> np.random.SeedSequence:
+    """SeedSequence for one simulation, spawned from (season, week, game, sim).
+
+    Args:
+        season: Season year.
+        week: Week number.
+        game: Game index, or a game_id string (hashed with CRC32).
+        sim: Simulation index within the game.
+        seed: Base entropy shared by a whole run (runtime.seed).
+
+    Returns:
+        np.random.SeedSequence: Independent of every other (season, week, game, sim).
+    """
+    if isinstance(game, str):
+        game = zlib.crc32(game.encode())
+    return np.random.SeedSequence(seed, spawn_key=(int(season), int(week), int(game), int(sim)))
+
+
+def batch_seed(seeds: Sequence[Any]) -> np.random.SeedSequence:
+    """SeedSequence for simulations played together, e.g. one BatchGameState.
+
+    Made from the per-simulation seeds (see sim_seed), so the same simulations in the same
+    order always play the same batch.
+
+    Args:
+        seeds: The simulations' seeds, SeedSequences or ints.
+    """
+    sequences = [seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed) for seed in seeds]
+    return np.random.SeedSequence([int(sequence.generate_state(1)[0]) for sequence in sequences])
+
+
+def buffer_seed(name: str, seed: int = 0) -> int:
+    """Seed for drawing one KDE sample buffer (e.g. 'rush_open_samples').
+
+    Each buffer gets its own stream, spawned from `seed` (runtime.seed) and the buffer
+    name, so a run with the same seed draws the same buffers in any process.
+
+    Returns:
+        int: A 32-bit seed, as KernelDensity.sample's random_state takes.
+    """
+    return int(np.random.SeedSequence(seed, spawn_key=(zlib.crc32(name.encode()),)).generate_state(1)[0])
@@ -0,0 +1,82 @@
+import math
+import random
+from typing import Any, Dict, Mapping, Sequence
+
+# Roster weight lists that get an alias table, as (weights key, sampler key) suffixes.
+_SAMPLED_WEIGHTS = [
+    ("carry_weights", "carry_sampler"),
+    ("rz_carry_weights", "rz_carry_sampler"),
+    ("gl_carry_weights", "gl_carry_sampler"),
+    ("target_weights", "target_sampler"),
+]
+
+
+class AliasTable:
+    """Vose alias table for O(1) draws from a fixed discrete distribution.
+
+    Building the table is O(n); every draw then costs one uniform and one comparison,
+    however many outcomes there are. Weights follow the engine's carrier rules: NaN
+    weights count as zero, and if every weight is zero all outcomes are equally likely.
+
+    Attributes:
+        n (int): Number of outcomes.
+        prob (List[float]): Probability of keeping column i rather than its alias.
+        alias (List[int]): Alternative outcome for each column.
+    """
+
+    __slots__ = ("n", "prob", "alias")
+
+    def __init__(self, weights: Sequence[float]):
+        weights = [0.0 if w is None or math.isnan(w) else float(w) for w in weights]
+        self.n = len(weights)
+        total = sum(weights)
+        if total <= 0:
+            weights = [1.0] * self.n
+            total = float(self.n)
+        scaled = [w * self.n / total for w in weights]
+        self.prob = [1.0] * self.n
+        self.alias = list(range(self.n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+        # Whatever is left is 1 up to rounding error, so it always keeps its own column.
+
+    def draw(self, rng: Any = random) -> int:
+        """Draws an outcome index using a single rng.random() call."""
+        x = rng.random() * self.n
+        i = int(x)
+        # The fractional part of x is itself uniform, so it decides column vs alias.
+        return i if x - i < self.prob[i] else self.alias[i]
+
+    def probabilities(self) -> list:
+        """The normalized distribution the table draws from."""
+        p = list(self.prob)
+        for i, keep in enumerate(self.prob):
+            p[self.alias[i]] += 1.0 - keep
+        return [v / self.n for v in p]
+
+
+def build_samplers(roster: Mapping[str, Any]) -> Dict[str, AliasTable]:
+    """Alias tables for the carrier (every zone) and target weights in a roster.
+
+    Args:
+        roster: Mapping with GameState roster attributes, e.g. `home_rz_carry_weights`.
+
+    Returns:
+        Dict[str, AliasTable]: `<side>_<zone>carry_sampler` and `<side>_target_sampler`.
+    """
+    samplers = {}
+    for side in ["home", "away"]:
+        for weights_key, sampler_key in _SAMPLED_WEIGHTS:
+            samplers["%s_%s" % (side, sampler_key)] = AliasTable(roster["%s_%s" % (side, weights_key)])
+    return samplers
@@ -0,0 +1,73 @@
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from engine.game import GameState, GameSteps
+
+
+class InferenceScheduler:
+    """Runs many scalar GameStates together and batches their model calls.
+
+    Each game runs as a generator (GameState.play_game_steps) that pauses whenever it
+    needs class probabilities. On every tick the scheduler stacks the pending feature
+    rows for each model into one matrix, makes a single predict_proba call per model,
+    and sends each row back to its game. The game logic stays the scalar code in
+    engine/game.py; only inference is batched.
+
+    Attributes:
+        max_active (Optional[int]): Maximum number of games in flight. Further games start
+            as earlier ones finish. None runs every game at once.
+        ticks (int): Scheduling rounds in the last play_games call.
+        model_calls (int): predict_proba calls in the last play_games call.
+        rows (int): Feature rows evaluated in the last play_games call.
+    """
+
+    def __init__(self, max_active: Optional[int] = None):
+        self.max_active = max_active
+        self.ticks = 0
+        self.model_calls = 0
+        self.rows = 0
+
+    def play_games(self, games: Sequence[GameState]) -> List[Tuple[Dict[str, float], List[Dict[str, Any]]]]:
+        """Simulates every game to completion.
+
+        Args:
+            games: Freshly constructed GameStates. They may belong to different matchups.
+
+        Returns:
+            List of (fantasy_points, play_log) tuples, in the order of `games`.
+        """
+        self.ticks = self.model_calls = self.rows = 0
+        results: List[Any] = [None] * len(games)
+        queued = deque(range(len(games)))
+        # id(model) -> (model, [(game index, steps, features)])
+        waiting: Dict[int, Tuple[Any, List[Tuple[int, GameSteps, List[float]]]]] = {}
+
+        def resume(i: int, steps: GameSteps, probs: Optional[np.ndarray]) -> None:
+            try:
+                request = next(steps) if probs is None else steps.send(probs)
+            except StopIteration as stop:
+                results[i] = stop.value
+                start_next()
+                return
+            model = getattr(games[i], request.model)
+            waiting.setdefault(id(model), (model, []))[1].append((i, steps, request.features))
+
+        def start_next() -> None:
+            if queued:
+                i = queued.popleft()
+                resume(i, games[i].play_game_steps(), None)
+
+        for _ in range(len(games) if self.max_active is None else min(self.max_active, len(games))):
+            start_next()
+
+        while waiting:
+            self.ticks += 1
+            tick, waiting = waiting, {}
+            for model, pending in tick.values():
+                probs = model.predict_proba(np.array([features for _, _, features in pending], dtype=float))
+                self.model_calls += 1
+                self.rows += len(pending)
+                for (i, steps, _), row in zip(pending, probs):
+                    resume(i, steps, row)
+
+        return results
@@ -0,0 +1,215 @@
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from engine.players import PlayerTable, STAT_QUANTILES
+
+# Centroids kept per player. About 0.1-0.5% error at the exported percentiles.
+DEFAULT_COMPRESSION = 200
+
+# Percentile columns of a weekly summary, with the quantile each one exports.
+SUMMARY_PERCENTILES = dict(zip(["percentile_12", "percentile_25", "median", "percentile_75", "percentile_88"], STAT_QUANTILES))
+
+
+def _compress(means: np.ndarray, weights: np.ndarray, compression: int):
+    """Merges every row's weighted points into at most `compression` centroids.
+
+    Points are sorted and bucketed on the t-digest k1 scale, k = compression *
+    (asin(2q - 1) / pi + 1/2), so centroids stay small in the tails, where the exported
+    percentiles need the resolution, and grow towards the median. Zero weights are
+    empty slots.
+    """
+    players = len(means)
+    order = np.argsort(np.where(weights > 0, means, np.inf), axis=1, kind="stable")
+    means = np.take_along_axis(means, order, axis=1)
+    weights = np.take_along_axis(weights, order, axis=1)
+    total = weights.sum(axis=1, keepdims=True)
+    q = (np.cumsum(weights, axis=1) - weights / 2) / np.maximum(total, 1)
+    k = compression * (np.arcsin(np.clip(2 * q - 1, -1, 1)) / np.pi + 0.5)
+    cluster = np.clip(k.astype(np.int64), 0, compression - 1)
+    flat = (np.arange(players)[:, None] * compression + cluster).ravel()
+    size = players * compression
+    merged_weights = np.bincount(flat, weights.ravel(), size).reshape(players, compression)
+    sums = np.bincount(flat, (weights * np.where(weights > 0, means, 0.0)).ravel(), size).reshape(players, compression)
+    merged_means = np.divide(sums, merged_weights, out=np.zeros_like(sums), where=merged_weights > 0)
+    return merged_means, merged_weights
+
+
+class QuantileSketch:
+    """Mergeable t-digest sketches of the fantasy points of players who share simulations.
+
+    One sketch covers one game, or a chunk of a game's simulations. Each player's points
+    are folded into at most `compression` weighted centroids, plus an exact count, sum,
+    min and max. Simulations where a player did not score are counted but not sketched,
+    so the same sketch answers both the skip-NaN percentiles (mean, percentile_90) and
+    the zero-filled ones (median, percentile_12, ...) that the exports use. Sketches of
+    different chunks of a game (e.g. from different pool workers) merge into one, and
+    memory is O(players x compression) however many simulations are folded in.
+
+    Attributes:
+        compression (int): Centroids per player.
+        n_sims (int): Simulations folded in.
+        ids (List[Any]): Player id of each row.
+        count (np.ndarray): Simulations in which each player scored.
+        total (np.ndarray): Sum of each player's points.
+        minimum (np.ndarray): Lowest points of each player.
+        maximum (np.ndarray): Highest points of each player.
+    """
+
+    def __init__(self, compression: int = DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.n_sims = 0
+        self.ids: List[Any] = []
+        self._index: Dict[Any, int] = {}
+        self._means = np.zeros((0, compression))
+        self._weights = np.zeros((0, compression))
+        self.count = np.zeros(0)
+        self.total = np.zeros(0)
+        self.minimum = np.zeros(0)
+        self.maximum = np.zeros(0)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _rows(self, ids: Sequence[Any]) -> np.ndarray:
+        new = [player_id for player_id in dict.fromkeys(ids) if player_id not in self._index]
+        if new:
+            for player_id in new:
+                self._index[player_id] = len(self.ids)
+                self.ids.append(player_id)
+            grow = len(new)
+            self._means = np.vstack([self._means, np.zeros((grow, self.compression))])
+            self._weights = np.vstack([self._weights, np.zeros((grow, self.compression))])
+            self.count = np.concatenate([self.count, np.zeros(grow)])
+            self.total = np.concatenate([self.total, np.zeros(grow)])
+            self.minimum = np.concatenate([self.minimum, np.full(grow, np.inf)])
+            self.maximum = np.concatenate([self.maximum, np.full(grow, -np.inf)])
+        return np.array([self._index[player_id] for player_id in ids], dtype=np.int64)
+
+    def _fold(self, rows: np.ndarray, means: np.ndarray, weights: np.ndarray):
+        means = np.hstack([self._means[rows], means])
+        weights = np.hstack([self._weights[rows], weights])
+        self._means[rows], self._weights[rows] = _compress(means, weights, self.compression)
+
+    def update(self, ids: Sequence[Any], points: np.ndarray):
+        """Folds in (sims, players) points for `ids`, NaN where a player did not score.
+
+        Every simulation counts towards n_sims, so pass all of a chunk's simulations
+        (players who never scored in it can be left out).
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, len(ids))
+        self.n_sims += len(points)
+        rows = self._rows(ids)
+        scored = ~np.isnan(points)
+        values = np.where(scored, points, 0.0).T
+        self.count[rows] += scored.sum(axis=0)
+        self.total[rows] += values.sum(axis=1)
+        self.minimum[rows] = np.minimum(self.minimum[rows], np.where(scored, points, np.inf).min(axis=0, initial=np.inf))
+        self.maximum[rows] = np.maximum(self.maximum[rows], np.where(scored, points, -np.inf).max(axis=0, initial=-np.inf))
+        self._fold(rows, values, scored.T.astype(np.float64))
+
+    def merge(self, other: "QuantileSketch"):
+        """Folds in a sketch of other simulations of the same game."""
+        self.n_sims += other.n_sims
+        rows = self._rows(other.ids)
+        self.count[rows] += other.count
+        self.total[rows] += other.total
+        self.minimum[rows] = np.minimum(self.minimum[rows], other.minimum)
+        self.maximum[rows] = np.maximum(self.maximum[rows], other.maximum)
+        self._fold(rows, other._means, other._weights)
+
+    def mean(self) -> np.ndarray:
+        """Mean points of each player over the simulations in which they scored."""
+        return self.total / np.maximum(self.count, 1)
+
+    def quantiles(self, quantiles: Sequence[float], fill: Optional[float] = None) -> np.ndarray:
+        """(len(quantiles), players) estimated quantiles, with numpy's linear interpolation.
+
+        Args:
+            quantiles: Quantiles to estimate, in [0, 1].
+            fill: If set, simulations where a player did not score count as this value
+                (as after fillna); otherwise they are skipped (as np.nanquantile does).
+        """
+        quantiles = np.asarray(quantiles, dtype=np.float64)
+        out = np.full((len(quantiles), len(self)), np.nan)
+        for row in range(len(self)):
+            weights = self._weights[row]
+            keep = weights > 0
+            means, weights = self._means[row][keep], weights[keep]
+            if not len(means):
+                continue
+            # A centroid of w points is centered on the middle of the ranks it covers.
+            positions = np.cumsum(weights) - (weights + 1) / 2
+            positions = np.concatenate([[0.0], positions, [self.count[row] - 1]])
+            values = np.concatenate([[self.minimum[row]], means, [self.maximum[row]]])
+            n = self.count[row]
+            missing = self.n_sims - self.count[row] if fill is not None else 0
+            if missing > 0:
+                # The missing simulations are a block of `fill` values slotted in by rank.
+                above = values >= fill
+                start = positions[~above].max() + 1 if (~above).any() else 0.0
+                positions = np.where(above, positions + missing, positions)
+                positions = np.concatenate([positions, [start, start + missing - 1]])
+                values = np.concatenate([values, [fill, fill]])
+                order = np.argsort(positions, kind="stable")
+                positions, values = positions[order], values[order]
+                n = self.n_sims
+            out[:, row] = np.interp(quantiles * (n - 1), positions, values)
+        return out
+
+
+class SketchResults:
+    """The SimulationResults counterpart that keeps one QuantileSketch per game.
+
+    Used for runs that only export the mean and percentiles (runtime.result_sketches):
+    raw simulations are folded into sketches as each game comes in and then dropped.
+
+    Attributes:
+        compression (int): Centroids per player of each game's sketch.
+        games (Dict[Hashable, QuantileSketch]): Sketch of each game.
+    """
+
+    def __init__(self, compression: int = DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.games: Dict[Hashable, QuantileSketch] = {}
+
+    def add_game(self, game_id: Hashable, players: PlayerTable, points: np.ndarray):
+        """Folds a game's (sims, players) points into its sketch."""
+        points = np.asarray(points).reshape(-1, len(players))
+        keep = ~np.isnan(points).all(axis=0)
+        sketch = QuantileSketch(self.compression)
+        sketch.update(players.ids[keep].tolist(), points[:, keep])
+        self.games[game_id] = sketch
+
+    def add_frame(self, game_id: Hashable, frame: pd.DataFrame):
+        """Folds in a players x sims frame, e.g. a batch engine projection."""
+        sketch = QuantileSketch(self.compression)
+        sketch.update(frame.index.tolist(), frame.to_numpy().T)
+        self.games[game_id] = sketch
+
+    def add_sketch(self, game_id: Hashable, sketch: QuantileSketch):
+        """Adds a game already sketched elsewhere (e.g. merged from pool workers)."""
+        self.games[game_id] = sketch
+
+    def summary(self, week: int) -> pd.DataFrame:
+        """The weekly projection columns _weekly_projection and compute_stats_and_export produce.
+
+        Returns:
+            pd.DataFrame: One row per player with `player_id`, `mean`, `percentile_90` and
+                `week` (skipping simulations where the player did not score), and the
+                SUMMARY_PERCENTILES columns (counting those simulations as 0).
+        """
+        frames = []
+        for sketch in self.games.values():
+            frame = pd.DataFrame({
+                "player_id": sketch.ids,
+                "mean": sketch.mean(),
+                "percentile_90": sketch.quantiles([0.9])[0],
+            })
+            filled = sketch.quantiles(list(SUMMARY_PERCENTILES.values()), fill=0.0)
+            for column, values in zip(SUMMARY_PERCENTILES, filled):
+                frame[column] = values
+            frames.append(frame)
+        columns = ["player_id", "mean", "percentile_90", "week"] + list(SUMMARY_PERCENTILES)
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True).assign(week=week)[columns]
@@ -0,0 +1,55 @@
+import time
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+import numpy as np
+from engine.context import MatchupContext
+from engine.pool import PendingGame, SimulationPool
+
+
+class SlateScheduler:
+    """Runs every game of a slate through one SimulationPool queue.
+
+    Projecting week by week (and game by game) waits for each game's simulations before
+    the next game is even compiled, so with small n the workers sit idle between games
+    and a slow game (e.g. one with a lot of overtime) holds up the rest. The scheduler
+    queues the sim chunks of every game of a whole ROS run or backtest as soon as each
+    game is compiled. Idle workers take the next chunk from any game, and results are
+    only collected at the end, keyed by whatever the caller used (e.g. (season, week, game)).
+
+    Attributes:
+        pool (SimulationPool): Workers that run the chunks.
+        wall_seconds (float): Time from the first submit to the last collected result.
+        utilization (float): Worker busy time over processes x wall_seconds for the last
+            collect(). Time the workers spend waiting for the parent to compile games
+            counts as idle.
+    """
+
+    def __init__(self, pool: SimulationPool):
+        self.pool = pool
+        self.wall_seconds = 0.0
+        self.utilization = 0.0
+        self._pending: Dict[Hashable, PendingGame] = {}
+        self._start: Optional[float] = None
+        self._busy_start = 0.0
+
+    def submit(self, key: Hashable, context: MatchupContext, seeds: Sequence[Any], sketch_compression: Optional[int] = None):
+        """Queues a game's simulations; returns immediately. See SimulationPool.submit."""
+        if self._start is None:
+            self._start = time.perf_counter()
+            self._busy_start = self.pool.busy_seconds
+        self._pending[key] = self.pool.submit(context, seeds, sketch_compression)
+
+    def collect(self) -> Dict[Hashable, Tuple[Any, Optional[np.ndarray]]]:
+        """Waits for every submitted game.
+
+        Returns:
+            Dict mapping each submitted key to the game's (points, stats), as returned by
+            SimulationPool.simulate.
+        """
+        results = {key: pending.result() for key, pending in self._pending.items()}
+        if self._start is not None:
+            self.wall_seconds = time.perf_counter() - self._start
+            busy = self.pool.busy_seconds - self._busy_start
+            self.utilization = busy / (self.pool.processes * self.wall_seconds) if self.wall_seconds > 0 else 0.0
+        self._pending = {}
+        self._start = None
+        return results
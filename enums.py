@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 class StrEnum(str, Enum):
     """Base class for string enums to allow easy comparison."""
@@ -29,3 +29,34 @@ class StatKey(StrEnum):
     RUSHING_YARDS = "rushing_yards"
     TARGETS = "targets"
     CARRIES = "carries"
+
+class StatLine(IntEnum):
+    """Columns of the per-player stat-line array recorded by GameState.
+
+    Team defenses use the DEF_* columns and POINTS_ALLOWED; everyone else uses the
+    offensive and kicking columns.
+    """
+    PASS_ATTEMPTS = 0
+    COMPLETIONS = 1
+    PASS_YARDS = 2
+    PASS_TDS = 3
+    INTERCEPTIONS = 4
+    SACKS = 5
+    CARRIES = 6
+    RUSH_YARDS = 7
+    RUSH_TDS = 8
+    TARGETS = 9
+    RECEPTIONS = 10
+    REC_YARDS = 11
+    REC_TDS = 12
+    FUMBLES_LOST = 13
+    FG_0_39 = 14
+    FG_40_49 = 15
+    FG_50_PLUS = 16
+    PAT_MADE = 17
+    DEF_SACKS = 18
+    DEF_INTS = 19
+    DEF_FUMBLE_RECS = 20
+    DEF_SAFETIES = 21
+    DEF_TDS = 22
+    POINTS_ALLOWED = 23
@@ -3,10 +3,13 @@ import argparse
 import warnings
 import os
 import datetime
+import functools
 from collections import defaultdict
 from sklearn.exceptions import InconsistentVersionWarning # Import for specific warning suppression
 
+import numpy as np
 import pandas as pd
+import polars as pl
 import matplotlib.pyplot as plt
 from sklearn.metrics import r2_score, mean_squared_error
 from sklearn.calibration import CalibrationDisplay
@@ -16,13 +19,31 @@ from dateutil.parser import parse
 from data import nfl_client as nfl_data_py
 import score
 from engine import game
+from engine.batch import BatchGameState
+from engine.scheduler import InferenceScheduler
+from engine.rng import SimRandom, batch_seed, buffer_seed, sim_seed
+from engine.pool import SimulationPool
+from engine.slate import SlateScheduler
+from engine.buffers import SampleBuffers
+from engine.players import STAT_QUANTILES
+from engine.results import SimulationResults
+from engine.sketch import QuantileSketch, SketchResults
+from engine.context import MatchupContext, QUESTIONABLE_SCRATCH_RATE, QUESTIONABLE_VOLUME_FACTOR, scenario_matrix
 from stats import players, teams, injuries
-from data import loader
-from models import int_return, kicking, completion, playcall, receivers, rushers
+from stats import cache as stats_cache
+from data import loader, pbp_store
+from models import int_return, kicking, completion, playcall, receivers, rushers, lookup, tree_ensemble
 from evaluation import calibration
-from reporting import html_generator
+from reporting import dataset, html_generator
 from settings import AppConfig
-from settings import AppConfig, BENCHMARK_SUITE # Import BENCHMARK_SUITE
+from settings import AppConfig, BENCHMARK_SUITE, ScoringSettings # Import BENCHMARK_SUITE
+
+# PBP columns a projection or backtest run reads: the team and player stats, actual
+# fantasy points (score_from_play) and the final score of each game.
+PBP_COLUMNS = list(dict.fromkeys(
+    teams.PBP_COLUMNS + players.PBP_COLUMNS + score.PBP_COLUMNS
+    + ["play_id", "home_team", "away_team", "total_home_score", "total_away_score"]
+))
 
 
 def calculate_fantasy_leaders(pbp_data, season, week, config):
@@ -52,6 +73,32 @@ def calculate_fantasy_leaders(pbp_data, season, week, config):
     return all_scores_sorted
 
 
+def fantasy_leaders_by_week(pbp_data, slices, config):
+    """calculate_fantasy_leaders for every (season, week) in `slices`, scored in one pass.
+
+    Args:
+        pbp_data: PBP from loader.load_data, or a loader.PbpScan (only the weeks in
+            `slices` are read).
+        slices: (season, week) pairs, e.g. BENCHMARK_SUITE.
+        config: Run config; its scoring settings are applied.
+
+    Returns:
+        Dict[Tuple[int, int], pd.DataFrame]: Each week's frame as calculate_fantasy_leaders
+            returns it. Weeks without plays are missing.
+    """
+    keys = [season * 100 + week for season, week in slices]
+    if isinstance(pbp_data, loader.PbpScan):
+        data = pbp_data.collect((pl.col("season") * 100 + pl.col("week")).is_in(keys))
+    else:
+        data = pbp_data.loc[(pbp_data.season * 100 + pbp_data.week).isin(keys)]
+    points = score.fantasy_points(data, config.scoring)
+    leaders = {}
+    for (season, week), week_points in points.groupby(["season", "week"], sort=False):
+        week_points = week_points[["player_id", "score"]].reset_index(drop=True)
+        leaders[(int(season), int(week))] = week_points.sort_values(by=["score"], ascending=False).dropna()
+    return leaders
+
+
 def build_player_id_map(data):
     all_players = {}
     for i in range(len(data)):
@@ -66,18 +113,83 @@ def build_player_id_map(data):
     return all_players
 
 
-def project_week(data, snap_data, models, season, week, config):
-    n = config.runtime.n_simulations
-    season_data = data.loc[
+def project_week(data, snap_data, models, season, week, config, stat_lines=False, profiles=None, pool=None, sketch_compression=None):
+    """Projects every game of a week.
+
+    Args:
+        stat_lines: Also return per-player stat-line means and quantiles
+            (PlayerTable.stat_frame).
+        profiles: Optional list of ScoringSettings. Every profile is scored from the same
+            simulations' stat lines with one matrix multiply (score.score_stat_lines).
+        pool: Optional SimulationPool. Scalar simulations then run in its workers,
+            which already hold the models.
+        sketch_compression: If set, fold each game's points into quantile sketches
+            (engine.sketch) with this many centroids per player instead of keeping them.
+
+    Returns:
+        pd.DataFrame: Fantasy points, players x simulations, or with profiles a list of
+            such frames, one per profile. With sketch_compression, SketchResults in place
+            of each frame. With stat_lines=True, a (points, stat lines) tuple.
+    """
+    record_stats = stat_lines or bool(profiles)
+    if record_stats and config.runtime.use_batch_engine:
+        raise ValueError("Stat lines are only recorded by the scalar engine")
+
+    def games():
+        for game_id, row, game_stats, team_stats, game_info, seeds in week_games(data, snap_data, season, week, config):
+            if config.runtime.use_batch_engine:
+                yield game_id, project_game_batch(
+                    models, game_stats, team_stats, row.home_team, row.away_team, week, config, game_info, seeds=seeds
+                )
+                continue
+
+            # Compile rosters and team stats once; every simulation reuses them.
+            context = MatchupContext(
+                models, row.home_team, row.away_team, game_stats, team_stats, config.scoring, game_info, record_stats
+            )
+            yield (game_id, context, *simulate_seeds(context, seeds, config, pool, sketch_compression))
+
+    # Games are consumed as they finish, so only one game's raw arrays are alive at a time.
+    return week_projection(games(), stat_lines, profiles, sketch_compression)
+
+
+def history_plays(data, season, week):
+    """The plays a week's stats are computed from: last season and this season before `week`.
+
+    Args:
+        data: PBP from loader.load_data, or a loader.PbpScan. A scan reads only these
+            plays, and only the ones of teams.PLAY_TYPES.
+    """
+    if isinstance(data, loader.PbpScan):
+        return data.collect(
+            ((pl.col("season") == season - 1) | ((pl.col("season") == season) & (pl.col("week") < week)))
+            & pl.col("play_type").is_in(teams.PLAY_TYPES)
+        )
+    return data.loc[
         (data.season == season - 1) | ((data.season == season) & (data.week < week))
     ]
-    team_stats = teams.calculate(season_data, season)
-    player_stats = players.calculate(season_data, snap_data, team_stats, season, week)
-    schedules = nfl_data_py.import_schedules([season])
+
+
+def week_games(data, snap_data, season, week, config):
+    """Prepares the inputs of every game of a week.
+
+    Yields:
+        Tuple of (game id, schedule row, player stats for both teams, team stats,
+        game_info, per-simulation seeds).
+    """
+    n = config.runtime.n_simulations
+    season_data = history_plays(data, season, week)
+    estimators = stats_cache.estimator_state(season_data, season, week) if config.runtime.incremental_estimators else None
+    if config.runtime.cache_week_stats:
+        team_stats, player_stats = stats_cache.week_stats(season_data, snap_data, season, week, estimators)
+        schedules = stats_cache.schedule(season)
+    else:
+        team_stats = teams.calculate(season_data, season, estimators)
+        player_stats = players.calculate(season_data, snap_data, team_stats, season, week, estimators)
+        schedules = nfl_data_py.import_schedules([season])
     schedules = schedules.loc[schedules.week == week]
 
     inj_data = injuries.get_injury_data(season, week)
-    all_projections = []
     if inj_data is not None:
         player_stats = player_stats.merge(
             inj_data[["player_id", "status", "exp_return"]], on="player_id", how="left"
@@ -129,73 +241,246 @@ def project_week(data, snap_data, models, season, week, config):
             "total_line": float(row.get("total_line", 45.0)) if pd.notna(row.get("total_line")) else 45.0,
             "spread_line": float(row.get("spread_line", 0.0)) if pd.notna(row.get("spread_line")) else 0.0,
         }
-        
-        if config.runtime.use_parallel:
-            projections = Parallel(n_jobs=-1)(
-                delayed(project_game)(
-                    models, game_stats, team_stats, row.home_team, row.away_team, week, config, game_info
-                )
-                for i in range(n)
-            )
+
+        # One reproducible stream per (season, week, game, sim), wherever the sim runs.
+        game_id = row.get("game_id", i)
+        seeds = [sim_seed(season, week, game_id, sim, config.runtime.seed) for sim in range(n)]
+        yield game_id, row, game_stats, team_stats, game_info, seeds
+
+
+def simulate_seeds(context, seeds, config, pool=None, sketch_compression=None):
+    """Plays one simulation per seed of a compiled matchup with the configured runner.
+
+    Returns:
+        Tuple[np.ndarray, Optional[np.ndarray]]: (sims, players) points and, if the
+            context records them, (sims, players, StatLine) stat lines. With a pool and
+            sketch_compression, the workers' merged QuantileSketch in place of the points.
+    """
+    if pool is not None:
+        return pool.simulate(context, seeds, sketch_compression)
+    if config.runtime.use_batched_inference:
+        results = simulate_matchup_scheduled(context, seeds)
+    elif config.runtime.use_parallel:
+        results = Parallel(n_jobs=-1)(delayed(simulate_matchup)(context, seed) for seed in seeds)
+    else:
+        results = [simulate_matchup(context, seed) for seed in seeds]
+    points = np.vstack([points for points, _ in results])
+    stats = np.stack([stats for _, stats in results]) if context.record_stats else None
+    return points, stats
+
+
+def week_projection(games, stat_lines=False, profiles=None, sketch_compression=None):
+    """Assembles a week's results in the form project_week returns.
+
+    Args:
+        games: Per game, either a (game id, context, points, stats) tuple with the arrays
+            (or sketch) from simulate_seeds, or a (game id, frame) pair with a batch
+            engine projection.
+        stat_lines: Also return the stat-line means and quantiles.
+        profiles: Scoring profiles to score from the stat lines.
+        sketch_compression: Collect SketchResults with this compression instead of
+            SimulationResults.
+    """
+    def new_results():
+        return SketchResults(sketch_compression) if sketch_compression else SimulationResults()
+
+    results = new_results()
+    all_stat_lines = []
+    all_profiles = [new_results() for _ in profiles or []]
+    for game in games:
+        if isinstance(game[1], pd.DataFrame):
+            results.add_frame(*game)
+            continue
+        game_id, context, points, stat_tensor = game
+        # Player ids are only attached here, once per game, rather than per simulation.
+        if isinstance(points, QuantileSketch):
+            results.add_sketch(game_id, points)
         else:
-            projections = [
-                project_game(models, game_stats, team_stats, row.home_team, row.away_team, week, config, game_info)
-                for i in range(n)
-            ]
+            results.add_game(game_id, context.players, points)
+        if stat_lines:
+            all_stat_lines.append(context.players.stat_frame(stat_tensor))
+        if profiles:
+            scores = score.score_stat_lines(stat_tensor, context.players.defense, profiles)
+            for profile_results, profile_points in zip(all_profiles, scores):
+                profile_results.add_game(game_id, context.players, profile_points)
 
-        df = pd.DataFrame(projections).transpose()
-        all_projections.append(df)
-    
-    if not all_projections:
-        return pd.DataFrame()
+    if not results.games:
+        proj_df = [pd.DataFrame() for _ in profiles] if profiles else pd.DataFrame()
+        return (proj_df, pd.DataFrame()) if stat_lines else proj_df
 
-    proj_df = pd.concat(all_projections)
+    proj_df = results if sketch_compression else results.frame()
+    if profiles:
+        proj_df = all_profiles if sketch_compression else [profile_results.frame() for profile_results in all_profiles]
+    if stat_lines:
+        return proj_df, pd.concat(all_stat_lines)
 
     return proj_df
 
 
+def project_slate(
+    data, snap_data, models, slate, config, pool, stat_lines=False, profiles=None, skip_errors=False, sketch_compression=None
+):
+    """Projects several weeks at once through one SlateScheduler queue.
+
+    Every game of every (season, week) is compiled and queued on the pool as soon as it
+    is ready, so the workers never wait for a week (or a slow game) to finish.
+
+    Args:
+        slate: (season, week) pairs, e.g. the rest of a season or BENCHMARK_SUITE.
+        pool: SimulationPool that runs the simulations.
+        stat_lines, profiles, sketch_compression: As for project_week.
+        skip_errors: Skip (and report) weeks whose inputs fail to build, as the backtest
+            does for weeks with missing historical data.
+
+    Returns:
+        Dict mapping (season, week) to what project_week returns for that week.
+    """
+    record_stats = stat_lines or bool(profiles)
+    scheduler = SlateScheduler(pool)
+    contexts = {}
+    for season, week in slate:
+        try:
+            for game_id, row, game_stats, team_stats, game_info, seeds in week_games(data, snap_data, season, week, config):
+                context = MatchupContext(
+                    models, row.home_team, row.away_team, game_stats, team_stats, config.scoring, game_info, record_stats
+                )
+                contexts[(season, week, game_id)] = context
+                scheduler.submit((season, week, game_id), context, seeds, sketch_compression)
+        except Exception as e:
+            if not skip_errors:
+                raise
+            print(f"Skipping {season} W{week}: {e}")
+    results = scheduler.collect()
+    print(f"Simulated {len(results)} games in {scheduler.wall_seconds:.1f}s "
+          f"({scheduler.utilization:.0%} worker utilization)")
+
+    projections = {}
+    for season, week in slate:
+        keys = [key for key in contexts if key[:2] == (season, week)]
+        if keys or not skip_errors:
+            projections[(season, week)] = week_projection(
+                ((key[2], contexts[key], *results.pop(key)) for key in keys), stat_lines, profiles, sketch_compression
+            )
+    return projections
+
+
 def project_game(models, player_stats, team_stats, home, away, week, config, game_info={}):
-    # Apply Probabilistic Injury Logic
-    # Logic: Q players have 25% chance of being scratch (removed), 
-    # and if active, 20% volume reduction (limited/decoy risk).
-    
-    # We must work on a copy to avoid modifying the master DF for other sims
-    player_stats = player_stats.copy()
-    
-    q_players = player_stats[player_stats['status'] == 'Questionable']
-    drop_indices = []
-    
-    for idx, row in q_players.iterrows():
-        if random.random() < 0.25:
-            # Simulating Inactive
-            drop_indices.append(idx)
-        else:
-            # Simulating Active but Limited
-            # Reduce volume share by 20%
-            player_stats.at[idx, 'target_share_est'] *= 0.8
-            player_stats.at[idx, 'carry_share_est'] *= 0.8
-            
-    if drop_indices:
-        player_stats = player_stats.drop(drop_indices)
+    context = MatchupContext(models, home, away, player_stats, team_stats, config.scoring, game_info)
+    points, _ = simulate_matchup(context)
+    return context.players.to_dict(points)
+
+
+def simulate_matchup(context, seed=None):
+    """Plays one simulation of a compiled matchup, with its own injury scenario.
+
+    With a seed (see engine.rng.sim_seed) the simulation draws from its own SimRandom
+    stream and can be replayed exactly; otherwise it uses the global `random` module.
+
+    Returns:
+        Tuple[np.ndarray, Optional[np.ndarray]]: Fantasy points indexed like
+            `context.players` (NaN for players who did not score), and the float32
+            (players, StatLine) stat lines if the context records them, else None.
+    """
+    rng = SimRandom(seed) if seed is not None else None
+    game = context.sample_game_state(rng=rng)
+    game.play_game()
+    return game.points, game.stats
+
+
+def simulate_matchup_scheduled(context, seeds):
+    """Plays one simulation per seed with batched model inference.
+
+    Each simulation is an ordinary scalar GameState (with its own injury scenario), run
+    as a generator by engine.scheduler.InferenceScheduler.
+
+    Returns:
+        List of (points, stats) per simulation, as returned by simulate_matchup.
+    """
+    games = [context.sample_game_state(rng=SimRandom(seed) if seed is not None else None) for seed in seeds]
+    InferenceScheduler().play_games(games)
+    return [(game.points, game.stats) for game in games]
+
+
+def project_game_scheduled(context, n=1, seeds=None):
+    """Projects n simulations of a matchup, batching model inference across simulations.
+
+    Args:
+        context: MatchupContext for the game.
+        n: Number of simulations.
+        seeds: Optional per-simulation seeds (see engine.rng.sim_seed).
+
+    Returns:
+        pd.DataFrame: Fantasy points, players x simulations.
+    """
+    seeds = seeds if seeds is not None else [None] * n
+    results = simulate_matchup_scheduled(context, seeds)
+    return context.players.to_frame(np.vstack([points for points, _ in results]))
+
+
+def project_game_batch(models, player_stats, team_stats, home, away, week, config, game_info={}, n=1, seeds=None):
+    """Projects n simulations of a game with the lockstep batch engine.
+
+    Questionable-player scenarios are drawn for every simulation up front, as one
+    (sims, questionable) matrix. With seeds, row i comes from seeds[i] and matches the
+    scenario the scalar engine plays for that seed. Simulations sharing a scenario run
+    together in one BatchGameState, seeded from their seeds (see batch_seed), and the
+    results are put back in simulation order. The same seeds give the same points.
+
+    Returns:
+        pd.DataFrame: Fantasy points with one row per player and one column per simulation.
+    """
+    q_indices = player_stats.index[player_stats['status'] == 'Questionable']
+    if seeds is not None:
+        n = len(seeds)
+        scratched = scenario_matrix(seeds, len(q_indices))
+    else:
+        scratched = np.random.random((n, len(q_indices))) < QUESTIONABLE_SCRATCH_RATE
+    scenarios, scenario_of_sim = np.unique(scratched, axis=0, return_inverse=True)
+    scenario_of_sim = scenario_of_sim.reshape(-1)
 
-    home_player_stats = player_stats[player_stats["team"].isin([home])]
-    away_player_stats = player_stats[player_stats["team"].isin([away])]
     home_team_stats = team_stats[team_stats["team"].isin([home])]
     away_team_stats = team_stats[team_stats["team"].isin([away])]
-    game_machine = game.GameState(
-        models,
-        home,
-        away,
-        home_player_stats,
-        away_player_stats,
-        home_team_stats,
-        away_team_stats,
-        rules=config.scoring,
-        game_info=game_info,
-        trace=False
+    results = []
+    for s, scenario in enumerate(scenarios):
+        sims = np.flatnonzero(scenario_of_sim == s)
+        scenario_stats = _apply_injury_scenario(player_stats, q_indices, scenario)
+        batch = BatchGameState(
+            models,
+            home,
+            away,
+            scenario_stats[scenario_stats["team"].isin([home])],
+            scenario_stats[scenario_stats["team"].isin([away])],
+            home_team_stats,
+            away_team_stats,
+            rules=config.scoring,
+            n_simulations=len(sims),
+            game_info=game_info,
+            seed=None if seeds is None else batch_seed([seeds[sim] for sim in sims]),
+        )
+        df = batch.play_games()
+        df.columns = sims
+        results.append(df)
+    return pd.concat(results, axis=1).reindex(columns=range(n))
+
+
+def _apply_injury_scenario(player_stats, q_indices, scratched):
+    """Applies one questionable-player scenario to player_stats, returning a new frame.
+
+    Scratched players are removed; the others stay active with a 20% volume reduction.
+    The scenario is applied as one row mask and one multiplier per volume column.
+    """
+    positions = player_stats.index.get_indexer(q_indices)
+    scratched = np.asarray(scratched, dtype=bool)
+    keep = np.ones(len(player_stats), dtype=bool)
+    keep[positions[scratched]] = False
+    # Simulating Active but Limited: reduce volume share by 20%
+    factor = np.ones(len(player_stats))
+    factor[positions[~scratched]] = QUESTIONABLE_VOLUME_FACTOR
+    player_stats = player_stats.assign(
+        target_share_est=player_stats['target_share_est'].to_numpy() * factor,
+        carry_share_est=player_stats['carry_share_est'].to_numpy() * factor,
     )
-    scores, _ = game_machine.play_game()
-    return scores
+    return player_stats[keep]
 
 
 def score_predictions(predictions):
@@ -263,22 +548,44 @@ def plot_predictions(predictions):
     plt.show()
 
 
-def compute_stats_and_export(projection_data, season, week, version, output_dir="projections"):
-    median = projection_data.median(axis=1)
-    percentile_12 = projection_data.quantile(0.125, axis=1)
-    percentile_25 = projection_data.quantile(0.25, axis=1)
-    percentile_75 = projection_data.quantile(0.75, axis=1)
-    percentile_88 = projection_data.quantile(0.875, axis=1)
-    projection_data = projection_data.assign(median=median)
-    projection_data = projection_data.assign(percentile_12=percentile_12)
-    projection_data = projection_data.assign(percentile_25=percentile_25)
-    projection_data = projection_data.assign(percentile_75=percentile_75)
-    projection_data = projection_data.assign(percentile_88=percentile_88)
-    roster_data = nfl_data_py.import_seasonal_rosters(
-        [season], columns=["player_id", "position", "player_name", "team"]
-    )
+def compute_stats_and_export(
+    projection_data, season, week, version, output_dir="projections", stat_lines=None,
+    export_format="csv", export_simulations=False, roster_data=None,
+):
+    """Computes a week's percentiles and writes its projection files and HTML report.
+
+    Args:
+        projection_data: Weekly projection from _weekly_projection.
+        export_format: "csv" (summary/all/position CSVs), "parquet" (one Parquet dataset
+            partitioned by position, see reporting.dataset) or "both".
+        export_simulations: Also store every player's float32 simulations (0 where the
+            player did not score) in the Parquet dataset.
+        roster_data: Season roster (player_id, position, player_name, team); loaded if
+            not given.
+    """
+    # Every percentile in one call, over the simulation columns only. A summary from
+    # quantile sketches (SketchResults) already has them.
+    sim_columns = _simulation_columns(projection_data)
+    sims = projection_data[sim_columns].to_numpy()
+    if sim_columns or "median" not in projection_data:
+        if sims.size:
+            quantiles = np.quantile(sims, STAT_QUANTILES, axis=1)
+        else:
+            quantiles = np.full((len(STAT_QUANTILES), len(sims)), np.nan)
+        percentile_12, percentile_25, median, percentile_75, percentile_88 = quantiles
+        projection_data = projection_data.assign(median=median)
+        projection_data = projection_data.assign(percentile_12=percentile_12)
+        projection_data = projection_data.assign(percentile_25=percentile_25)
+        projection_data = projection_data.assign(percentile_75=percentile_75)
+        projection_data = projection_data.assign(percentile_88=percentile_88)
+    if roster_data is None:
+        roster_data = nfl_data_py.season_roster(season).reset_index()
+    # Row numbers follow each player through the merge and sort to their simulations.
+    projection_data = projection_data.assign(sim_row=np.arange(len(projection_data)))
     projection_data = projection_data.merge(roster_data, on="player_id", how="left")
-    projection_data = projection_data.sort_values(by="median", ascending=False)[
+    projection_data = projection_data.sort_values(by="median", ascending=False)
+    simulations = sims[projection_data.sim_row.to_numpy()] if export_simulations and sim_columns else None
+    projection_data = projection_data[
         [
             "player_id",
             "player_name",
@@ -296,51 +603,93 @@ def compute_stats_and_export(projection_data, season, week, version, output_dir=
     base_dir = os.path.join(output_dir, f"v{version}", f"week_{week}")
     os.makedirs(base_dir, exist_ok=True)
 
-    # Save Summary (was projections_week_X_vY.csv)
-    projection_data.to_csv(os.path.join(base_dir, "summary.csv"))
-    
-    # Save Splits
-    projection_data.to_csv(os.path.join(base_dir, "all.csv"))
-    projection_data.loc[projection_data.position == "QB"].to_csv(os.path.join(base_dir, "qb.csv"))
-    projection_data.loc[projection_data.position == "RB"].to_csv(os.path.join(base_dir, "rb.csv"))
-    projection_data.loc[projection_data.position == "WR"].to_csv(os.path.join(base_dir, "wr.csv"))
-    projection_data.loc[projection_data.position == "TE"].to_csv(os.path.join(base_dir, "te.csv"))
-    projection_data.loc[projection_data.position.isin(["RB", "WR", "TE"])].to_csv(
-        os.path.join(base_dir, "flex.csv")
-    )
-    projection_data.loc[projection_data.position == "K"].to_csv(os.path.join(base_dir, "k.csv"))
+    if export_format in ("parquet", "both"):
+        dataset.write_projection_dataset(projection_data, base_dir, simulations)
+    if export_format in ("csv", "both"):
+        # Save Summary (was projections_week_X_vY.csv) and the position splits
+        dataset.write_csv_views(projection_data, base_dir)
+
+    # Per-stat means and quantiles (yards, TDs, receptions, ...), if they were recorded
+    if stat_lines is not None:
+        if export_format == "parquet":
+            stat_lines.to_parquet(os.path.join(base_dir, "stat_lines.parquet"))
+        else:
+            stat_lines.to_csv(os.path.join(base_dir, "stat_lines.csv"))
     
     # Generate HTML Report
-    html_generator.generate_html_report(week, season, base_dir)
+    html_generator.generate_html_report(week, season, base_dir, projection_data)
+
 
+def _simulation_columns(projection_data):
+    # Simulations are the integer-labelled columns of a players x sims frame.
+    return [column for column in projection_data.columns if isinstance(column, (int, np.integer))]
 
-def project_ros(pbp_data, snap_data, models, config):
+
+def _weekly_projection(projection_data, week):
+    if isinstance(projection_data, SketchResults):
+        return projection_data.summary(week)
+    sims = projection_data.to_numpy()
+    # Players who did not score in a simulation are skipped here, then count as 0 below.
+    mean = np.nanmean(sims, axis=1) if sims.size else np.zeros(len(sims))
+    percentile_90 = np.nanquantile(sims, 0.9, axis=1) if sims.size else np.zeros(len(sims))
+    # Filled once into a new frame rather than copied by reset_index, each assign and fillna.
+    weekly = pd.DataFrame(np.nan_to_num(sims), columns=projection_data.columns, copy=False)
+    weekly.insert(0, "player_id", projection_data.index)
+    weekly["mean"] = mean
+    weekly["percentile_90"] = percentile_90
+    weekly["week"] = week
+    return weekly
+
+
+def project_ros(pbp_data, snap_data, models, config, pool=None):
     all_weeks = []
     
     season = config.runtime.season
     cur_week = config.runtime.week
     version = config.runtime.version
-    
-    for week in range(cur_week, 19):
-        print("Running projections on %s Week %s" % (season, week))
-        projection_data = project_week(
-            pbp_data, snap_data, models, season, week, config
-        ).reset_index()
-        mean = projection_data.mean(axis=1)
-        percentile_90 = projection_data.quantile(0.9, axis=1)
-        projection_data = projection_data.assign(mean=mean)
-        projection_data = projection_data.assign(percentile_90=percentile_90)
-        projection_data = projection_data.assign(week=week)
-        projection_data = projection_data.rename(columns={"index": "player_id"}).fillna(
-            0
+    # Extra leagues are scored from the main run's stat lines instead of re-simulating.
+    profile_files = config.runtime.scoring_profiles
+    profiles = [config.scoring] + [ScoringSettings.load(path) for path in profile_files] if profile_files else None
+    # Only the mean and percentiles are exported, so raw simulations can be sketched away.
+    sketch_compression = config.runtime.sketch_compression if config.runtime.result_sketches else None
+    weeks = range(cur_week, 19)
+    # Rosters are loaded once for every week's export and the ROS totals.
+    roster_data = nfl_data_py.season_roster(season).reset_index()
+    export = dict(
+        export_format=config.runtime.export_format, export_simulations=config.runtime.export_simulations,
+        roster_data=roster_data,
+    )
+    slate = None
+    if _use_slate(config, pool):
+        print("Running projections on %s Weeks %s-%s" % (season, cur_week, weeks[-1]))
+        slate = project_slate(
+            pbp_data, snap_data, models, [(season, week) for week in weeks], config, pool,
+            stat_lines=config.runtime.record_stat_lines, profiles=profiles, sketch_compression=sketch_compression,
         )
+    
+    for week in weeks:
+        if slate is not None:
+            projection_data = slate[(season, week)]
+        else:
+            print("Running projections on %s Week %s" % (season, week))
+            projection_data = project_week(
+                pbp_data, snap_data, models, season, week, config,
+                stat_lines=config.runtime.record_stat_lines, profiles=profiles, pool=pool,
+                sketch_compression=sketch_compression,
+            )
+        stat_lines = None
+        if config.runtime.record_stat_lines:
+            projection_data, stat_lines = projection_data
+        if profiles:
+            projection_data, profile_data = projection_data[0], projection_data[1:]
+            for path, data in zip(profile_files, profile_data):
+                profile_dir = os.path.join(config.runtime.output_dir, "profiles", os.path.splitext(os.path.basename(path))[0])
+                compute_stats_and_export(_weekly_projection(data, week), season, week, version, profile_dir, **export)
+        projection_data = _weekly_projection(projection_data, week)
         all_weeks.append(projection_data)
-        compute_stats_and_export(projection_data, season, week, version, config.runtime.output_dir)
+        compute_stats_and_export(projection_data, season, week, version, config.runtime.output_dir, stat_lines, **export)
 
     all_ros = pd.concat(all_weeks)
-    roster_data = nfl_data_py.import_seasonal_rosters(
-        [season], columns=["player_id", "position", "player_name", "team"]
-    )
     all_ros = all_ros.merge(roster_data, on="player_id", how="left")
     ros_sum = (
         all_ros.groupby("player_id")["mean"]
@@ -369,24 +718,29 @@ def project_ros(pbp_data, snap_data, models, config):
     base_dir = os.path.join(config.runtime.output_dir, f"v{version}", "ros")
     os.makedirs(base_dir, exist_ok=True)
 
-    ros_sum.merge(roster_data, on="player_id", how="outer")[
+    ros_total_df = ros_sum.merge(roster_data, on="player_id", how="outer")[
         ["player_id", "player_name", "team", "position", "ros_total"]
-    ].to_csv(os.path.join(base_dir, "total.csv"))
-    
+    ]
     ros_mean_df = ros_mean.merge(roster_data, on="player_id", how="outer")[
         ["player_id", "player_name", "team", "position", "ros_mean"]
     ]
-    ros_mean_df.to_csv(os.path.join(base_dir, "mean.csv"))
-    
-    playoffs_mean.merge(roster_data, on="player_id", how="outer")[
+    playoffs_df = playoffs_mean.merge(roster_data, on="player_id", how="outer")[
         ["player_id", "player_name", "team", "position", "playoffs_mean"]
-    ].to_csv(os.path.join(base_dir, "playoffs.csv"))
+    ]
+    if config.runtime.export_format in ("parquet", "both"):
+        # One table with all three ROS columns, partitioned like the weekly datasets.
+        ros_df = ros_mean_df.merge(ros_sum, on="player_id", how="left").merge(playoffs_mean, on="player_id", how="left")
+        dataset.write_projection_dataset(ros_df, base_dir)
+    if config.runtime.export_format in ("csv", "both"):
+        ros_total_df.to_csv(os.path.join(base_dir, "total.csv"))
+        ros_mean_df.to_csv(os.path.join(base_dir, "mean.csv"))
+        playoffs_df.to_csv(os.path.join(base_dir, "playoffs.csv"))
     
     # Generate ROS Report
     html_generator.generate_ros_report(ros_mean_df, season, cur_week, base_dir)
 
 
-def get_models():
+def get_models(use_lookup_tables=False, compile_trees=False, presample=True, seed=0):
     models = {
         "playcall_model": playcall.build_or_load_playcall_model(),
         "rush_open_model": rushers.build_or_load_rush_open_kde(),
@@ -411,58 +765,117 @@ def get_models():
     models.update(receivers.build_or_load_all_yac_kdes())
 
     # Optimization: Pre-sample KDEs to avoid expensive sampling during simulation loops
-    # This moves the cost from O(simulations * plays) to O(1) per execution
-    SAMPLE_SIZE = 100000
-    
-    # Core Movement Models
-    models["rush_open_samples"] = models["rush_open_model"].sample(SAMPLE_SIZE).flatten()
-    models["rush_rz_samples"] = models["rush_rz_model"].sample(SAMPLE_SIZE).flatten()
-    
-    # Scramble Sampling (Split)
-    scramble_kde_dict = models["scramble_model"]
-    models["scramble_samples"] = scramble_kde_dict["default"].sample(SAMPLE_SIZE).flatten()
-    models["scramble_samples_mobile"] = scramble_kde_dict["mobile"].sample(SAMPLE_SIZE).flatten()
-    models["scramble_samples_pocket"] = scramble_kde_dict["pocket"].sample(SAMPLE_SIZE).flatten()
-    
-    models["int_return_samples"] = models["int_return_model"].sample(SAMPLE_SIZE).flatten()
-    
-    # Receiver Models (Air Yards & YAC)
-    for pos in ["RB", "WR", "TE", "ALL"]:
-        # Air Yards (Global)
-        key_ay = f"air_yards_{pos}"
-        if key_ay in models:
-            models[f"{key_ay}_samples"] = models[key_ay].sample(SAMPLE_SIZE).flatten()
-        
-        # YAC (Split)
-        for zone in ["open", "rz"]:
-            key_yac = f"yac_{pos}_{zone}"
-            if key_yac in models:
-                models[f"{key_yac}_samples"] = models[key_yac].sample(SAMPLE_SIZE).flatten()
+    # This moves the cost from O(simulations * plays) to O(1) per execution.
+    # Pool workers skip this and attach the parent's shared buffers instead.
+    if presample:
+        SAMPLE_SIZE = 100000
+
+        # Each buffer is drawn from its own stream of `seed` (runtime.seed), so the same
+        # seed gives the same buffers in every run and process, and simulations replay.
+        def sample(model, key):
+            models[key] = model.sample(SAMPLE_SIZE, random_state=buffer_seed(key, seed)).flatten()
+
+        # Core Movement Models
+        sample(models["rush_open_model"], "rush_open_samples")
+        sample(models["rush_rz_model"], "rush_rz_samples")
+
+        # Scramble Sampling (Split)
+        scramble_kde_dict = models["scramble_model"]
+        sample(scramble_kde_dict["default"], "scramble_samples")
+        sample(scramble_kde_dict["mobile"], "scramble_samples_mobile")
+        sample(scramble_kde_dict["pocket"], "scramble_samples_pocket")
+
+        sample(models["int_return_model"], "int_return_samples")
+
+        # Receiver Models (Air Yards & YAC)
+        for pos in ["RB", "WR", "TE", "ALL"]:
+            # Air Yards (Global)
+            key_ay = f"air_yards_{pos}"
+            if key_ay in models:
+                sample(models[key_ay], f"{key_ay}_samples")
+
+            # YAC (Split)
+            for zone in ["open", "rz"]:
+                key_yac = f"yac_{pos}_{zone}"
+                if key_yac in models:
+                    sample(models[key_yac], f"{key_yac}_samples")
+
+    # Optimization: Evaluate the XGBoost classifiers as flat NumPy node arrays
+    if compile_trees:
+        models = tree_ensemble.compile_models(models)
+
+    # Optimization: Swap per-snap XGBoost calls for interpolated probability tables
+    if use_lookup_tables:
+        models = lookup.build_lookup_tables(models)
 
     return models
 
 
-def run_projections(pbp_data, snap_data, config):
-    models = get_models()
+def _use_slate(config, pool):
+    return pool is not None and config.runtime.use_slate_scheduler and not config.runtime.use_batch_engine
+
+
+def start_pool(config, models=None):
+    """Starts a SimulationPool whose workers each load the models, if the config asks for one.
+
+    The KDE sample buffers are packed once here and shared with every worker (see
+    engine.buffers.SampleBuffers), so all workers read the same samples from one copy.
+
+    Args:
+        config: AppConfig of the run.
+        models: The in-process models of the run. Their sample buffers are the ones the
+            workers get (cast to runtime.sample_buffer_dtype), so pool and in-process
+            simulations share one draw. Loaded with runtime.seed if not given.
+    """
+    if not (config.runtime.use_process_pool or config.runtime.use_slate_scheduler):
+        return None
+    if models is None:
+        models = get_models(config.runtime.use_lookup_tables, config.runtime.use_compiled_trees, seed=config.runtime.seed)
+    buffers = SampleBuffers.create(models, config.runtime.sample_buffer_dtype, config.runtime.sample_buffer_path)
+    loader = functools.partial(
+        get_models, config.runtime.use_lookup_tables, config.runtime.use_compiled_trees, presample=False
+    )
+    pool = SimulationPool(loader, config.runtime.pool_workers, config.runtime.pool_chunk_size, buffers)
+    print(f"Started {pool.processes} simulation workers in {pool.startup_seconds:.1f}s "
+          f"({buffers.nbytes / 2 ** 20:.1f} MiB shared sample buffers)")
+    return pool
+
+
+def run_projections(pbp_data, snap_data, config, pool=None, models=None):
+    if models is None:
+        models = get_models(config.runtime.use_lookup_tables, config.runtime.use_compiled_trees, seed=config.runtime.seed)
     print(f"--- Generating Projections for Season {config.runtime.season} Week {config.runtime.week}+ ---")
-    project_ros(pbp_data, snap_data, models, config)
+    project_ros(pbp_data, snap_data, models, config, pool)
 
 
-def run_backtest(pbp_data, snap_data, config):
-    models = get_models()
+def run_backtest(pbp_data, snap_data, config, pool=None, models=None):
+    if models is None:
+        models = get_models(config.runtime.use_lookup_tables, config.runtime.use_compiled_trees, seed=config.runtime.seed)
     print("\n--- Starting Backtesting & Calibration ---")
     calibration_results = []
+    slate = None
+    if _use_slate(config, pool):
+        # Every backtest slice goes through one queue; failed weeks are skipped up front.
+        slate = project_slate(pbp_data, snap_data, models, BENCHMARK_SUITE, config, pool, skip_errors=True)
+
+    # Actual points of every backtest week, scored in one pass.
+    actuals = fantasy_leaders_by_week(pbp_data, BENCHMARK_SUITE, config)
 
     # Use BENCHMARK_SUITE from benchmark.py
     for season, week in BENCHMARK_SUITE:
+        if slate is not None and (season, week) not in slate:
+            continue
         try:
             print(f"Backtesting {season} Week {week}...")
             
             # A. Run Simulations -> Get Raw Distribution
-            sims_df = project_week(pbp_data, snap_data, models, season, week, config)
+            if slate is not None:
+                sims_df = slate[(season, week)]
+            else:
+                sims_df = project_week(pbp_data, snap_data, models, season, week, config, pool=pool)
             
             # B. Get Actual Outcomes
-            actuals_df = calculate_fantasy_leaders(pbp_data, season, week, config)
+            actuals_df = actuals.get((season, week), pd.DataFrame(columns=["player_id", "score"]))
             
             # C. Merge
             sims_df['simulations'] = sims_df.values.tolist()
@@ -514,6 +927,24 @@ def parse_args():
     common_parser.add_argument("--week", type=int, default=2, help="Week")
     common_parser.add_argument("--simulations", type=int, default=5, help="Number of simulations")
     common_parser.add_argument("--version", type=str, default="402", help="Version tag")
+    common_parser.add_argument("--seed", type=int, default=None, help="Base seed for per-simulation random streams")
+    common_parser.add_argument("--lookup-tables", action="store_true", help="Use interpolated model probability tables")
+    common_parser.add_argument("--compiled-trees", action="store_true", help="Evaluate XGBoost models with the NumPy tree evaluator")
+    common_parser.add_argument("--batch", action="store_true", help="Use the vectorized batch engine")
+    common_parser.add_argument("--batched-inference", action="store_true", help="Run simulations as generators with batched model calls")
+    common_parser.add_argument("--stat-lines", action="store_true", help="Record and export per-player stat-line quantiles")
+    common_parser.add_argument("--profiles", nargs="+", default=None, help="Extra scoring YAML files scored from the same simulations")
+    common_parser.add_argument("--process-pool", action="store_true", help="Simulate in persistent worker processes that load the models once")
+    common_parser.add_argument("--workers", type=int, default=None, help="Worker processes for --process-pool")
+    common_parser.add_argument("--slate", action="store_true", help="Queue every game of the run on one worker pool (implies --process-pool)")
+    common_parser.add_argument("--cache-stats", action="store_true", help="Compute team/player stats once per as-of week and schedules once per season")
+    common_parser.add_argument("--incremental-estimators", action="store_true", help="Advance the play-level stat estimators one week at a time instead of recomputing them")
+    common_parser.add_argument("--sketch", action="store_true", help="Keep ROS projections as per-player quantile sketches instead of every simulation")
+    common_parser.add_argument("--export", choices=["csv", "parquet", "both"], default=None, help="Projection output format")
+    common_parser.add_argument("--export-sims", action="store_true", help="Store every player's simulations in the Parquet output")
+    common_parser.add_argument("--pbp-source", type=str, default=None, help="Fill the PBP store from this directory instead of nflreadpy")
+    common_parser.add_argument("--compact-pbp", action="store_true", help="Downcast PBP ints/flags to int8/int16 and floats to float32 at load")
+    common_parser.add_argument("--lazy-pbp", action="store_true", help="Scan PBP lazily with polars and read only each week's plays")
 
     # Subcommands
     subparsers.add_parser("project", parents=[common_parser], help="Run future projections")
@@ -532,6 +963,24 @@ if __name__ == "__main__":
     if args.week: config.runtime.week = args.week
     if args.simulations: config.runtime.n_simulations = args.simulations
     if args.version: config.runtime.version = args.version
+    if args.seed is not None: config.runtime.seed = args.seed
+    if args.lookup_tables: config.runtime.use_lookup_tables = True
+    if args.compiled_trees: config.runtime.use_compiled_trees = True
+    if args.batch: config.runtime.use_batch_engine = True
+    if args.batched_inference: config.runtime.use_batched_inference = True
+    if args.stat_lines: config.runtime.record_stat_lines = True
+    if args.profiles: config.runtime.scoring_profiles = args.profiles
+    if args.process_pool: config.runtime.use_process_pool = True
+    if args.workers: config.runtime.pool_workers = args.workers
+    if args.slate: config.runtime.use_slate_scheduler = True
+    if args.cache_stats: config.runtime.cache_week_stats = True
+    if args.incremental_estimators: config.runtime.incremental_estimators = True
+    if args.sketch: config.runtime.result_sketches = True
+    if args.export: config.runtime.export_format = args.export
+    if args.export_sims: config.runtime.export_simulations = True
+    if args.pbp_source: config.runtime.pbp_source = args.pbp_source
+    if args.compact_pbp: config.runtime.compact_pbp = True
+    if args.lazy_pbp: config.runtime.lazy_pbp = True
     
     command = args.command or "all"
 
@@ -556,15 +1005,28 @@ if __name__ == "__main__":
             years_to_load.add(season_year - 1)
 
     print(f"Loading data for years: {sorted(list(years_to_load))}")
+    if config.runtime.pbp_source:
+        pbp_store.set_source(pbp_store.DirectorySource(config.runtime.pbp_source))
     loader.clean_and_save_data(list(years_to_load))
     injuries.clean_and_save_data(list(years_to_load))
-    pbp_data = loader.load_data(list(years_to_load))
+    if config.runtime.lazy_pbp:
+        pbp_data = loader.PbpScan(list(years_to_load), columns=PBP_COLUMNS, downcast=config.runtime.compact_pbp)
+    else:
+        pbp_data = loader.load_data(list(years_to_load), columns=PBP_COLUMNS, downcast=config.runtime.compact_pbp)
     snap_data = loader.load_snap_counts(list(years_to_load))
     
-    if command == "all":
-        run_projections(pbp_data, snap_data, config)
-        run_backtest(pbp_data, snap_data, config)
-    elif command == "project":
-        run_projections(pbp_data, snap_data, config)
-    elif command == "backtest":
-        run_backtest(pbp_data, snap_data, config)
+    # One set of models and sample buffers, and one worker pool sharing them, for the
+    # whole run: projections, every week and every backtest slice.
+    models = get_models(config.runtime.use_lookup_tables, config.runtime.use_compiled_trees, seed=config.runtime.seed)
+    pool = start_pool(config, models)
+    try:
+        if command == "all":
+            run_projections(pbp_data, snap_data, config, pool, models)
+            run_backtest(pbp_data, snap_data, config, pool, models)
+        elif command == "project":
+            run_projections(pbp_data, snap_data, config, pool, models)
+        elif command == "backtest":
+            run_backtest(pbp_data, snap_data, config, pool, models)
+    finally:
+        if pool is not None:
+            pool.close()
@@ -5,6 +5,10 @@ from sklearn.model_selection import train_test_split
 from data import loader
 
 model_name = "models/trained_models/completion_regression_model"
+PBP_COLUMNS = [
+    "play_type", "pass_attempt", "two_point_attempt", "sack", "fumble", "down", "ydstogo",
+    "yardline_100", "air_yards", "wind", "roof", "complete_pass",
+]
 
 
 def build_or_load_completion_model():
@@ -20,7 +24,7 @@ def build_or_load_completion_model():
 def build_completion_model():
     # get the baseline data
     YEARS = [2019, 2020, 2021, 2022, 2023]
-    data = loader.load_data(YEARS)
+    data = loader.load_data(YEARS, columns=PBP_COLUMNS, downcast=True)
     
     # Enrich with weather features
     if 'roof' in data.columns:
@@ -4,6 +4,7 @@ from sklearn.model_selection import GridSearchCV
 import pandas as pd
 import numpy as np
 import joblib
+from data import loader
 
 int_return_model_name = "models/trained_models/int_return_yards_kde"
 
@@ -29,15 +30,7 @@ def int_return_data(fast=False):
     else:
         # Always use full history
         YEARS = [2018, 2019, 2020, 2021, 2022, 2023]
-    data = pd.DataFrame()
-    for i in YEARS:
-        i_data = pd.read_csv(
-            "data/pbp_" + str(i) + ".csv.gz", compression="gzip", low_memory=False
-        )
-
-        data = pd.concat([data, i_data], sort=True)
-    data.reset_index(drop=True, inplace=True)
-    return data
+    return loader.load_data(YEARS, columns=["interception", "return_yards"], downcast=True)
 
 
 def fit_kde(data, fast=False):
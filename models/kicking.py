@@ -6,6 +6,10 @@ from sklearn.preprocessing import LabelEncoder
 from data import loader
 
 model_name = "models/trained_models/kicking_regression_model"
+PBP_COLUMNS = [
+    "play_type", "field_goal_result", "score_differential", "quarter_seconds_remaining",
+    "qtr", "kick_distance", "wind", "roof",
+]
 
 class XGBKicker:
     def __init__(self, model, encoder):
@@ -37,7 +41,7 @@ def build_or_load_kicking_model():
 def build_kicking_model():
     # get the baseline data
     YEARS = [2019, 2020, 2021, 2022, 2023]
-    data = loader.load_data(YEARS)
+    data = loader.load_data(YEARS, columns=PBP_COLUMNS, downcast=True)
     
     # Enrich with weather features
     if 'roof' in data.columns:
@@ -0,0 +1,235 @@
+import time
+import numpy as np
+from typing import Any, Dict, List, Sequence
+
+# Default grids for each model input, in the model's feature order. Axes marked discrete
+# are looked up exactly (nearest grid value); all others are linearly interpolated and
+# clamped to the grid range.
+
+# Playcall: down, ydstogo, score_differential, quarter_seconds_remaining, qtr,
+# yardline_100, total_line, spread_line, drive_play_count
+PLAYCALL_AXES = [
+    ("down", [1, 2, 3, 4], True),
+    ("ydstogo", [1, 2, 3, 5, 7, 10, 15, 20, 30], False),
+    ("score_differential", [-21, -14, -8, -4, 0, 4, 8, 14, 21], False),
+    ("quarter_seconds_remaining", [0, 60, 120, 240, 450, 675, 900], False),
+    ("qtr", [1, 2, 3, 4, 5], True),
+    ("yardline_100", [1, 5, 10, 20, 35, 50, 65, 80, 99], False),
+    ("total_line", [38.0, 52.0], False),
+    ("spread_line", [-10.0, 10.0], False),
+    ("drive_play_count", [1, 4, 8, 14], False),
+]
+
+# Completion: down, ydstogo, yardline_100, air_yards, wind, is_outdoors
+COMPLETION_AXES = [
+    ("down", [1, 2, 3, 4], True),
+    ("ydstogo", [1, 3, 6, 10, 15, 25], False),
+    ("yardline_100", [1, 5, 10, 20, 35, 50, 65, 80, 99], False),
+    ("air_yards", list(np.arange(-10.0, 62.5, 2.5)), False),
+    ("wind", [0.0, 5.0, 10.0, 15.0, 20.0, 30.0], False),
+    ("is_outdoors", [0, 1], True),
+]
+
+# Field goal: score_differential, quarter_seconds_remaining, qtr, kick_distance, wind, is_outdoors
+FIELD_GOAL_AXES = [
+    ("score_differential", [-21, -14, -8, -4, 0, 4, 8, 14, 21], False),
+    ("quarter_seconds_remaining", [0, 60, 120, 240, 450, 675, 900], False),
+    ("qtr", [1, 2, 3, 4, 5], True),
+    ("kick_distance", list(np.arange(18.0, 72.0, 2.0)), False),
+    ("wind", [0.0, 5.0, 10.0, 15.0, 20.0, 30.0], False),
+    ("is_outdoors", [0, 1], True),
+]
+
+
+class ProbabilityTable:
+    """Interpolated lookup table that stands in for a classifier's predict_proba.
+
+    The table stores the wrapped model's class probabilities on a grid over its input
+    features. Lookups interpolate multilinearly on continuous axes and pick the nearest
+    grid value on discrete axes. Since the table exposes `classes_` and `predict_proba`
+    like the models, GameState and BatchGameState use it without changes.
+
+    Attributes:
+        classes_ (np.ndarray): Class labels, in the wrapped model's order.
+        feature_names (List[str]): Name of each input feature (one axis per feature).
+        grids (List[np.ndarray]): Grid values for each axis.
+        discrete (np.ndarray): Mask of axes looked up without interpolation.
+        values (np.ndarray): (*grid_shape, n_classes) float32 probability table.
+        error_report (Dict[str, float]): Interpolation error against the wrapped model,
+            filled in by `measure_error`.
+    """
+
+    def __init__(
+        self,
+        classes: Sequence[Any],
+        feature_names: List[str],
+        grids: List[Sequence[float]],
+        discrete: List[bool],
+        values: np.ndarray,
+    ):
+        self.classes_ = np.asarray(classes)
+        self.feature_names = feature_names
+        self.grids = [np.asarray(g, dtype=float) for g in grids]
+        self.discrete = np.asarray(discrete, dtype=bool)
+        self.values = values
+        self.error_report: Dict[str, float] = {}
+
+        shape = np.array([len(g) for g in self.grids])
+        self._strides = np.append(np.cumprod(shape[::-1])[::-1][1:], 1)
+        self._flat_values = values.reshape(-1, values.shape[-1])
+        # Grids padded with +inf into one matrix, so every axis is located in one pass.
+        self._grid_pad = np.full((len(shape), shape.max() + 1), np.inf)
+        for axis, grid in enumerate(self.grids):
+            self._grid_pad[axis, :len(grid)] = grid
+        self._lo = np.array([g[0] for g in self.grids])
+        self._hi = np.array([g[-1] for g in self.grids])
+        self._max_lower = np.maximum(shape - 2, 0)
+        self._axis_index = np.arange(len(shape))
+        # Corner offsets for the interpolated axes (2^k corners of the enclosing cell).
+        self._interp_axes = np.flatnonzero(~self.discrete & (shape > 1))
+        k = len(self._interp_axes)
+        self._corners = ((np.arange(2 ** k)[:, None] >> np.arange(k)) & 1).astype(bool)
+        self._corner_offsets = self._corners @ self._strides[self._interp_axes]
+
+    @classmethod
+    def build(
+        cls,
+        model: Any,
+        axes: List[tuple],
+        resolution: int = 1,
+        chunk_size: int = 250000,
+    ) -> "ProbabilityTable":
+        """Evaluates a model on every grid point and stores the probabilities.
+
+        Args:
+            model: Fitted classifier exposing `predict_proba` and `classes_`.
+            axes: (feature_name, grid_values, is_discrete) for every model input, in order.
+            resolution: Subdivides each continuous axis interval into this many steps.
+            chunk_size: Number of grid rows passed to predict_proba at a time.
+
+        Returns:
+            ProbabilityTable: The populated table.
+        """
+        names = [a[0] for a in axes]
+        discrete = [a[2] for a in axes]
+        grids = [
+            np.asarray(a[1], dtype=float) if a[2] else _refine(np.asarray(a[1], dtype=float), resolution)
+            for a in axes
+        ]
+        shape = tuple(len(g) for g in grids)
+        total = int(np.prod(shape))
+        classes = np.asarray(model.classes_)
+        values = np.empty((total, len(classes)), dtype=np.float32)
+        for start in range(0, total, chunk_size):
+            idx = np.arange(start, min(start + chunk_size, total))
+            coords = np.unravel_index(idx, shape)
+            X = np.column_stack([g[c] for g, c in zip(grids, coords)])
+            values[idx] = model.predict_proba(X)
+        return cls(classes, names, grids, discrete, values.reshape(shape + (len(classes),)))
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """Interpolated class probabilities for each row of X.
+
+        Args:
+            X: (n, n_features) array-like of model inputs.
+
+        Returns:
+            np.ndarray: (n, n_classes) probabilities.
+        """
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X[None, :]
+        x = np.clip(X, self._lo, self._hi)
+        x = np.where(np.isnan(x), self._lo, x)
+
+        # Lower corner of the enclosing cell and fractional position within it, per axis.
+        lower = (self._grid_pad[None, :, :] <= x[:, :, None]).sum(axis=2) - 1
+        lower = np.clip(lower, 0, self._max_lower)
+        g_lo = self._grid_pad[self._axis_index, lower]
+        g_hi = self._grid_pad[self._axis_index, lower + 1]
+        frac = (x - g_lo) / (g_hi - g_lo)
+        # Discrete (and single-point) axes snap to the nearest grid value.
+        index = np.where(self.discrete, lower + (frac > 0.5), lower)
+        base = index @ self._strides
+
+        if len(self._interp_axes) == 0:
+            return self._flat_values[base].astype(float)
+
+        f = frac[:, self._interp_axes]
+        weights = np.where(self._corners[None, :, :], f[:, None, :], 1 - f[:, None, :]).prod(axis=2)
+        corner_values = self._flat_values[base[:, None] + self._corner_offsets]
+        return np.einsum("nc,nck->nk", weights, corner_values, dtype=float)
+
+    def measure_error(self, model: Any, n_samples: int = 20000, seed: int = 0) -> Dict[str, float]:
+        """Compares the table against the wrapped model on random in-range inputs.
+
+        Continuous features are drawn uniformly between their grid bounds, and discrete
+        features from their grid values.
+
+        Returns:
+            Dict[str, float]: Worst-case and mean absolute probability error.
+        """
+        rng = np.random.default_rng(seed)
+        X = np.column_stack([
+            rng.choice(g, n_samples) if d else rng.uniform(g[0], g[-1], n_samples)
+            for g, d in zip(self.grids, self.discrete)
+        ])
+        error = np.abs(self.predict_proba(X) - np.asarray(model.predict_proba(X)))
+        worst = np.unravel_index(np.argmax(error), error.shape)
+        self.error_report = {
+            "max_abs_error": float(error.max()),
+            "mean_abs_error": float(error.mean()),
+            "p99_abs_error": float(np.quantile(error.max(axis=1), 0.99)),
+            "worst_class": str(self.classes_[worst[1]]),
+            "grid_points": int(np.prod(self.values.shape[:-1])),
+        }
+        self.error_report.update(
+            {"worst_%s" % name: float(X[worst[0], i]) for i, name in enumerate(self.feature_names)}
+        )
+        return self.error_report
+
+
+def build_lookup_tables(
+    models: Dict[str, Any],
+    resolution: int = 1,
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """Replaces the playcall, completion and field goal models with lookup tables.
+
+    Args:
+        models: Models dictionary as returned by main.get_models().
+        resolution: Grid refinement factor (see ProbabilityTable.build).
+        verbose: If True, prints build time and error report for each table.
+
+    Returns:
+        Dict[str, Any]: A copy of models with the three classifiers swapped for tables.
+            The original models are kept under "<name>_source".
+    """
+    models = dict(models)
+    for key, axes in [
+        ("playcall_model", PLAYCALL_AXES),
+        ("completion_model", COMPLETION_AXES),
+        ("field_goal_model", FIELD_GOAL_AXES),
+    ]:
+        source = models[key]
+        start = time.time()
+        table = ProbabilityTable.build(source, axes, resolution=resolution)
+        build_time = time.time() - start
+        report = table.measure_error(source)
+        models["%s_source" % key] = source
+        models[key] = table
+        if verbose:
+            print(
+                "%s table: %d points built in %.1fs, max error %.4f (mean %.4f, p99 %.4f, worst class %s)"
+                % (key, report["grid_points"], build_time, report["max_abs_error"],
+                   report["mean_abs_error"], report["p99_abs_error"], report["worst_class"])
+            )
+    return models
+
+
+def _refine(grid: np.ndarray, resolution: int) -> np.ndarray:
+    if resolution <= 1 or len(grid) < 2:
+        return grid
+    steps = np.linspace(0, 1, resolution, endpoint=False)
+    refined = (grid[:-1, None] + (grid[1:] - grid[:-1])[:, None] * steps).ravel()
+    return np.append(refined, grid[-1])
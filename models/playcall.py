@@ -6,6 +6,11 @@ from sklearn.preprocessing import LabelEncoder
 from data import loader # Import loader
 
 model_name = "models/trained_models/playcall_regression_model"
+PBP_COLUMNS = [
+    "play_type", "two_point_attempt", "down", "ydstogo", "score_differential",
+    "quarter_seconds_remaining", "qtr", "yardline_100", "total_line", "spread_line",
+    "drive_play_count",
+]
 
 class XGBPlayCaller:
     def __init__(self, model, encoder):
@@ -59,7 +64,7 @@ def test_playcall_model(model):
 def build_playcall_model(fast=False):
     # get the baseline data
     YEARS = [2018, 2019, 2020, 2021, 2022, 2023]
-    data = loader.load_data(YEARS) # Use loader.load_data
+    data = loader.load_data(YEARS, columns=PBP_COLUMNS, downcast=True) # Use loader.load_data
     
     # Fill NaNs for new features before filtering
     data['total_line'] = data['total_line'].fillna(data['total_line'].mean())
@@ -1,5 +1,6 @@
 import matplotlib.pyplot as plt
 from data import nfl_client as nfl_data_py
+from data import loader
 from sklearn.neighbors import KernelDensity
 from sklearn.model_selection import GridSearchCV
 import pandas as pd
@@ -28,16 +29,11 @@ def receiver_data(fast=False):
     else:
         # Always use full history
         YEARS = [2019, 2020, 2021, 2022, 2023]
-    data = pd.DataFrame()
-    for i in YEARS:
-        i_data = pd.read_csv(
-            "data/pbp_" + str(i) + ".csv.gz", compression="gzip", low_memory=False
-        )
-        # Include yardline_100 for zone splitting
-        i_data = i_data.loc[~i_data.receiver_player_id.isnull()][
-            ["receiver_player_id", "air_yards", "yards_after_catch", "yardline_100"]
-        ]
-        data = pd.concat([data, i_data], sort=True)
+    data = loader.load_data(YEARS, columns=["air_yards", "yards_after_catch", "yardline_100"], downcast=True)
+    # Include yardline_100 for zone splitting
+    data = data.loc[~data.receiver_player_id.isnull()][
+        ["receiver_player_id", "air_yards", "yards_after_catch", "yardline_100"]
+    ]
     data = data.rename(columns={"receiver_player_id": "player_id"})
     roster_data = nfl_data_py.import_seasonal_rosters(
         YEARS, columns=["player_id", "position", "player_name"]
@@ -9,6 +9,10 @@ from data import loader
 rush_open_model_name = "models/trained_models/rushing_yards_open_kde"
 rush_rz_model_name = "models/trained_models/rushing_yards_rz_kde"
 scramble_model_name = "models/trained_models/scramble_yards_kde"
+PBP_COLUMNS = [
+    "season", "game_id", "rush", "qb_scramble", "yardline_100", "rushing_yards",
+    "rusher_player_id", "passer_player_id",
+]
 
 
 def build_rush_open_kde(fast=False):
@@ -98,7 +102,7 @@ def rusher_data(fast=False):
         YEARS = [2019, 2020, 2021, 2022, 2023]
     
     # Use loader instead of direct CSV read
-    data = loader.load_data(YEARS)
+    data = loader.load_data(YEARS, columns=PBP_COLUMNS, downcast=True)
     data.reset_index(drop=True, inplace=True)
     return data
 
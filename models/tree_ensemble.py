@@ -0,0 +1,237 @@
+import json
+import numpy as np
+from typing import Any, Dict
+
+# Objectives whose base_score is stored as a probability and must be mapped to a margin.
+_LOGISTIC_OBJECTIVES = {"binary:logistic", "reg:logistic"}
+_SOFTMAX_OBJECTIVES = {"multi:softprob"}
+
+
+class TreeEnsemble:
+    """Pure-NumPy evaluator for a boosted tree ensemble exported from XGBoost.
+
+    All trees are flattened into shared node arrays (feature, threshold, left/right
+    child, default direction for missing values, leaf value). Leaves point to
+    themselves, so every row walks every tree for exactly `max_depth` steps with no
+    branching. Margins are accumulated in float32 in tree order, starting from the
+    base margin, like XGBoost's CPU predictor, and then go through the same softmax or
+    logistic transform. Evaluating a compiled ensemble does not import xgboost.
+
+    Attributes:
+        classes_ (np.ndarray): Class labels in predict_proba column order.
+        objective (str): XGBoost objective the ensemble was trained with.
+        max_depth (int): Deepest tree in the ensemble.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        default_left: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        tree_group: np.ndarray,
+        base_margin: np.ndarray,
+        objective: str,
+        classes: np.ndarray,
+        max_depth: int,
+    ):
+        self.feature = feature.astype(np.int32)
+        self.threshold = threshold.astype(np.float32)
+        self.left = left.astype(np.int32)
+        self.right = right.astype(np.int32)
+        self.default_left = default_left.astype(bool)
+        self.value = value.astype(np.float32)
+        self.roots = roots.astype(np.int32)
+        self.tree_group = tree_group.astype(np.int32)
+        self.base_margin = base_margin.astype(np.float32)
+        self.objective = str(objective)
+        self.classes_ = np.asarray(classes)
+        self.max_depth = int(max_depth)
+
+        # Interleaved (left, right) children, so the next node is children[2 * node + go_right].
+        self._children = np.column_stack([self.left, self.right]).ravel().astype(np.int64)
+        self._missing_right = ~self.default_left
+        self._feature = self.feature.astype(np.int64)
+        self._roots = self.roots.astype(np.int64)
+
+        self.n_groups = len(self.base_margin)
+        # Trees are boosted round-robin over output groups; order them group-major so the
+        # per-group sums keep their original boosting order.
+        self._tree_order = np.argsort(self.tree_group, kind="stable")
+        counts = np.bincount(self.tree_group, minlength=self.n_groups)
+        self._trees_per_group = int(counts[0]) if len(set(counts)) == 1 else None
+
+    @classmethod
+    def from_xgboost(cls, model: Any) -> "TreeEnsemble":
+        """Compiles an XGBClassifier, or an XGBPlayCaller/XGBKicker wrapper around one.
+
+        Args:
+            model: Fitted XGBoost classifier or repo wrapper with `.model` and `classes_`.
+
+        Returns:
+            TreeEnsemble: The flattened ensemble, with the same classes_ as the model.
+        """
+        classifier = getattr(model, "model", model)
+        raw = json.loads(classifier.get_booster().save_raw(raw_format="json"))
+        learner = raw["learner"]
+        objective = learner["objective"]["name"]
+        if objective not in _LOGISTIC_OBJECTIVES | _SOFTMAX_OBJECTIVES:
+            raise ValueError("Unsupported XGBoost objective: %s" % objective)
+        booster = learner["gradient_booster"]
+        if booster["name"] != "gbtree":
+            raise ValueError("Only gbtree boosters can be compiled, got %s" % booster["name"])
+
+        base_score = np.atleast_1d(np.asarray(json.loads(learner["learner_model_param"]["base_score"]), dtype=np.float32))
+        if objective in _LOGISTIC_OBJECTIVES:
+            # Same float32 expression XGBoost uses to turn the probability into a margin.
+            base_margin = -np.log(np.float32(1) / base_score - np.float32(1))
+        else:
+            base_margin = base_score
+
+        features, thresholds, lefts, rights, defaults, values, roots = [], [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+        for tree in booster["model"]["trees"]:
+            if any(tree.get("split_type", [])):
+                raise ValueError("Categorical splits are not supported")
+            left = np.asarray(tree["left_children"], dtype=np.int64)
+            right = np.asarray(tree["right_children"], dtype=np.int64)
+            n_nodes = len(left)
+            is_leaf = left == -1
+            node_ids = np.arange(n_nodes)
+            # Leaves loop back to themselves so traversal can run a fixed number of steps.
+            lefts.append(np.where(is_leaf, node_ids, left) + offset)
+            rights.append(np.where(is_leaf, node_ids, right) + offset)
+            features.append(np.where(is_leaf, 0, tree["split_indices"]))
+            thresholds.append(np.asarray(tree["split_conditions"], dtype=np.float32))
+            defaults.append(np.asarray(tree["default_left"], dtype=bool))
+            values.append(np.where(is_leaf, np.asarray(tree["split_conditions"], dtype=np.float32), 0))
+            roots.append(offset)
+            max_depth = max(max_depth, _tree_depth(left, right))
+            offset += n_nodes
+
+        classes = getattr(model, "classes_", None)
+        if classes is None:
+            classes = np.arange(max(len(base_margin), 2))
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            default_left=np.concatenate(defaults),
+            value=np.concatenate(values),
+            roots=np.asarray(roots),
+            tree_group=np.asarray(booster["model"]["tree_info"]),
+            base_margin=base_margin,
+            objective=objective,
+            classes=np.asarray(classes),
+            max_depth=max_depth,
+        )
+
+    def save(self, path: str) -> None:
+        """Saves the node arrays to an .npz file loadable without xgboost."""
+        np.savez(
+            path,
+            feature=self.feature,
+            threshold=self.threshold,
+            left=self.left,
+            right=self.right,
+            default_left=self.default_left,
+            value=self.value,
+            roots=self.roots,
+            tree_group=self.tree_group,
+            base_margin=self.base_margin,
+            objective=np.asarray(self.objective),
+            classes=self.classes_,
+            max_depth=np.asarray(self.max_depth),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "TreeEnsemble":
+        """Loads an ensemble written by `save`."""
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {key: data[key] for key in data.files}
+        arrays["objective"] = str(arrays["objective"])
+        arrays["max_depth"] = int(arrays["max_depth"])
+        return cls(**arrays)
+
+    def leaf_values(self, X: Any) -> np.ndarray:
+        """Returns the (n_rows, n_trees) leaf value reached in every tree."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        n = len(X)
+        # Evaluate every split once up front; the walk then only gathers booleans.
+        fvalue = X.take(self._feature, axis=1)
+        go_right = fvalue >= self.threshold
+        if np.isnan(fvalue).any():
+            go_right = np.where(np.isnan(fvalue), self._missing_right, go_right)
+        go_right = go_right.ravel()
+
+        node = np.tile(self._roots, n)
+        offset = np.repeat(np.arange(n) * len(self.feature), len(self._roots)) if n > 1 else 0
+        for _ in range(self.max_depth):
+            step = node * 2
+            step += go_right.take(node + offset)
+            node = self._children.take(step)
+        return self.value.take(node).reshape(n, len(self._roots))
+
+    def decision_function(self, X: Any) -> np.ndarray:
+        """Returns raw margins, shaped (n_rows, n_groups)."""
+        leaves = self.leaf_values(X)
+        n = len(leaves)
+        if self._trees_per_group is not None:
+            # Sequential float32 sum in boosting order, seeded with the base margin.
+            seeded = np.empty((n, self.n_groups, self._trees_per_group + 1), dtype=np.float32)
+            seeded[:, :, 0] = self.base_margin
+            seeded[:, :, 1:] = leaves.take(self._tree_order, axis=1).reshape(n, self.n_groups, -1)
+            return np.cumsum(seeded, axis=2, dtype=np.float32)[:, :, -1]
+        margins = np.tile(self.base_margin, (n, 1))
+        for group in range(self.n_groups):
+            trees = self.tree_group == group
+            margins[:, group] += leaves[:, trees].sum(axis=1, dtype=np.float32)
+        return margins
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """Class probabilities, matching the source model's predict_proba."""
+        margins = self.decision_function(X)
+        if self.objective in _SOFTMAX_OBJECTIVES:
+            # Same steps as XGBoost's Softmax: float exp of the shifted margins, double sum.
+            shifted = _expf(margins - margins.max(axis=1, keepdims=True))
+            total = shifted.sum(axis=1, keepdims=True, dtype=np.float64).astype(np.float32)
+            return shifted / total
+        p = np.float32(1) / (np.float32(1) + _expf(-margins[:, 0]))
+        return np.column_stack([np.float32(1) - p, p])
+
+
+def compile_models(models: Dict[str, Any]) -> Dict[str, Any]:
+    """Replaces the XGBoost playcall, completion and field goal models with TreeEnsembles.
+
+    Args:
+        models: Models dictionary as returned by main.get_models().
+
+    Returns:
+        Dict[str, Any]: A copy of models with the three classifiers compiled.
+    """
+    models = dict(models)
+    for key in ["playcall_model", "completion_model", "field_goal_model"]:
+        models[key] = TreeEnsemble.from_xgboost(models[key])
+    return models
+
+
+def _expf(x: np.ndarray) -> np.ndarray:
+    # Rounding a double exp to float32 tracks C expf more closely than NumPy's float32 exp.
+    return np.exp(x.astype(np.float64)).astype(np.float32)
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth = np.zeros(len(left), dtype=np.int64)
+    # XGBoost numbers children after their parents, so one forward pass suffices.
+    for node in range(len(left)):
+        if left[node] != -1:
+            depth[left[node]] = depth[node] + 1
+            depth[right[node]] = depth[node] + 1
+    return int(depth.max())
@@ -0,0 +1,1617 @@
+"""Throughput benchmarks for the simulation engine.
+
+Unlike benchmark.py (which measures projection accuracy over BENCHMARK_SUITE), these
+benchmarks measure speed. They run on a synthetic matchup with small XGBoost models
+trained on random data, so they need no PBP downloads or trained model files.
+
+Usage:
+    python perf_benchmark.py engine --simulations 1000
+    python perf_benchmark.py tables --resolution 1
+    python perf_benchmark.py trees
+    python perf_benchmark.py scheduler --simulations 1000
+    python perf_benchmark.py context --simulations 1000
+    python perf_benchmark.py sampling --draws 200000
+    python perf_benchmark.py rng --draws 1000000
+    python perf_benchmark.py players --simulations 10000
+    python perf_benchmark.py statlines --simulations 30
+    python perf_benchmark.py profiles --simulations 30 --profiles 4
+    python perf_benchmark.py pool --simulations 20 --games 4 --workers 2
+    python perf_benchmark.py buffers --workers 32
+    python perf_benchmark.py slate --weeks 4 --games 4 --simulations 4
+    python perf_benchmark.py scenarios --simulations 2000 --questionable 4
+    python perf_benchmark.py ros --week 2 --estimators 30
+    python perf_benchmark.py results --simulations 10000
+    python perf_benchmark.py sketch --simulations 10000 --weeks 4
+    python perf_benchmark.py export --players 600 --simulations 10000
+    python perf_benchmark.py reference --weeks 17
+    python perf_benchmark.py pbp --plays 49000 --columns 372
+    python perf_benchmark.py pbpload --seasons 1 2 4
+    python perf_benchmark.py lazypbp --seasons 4 --week 10
+    python perf_benchmark.py actuals --seasons 2
+    python perf_benchmark.py estimators --seasons 2 --week 18
+    python perf_benchmark.py ewma --seasons 2
+"""
+import argparse
+import contextlib
+import copy
+import io
+import multiprocessing
+import os
+import pickle
+import random
+import tempfile
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.preprocessing import LabelEncoder
+from xgboost import XGBClassifier
+
+from data import loader, nfl_client, pbp_store
+from engine.game import GameState
+from engine.batch import BatchGameState
+from engine.scheduler import InferenceScheduler
+from engine.context import MatchupContext
+from engine.sampling import AliasTable
+from engine.rng import SimRandom, sim_seed
+from engine.pool import SimulationPool
+from engine.slate import SlateScheduler
+from engine.buffers import SampleBuffers, sample_keys
+from main import PBP_COLUMNS
+from engine.players import STAT_QUANTILES
+from engine.results import SimulationResults
+from engine.sketch import SketchResults, SUMMARY_PERCENTILES
+from models.playcall import XGBPlayCaller
+from reporting.dataset import write_csv_views, write_projection_dataset
+from models.kicking import XGBKicker
+from models.lookup import build_lookup_tables
+from models.tree_ensemble import compile_models
+from score import score_stat_lines
+from settings import AppConfig, ScoringSettings
+from stats import cache as stats_cache
+from stats.estimator_state import EstimatorState
+from stats import players, teams
+from stats.util import _compute_estimator_vectorized, _compute_estimators_vectorized
+
+SAMPLE_SIZE = 100000
+HOME, AWAY = "KC", "DET"
+
+# A representative input row for each classifier, used for per-call latency.
+LATENCY_ROWS = {
+    "playcall_model": [2, 7, -3, 420, 2, 62, 47.5, -3.0, 4],
+    "completion_model": [2, 7, 62, 8.5, 5.0, 1],
+    "field_goal_model": [-3, 420, 2, 44, 5.0, 1],
+}
+
+
+def _train_classifier(X, y, n_estimators=100, objective='multi:softprob'):
+    model = XGBClassifier(
+        n_estimators=n_estimators,
+        max_depth=4,
+        learning_rate=0.1,
+        objective=objective,
+    )
+    model.fit(X, y)
+    return model
+
+
+def build_synthetic_models(seed=0):
+    """Builds a models dict shaped like main.get_models(), using synthetic training data."""
+    rng = np.random.default_rng(seed)
+    n = 5000
+
+    # Playcall: down, ydstogo, score_diff, sec, qtr, yardline, total, spread, drive_play_count
+    X = np.column_stack([
+        rng.integers(1, 5, n), rng.integers(1, 20, n), rng.integers(-21, 22, n),
+        rng.integers(0, 900, n), rng.integers(1, 6, n), rng.integers(1, 100, n),
+        rng.normal(45, 4, n), rng.normal(0, 5, n), rng.integers(1, 15, n),
+    ]).astype(float)
+    fourth = X[:, 0] == 4
+    labels = np.where(rng.random(n) < 0.6, "pass", "run").astype(object)
+    labels[fourth & (X[:, 5] < 35)] = "field_goal"
+    labels[fourth & (X[:, 5] >= 35)] = "punt"
+    le = LabelEncoder()
+    playcall_model = XGBPlayCaller(_train_classifier(X, le.fit_transform(labels)), le)
+
+    # Completion: down, ydstogo, yardline, air_yards, wind, is_outdoors
+    X = np.column_stack([
+        rng.integers(1, 5, n), rng.integers(1, 20, n), rng.integers(1, 100, n),
+        rng.normal(8, 9, n), rng.uniform(0, 20, n), rng.integers(0, 2, n),
+    ]).astype(float)
+    complete = (rng.random(n) < 0.75 - 0.01 * X[:, 3]).astype(int)
+    completion_model = _train_classifier(X, complete, objective='binary:logistic')
+
+    # Field goal: score_diff, sec, qtr, kick_distance, wind, is_outdoors
+    X = np.column_stack([
+        rng.integers(-21, 22, n), rng.integers(0, 900, n), rng.integers(1, 6, n),
+        rng.integers(18, 65, n), rng.uniform(0, 20, n), rng.integers(0, 2, n),
+    ]).astype(float)
+    u = rng.random(n)
+    p_made = 1.2 - 0.012 * X[:, 3]
+    results = np.where(u < p_made, "made", np.where(u < p_made + 0.02, "blocked", "missed"))
+    le = LabelEncoder()
+    field_goal_model = XGBKicker(_train_classifier(X, le.fit_transform(results)), le)
+
+    models = {
+        "playcall_model": playcall_model,
+        "completion_model": completion_model,
+        "field_goal_model": field_goal_model,
+        "clock_model": {},
+    }
+    try:
+        clock_df = pd.read_csv("stats/clock_runoff.csv")
+        models["clock_model"] = clock_df.set_index(
+            ['qtr_bucket', 'time_bucket', 'score_bucket', 'play_type_detail']
+        )['mean'].to_dict()
+    except FileNotFoundError:
+        pass
+
+    models["rush_open_samples"] = rng.gamma(2.0, 2.2, SAMPLE_SIZE) - 1.0
+    models["rush_rz_samples"] = rng.gamma(1.5, 1.8, SAMPLE_SIZE) - 1.0
+    models["scramble_samples"] = rng.gamma(2.0, 3.5, SAMPLE_SIZE)
+    models["scramble_samples_mobile"] = rng.gamma(2.0, 4.0, SAMPLE_SIZE)
+    models["scramble_samples_pocket"] = rng.gamma(2.0, 3.0, SAMPLE_SIZE)
+    models["int_return_samples"] = rng.gamma(1.5, 8.0, SAMPLE_SIZE)
+    for pos, mean_air in [("RB", 0.5), ("WR", 10.0), ("TE", 6.5), ("ALL", 8.0)]:
+        models[f"air_yards_{pos}_samples"] = rng.normal(mean_air, 8.0, SAMPLE_SIZE)
+        for zone in ["open", "rz"]:
+            models[f"yac_{pos}_{zone}_samples"] = rng.gamma(1.2, 4.0, SAMPLE_SIZE) - 0.5
+    return models
+
+
+def build_synthetic_matchup(seed=0):
+    """Builds player and team stats frames for a two-team synthetic matchup."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for team in [HOME, AWAY]:
+        roster = [("QB", 1), ("RB", 3), ("WR", 5), ("TE", 2), ("K", 1)]
+        for position, count in roster:
+            for i in range(count):
+                is_rb = position == "RB"
+                rows.append({
+                    "player_id": "%s_%s%d" % (team, position, i),
+                    "player_name": "%s %s%d" % (team, position, i),
+                    "position": position,
+                    "team": team,
+                    "status": "Active",
+                    "exp_return": None,
+                    "relative_air_yards_est": rng.uniform(0.8, 1.2),
+                    "target_share_est": rng.uniform(0.02, 0.25) if position in ["RB", "WR", "TE"] else 0.0,
+                    "target_percentage": 0.1 if position in ["RB", "WR", "TE"] else 0.0,
+                    "relative_yac_est": rng.uniform(0.8, 1.2),
+                    "receiver_cpoe_est": rng.normal(0, 2),
+                    "carry_share_est": rng.uniform(0.1, 0.6) if is_rb else 0.0,
+                    "redzone_carry_share_est": rng.uniform(0.1, 0.6) if is_rb else 0.0,
+                    "goal_line_carry_share_est": rng.uniform(0.1, 0.6) if is_rb else 0.0,
+                    "relative_ypc_est": rng.uniform(0.9, 1.1),
+                    "cpoe_est": rng.normal(0, 2) if position == "QB" else 0.0,
+                    "pass_attempts": 500 if position == "QB" else 0,
+                    "scramble_rate_est": 0.05 if position == "QB" else 0.0,
+                    "relative_yards_per_scramble_est": 1.0,
+                    "fgoe_est": 0.02 if position == "K" else 0.0,
+                    "is_mobile": 0,
+                    "starting_qb": 1 if position == "QB" else 0,
+                    "kick_attempts": 30 if position == "K" else 0,
+                    "starting_k": 1 if position == "K" else 0,
+                })
+    player_stats = pd.DataFrame(rows)
+    team_stats = pd.DataFrame({
+        "team": [HOME, AWAY],
+        "defense_relative_ypc_est": [1.0, 1.05],
+        "defense_relative_yac_est": [0.95, 1.0],
+        "defense_relative_air_yards": [1.0, 1.0],
+        "defense_cpoe_est": [-1.0, 1.0],
+        "defense_int_rate_est": [0.022, 0.02],
+        "offense_sack_rate_est": [0.06, 0.07],
+        "defense_sack_rate_est": [0.07, 0.06],
+        "lg_sack_rate": [0.065, 0.065],
+        "offense_pass_oe_est": [3.0, -1.0],
+        "defense_pass_oe_est": [0.0, 1.0],
+        "offense_go_for_it_rate_est": [0.1, 0.0],
+    })
+    return player_stats, team_stats
+
+
+def matchup_args(models, player_stats, team_stats):
+    return dict(
+        models=models,
+        home_team=HOME,
+        away_team=AWAY,
+        home_player_stats=player_stats[player_stats.team == HOME],
+        away_player_stats=player_stats[player_stats.team == AWAY],
+        home_team_stats=team_stats[team_stats.team == HOME],
+        away_team_stats=team_stats[team_stats.team == AWAY],
+        rules=ScoringSettings(),
+        game_info={"wind": 5.0, "is_outdoors": 1, "total_line": 47.5, "spread_line": -3.0},
+    )
+
+
+def bench_engine(args):
+    """Games/sec of the scalar GameState loop versus BatchGameState."""
+    models = build_synthetic_models()
+    player_stats, team_stats = build_synthetic_matchup()
+    game_args = matchup_args(models, player_stats, team_stats)
+
+    random.seed(0)
+    n_scalar = min(args.simulations, args.scalar_simulations)
+    start = time.perf_counter()
+    scalar_points = [GameState(**game_args).play_game()[0] for _ in range(n_scalar)]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = BatchGameState(**game_args, n_simulations=args.simulations, seed=0)
+    batch_points = batch.play_games()
+    batch_time = time.perf_counter() - start
+
+    scalar_df = pd.DataFrame(scalar_points).transpose()
+    print("Scalar engine: %d games in %.2fs (%.1f games/sec)" % (n_scalar, scalar_time, n_scalar / scalar_time))
+    print("Batch engine:  %d games in %.2fs (%.1f games/sec)" % (
+        args.simulations, batch_time, args.simulations / batch_time))
+    print("Speedup: %.1fx" % ((args.simulations / batch_time) / (n_scalar / scalar_time)))
+    print("Mean points (scalar vs batch):")
+    for player_id in ["%s_QB0" % HOME, "%s_RB0" % HOME, "%s_WR0" % AWAY, "%s_K0" % AWAY, HOME]:
+        print("  %-10s %6.2f  %6.2f" % (player_id, scalar_df.loc[player_id].mean(), batch_points.loc[player_id].mean()))
+
+
+def _time_per_call(fn, X, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(X)
+    return (time.perf_counter() - start) / repeats
+
+
+def bench_tables(args):
+    """Build cost, accuracy and per-call latency of the probability lookup tables."""
+    models = build_synthetic_models()
+    start = time.perf_counter()
+    tables = build_lookup_tables(models, resolution=args.resolution)
+    print("Total table build time: %.1fs" % (time.perf_counter() - start))
+
+    print("%-18s %12s %12s %12s %12s" % ("model", "xgb 1-row", "table 1-row", "xgb/row@1k", "table/row@1k"))
+    for key, row in LATENCY_ROWS.items():
+        single = [row]
+        batch = np.tile(row, (1000, 1)).astype(float)
+        source, table = tables["%s_source" % key], tables[key]
+        print("%-18s %10.1fus %10.1fus %10.2fus %10.2fus" % (
+            key,
+            _time_per_call(source.predict_proba, single, 200) * 1e6,
+            _time_per_call(table.predict_proba, single, 2000) * 1e6,
+            _time_per_call(source.predict_proba, batch, 20) * 1e3,
+            _time_per_call(table.predict_proba, batch, 20) * 1e3,
+        ))
+
+    player_stats, team_stats = build_synthetic_matchup()
+    for label, game_models in [("xgboost", models), ("tables", tables)]:
+        game_args = matchup_args(game_models, player_stats, team_stats)
+        random.seed(0)
+        start = time.perf_counter()
+        for _ in range(args.simulations):
+            GameState(**game_args).play_game()
+        elapsed = time.perf_counter() - start
+        print("Scalar engine with %-8s %d games in %.2fs (%.1f games/sec)" % (
+            label, args.simulations, elapsed, args.simulations / elapsed))
+
+
+def bench_trees(args):
+    """Equivalence and per-call latency of the compiled NumPy tree ensembles."""
+    models = build_synthetic_models()
+    start = time.perf_counter()
+    compiled = compile_models(models)
+    print("Compile time: %.2fs" % (time.perf_counter() - start))
+
+    rng = np.random.default_rng(0)
+    print("%-18s %10s %12s %12s %12s %12s" % (
+        "model", "max diff", "xgb 1-row", "numpy 1-row", "xgb/row@1k", "numpy/row@1k"))
+    for key, row in LATENCY_ROWS.items():
+        single = [row]
+        batch = np.tile(row, (1000, 1)) * rng.uniform(0.5, 1.5, (1000, len(row)))
+        source, ensemble = models[key], compiled[key]
+        diff = np.abs(np.asarray(source.predict_proba(batch)) - ensemble.predict_proba(batch)).max()
+        print("%-18s %10.1e %10.1fus %10.1fus %10.2fus %10.2fus" % (
+            key,
+            diff,
+            _time_per_call(source.predict_proba, single, 200) * 1e6,
+            _time_per_call(ensemble.predict_proba, single, 2000) * 1e6,
+            _time_per_call(source.predict_proba, batch, 20) * 1e3,
+            _time_per_call(ensemble.predict_proba, batch, 20) * 1e3,
+        ))
+
+    player_stats, team_stats = build_synthetic_matchup()
+    for label, game_models in [("xgboost", models), ("numpy", compiled)]:
+        game_args = matchup_args(game_models, player_stats, team_stats)
+        random.seed(0)
+        start = time.perf_counter()
+        for _ in range(args.simulations):
+            GameState(**game_args).play_game()
+        elapsed = time.perf_counter() - start
+        print("Scalar engine with %-8s %d games in %.2fs (%.1f games/sec)" % (
+            label, args.simulations, elapsed, args.simulations / elapsed))
+
+
+def bench_scheduler(args):
+    """Games/sec of the one-row-at-a-time play_game loop versus batched inference."""
+    models = build_synthetic_models()
+    player_stats, team_stats = build_synthetic_matchup()
+    game_args = matchup_args(models, player_stats, team_stats)
+    template = GameState(**game_args)
+
+    def fresh_games(n):
+        # Constructing GameStates is the same for both modes, so it is kept out of the timing.
+        games = []
+        for _ in range(n):
+            game = copy.copy(template)
+            game.reset_points()
+            games.append(game)
+        return games
+
+    random.seed(0)
+    n_scalar = min(args.simulations, args.scalar_simulations)
+    games = fresh_games(n_scalar)
+    start = time.perf_counter()
+    scalar_points = [game.play_game()[0] for game in games]
+    scalar_time = time.perf_counter() - start
+    print("play_game loop:      %d games in %.2fs (%.1f games/sec)" % (n_scalar, scalar_time, n_scalar / scalar_time))
+
+    scheduler = InferenceScheduler(max_active=args.max_active)
+    games = fresh_games(args.simulations)
+    start = time.perf_counter()
+    results = scheduler.play_games(games)
+    elapsed = time.perf_counter() - start
+    print("Batched inference:   %d games in %.2fs (%.1f games/sec)" % (
+        args.simulations, elapsed, args.simulations / elapsed))
+    print("Speedup: %.1fx" % ((args.simulations / elapsed) / (n_scalar / scalar_time)))
+    print("%d ticks, %d predict_proba calls, %.0f rows per call" % (
+        scheduler.ticks, scheduler.model_calls, scheduler.rows / max(scheduler.model_calls, 1)))
+
+    scalar_df = pd.DataFrame(scalar_points).transpose()
+    scheduled_df = pd.DataFrame([points for points, _ in results]).transpose()
+    print("Mean points (play_game vs batched):")
+    for player_id in ["%s_QB0" % HOME, "%s_RB0" % HOME, "%s_WR0" % AWAY, "%s_K0" % AWAY, HOME]:
+        print("  %-10s %6.2f  %6.2f" % (player_id, scalar_df.loc[player_id].mean(), scheduled_df.loc[player_id].mean()))
+
+
+def bench_context(args):
+    """Per-simulation GameState construction cost: DataFrames versus a MatchupContext."""
+    # Imported here so the other benchmarks don't pay for main's imports.
+    from main import _apply_injury_scenario
+
+    models = build_synthetic_models()
+    player_stats, team_stats = build_synthetic_matchup()
+    questionable = ["%s_WR0" % HOME, "%s_RB1" % AWAY, "%s_TE0" % HOME, "%s_WR1" % AWAY][:args.questionable]
+    player_stats.loc[player_stats.player_id.isin(questionable), "status"] = "Questionable"
+    rules = ScoringSettings()
+
+    random.seed(0)
+    start = time.perf_counter()
+    for _ in range(args.simulations):
+        q_indices = player_stats.index[player_stats['status'] == 'Questionable']
+        scenario_stats = _apply_injury_scenario(
+            player_stats, q_indices, [random.random() < 0.25 for _ in q_indices]
+        )
+        GameState(
+            models, HOME, AWAY,
+            scenario_stats[scenario_stats["team"].isin([HOME])],
+            scenario_stats[scenario_stats["team"].isin([AWAY])],
+            team_stats[team_stats["team"].isin([HOME])],
+            team_stats[team_stats["team"].isin([AWAY])],
+            rules=rules,
+        )
+    before = (time.perf_counter() - start) / args.simulations
+
+    random.seed(0)
+    start = time.perf_counter()
+    context = MatchupContext(models, HOME, AWAY, player_stats, team_stats, rules)
+    compile_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(args.simulations):
+        context.sample_game_state()
+    after = (time.perf_counter() - start) / args.simulations
+
+    print("%d questionable players, %d simulations" % (len(questionable), args.simulations))
+    print("DataFrame construction: %8.1fus per sim" % (before * 1e6))
+    print("MatchupContext:         %8.1fus per sim (+ %.1fms once to compile)" % (after * 1e6, compile_time * 1e3))
+    print("Speedup: %.0fx" % (before / after))
+
+
+def bench_sampling(args):
+    """Carrier/target draws per second: random.choices versus alias tables."""
+    player_stats, _ = build_synthetic_matchup()
+    roster = player_stats[player_stats.team == HOME]
+    carriers = roster.loc[roster.carry_share_est > 0, "carry_share_est"].tolist()
+    targets = roster.loc[roster.target_percentage > 0, "target_share_est"].tolist()
+    targets = [w / sum(targets) for w in targets]
+
+    def choices_carrier(candidates, weights):
+        # The per-play work choose_carrier used to do.
+        weights = [0.0 if pd.isna(w) else w for w in weights]
+        if sum(weights) == 0:
+            weights = [1.0 for _ in weights]
+        return random.choices(candidates, weights=weights, k=1)[0]
+
+    def choices_target(candidates, weights):
+        return random.choices(candidates, weights=weights, k=1)[0]
+
+    def alias_draw(candidates, sampler):
+        return candidates[sampler.draw()]
+
+    print("%-10s %10s %18s %18s %8s" % ("selection", "outcomes", "random.choices/s", "alias/s", "speedup"))
+    for label, weights, choices in [("carrier", carriers, choices_carrier), ("target", targets, choices_target)]:
+        candidates = list(range(len(weights)))
+        start = time.perf_counter()
+        for _ in range(args.draws):
+            choices(candidates, weights)
+        before = args.draws / (time.perf_counter() - start)
+
+        sampler = AliasTable(weights)
+        start = time.perf_counter()
+        for _ in range(args.draws):
+            alias_draw(candidates, sampler)
+        after = args.draws / (time.perf_counter() - start)
+        print("%-10s %10d %16.0f %16.0f %7.1fx" % (label, len(weights), before, after, after / before))
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        AliasTable(targets)
+    print("Alias table build (%d outcomes): %.1fus" % (len(targets), (time.perf_counter() - start) * 1e3))
+
+
+def bench_rng(args):
+    """Per-draw cost of the global random module versus block-drawn SimRandom streams."""
+    samples = np.random.default_rng(0).normal(5.0, 6.0, SAMPLE_SIZE)
+    stream = SimRandom(sim_seed(2024, 1, 0, 0))
+    weights = [0.1, 0.5, 0.1, 0.3]
+    population = ["field_goal", "pass", "punt", "run"]
+
+    print("%-24s %14s %14s %8s" % ("draw", "random/s", "SimRandom/s", "speedup"))
+    for label, before, after in [
+        ("uniform", random.random, stream.random),
+        ("sample buffer choice", lambda: random.choice(samples), lambda: stream.choice(samples)),
+        ("weighted choices", lambda: random.choices(population, weights=weights, k=1),
+         lambda: stream.choices(population, weights=weights, k=1)),
+    ]:
+        rates = []
+        for fn in [before, after]:
+            start = time.perf_counter()
+            for _ in range(args.draws):
+                fn()
+            rates.append(args.draws / (time.perf_counter() - start))
+        print("%-24s %14.0f %14.0f %7.1fx" % (label, rates[0], rates[1], rates[1] / rates[0]))
+
+    models = build_synthetic_models()
+    player_stats, team_stats = build_synthetic_matchup()
+    context = MatchupContext(models, HOME, AWAY, player_stats, team_stats, ScoringSettings())
+    for label, make_rng in [
+        ("random module", lambda sim: None),
+        ("SimRandom", lambda sim: SimRandom(sim_seed(2024, 1, 0, sim))),
+    ]:
+        random.seed(0)
+        start = time.perf_counter()
+        for sim in range(args.simulations):
+            context.sample_game_state(rng=make_rng(sim)).play_game()
+        elapsed = time.perf_counter() - start
+        print("Scalar engine with %-14s %d games in %.2fs (%.1f games/sec)" % (
+            label, args.simulations, elapsed, args.simulations / elapsed))
+
+
+def bench_players(args):
+    """Time and peak memory of collecting a week of results: per-sim dicts versus a points array."""
+    models = build_synthetic_models()
+    player_stats, team_stats = build_synthetic_matchup()
+    context = MatchupContext(models, HOME, AWAY, player_stats, team_stats, ScoringSettings())
+    random.seed(0)
+    # Play a handful of real games and cycle through their results for every simulation.
+    played = []
+    for _ in range(args.games):
+        game = context.sample_game_state()
+        game.play_game()
+        played.append(game.points)
+    print("%d matchups x %d simulations, %d player slots per matchup" % (
+        args.matchups, args.simulations, len(context.players)))
+
+    def dicts():
+        # Before: one defaultdict per simulation, keyed by player id, then a transposed frame.
+        frames = []
+        for _ in range(args.matchups):
+            projections = [dict(context.players.to_dict(played[sim % args.games])) for sim in range(args.simulations)]
+            frames.append(pd.DataFrame(projections).transpose())
+        return pd.concat(frames)
+
+    def arrays():
+        # After: a preallocated (simulations, players) array, mapped to ids once per matchup.
+        frames = []
+        for _ in range(args.matchups):
+            points = np.empty((args.simulations, len(context.players)))
+            for sim in range(args.simulations):
+                points[sim] = played[sim % args.games]
+            frames.append(context.players.to_frame(points))
+        return pd.concat(frames)
+
+    print("%-24s %10s %14s" % ("results", "seconds", "peak MiB"))
+    outputs = []
+    for label, fn in [("per-sim dicts", dicts), ("points array", arrays)]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        outputs.append(fn())
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("%-24s %10.2f %14.1f" % (label, elapsed, peak / 2 ** 20))
+    before, after = outputs
+    pd.testing.assert_frame_equal(before.sort_index(), after.sort_index(), check_dtype=False)
+    print("Exports match (%d player rows)" % len(after))
+
+
+def bench_stat_lines(args):
+    """Scalar engine games/sec with and without stat-line recording, plus the quantile export."""
+    models = build_synthetic_models()
+    player_stats, team_stats = build_synthetic_matchup()
+    contexts = {
+        record_stats: MatchupContext(
+            models, HOME, AWAY, player_stats, team_stats, ScoringSettings(), record_stats=record_stats
+        )
+        for record_stats in [False, True]
+    }
+    best = {False: float("inf"), True: float("inf")}
+    # Alternate which mode goes first and keep each one's best round, since the
+    # overhead is small next to run-to-run noise.
+    for round_ in range(args.rounds):
+        for record_stats in [False, True] if round_ % 2 else [True, False]:
+            context = contexts[record_stats]
+            start = time.perf_counter()
+            for sim in range(args.simulations):
+                context.sample_game_state(rng=SimRandom(sim_seed(2024, 1, 0, sim))).play_game()
+            best[record_stats] = min(best[record_stats], time.perf_counter() - start)
+    for record_stats in [False, True]:
+        print("Stat lines %-4s %d games in %.2fs (%.1f games/sec)" % (
+            "on" if record_stats else "off", args.simulations, best[record_stats], args.simulations / best[record_stats]))
+    print("Recording overhead: %.1f%%" % (100 * (best[True] / best[False] - 1)))
+
+    context = contexts[True]
+    stats = []
+    for sim in range(min(args.simulations, 50)):
+        game = context.sample_game_state(rng=SimRandom(sim_seed(2024, 1, 0, sim)))
+        game.play_game()
+        stats.append(game.stats)
+    stats = np.stack([stats[sim % len(stats)] for sim in range(args.export_simulations)])
+    start = time.perf_counter()
+    frame = context.players.stat_frame(stats)
+    print("stat_frame for %d sims x %d players x %d stats (%.1f MiB float32): %.3fs, %d rows x %d columns" % (
+        stats.shape[0], stats.shape[1], stats.shape[2], stats.nbytes / 2 ** 20,
+        time.perf_counter() - start, frame.shape[0], frame.shape[1]))
+
+
+def bench_profiles(args):
+    """Scoring several profiles: one engine run per profile versus one run's stat lines."""
+    models = build_synthetic_models()
+    player_stats, team_stats = build_synthetic_matchup()
+    profiles = [
+        ScoringSettings(reception=0.5 * (k % 3), pass_td=4.0 + 2 * (k % 2), pa_0=10.0 + k)
+        for k in range(args.profiles)
+    ]
+    seeds = [sim_seed(2024, 1, 0, sim) for sim in range(args.simulations)]
+
+    start = time.perf_counter()
+    rerun = []
+    for rules in profiles:
+        context = MatchupContext(models, HOME, AWAY, player_stats, team_stats, rules)
+        points = []
+        for seed in seeds:
+            game = context.sample_game_state(rng=SimRandom(seed))
+            game.play_game()
+            points.append(game.points)
+        rerun.append(points)
+    rerun = np.array(rerun)
+    rerun_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    context = MatchupContext(models, HOME, AWAY, player_stats, team_stats, profiles[0], record_stats=True)
+    stats = []
+    for seed in seeds:
+        game = context.sample_game_state(rng=SimRandom(seed))
+        game.play_game()
+        stats.append(game.stats)
+    stats = np.stack(stats)
+    simulate_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    scored = score_stat_lines(stats, context.players.defense, profiles)
+    score_elapsed = time.perf_counter() - start
+
+    print("Re-simulating per profile: %d profiles x %d games in %.2fs" % (args.profiles, args.simulations, rerun_elapsed))
+    print("Stat lines + matmul:       %d games in %.2fs, scoring %.4fs (%.1fx faster)" % (
+        args.simulations, simulate_elapsed, score_elapsed, rerun_elapsed / (simulate_elapsed + score_elapsed)))
+    np.testing.assert_array_equal(np.isnan(scored), np.isnan(rerun))
+    print("Max abs difference vs re-simulated points: %.2e" % np.nanmax(np.abs(scored - rerun)))
+
+
+def _simulate(context, seed):
+    game = context.sample_game_state(rng=SimRandom(seed))
+    game.play_game()
+    return game.points
+
+
+def bench_pool(args):
+    """Startup, per-task overhead and throughput of joblib per-sim tasks versus a SimulationPool."""
+    models = build_synthetic_models()
+    player_stats, team_stats = build_synthetic_matchup()
+    context = MatchupContext(models, HOME, AWAY, player_stats, team_stats, ScoringSettings())
+    detached = copy.copy(context)
+    detached.models = None
+    print("Pickled context: %.1f MiB with models, %.1f KiB without" % (
+        len(pickle.dumps(context)) / 2 ** 20, len(pickle.dumps(detached)) / 2 ** 10))
+    games = [[sim_seed(2024, 1, game, sim) for sim in range(args.simulations)] for game in range(args.games)]
+    total = args.games * args.simulations
+
+    start = time.perf_counter()
+    serial = [np.vstack([_simulate(context, seed) for seed in seeds]) for seeds in games]
+    serial_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with Parallel(n_jobs=args.workers) as parallel:
+        joblib_points = [np.vstack(parallel(delayed(_simulate)(context, seed) for seed in seeds)) for seeds in games]
+    joblib_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with SimulationPool(build_synthetic_models, args.workers) as pool:
+        startup = time.perf_counter() - start
+        empty = []
+        for _ in range(args.rounds):
+            task_start = time.perf_counter()
+            pool.simulate(context, [])
+            empty.append(time.perf_counter() - task_start)
+        run_start = time.perf_counter()
+        pool_points = [pool.simulate(context, seeds)[0] for seeds in games]
+        pool_elapsed = time.perf_counter() - run_start
+
+    print("%-26s %10s %12s %12s" % ("Mode", "startup s", "run s", "games/sec"))
+    print("%-26s %10s %12.2f %12.1f" % ("in process", "-", serial_elapsed, total / serial_elapsed))
+    print("%-26s %10s %12.2f %12.1f" % ("joblib, task per sim", "-", joblib_elapsed, total / joblib_elapsed))
+    print("%-26s %10.2f %12.2f %12.1f" % ("SimulationPool", startup, pool_elapsed, total / pool_elapsed))
+    print("Pool round trip for an empty game: %.1f ms (median of %d)" % (1000 * np.median(empty), args.rounds))
+    for points in [joblib_points, pool_points]:
+        for expected, actual in zip(serial, points):
+            np.testing.assert_array_equal(expected, actual)
+    print("Results match the in-process simulations")
+
+
+def _proc_kib(path, field):
+    with open(path) as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def _buffer_worker(mode, payload, results, done):
+    start = time.perf_counter()
+    arrays = pickle.loads(payload) if mode == "copy" else SampleBuffers.attach(payload).arrays
+    elapsed = time.perf_counter() - start
+    checksum = sum(float(array.sum()) for array in arrays.values())  # touch every page
+    results.put((
+        elapsed, checksum,
+        _proc_kib("/proc/self/status", "VmHWM"),
+        _proc_kib("/proc/self/smaps_rollup", "Pss"),
+    ))
+    done.wait()
+
+
+def bench_buffers(args):
+    """Per-worker copies of the sample buffers versus one shared float32 block: attach time and memory."""
+    models = build_synthetic_models()
+    samples = {key: models[key] for key in sample_keys(models)}
+    copy_bytes = sum(array.nbytes for array in samples.values())
+    buffers = SampleBuffers.create(samples, args.dtype)
+    print("%d sample buffers: %.1f MiB as float64 copies, %.1f MiB shared %s block" % (
+        len(samples), copy_bytes / 2 ** 20, buffers.nbytes / 2 ** 20, args.dtype))
+
+    context = multiprocessing.get_context("fork")
+    print("%-8s %8s %14s %16s %16s" % ("Mode", "workers", "attach ms", "sum peak RSS", "sum PSS MiB"))
+    for mode, payload in [("copy", pickle.dumps(samples)), ("shared", buffers.spec)]:
+        results, done = context.Queue(), context.Event()
+        workers = [context.Process(target=_buffer_worker, args=(mode, payload, results, done)) for _ in range(args.workers)]
+        for worker in workers:
+            worker.start()
+        # Every worker holds its buffers until all have reported, as in a live pool.
+        reports = [results.get() for _ in workers]
+        done.set()
+        for worker in workers:
+            worker.join()
+        attach = np.array([report[0] for report in reports])
+        print("%-8s %8d %14.3f %16.1f %16.1f" % (
+            mode, args.workers, 1000 * np.median(attach),
+            sum(report[2] for report in reports) / 2 ** 10, sum(report[3] for report in reports) / 2 ** 10))
+    buffers.close()
+
+
+def bench_slate(args):
+    """Wall time and worker utilization: waiting on each game in turn versus one slate-wide queue."""
+    models = build_synthetic_models()
+    player_stats, team_stats = build_synthetic_matchup()
+    slate = [(week, game) for week in range(1, args.weeks + 1) for game in range(args.games)]
+    seeds = {
+        (week, game): [sim_seed(2024, week, game, sim) for sim in range(args.simulations)] for week, game in slate
+    }
+
+    def compile_game():
+        return MatchupContext(models, HOME, AWAY, player_stats, team_stats, ScoringSettings())
+
+    with SimulationPool(build_synthetic_models, args.workers) as pool:
+        print("%-20s %8s %10s %12s %12s" % ("Mode", "games", "wall s", "games/sec", "utilization"))
+        start, busy = time.perf_counter(), pool.busy_seconds
+        per_game = {key: pool.simulate(compile_game(), seeds[key])[0] for key in slate}
+        elapsed = time.perf_counter() - start
+        print("%-20s %8d %10.2f %12.1f %11.0f%%" % (
+            "game by game", len(slate), elapsed, len(slate) * args.simulations / elapsed,
+            100 * (pool.busy_seconds - busy) / (pool.processes * elapsed)))
+
+        scheduler = SlateScheduler(pool)
+        for key in slate:
+            scheduler.submit(key, compile_game(), seeds[key])
+        results = scheduler.collect()
+        print("%-20s %8d %10.2f %12.1f %11.0f%%" % (
+            "slate queue", len(slate), scheduler.wall_seconds, len(slate) * args.simulations / scheduler.wall_seconds,
+            100 * scheduler.utilization))
+    for key in slate:
+        np.testing.assert_array_equal(per_game[key], results[key][0])
+    print("Results match")
+
+
+def _copy_injury_scenario(player_stats, q_indices, scratched):
+    # The per-simulation DataFrame copy / .at / drop that _apply_injury_scenario replaced.
+    player_stats = player_stats.copy()
+    drop_indices = []
+    for idx, is_scratched in zip(q_indices, scratched):
+        if is_scratched:
+            drop_indices.append(idx)
+        else:
+            player_stats.at[idx, 'target_share_est'] *= 0.8
+            player_stats.at[idx, 'carry_share_est'] *= 0.8
+    return player_stats.drop(drop_indices) if drop_indices else player_stats
+
+
+def bench_scenarios(args):
+    """Cost of drawing and applying a game's questionable-player scenarios: per-sim frames versus one matrix."""
+    from main import _apply_injury_scenario
+
+    player_stats, team_stats = build_synthetic_matchup()
+    questionable = ["%s_WR0" % HOME, "%s_RB1" % AWAY, "%s_TE0" % HOME, "%s_WR1" % AWAY][:args.questionable]
+    player_stats.loc[player_stats.player_id.isin(questionable), "status"] = "Questionable"
+    q_indices = player_stats.index[player_stats['status'] == 'Questionable']
+    seeds = [sim_seed(2024, 1, 0, sim) for sim in range(args.simulations)]
+
+    start = time.perf_counter()
+    for seed in seeds:
+        rng = SimRandom(seed)
+        _copy_injury_scenario(player_stats, q_indices, [rng.random() < 0.25 for _ in q_indices])
+    per_sim = time.perf_counter() - start
+
+    start = time.perf_counter()
+    context = MatchupContext({}, HOME, AWAY, player_stats, team_stats, ScoringSettings())
+    scratched = context.sample_scenarios(seeds)
+    draw = time.perf_counter() - start
+    scenarios, scenario_of_sim = np.unique(scratched, axis=0, return_inverse=True)
+    frames = [_apply_injury_scenario(player_stats, q_indices, scenario) for scenario in scenarios]
+    frames_elapsed = time.perf_counter() - start
+    rosters = [context.roster(row) for row in scratched]
+    rosters_elapsed = time.perf_counter() - start
+
+    print("%d simulations, %d questionable players (%d distinct scenarios)" % (
+        args.simulations, len(q_indices), len(scenarios)))
+    print("Per-sim frame copy/.at/drop:          %8.3fs" % per_sim)
+    print("Scenario matrix draw:                 %8.3fs" % draw)
+    print("  + masked frames per scenario:       %8.3fs (%.0fx faster)" % (frames_elapsed, per_sim / frames_elapsed))
+    print("  + context rosters for every sim:    %8.3fs" % rosters_elapsed)
+
+
+def build_synthetic_season(season, week, plays_per_game=130, seed=0):
+    """PBP for the previous season and this season before `week`, plus this season's schedule."""
+    rng = np.random.default_rng(seed)
+    teams = ["T%02d" % i for i in range(32)]
+    games = []
+    for game_season, weeks in [(season - 1, range(1, 18)), (season, range(1, 19))]:
+        for game_week in weeks:
+            order = rng.permutation(32)
+            for i in range(16):
+                home, away = teams[order[2 * i]], teams[order[2 * i + 1]]
+                games.append((game_season, game_week, home, away))
+    schedule = pd.DataFrame(
+        [g for g in games if g[0] == season], columns=["season", "week", "home_team", "away_team"]
+    )
+    schedule["game_id"] = ["%d_%02d_%s_%s" % (s, w, a, h) for s, w, h, a in schedule.itertuples(index=False)]
+    schedule["gameday"] = "%d-09-08" % season
+
+    played = [g for g in games if g[0] == season - 1 or g[1] < week]
+    n = len(played) * plays_per_game
+    game_rows = np.repeat(np.arange(len(played)), plays_per_game)
+    posteam_home = rng.random(n) < 0.5
+    frame = pd.DataFrame(played, columns=["season", "week", "home_team", "away_team"]).iloc[game_rows]
+    data = pd.DataFrame({
+        "season": frame.season.to_numpy(),
+        "week": frame.week.to_numpy(),
+        "game_id": np.repeat(["g%d" % i for i in range(len(played))], plays_per_game),
+        "play_id": np.tile(np.arange(plays_per_game), len(played)),
+        "posteam": np.where(posteam_home, frame.home_team, frame.away_team),
+        "defteam": np.where(posteam_home, frame.away_team, frame.home_team),
+        "yards_gained": rng.normal(5, 8, n),
+    })
+    data["receiver_player_id"] = data.posteam + "_WR" + rng.integers(0, 5, n).astype(str)
+    return data, schedule
+
+
+def _synthetic_stats(teams, estimators):
+    """Stand-ins for teams.calculate / players.calculate that run `estimators` EWMA passes."""
+    player_frames, team_frames = [], []
+    for i in range(0, len(teams), 2):
+        player_stats, team_stats = build_synthetic_matchup(seed=i)
+        names = {HOME: teams[i], AWAY: teams[i + 1]}
+        player_stats["player_id"] = player_stats.player_id.replace(names, regex=True)
+        player_stats["team"] = player_stats.team.map(names)
+        team_stats["team"] = team_stats.team.map(names)
+        player_frames.append(player_stats)
+        team_frames.append(team_stats)
+    player_stats, team_stats = pd.concat(player_frames, ignore_index=True), pd.concat(team_frames, ignore_index=True)
+    team_stats["offense_sacks_per_dropback"] = team_stats["defense_sacks_per_dropback"] = 0.065
+    player_stats["redzone_target_share_est"] = player_stats.target_share_est
+    for column in ["targets", "relative_yac", "carry_percentage", "carries", "relative_ypc", "yards_per_scramble_est", "snap_share_est"]:
+        player_stats[column] = 0.0
+
+    def run_estimators(data, group_col, count):
+        priors = pd.DataFrame({group_col: data[group_col].unique(), "yards_gained": 5.0})
+        for _ in range(count):
+            _compute_estimator_vectorized(data, group_col, "yards_gained", 150, priors, "est")
+
+    def teams_calculate(data, season):
+        run_estimators(data, "posteam", estimators // 3)
+        return team_stats.copy()
+
+    def players_calculate(data, snap_counts, team_stats, season, week):
+        run_estimators(data, "receiver_player_id", estimators - estimators // 3)
+        return player_stats.copy()
+
+    return teams_calculate, players_calculate
+
+
+def bench_ros(args):
+    """Rest-of-season week preparation: per-week stats and schedule loads versus the stats cache."""
+    from main import week_games
+
+    data, schedule = build_synthetic_season(args.season, args.week, args.plays)
+    snap_data = pd.DataFrame({"season": [], "week": [], "pfr_player_id": []})
+    teams_calculate, players_calculate = _synthetic_stats(sorted(set(schedule.home_team)), args.estimators)
+
+    def load_schedule(years):
+        time.sleep(args.schedule_seconds)
+        return schedule.copy()
+
+    weeks = range(args.week, 19)
+    results = {}
+    with (patch("stats.teams.calculate", side_effect=teams_calculate) as teams_calc,
+          patch("stats.players.calculate", side_effect=players_calculate),
+          patch("data.nfl_client.import_schedules", side_effect=load_schedule),
+          patch("data.nfl_client.import_depth_charts", return_value=pd.DataFrame({"position": []})),
+          patch("stats.injuries.get_injury_data", return_value=None)):
+        print("%d plays, weeks %d-18 of %d, %d estimators per stats pass" % (len(data), args.week, args.season, args.estimators))
+        print("%-12s %10s %12s %14s" % ("Mode", "wall s", "s/week", "stats passes"))
+        for cached in [False, True]:
+            config = AppConfig()
+            config.runtime.n_simulations = 1
+            config.runtime.cache_week_stats = cached
+            stats_cache.clear()
+            teams_calc.reset_mock()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                games = [list(week_games(data, snap_data, args.season, week, config)) for week in weeks]
+            elapsed = time.perf_counter() - start
+            results[cached] = games
+            print("%-12s %10.2f %12.3f %14d" % ("cached" if cached else "per week", elapsed, elapsed / len(weeks), teams_calc.call_count))
+    stats_cache.clear()
+    for uncached, cached in zip(results[False], results[True]):
+        for a, b in zip(uncached, cached):
+            pd.testing.assert_frame_equal(a[2], b[2])
+            pd.testing.assert_frame_equal(a[3], b[3])
+    print("Game inputs match")
+
+
+def _frame_week(games):
+    # The per-game to_frame / concat / five quantile calls that SimulationResults replaced.
+    frame = pd.concat([players.to_frame(points) for players, points in games]).reset_index()
+    frame = frame.assign(mean=frame.mean(axis=1, numeric_only=True), percentile_90=frame.quantile(0.9, axis=1, numeric_only=True))
+    sims = frame.drop(columns=["index", "mean", "percentile_90"]).fillna(0)
+    return frame.assign(**{"q%d" % i: sims.quantile(q, axis=1) for i, q in enumerate(STAT_QUANTILES)})
+
+
+def bench_results(args):
+    """Time and peak memory of a week's result matrix and percentiles: per-game frames versus SimulationResults."""
+    from main import _weekly_projection
+
+    models = build_synthetic_models()
+    player_stats, team_stats = build_synthetic_matchup()
+    context = MatchupContext(models, HOME, AWAY, player_stats, team_stats, ScoringSettings())
+    seeds = [sim_seed(2024, 1, 0, sim) for sim in range(args.games)]
+    played = np.vstack([_simulate(context, seed) for seed in seeds])
+    # Every matchup cycles through the same handful of real games.
+    points = played[np.arange(args.simulations) % args.games]
+    print("%d matchups x %d simulations" % (args.matchups, args.simulations))
+
+    def frames():
+        return _frame_week([(context.players, points) for _ in range(args.matchups)])
+
+    def matrix():
+        results = SimulationResults()
+        for game in range(args.matchups):
+            results.add_game(game, context.players, points)
+        frame = _weekly_projection(results.frame(), 1)
+        quantiles = np.quantile(frame[list(range(args.simulations))].to_numpy(), STAT_QUANTILES, axis=1)
+        return frame.assign(**{"q%d" % i: values for i, values in enumerate(quantiles)})
+
+    print("%-24s %10s %14s" % ("results", "seconds", "peak MiB"))
+    outputs = []
+    for label, fn in [("per-game frames", frames), ("SimulationResults", matrix)]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        outputs.append(fn())
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("%-24s %10.2f %14.1f" % (label, elapsed, peak / 2 ** 20))
+    before, after = outputs
+    columns = ["mean", "percentile_90"] + ["q%d" % i for i in range(len(STAT_QUANTILES))]
+    np.testing.assert_allclose(after[columns].to_numpy(), before[columns].to_numpy(), rtol=1e-5, atol=1e-4)
+    print("Percentiles match (%d player rows)" % len(after))
+
+
+def bench_sketch(args):
+    """Time, peak memory and accuracy of a ROS run's weekly projections: every simulation versus quantile sketches."""
+    from main import _weekly_projection
+
+    models = build_synthetic_models()
+    player_stats, team_stats = build_synthetic_matchup()
+    context = MatchupContext(models, HOME, AWAY, player_stats, team_stats, ScoringSettings())
+    played = np.vstack([_simulate(context, sim_seed(2024, 1, 0, sim)) for sim in range(args.games)])
+    rng = np.random.default_rng(0)
+    print("%d weeks x %d matchups x %d simulations, compression %d" % (
+        args.weeks, args.matchups, args.simulations, args.compression))
+
+    def week_points(week):
+        # A different shuffle of the played games for every matchup and week.
+        return played[rng.integers(0, args.games, args.simulations)]
+
+    def ros(results_for_week):
+        all_weeks = []
+        for week in range(args.weeks):
+            results = results_for_week()
+            for game in range(args.matchups):
+                results.add_game((week, game), context.players, week_points(week))
+            projection = results if isinstance(results, SketchResults) else results.frame()
+            all_weeks.append(_weekly_projection(projection, week))
+        return all_weeks
+
+    def summarize(frame):
+        # The percentiles compute_stats_and_export takes from every simulation.
+        sims = frame[[column for column in frame.columns if isinstance(column, (int, np.integer))]].to_numpy()
+        quantiles = np.quantile(sims, list(SUMMARY_PERCENTILES.values()), axis=1)
+        return frame.assign(**dict(zip(SUMMARY_PERCENTILES, quantiles)))
+
+    print("%-24s %10s %14s" % ("results", "seconds", "peak MiB"))
+    outputs = []
+    for label, fn in [("every simulation", lambda: ros(SimulationResults)),
+                      ("quantile sketches", lambda: ros(lambda: SketchResults(args.compression)))]:
+        rng = np.random.default_rng(0)
+        tracemalloc.start()
+        start = time.perf_counter()
+        outputs.append(fn())
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("%-24s %10.2f %14.1f" % (label, elapsed, peak / 2 ** 20))
+
+    columns = ["mean", "percentile_90"] + list(SUMMARY_PERCENTILES)
+    exact = pd.concat([summarize(frame)[columns] for frame in outputs[0]]).to_numpy()
+    sketched = pd.concat([frame[columns] for frame in outputs[1]]).to_numpy()
+    error = np.abs(sketched - exact)
+    print("Max abs error %.3f points, mean %.4f (%d player-weeks)" % (error.max(), error.mean(), len(exact)))
+
+
+def _write_position_csvs(projections, base_dir):
+    # The summary/all/position CSV writes that write_csv_views replaced.
+    projections.to_csv(os.path.join(base_dir, "summary.csv"))
+    projections.to_csv(os.path.join(base_dir, "all.csv"))
+    for position in ["QB", "RB", "WR", "TE"]:
+        projections.loc[projections.position == position].to_csv(os.path.join(base_dir, "%s.csv" % position.lower()))
+    projections.loc[projections.position.isin(["RB", "WR", "TE"])].to_csv(os.path.join(base_dir, "flex.csv"))
+    projections.loc[projections.position == "K"].to_csv(os.path.join(base_dir, "k.csv"))
+
+
+def _dir_bytes(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def bench_export(args):
+    """Write time and bytes on disk of a week's projection files: CSVs versus a partitioned Parquet dataset."""
+    rng = np.random.default_rng(0)
+    positions = rng.choice(["QB", "RB", "WR", "TE", "K", None], args.players, p=[0.1, 0.2, 0.3, 0.15, 0.1, 0.15])
+    simulations = rng.gamma(2.0, 5.0, (args.players, args.simulations)).astype(np.float32)
+    quantiles = np.quantile(simulations, STAT_QUANTILES, axis=1)
+    projections = pd.DataFrame({
+        "player_id": ["00-%07d" % i for i in range(args.players)],
+        "player_name": ["Player %d" % i for i in range(args.players)],
+        "team": rng.choice(["KC", "DET", "BUF", "MIA"], args.players),
+        "position": positions,
+        "percentile_12": quantiles[0],
+        "percentile_25": quantiles[1],
+        "median": quantiles[2],
+        "percentile_75": quantiles[3],
+        "percentile_88": quantiles[4],
+    }).sort_values("median", ascending=False)
+    simulations = simulations[projections.index.to_numpy()]
+    print("%d players x %d simulations" % (args.players, args.simulations))
+
+    def sims_csv(base_dir):
+        _write_position_csvs(projections, base_dir)
+        pd.DataFrame(simulations, index=projections.player_id).to_csv(os.path.join(base_dir, "simulations.csv"))
+
+    modes = [
+        ("position CSVs", lambda base_dir: _write_position_csvs(projections, base_dir)),
+        ("CSV views", lambda base_dir: write_csv_views(projections, base_dir)),
+        ("Parquet dataset", lambda base_dir: write_projection_dataset(projections, base_dir)),
+        ("CSVs + sims CSV", sims_csv),
+        ("Parquet + sims", lambda base_dir: write_projection_dataset(projections, base_dir, simulations)),
+    ]
+    print("%-20s %10s %12s" % ("Output", "seconds", "KiB"))
+    for label, write in modes:
+        with tempfile.TemporaryDirectory() as base_dir:
+            start = time.perf_counter()
+            write(base_dir)
+            elapsed = time.perf_counter() - start
+            print("%-20s %10.3f %12.0f" % (label, elapsed, _dir_bytes(base_dir) / 1024))
+
+
+def build_synthetic_reference(season, players=24000, roster=3000, seed=0):
+    """Polars rosters, player ids and depth charts about the size of nflverse's tables."""
+    import polars as pl
+
+    rng = np.random.default_rng(seed)
+    positions = rng.choice(["QB", "RB", "WR", "TE", "K", "OL", "DL"], players)
+    extra = {"col_%d" % i: rng.random(players) for i in range(24)}
+    ids = pl.DataFrame({
+        "gsis_id": ["00-%07d" % i for i in range(players)],
+        "pfr_id": ["Pfr%05d" % i for i in range(players)],
+        "mfl_id": np.arange(players),
+        "display_name": ["Player %d" % i for i in range(players)],
+        "latest_team": rng.choice(["KC", "DET", "BUF", "MIA"], players),
+        "position": positions,
+        **extra,
+    })
+    rows = rng.choice(players, roster, replace=False)
+    rosters = pl.DataFrame({
+        "season": np.full(roster, season),
+        "gsis_id": ["00-%07d" % i for i in rows],
+        "full_name": ["Player %d" % i for i in rows],
+        "position": positions[rows],
+        "team": rng.choice(["KC", "DET", "BUF", "MIA"], roster),
+        **{name: values[rows] for name, values in extra.items()},
+    })
+    depth_charts = pl.DataFrame({
+        "week": np.repeat(np.arange(1, 19), roster),
+        "gsis_id": ["00-%07d" % i for i in np.tile(rows, 18)],
+        "position": np.tile(positions[rows], 18),
+        "depth_team": rng.integers(1, 4, 18 * roster).astype(str),
+    })
+    return rosters, ids, depth_charts
+
+
+def _uncached_lookups(season, week):
+    """The reference lookups of one ROS week before the registry: each loads and converts its table."""
+    roster = nfl_client._load_rosters([season])
+    roster[["player_id", "position", "player_name", "team"]].drop_duplicates(subset="player_id")
+    depth_charts = nfl_client.to_pandas(nfl_client.nfl.load_depth_charts([season]))
+    depth_charts.loc[depth_charts.week == week]
+    ids = nfl_client._load_players()[["gsis_id", "pfr_id"]]
+    ids.dropna(subset=["pfr_id", "gsis_id"])
+    nfl_client._load_rosters([season])[["player_id", "position", "team"]]
+    nfl_client._load_rosters([season])[["player_id", "position", "player_name", "team"]]
+
+
+def _registry_lookups(season, week):
+    """The same lookups through the reference-data registry."""
+    nfl_client.season_roster(season).reset_index()
+    nfl_client.depth_chart(season, week).copy()
+    nfl_client.gsis_ids("pfr_id").reset_index()
+    nfl_client.season_roster(season)[["position", "team"]].reset_index()
+    nfl_client.season_roster(season).reset_index()
+
+
+def bench_reference(args):
+    """Reference-table lookups of a ROS run, loading each table per call vs the registry, and cold starts."""
+    season = 2023
+    rosters, ids, depth_charts = build_synthetic_reference(season)
+    print("%d roster rows, %d players, %d depth chart rows, %d weeks, %.2fs per download" % (
+        len(rosters), len(ids), len(depth_charts), args.weeks, args.latency))
+
+    def download(table):
+        def load(*_):
+            time.sleep(args.latency)
+            return table
+        return load
+
+    with (tempfile.TemporaryDirectory() as snapshots,
+          patch.object(nfl_client, "SNAPSHOT_DIR", snapshots),
+          patch("nflreadpy.load_rosters", side_effect=download(rosters)),
+          patch("nflreadpy.load_players", side_effect=download(ids)),
+          patch("nflreadpy.load_depth_charts", side_effect=download(depth_charts)),
+          patch("nflreadpy.get_current_season", return_value=season + 1)):
+        print("%-24s %10s" % ("Lookups", "seconds"))
+        modes = [("load per call", _uncached_lookups), ("registry", _registry_lookups)]
+        for label, lookups in modes:
+            nfl_client.clear()
+            start = time.perf_counter()
+            for week in range(1, args.weeks + 1):
+                lookups(season, week)
+            print("%-24s %10.3f" % (label, time.perf_counter() - start))
+
+        # Cold starts: a new process without and then with snapshots on disk.
+        for name in os.listdir(snapshots):
+            os.remove(os.path.join(snapshots, name))
+        for label in ["cold, no snapshot", "cold, from snapshot"]:
+            nfl_client.clear()
+            start = time.perf_counter()
+            _registry_lookups(season, 1)
+            print("%-24s %10.3f" % (label, time.perf_counter() - start))
+
+
+def build_synthetic_pbp(season, plays=49000, columns=372, seed=0):
+    """A polars season of plays about as wide as nflverse's: mostly float columns, some ids and text."""
+    import polars as pl
+
+    rng = np.random.default_rng(seed)
+    data = {
+        "season": np.full(plays, season),
+        "week": rng.integers(1, 19, plays),
+        "game_id": ["%d_%02d_G%03d" % (season, w, g) for w, g in zip(rng.integers(1, 19, plays), rng.integers(0, 16, plays))],
+        "play_id": np.arange(plays),
+        "posteam": rng.choice(["T%02d" % i for i in range(32)], plays),
+    }
+    ids = ["00-%07d" % i for i in range(2000)]
+    for i in range(columns // 10):
+        data["player_id_%d" % i] = np.where(rng.random(plays) < 0.3, rng.choice(ids, plays), None).tolist()
+    data["desc"] = ["(%d:00) Play %d description text" % (i % 15, i) for i in range(plays)]
+    for i in range(columns - len(data)):
+        values = rng.normal(0, 10, plays)
+        values[rng.random(plays) < 0.2] = np.nan
+        data["stat_%d" % i] = values
+    return pl.DataFrame(data, nan_to_null=True)
+
+
+def bench_pbp(args):
+    """Cold load of one season: the legacy CSV, a polars->pandas conversion as after a download, and the Parquet store."""
+    import polars as pl
+
+    season = 2023
+    plays = build_synthetic_pbp(season, args.plays, args.columns)
+    print("%d plays x %d columns" % (plays.height, plays.width))
+    with tempfile.TemporaryDirectory() as root, patch.object(pbp_store, "STORE_DIR", os.path.join(root, "store")):
+        csv_path = os.path.join(root, "pbp_%d.csv.gz" % season)
+        nfl_client.to_pandas(plays).to_csv(csv_path, index=False, compression="gzip")
+        pbp_store.refresh([season], lambda _: plays)
+        parquet_path = pbp_store.season_path(season)
+
+        # (label, load, file read); the conversion starts from plays already in memory.
+        modes = [
+            ("legacy CSV", lambda: pd.read_csv(csv_path, compression="gzip", low_memory=False), csv_path),
+            ("polars -> pandas", lambda: nfl_client.to_pandas(plays), None),
+            ("store (polars)", lambda: pl.read_parquet(parquet_path), parquet_path),
+            ("store (pandas)", lambda: pbp_store.load([season]), parquet_path),
+        ]
+        print("%-20s %10s %12s" % ("Load", "seconds", "MiB on disk"))
+        for label, load, path in modes:
+            start = time.perf_counter()
+            load()
+            elapsed = time.perf_counter() - start
+            size = "%.1f" % (os.path.getsize(path) / 2 ** 20) if path else "-"
+            print("%-20s %10.3f %12s" % (label, elapsed, size))
+
+
+# PBP_COLUMNS that hold text other than team or player ids, with values to draw from.
+_PBP_TEXT = {
+    "season_type": ["REG"],
+    "play_type": ["pass", "run", "field_goal", "punt", "kickoff", "extra_point", "no_play"],
+    "penalty_type": [None, "Holding", "Offensive Pass Interference"],
+    "run_gap": [None, "end", "guard", "tackle"],
+    "field_goal_result": [None, "made", "missed"],
+    "extra_point_result": [None, "good", "failed"],
+    "two_point_conv_result": [None, "success", "failure"],
+}
+
+
+def build_synthetic_main_pbp(season, plays=49000, columns=372, seed=0):
+    """build_synthetic_pbp with the columns main reads (PBP_COLUMNS) among its `columns`."""
+    import polars as pl
+
+    rng = np.random.default_rng(seed)
+    base = build_synthetic_pbp(season, plays, columns - len(PBP_COLUMNS) - 2, seed)
+    ids = ["00-%07d" % i for i in range(2000)]
+    data = {}
+    for column in PBP_COLUMNS + ["season_type"]:
+        if column in base.columns:
+            continue
+        if column in _PBP_TEXT:
+            data[column] = rng.choice(np.array(_PBP_TEXT[column], dtype=object), plays).tolist()
+        elif loader._is_id_column(column) or column.endswith("_name"):
+            data[column] = np.where(rng.random(plays) < 0.5, rng.choice(ids, plays), None).tolist()
+        else:
+            # Mostly whole-number stats and flags, as in nflverse's float64 columns.
+            values = rng.integers(0, 2 if rng.random() < 0.5 else 60, plays).astype(float)
+            values[rng.random(plays) < 0.05] = np.nan
+            data[column] = values
+    return base.with_columns(**{column: pl.Series(values, nan_to_null=True) for column, values in data.items()})
+
+
+def _pbpload_worker(store_dir, rosters, seasons, kwargs, results):
+    with (patch.object(pbp_store, "STORE_DIR", store_dir),
+          patch("data.nfl_client.import_seasonal_rosters", return_value=rosters),
+          patch("nflreadpy.get_current_season", return_value=2024)):
+        start_kib = _proc_kib("/proc/self/status", "VmRSS")
+        start = time.perf_counter()
+        data = loader.load_data(seasons, **kwargs)
+        elapsed = time.perf_counter() - start
+    results.put((elapsed, _proc_kib("/proc/self/status", "VmHWM") - start_kib, data.memory_usage(deep=True).sum(), data.shape[1]))
+
+
+def bench_pbpload(args):
+    """load_data with every column, main's PBP_COLUMNS, and those downcast: time, peak RSS and frame size."""
+    with tempfile.TemporaryDirectory() as root, patch.object(pbp_store, "STORE_DIR", root):
+        max_seasons = max(args.seasons)
+        seasons = list(range(2023 - max_seasons + 1, 2024))
+        pbp_store.refresh(seasons, lambda season: build_synthetic_main_pbp(season, args.plays, args.columns, season))
+        rosters = pd.DataFrame({
+            "player_id": ["00-%07d" % i for i in range(2000)] * max_seasons,
+            "position": np.resize(["QB", "RB", "WR", "TE"], 2000 * max_seasons),
+            "season": np.repeat(seasons, 2000),
+        })
+        modes = [
+            ("all columns", {}),
+            ("PBP_COLUMNS", {"columns": PBP_COLUMNS}),
+            ("+ downcast", {"columns": PBP_COLUMNS, "downcast": True}),
+            ("+ categorical ids", {"columns": PBP_COLUMNS, "downcast": True, "categorical_ids": True}),
+        ]
+        # Each load runs in a fresh process, so its peak RSS isn't hidden by an earlier
+        # one's. Spawned rather than forked: polars' thread pool doesn't survive a fork.
+        context = multiprocessing.get_context("spawn")
+        print("%-8s %-18s %8s %10s %16s %14s" % ("Seasons", "Load", "columns", "seconds", "peak RSS MiB", "frame MiB"))
+        for count in args.seasons:
+            for label, kwargs in modes:
+                results = context.Queue()
+                worker = context.Process(target=_pbpload_worker, args=(root, rosters, seasons[-count:], kwargs, results))
+                worker.start()
+                elapsed, peak_kib, frame_bytes, width = results.get()
+                worker.join()
+                print("%-8d %-18s %8d %10.3f %16.1f %14.1f" % (
+                    count, label, width, elapsed, peak_kib / 2 ** 10, frame_bytes / 2 ** 20), flush=True)
+
+
+def _week_stats_worker(store_dir, rosters, seasons, week, lazy, results):
+    from main import history_plays
+
+    with (patch.object(pbp_store, "STORE_DIR", store_dir),
+          patch("data.nfl_client.import_seasonal_rosters", return_value=rosters),
+          patch("nflreadpy.get_current_season", return_value=2024)):
+        start_kib = _proc_kib("/proc/self/status", "VmRSS")
+        start = time.perf_counter()
+        data = loader.PbpScan(seasons, PBP_COLUMNS) if lazy else loader.load_data(seasons, PBP_COLUMNS)
+        loaded = time.perf_counter()
+        season_data = history_plays(data, seasons[-1], week)
+        team_stats = teams.calculate(season_data, seasons[-1])
+        done = time.perf_counter()
+    results.put((loaded - start, done - loaded, _proc_kib("/proc/self/status", "VmHWM") - start_kib, len(season_data), team_stats))
+
+
+def bench_lazy_pbp(args):
+    """One week's team stats from pandas PBP of every season versus a lazy scan of just that week's plays."""
+    with tempfile.TemporaryDirectory() as root, patch.object(pbp_store, "STORE_DIR", root):
+        seasons = list(range(2023 - args.seasons + 1, 2024))
+        pbp_store.refresh(seasons, lambda season: build_synthetic_main_pbp(season, args.plays, args.columns, season))
+        rosters = pd.DataFrame({
+            "player_id": ["00-%07d" % i for i in range(2000)] * args.seasons,
+            "position": np.resize(["QB", "RB", "WR", "TE"], 2000 * args.seasons),
+            "season": np.repeat(seasons, 2000),
+        })
+        # Spawned for a clean peak RSS per path, as in bench_pbpload.
+        context = multiprocessing.get_context("spawn")
+        print("%d seasons x %d plays, stats for %d week %d" % (args.seasons, args.plays, seasons[-1], args.week))
+        print("%-8s %10s %12s %12s %16s %10s" % ("Path", "load s", "stats s", "total s", "peak RSS MiB", "plays"))
+        team_stats = {}
+        for lazy in [False, True]:
+            results = context.Queue()
+            worker = context.Process(target=_week_stats_worker, args=(root, rosters, seasons, args.week, lazy, results))
+            worker.start()
+            load_seconds, stats_seconds, peak_kib, plays, team_stats[lazy] = results.get()
+            worker.join()
+            print("%-8s %10.3f %12.3f %12.3f %16.1f %10d" % (
+                "lazy" if lazy else "pandas", load_seconds, stats_seconds, load_seconds + stats_seconds, peak_kib / 2 ** 10, plays))
+    pd.testing.assert_frame_equal(team_stats[False], team_stats[True])
+    print("Team stats match")
+
+
+def bench_actuals(args):
+    """Actual fantasy points of every week: calculate_fantasy_leaders per week vs one fantasy_leaders_by_week call."""
+    from main import calculate_fantasy_leaders, fantasy_leaders_by_week
+
+    seasons = list(range(2023 - args.seasons + 1, 2024))
+    data = pd.concat(
+        [nfl_client.to_pandas(build_synthetic_main_pbp(season, args.plays, len(PBP_COLUMNS) + 10, season)) for season in seasons],
+        ignore_index=True,
+    )
+    # Final scores are never missing (points_from_score raises on NaN).
+    data[["total_home_score", "total_away_score"]] = data[["total_home_score", "total_away_score"]].fillna(0)
+    slices = [(season, week) for season in seasons for week in range(1, 19)]
+    config = AppConfig()
+    print("%d plays, %d weeks" % (len(data), len(slices)))
+    print("%-24s %10s %12s" % ("Scorer", "seconds", "ms/week"))
+    start = time.perf_counter()
+    loop = {(season, week): calculate_fantasy_leaders(data, season, week, config) for season, week in slices}
+    elapsed = time.perf_counter() - start
+    print("%-24s %10.3f %12.2f" % ("score_from_play loop", elapsed, 1000 * elapsed / len(slices)))
+    start = time.perf_counter()
+    columnar = fantasy_leaders_by_week(data, slices, config)
+    elapsed = time.perf_counter() - start
+    print("%-24s %10.3f %12.2f" % ("fantasy_points", elapsed, 1000 * elapsed / len(slices)))
+    # Compared by player: the loop also gives a missing (synthetic) home or away team a
+    # row before dropping it, which can reorder players tied on points.
+    for key, leaders in loop.items():
+        pd.testing.assert_frame_equal(
+            columnar[key].sort_values("player_id", ignore_index=True), leaders.sort_values("player_id", ignore_index=True),
+            check_exact=True,
+        )
+    print("Points match exactly")
+
+
+def bench_estimators(args):
+    """A week of new plays: every tracked estimator recomputed over the history vs EstimatorState.update."""
+    seasons = list(range(2023 - args.seasons + 1, 2024))
+    data = pd.concat(
+        [nfl_client.to_pandas(build_synthetic_main_pbp(season, args.plays, len(PBP_COLUMNS) + 10, season)) for season in seasons],
+        ignore_index=True,
+    ).sort_values(["season", "week"], kind="mergesort")
+    rng = np.random.default_rng(0)
+    data["position_receiver"] = rng.choice(np.array(["WR", "RB", "TE", None], dtype=object), len(data))
+    new_week = (data.season == seasons[-1]) & (data.week == args.week)
+    history = data.loc[(data.season < seasons[-1]) | (data.week < args.week)]
+    state = EstimatorState()
+    start = time.perf_counter()
+    state.seed(history)
+    seed_elapsed = time.perf_counter() - start
+    print("%d plays of history, %d new plays, %d estimators" % (len(history), new_week.sum(), len(state.estimators)))
+    print("%-32s %10s" % ("Mode", "seconds"))
+    print("%-32s %10.3f" % ("seed (once)", seed_elapsed))
+
+    # What calculate computes: each builder's target over the plays sorted by week, with
+    # its prior and mask from them.
+    seen = data.loc[(data.season < seasons[-1]) | (data.week <= args.week)].sort_values("week", kind="mergesort")
+    start = time.perf_counter()
+    full = {}
+    for name, estimator in state.estimators.items():
+        rows = estimator.plays(seen)
+        full[name] = _compute_estimators_vectorized(rows, estimator.group_col, [estimator.target(rows)])
+    print("%-32s %10.3f" % ("full recompute", time.perf_counter() - start))
+    start = time.perf_counter()
+    state.update(data.loc[new_week])
+    print("%-32s %10.3f" % ("incremental update", time.perf_counter() - start))
+    start = time.perf_counter()
+    estimates = {name: state.table(estimator.group_col, [name]) for name, estimator in state.estimators.items()}
+    print("%-32s %10.3f" % ("estimates (priors from plays)", time.perf_counter() - start))
+    for name in state.estimators:
+        pd.testing.assert_frame_equal(estimates[name], full[name], check_dtype=False, rtol=1e-9)
+    print("Estimates match to rtol 1e-9")
+
+
+def bench_ewma(args):
+    """teams.calculate and players.calculate's play-level estimators: one _compute_estimator_vectorized call each vs one _compute_estimators_vectorized call per id column."""
+    seasons = list(range(2023 - args.seasons + 1, 2024))
+    data = pd.concat(
+        [nfl_client.to_pandas(build_synthetic_main_pbp(season, args.plays, len(PBP_COLUMNS) + 10, season)) for season in seasons],
+        ignore_index=True,
+    ).sort_values("week")
+    rng = np.random.default_rng(0)
+    data["defteam"] = rng.choice(["T%02d" % i for i in range(32)], len(data))
+    data["down"] = rng.integers(1, 5, len(data))
+    data["position_receiver"] = rng.choice(np.array(["WR", "RB", "TE", None], dtype=object), len(data))
+    data = data.assign(
+        go_for_it=data.play_type.isin(["pass", "run"]).astype(int),
+        deep_target=(data.air_yards >= 30).astype(float),
+        big_carry=(data.rushing_yards >= 10).astype(float),
+    )
+    groups = {
+        "posteam": [teams.offense_poe_target, teams.offense_sack_rate_target, teams.offense_go_for_it_rate_target],
+        "defteam": [
+            teams.defense_poe_target, teams.defense_yac_target, teams.defense_cpoe_target,
+            teams.defense_ypc_target, teams.defense_int_rate_target, teams.defense_sack_rate_target,
+        ],
+        "receiver_player_id": [players.air_yards_target, players.yac_target, players.receiver_cpoe_target, players.deep_target_rate_target],
+        "rusher_player_id": [players.ypc_target, players.ypc_middle_target, players.big_carry_rate_target],
+        "passer_player_id": [players.cpoe_target],
+        "passer_id": [players.scramble_rate_target, players.yards_per_scramble_target],
+    }
+    targets = {group_col: [target(data) for target in builders] for group_col, builders in groups.items()}
+    print("%d plays, %d estimators over %d id columns" % (len(data), sum(map(len, targets.values())), len(targets)))
+    print("%-32s %10s" % ("Mode", "seconds"))
+
+    start = time.perf_counter()
+    single = {}
+    for group_col, group_targets in targets.items():
+        for target in group_targets:
+            rows = data if target.mask is None else data.loc[target.mask]
+            priors = rows[[group_col]].drop_duplicates()
+            priors[target.target_col] = priors[group_col].map(target.prior) if isinstance(target.prior, pd.Series) else target.prior
+            single[target.result_col_name] = _compute_estimator_vectorized(
+                rows, group_col, target.target_col, target.span, priors, target.result_col_name
+            )
+    print("%-32s %10.3f" % ("one call per estimator", time.perf_counter() - start))
+    start = time.perf_counter()
+    wide = {group_col: _compute_estimators_vectorized(data, group_col, group_targets) for group_col, group_targets in targets.items()}
+    print("%-32s %10.3f" % ("one call per id column", time.perf_counter() - start))
+
+    for group_col, group_targets in targets.items():
+        for target in group_targets:
+            expected = single[target.result_col_name].reset_index(drop=True)
+            estimates = wide[group_col].loc[wide[group_col][group_col].isin(expected[group_col]), [group_col, target.result_col_name]]
+            pd.testing.assert_frame_equal(estimates.reset_index(drop=True), expected, check_exact=True)
+    print("Estimates match exactly")
+
+
+BENCHMARKS = {
+    "engine": bench_engine,
+    "tables": bench_tables,
+    "trees": bench_trees,
+    "scheduler": bench_scheduler,
+    "context": bench_context,
+    "sampling": bench_sampling,
+    "rng": bench_rng,
+    "players": bench_players,
+    "statlines": bench_stat_lines,
+    "profiles": bench_profiles,
+    "pool": bench_pool,
+    "buffers": bench_buffers,
+    "slate": bench_slate,
+    "scenarios": bench_scenarios,
+    "ros": bench_ros,
+    "results": bench_results,
+    "sketch": bench_sketch,
+    "export": bench_export,
+    "reference": bench_reference,
+    "pbp": bench_pbp,
+    "pbpload": bench_pbpload,
+    "lazypbp": bench_lazy_pbp,
+    "actuals": bench_actuals,
+    "estimators": bench_estimators,
+    "ewma": bench_ewma,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Simulation engine throughput benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    engine_parser = subparsers.add_parser("engine", help="Scalar vs batch engine games/sec")
+    engine_parser.add_argument("--simulations", type=int, default=1000, help="Games for the batch engine")
+    engine_parser.add_argument("--scalar-simulations", type=int, default=200, help="Games for the scalar engine")
+
+    tables_parser = subparsers.add_parser("tables", help="Probability lookup table accuracy and latency")
+    tables_parser.add_argument("--resolution", type=int, default=1, help="Grid refinement factor")
+    tables_parser.add_argument("--simulations", type=int, default=50, help="Scalar games per model variant")
+
+    trees_parser = subparsers.add_parser("trees", help="Compiled NumPy tree ensemble accuracy and latency")
+    trees_parser.add_argument("--simulations", type=int, default=50, help="Scalar games per model variant")
+
+    scheduler_parser = subparsers.add_parser("scheduler", help="play_game loop vs generator games with batched inference")
+    scheduler_parser.add_argument("--simulations", type=int, default=1000, help="Games for the scheduler")
+    scheduler_parser.add_argument("--scalar-simulations", type=int, default=200, help="Games for the play_game loop")
+    scheduler_parser.add_argument("--max-active", type=int, default=None, help="Maximum games in flight")
+
+    context_parser = subparsers.add_parser("context", help="GameState construction cost per simulation")
+    context_parser.add_argument("--simulations", type=int, default=1000, help="GameStates to construct")
+    context_parser.add_argument("--questionable", type=int, default=2, help="Questionable players (0-4)")
+
+    sampling_parser = subparsers.add_parser("sampling", help="Carrier/target selection draws per second")
+    sampling_parser.add_argument("--draws", type=int, default=200000, help="Draws per sampler")
+
+    rng_parser = subparsers.add_parser("rng", help="random module vs SimRandom draws per second")
+    rng_parser.add_argument("--draws", type=int, default=1000000, help="Draws per method")
+    rng_parser.add_argument("--simulations", type=int, default=20, help="Scalar games per RNG")
+
+    players_parser = subparsers.add_parser("players", help="Per-sim dicts vs points arrays for a week of results")
+    players_parser.add_argument("--simulations", type=int, default=10000, help="Simulations per matchup")
+    players_parser.add_argument("--matchups", type=int, default=16, help="Matchups in the week")
+    players_parser.add_argument("--games", type=int, default=20, help="Games actually played and reused")
+
+    stat_lines_parser = subparsers.add_parser("statlines", help="Stat-line recording overhead and quantile export")
+    stat_lines_parser.add_argument("--simulations", type=int, default=30, help="Scalar games per round")
+    stat_lines_parser.add_argument("--rounds", type=int, default=6, help="Timed rounds per mode (best is kept)")
+    stat_lines_parser.add_argument("--export-simulations", type=int, default=10000, help="Simulations in the exported tensor")
+
+    profiles_parser = subparsers.add_parser("profiles", help="Per-profile re-simulation vs stat-line scoring")
+    profiles_parser.add_argument("--simulations", type=int, default=30, help="Scalar games per profile")
+    profiles_parser.add_argument("--profiles", type=int, default=4, help="Scoring profiles to score")
+
+    pool_parser = subparsers.add_parser("pool", help="joblib per-sim tasks vs a persistent SimulationPool")
+    pool_parser.add_argument("--simulations", type=int, default=20, help="Simulations per game")
+    pool_parser.add_argument("--games", type=int, default=4, help="Games simulated")
+    pool_parser.add_argument("--workers", type=int, default=2, help="Worker processes")
+    pool_parser.add_argument("--rounds", type=int, default=20, help="Empty-task round trips timed")
+
+    buffers_parser = subparsers.add_parser("buffers", help="Per-worker sample buffer copies vs one shared block")
+    buffers_parser.add_argument("--workers", type=int, default=32, help="Worker processes holding the buffers")
+    buffers_parser.add_argument("--dtype", type=str, default="float32", help="Shared block dtype")
+
+    slate_parser = subparsers.add_parser("slate", help="Game-by-game pool calls vs one slate-wide queue")
+    slate_parser.add_argument("--weeks", type=int, default=4, help="Weeks in the slate")
+    slate_parser.add_argument("--games", type=int, default=4, help="Games per week")
+    slate_parser.add_argument("--simulations", type=int, default=4, help="Simulations per game")
+    slate_parser.add_argument("--workers", type=int, default=2, help="Worker processes")
+
+    scenarios_parser = subparsers.add_parser("scenarios", help="Per-sim injury scenario frames vs one scenario matrix")
+    scenarios_parser.add_argument("--simulations", type=int, default=2000, help="Simulations in the game")
+    scenarios_parser.add_argument("--questionable", type=int, default=4, help="Questionable players (0-4)")
+
+    ros_parser = subparsers.add_parser("ros", help="Per-week stats and schedule loads vs the stats cache in a ROS run")
+    ros_parser.add_argument("--season", type=int, default=2024, help="Season projected")
+    ros_parser.add_argument("--week", type=int, default=2, help="Current week (ROS covers it through week 18)")
+    ros_parser.add_argument("--plays", type=int, default=130, help="Plays per synthetic game")
+    ros_parser.add_argument("--estimators", type=int, default=30, help="EWMA estimator passes standing in for one stats calculation")
+    ros_parser.add_argument("--schedule-seconds", type=float, default=0.5, help="Stand-in latency of one schedule download")
+
+    results_parser = subparsers.add_parser("results", help="Per-game frames vs one float32 result matrix for a week")
+    results_parser.add_argument("--simulations", type=int, default=10000, help="Simulations per matchup")
+    results_parser.add_argument("--matchups", type=int, default=16, help="Matchups in the week")
+    results_parser.add_argument("--games", type=int, default=20, help="Distinct games played and cycled through")
+
+    sketch_parser = subparsers.add_parser("sketch", help="Raw simulations vs per-player quantile sketches over a ROS run")
+    sketch_parser.add_argument("--simulations", type=int, default=10000, help="Simulations per matchup")
+    sketch_parser.add_argument("--weeks", type=int, default=4, help="Weeks in the run")
+    sketch_parser.add_argument("--matchups", type=int, default=16, help="Matchups per week")
+    sketch_parser.add_argument("--games", type=int, default=100, help="Distinct games played and resampled")
+    sketch_parser.add_argument("--compression", type=int, default=200, help="Centroids per player")
+
+    export_parser = subparsers.add_parser("export", help="Position CSVs vs one partitioned Parquet dataset for a week")
+    export_parser.add_argument("--players", type=int, default=600, help="Players in the week")
+    export_parser.add_argument("--simulations", type=int, default=10000, help="Simulations per player")
+
+    reference_parser = subparsers.add_parser("reference", help="Reference tables loaded per call vs the memoized registry")
+    reference_parser.add_argument("--weeks", type=int, default=17, help="ROS weeks of lookups")
+    reference_parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every table download")
+
+    pbp_parser = subparsers.add_parser("pbp", help="Cold load of a season from the legacy CSV vs the Parquet store")
+    pbp_parser.add_argument("--plays", type=int, default=49000, help="Plays in the season")
+    pbp_parser.add_argument("--columns", type=int, default=372, help="Columns per play")
+
+    pbpload_parser = subparsers.add_parser("pbpload", help="load_data with all columns vs projected and downcast columns")
+    pbpload_parser.add_argument("--seasons", type=int, nargs="+", default=[1, 2, 4], help="Season counts to load")
+    pbpload_parser.add_argument("--plays", type=int, default=49000, help="Plays per season")
+    pbpload_parser.add_argument("--columns", type=int, default=372, help="Columns per play")
+
+    lazy_pbp_parser = subparsers.add_parser("lazypbp", help="One week's team stats from pandas PBP vs a lazy polars scan")
+    lazy_pbp_parser.add_argument("--seasons", type=int, default=4, help="Seasons in the store")
+    lazy_pbp_parser.add_argument("--week", type=int, default=10, help="Week of the last season to compute stats for")
+    lazy_pbp_parser.add_argument("--plays", type=int, default=49000, help="Plays per season")
+    lazy_pbp_parser.add_argument("--columns", type=int, default=372, help="Columns per play")
+
+    actuals_parser = subparsers.add_parser("actuals", help="Per-week score_from_play loop vs the columnar actual points scorer")
+    actuals_parser.add_argument("--seasons", type=int, default=2, help="Seasons of 18 weeks to score")
+    actuals_parser.add_argument("--plays", type=int, default=49000, help="Plays per season")
+
+    estimators_parser = subparsers.add_parser("estimators", help="Full EWMA estimator recompute vs an incremental weekly update")
+    estimators_parser.add_argument("--seasons", type=int, default=2, help="Seasons of history, the last one ending at --week")
+    estimators_parser.add_argument("--week", type=int, default=18, help="Week of the last season applied as new plays")
+    estimators_parser.add_argument("--plays", type=int, default=49000, help="Plays per season")
+
+    ewma_parser = subparsers.add_parser("ewma", help="Per-estimator EWMA calls vs the multi-target kernel")
+    ewma_parser.add_argument("--seasons", type=int, default=2, help="Seasons of plays")
+    ewma_parser.add_argument("--plays", type=int, default=49000, help="Plays per season")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    BENCHMARKS[args.command](args)
@@ -0,0 +1,72 @@
+import os
+import shutil
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+# Position CSVs written next to all.csv, and the positions each one holds.
+POSITION_VIEWS = {
+    "qb": ["QB"],
+    "rb": ["RB"],
+    "wr": ["WR"],
+    "te": ["TE"],
+    "flex": ["RB", "WR", "TE"],
+    "k": ["K"],
+}
+
+# Directory of the Parquet dataset inside a week (or ros) output directory.
+DATASET_DIR = "projections"
+
+# Partition of players without a roster position (e.g. team defenses). Readers can't
+# unify a null Hive partition with the others.
+UNKNOWN_POSITION = "NONE"
+
+
+def write_projection_dataset(projections: pd.DataFrame, base_dir: str, simulations: Optional[np.ndarray] = None) -> str:
+    """Writes a projection table as one Parquet dataset, partitioned by position.
+
+    All partitions are written in a single pass over the table
+    (`base_dir/projections/position=QB/...`). Players without a roster position go to
+    `position=NONE`. Read it back with `pd.read_parquet(path)`, or read one
+    position with `filters=[("position", "=", "QB")]`.
+
+    Args:
+        projections: One row per player, with a `position` column.
+        base_dir: Week (or ros) output directory.
+        simulations: Optional (players, sims) points aligned with the rows of
+            `projections`. They are stored as a fixed-size list<float32> column
+            `simulations`, one list per player.
+
+    Returns:
+        str: Path of the dataset directory.
+    """
+    # Imported here so CSV-only runs don't need a working pyarrow build.
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    projections = projections.assign(position=projections.position.fillna(UNKNOWN_POSITION))
+    table = pa.Table.from_pandas(projections, preserve_index=False)
+    if simulations is not None:
+        simulations = np.ascontiguousarray(simulations, dtype=np.float32)
+        values = pa.array(simulations.reshape(-1))
+        table = table.append_column("simulations", pa.FixedSizeListArray.from_arrays(values, simulations.shape[1]))
+    path = os.path.join(base_dir, DATASET_DIR)
+    ds.write_dataset(
+        table, path, format="parquet", partitioning=["position"], partitioning_flavor="hive",
+        existing_data_behavior="delete_matching",
+    )
+    return path
+
+
+def write_csv_views(projections: pd.DataFrame, base_dir: str, summary: bool = True):
+    """Writes all.csv, the position CSVs and (optionally) summary.csv from one table.
+
+    all.csv is serialized once and copied to summary.csv, and every position view is a
+    filter of the same table.
+    """
+    all_path = os.path.join(base_dir, "all.csv")
+    projections.to_csv(all_path)
+    if summary:
+        shutil.copyfile(all_path, os.path.join(base_dir, "summary.csv"))
+    for name, positions in POSITION_VIEWS.items():
+        projections.loc[projections.position.isin(positions)].to_csv(os.path.join(base_dir, "%s.csv" % name))
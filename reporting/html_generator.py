@@ -8,16 +8,17 @@ import seaborn as sns
 # Set style
 sns.set_theme(style="whitegrid")
 
-def generate_html_report(week, season, output_dir):
+def generate_html_report(week, season, output_dir, df=None):
     print(f"Generating HTML report for Season {season} Week {week}...")
     
-    # Load the summary CSV
-    summary_path = os.path.join(output_dir, "summary.csv")
-    if not os.path.exists(summary_path):
-        print("Summary CSV not found.")
-        return
+    # Load the summary CSV, unless the caller passed the summary frame
+    if df is None:
+        summary_path = os.path.join(output_dir, "summary.csv")
+        if not os.path.exists(summary_path):
+            print("Summary CSV not found.")
+            return
 
-    df = pd.read_csv(summary_path)
+        df = pd.read_csv(summary_path)
     
     # Create HTML content
     html_content = f"""
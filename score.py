@@ -1,8 +1,55 @@
 from collections import defaultdict
+from typing import Sequence
+import numpy as np
 import pandas as pd
+from enums import StatLine
 from settings import ScoringSettings
 from types import SimpleNamespace # Add this import
 
+# PBP columns score_from_play reads.
+PBP_COLUMNS = [
+    "defteam", "pass_touchdown", "rush_touchdown", "return_touchdown", "kickoff_attempt",
+    "punt_attempt", "passer_player_id", "receiver_player_id", "rusher_player_id",
+    "kickoff_returner_player_id", "punt_returner_player_id", "kicker_player_id",
+    "fumbled_1_player_id", "passing_yards", "receiving_yards", "rushing_yards", "return_yards",
+    "interception", "fumble_lost", "two_point_conv_result", "sack", "safety",
+    "field_goal_attempt", "field_goal_result", "kick_distance", "extra_point_attempt",
+    "extra_point_result",
+]
+
+# Scoring rule applied per unit of each stat-line column (the linear part of a profile).
+STAT_RULES = {
+    StatLine.PASS_YARDS: "pass_yard",
+    StatLine.PASS_TDS: "pass_td",
+    StatLine.INTERCEPTIONS: "intercept",
+    StatLine.SACKS: "sack",
+    StatLine.RUSH_YARDS: "rush_yard",
+    StatLine.RUSH_TDS: "rush_td",
+    StatLine.RECEPTIONS: "reception",
+    StatLine.REC_YARDS: "rec_yard",
+    StatLine.REC_TDS: "rec_td",
+    StatLine.FUMBLES_LOST: "fumble_lost",
+    StatLine.FG_0_39: "fg_0_39",
+    StatLine.FG_40_49: "fg_40_49",
+    StatLine.FG_50_PLUS: "fg_50_plus",
+    StatLine.PAT_MADE: "pat_made",
+    StatLine.DEF_SACKS: "def_sack",
+    StatLine.DEF_INTS: "def_int",
+    StatLine.DEF_FUMBLE_RECS: "def_fumble_rec",
+    StatLine.DEF_SAFETIES: "def_safety",
+    StatLine.DEF_TDS: "def_td",
+}
+
+# DST points-allowed brackets as (lowest score in bracket, rule), the same as points_from_score.
+PA_BRACKETS = [
+    (0, "pa_0"), (1, "pa_1_6"), (7, "pa_7_13"), (14, "pa_14_20"),
+    (21, "pa_21_27"), (28, "pa_28_34"), (35, "pa_35_plus"),
+]
+
+# Stat lines that never award points on their own; any other event means the player
+# has a points entry for that game (even if it is worth 0).
+_UNSCORED_STATS = [StatLine.PASS_ATTEMPTS, StatLine.TARGETS]
+
 def score_from_play(play, rules: ScoringSettings):
     """
     Calculates fantasy points for a single play based on the provided ScoringSettings.
@@ -116,4 +163,179 @@ def points_from_score(score, rules: ScoringSettings):
     elif score < 35:
         return rules.pa_28_34
     else:
-        return rules.pa_35_plus
\ No newline at end of file
+        return rules.pa_35_plus
+
+
+def _truthy(values: pd.Series) -> np.ndarray:
+    # Python truthiness, as score_from_play's `if play.x:` tests it: NaN counts as true.
+    if values.dtype.kind in "biuf":
+        return values.to_numpy() != 0
+    return np.array([bool(value) for value in values.astype(object)], dtype=bool)
+
+
+def _events(data: pd.DataFrame, rules: ScoringSettings):
+    """score_from_play's awards as (mask, player id column, points) in the order it adds them."""
+    def flag(column):
+        return _truthy(data[column])
+
+    def points(rule, column=None):
+        value = getattr(rules, rule)
+        return np.full(len(data), value, dtype=float) if column is None else value * data[column].to_numpy(dtype=float)
+
+    kickoff_returner = data.kickoff_returner_player_id.astype(object)
+    return_id = kickoff_returner.where(_truthy(kickoff_returner), data.punt_returner_player_id.astype(object))
+    two_point = (data.two_point_conv_result == "success").to_numpy()
+    field_goal = flag("field_goal_attempt") & (data.field_goal_result == "made").to_numpy()
+    distance = data.kick_distance.to_numpy(dtype=float)
+    fg_points = np.where(distance <= 39, rules.fg_0_39, np.where(distance <= 49, rules.fg_40_49, rules.fg_50_plus))
+    return [
+        (flag("pass_touchdown"), data.passer_player_id, points("pass_td")),
+        (flag("pass_touchdown"), data.receiver_player_id, points("rec_td")),
+        (flag("rush_touchdown"), data.rusher_player_id, points("rush_td")),
+        ((flag("kickoff_attempt") | flag("punt_attempt")) & flag("return_touchdown") & _truthy(return_id), return_id, points("ret_td")),
+        (flag("receiving_yards"), data.receiver_player_id, points("rec_yard", "receiving_yards")),
+        (flag("receiving_yards"), data.receiver_player_id, points("reception")),
+        (flag("passing_yards"), data.passer_player_id, points("pass_yard", "passing_yards")),
+        (flag("rushing_yards"), data.rusher_player_id, points("rush_yard", "rushing_yards")),
+        (flag("interception"), data.passer_player_id, points("intercept")),
+        (flag("interception"), data.defteam, points("def_int")),
+        (flag("interception") & flag("return_touchdown"), data.defteam, points("def_td")),
+        (flag("fumble_lost"), data.fumbled_1_player_id, points("fumble_lost")),
+        (flag("fumble_lost"), data.defteam, points("def_fumble_rec")),
+        (two_point & data.rusher_player_id.notna().to_numpy(), data.rusher_player_id, points("two_pt_conv")),
+        (two_point & data.receiver_player_id.notna().to_numpy(), data.receiver_player_id, points("two_pt_conv")),
+        (two_point & data.receiver_player_id.notna().to_numpy(), data.passer_player_id, points("two_pt_conv")),
+        (flag("sack"), data.defteam, points("def_sack")),
+        (flag("sack"), data.passer_player_id, points("sack")),
+        (flag("field_goal_attempt") & (data.field_goal_result == "blocked").to_numpy(), data.defteam, points("def_block")),
+        (field_goal, data.kicker_player_id, fg_points),
+        (flag("extra_point_attempt") & (data.extra_point_result == "made").to_numpy(), data.kicker_player_id, points("pat_made")),
+        (flag("safety"), data.defteam, points("def_safety")),
+    ]
+
+
+def fantasy_points(data: pd.DataFrame, rules: ScoringSettings) -> pd.DataFrame:
+    """Actual fantasy points of every player and team defense, for every week in `data`.
+
+    The columnar version of main.calculate_fantasy_leaders' loop over score_from_play,
+    with the same results: no_play rows are skipped, a player's points on a play are
+    dropped when they are NaN (e.g. NaN yards), and each defense gets points_from_score
+    for the final score of its games. Points are added in the same order as the loop, so
+    totals match it exactly.
+
+    Args:
+        data: PBP rows of any number of weeks, with season, week, game_id, play_type,
+            the team and final score columns and the PBP_COLUMNS.
+        rules: Scoring settings.
+
+    Returns:
+        pd.DataFrame: season, week, player_id and score, one row per player and week in
+            the order the loop first scores them.
+    """
+    data = data.loc[~(data.play_type.isin(["no_play"]))]
+    weeks, week_keys = pd.factorize(data.season.to_numpy(dtype=np.int64) * 100 + data.week.to_numpy(dtype=np.int64))
+    events = _events(data, rules)
+    # Play-major (play, event) order, as score_from_play builds each play's dict.
+    mask = np.stack([event[0] for event in events], axis=1).ravel()
+    ids = np.stack([event[1].astype(object).to_numpy() for event in events], axis=1).ravel()[mask]
+    values = np.stack([event[2] for event in events], axis=1).ravel()[mask]
+    plays = np.repeat(np.arange(len(data)), len(events))[mask]
+    keep = pd.notna(ids)
+    ids, values, plays = ids[keep], values[keep], plays[keep]
+
+    # One sum per (play, player), added in event order; NaN sums are dropped.
+    id_codes, id_keys = pd.factorize(ids)
+    pairs, pair_keys = pd.factorize(plays * len(id_keys) + id_codes)
+    pair_points = np.zeros(len(pair_keys))
+    np.add.at(pair_points, pairs, values)
+    pair_plays, pair_ids = np.divmod(pair_keys, max(len(id_keys), 1))
+    scored = ~np.isnan(pair_points)
+    pair_plays, pair_ids, pair_points = pair_plays[scored], pair_ids[scored], pair_points[scored]
+
+    # Defenses score the points allowed in the last row of each game (per week, as the
+    # loop scores a week at a time), after every play.
+    game_weeks = pd.DataFrame({"week": weeks, "game_id": data.game_id.to_numpy()})
+    last = np.flatnonzero(~game_weeks.duplicated(keep="last").to_numpy() & data.game_id.notna().to_numpy())
+    games = data.iloc[last]
+    teams = np.column_stack([games.home_team.to_numpy(dtype=object), games.away_team.to_numpy(dtype=object)]).ravel()
+    allowed = np.column_stack([games.total_away_score.astype(int), games.total_home_score.astype(int)]).ravel()
+    lower = np.array([low for low, _ in PA_BRACKETS])
+    brackets = np.searchsorted(lower, allowed, side="right") - 1
+    dst = pd.notna(teams)
+    dst_points = np.array([getattr(rules, rule) for _, rule in PA_BRACKETS])[brackets]
+
+    player_ids = np.concatenate([id_keys[pair_ids], teams[dst]])
+    player_weeks = np.concatenate([weeks[pair_plays], np.repeat(weeks[last], 2)[dst]])
+    player_points = np.concatenate([pair_points, dst_points[dst]])
+    id_codes, id_keys = pd.factorize(player_ids)
+    keys, key_index = pd.factorize(player_weeks * len(id_keys) + id_codes)
+    totals = np.zeros(len(key_index))
+    np.add.at(totals, keys, player_points)
+
+    key_weeks, key_ids = np.divmod(key_index, max(len(id_keys), 1))
+    season_weeks = week_keys[key_weeks]
+    return pd.DataFrame({
+        "season": season_weeks // 100,
+        "week": season_weeks % 100,
+        "player_id": id_keys[key_ids],
+        "score": totals,
+    })
+
+
+def scoring_matrix(profiles: Sequence[ScoringSettings]) -> np.ndarray:
+    """Coefficient matrix turning event counts into points for each scoring profile.
+
+    Args:
+        profiles: Scoring profiles, one output column each.
+
+    Returns:
+        np.ndarray: (len(StatLine) + len(PA_BRACKETS), len(profiles)) matrix whose rows
+            line up with the columns of event_counts().
+    """
+    matrix = np.zeros((len(StatLine) + len(PA_BRACKETS), len(profiles)))
+    for k, rules in enumerate(profiles):
+        for stat, rule in STAT_RULES.items():
+            matrix[stat, k] = getattr(rules, rule)
+        for b, (_, rule) in enumerate(PA_BRACKETS):
+            matrix[len(StatLine) + b, k] = getattr(rules, rule)
+    return matrix
+
+
+def event_counts(stats: np.ndarray, defense: np.ndarray) -> np.ndarray:
+    """Scoring-agnostic event counts from stat lines.
+
+    Appends one indicator column per points-allowed bracket, so that the nonlinear DST
+    bracket scoring becomes linear too.
+
+    Args:
+        stats: (..., players, StatLine) stat-line counters, e.g. stacked GameState.stats.
+        defense: Boolean mask over players marking the team defenses.
+
+    Returns:
+        np.ndarray: (..., players, len(StatLine) + len(PA_BRACKETS)) float64 counts.
+    """
+    stats = np.asarray(stats, dtype=np.float64)
+    lower = np.array([low for low, _ in PA_BRACKETS])
+    bracket = np.searchsorted(lower, stats[..., StatLine.POINTS_ALLOWED], side="right") - 1
+    indicators = (bracket[..., None] == np.arange(len(PA_BRACKETS))) & np.asarray(defense)[:, None]
+    return np.concatenate([stats, indicators], axis=-1)
+
+
+def score_stat_lines(stats: np.ndarray, defense: np.ndarray, profiles: Sequence[ScoringSettings]) -> np.ndarray:
+    """Fantasy points under every scoring profile, with one matrix multiply.
+
+    Args:
+        stats: (sims, players, StatLine) stat lines from one matchup.
+        defense: Boolean mask over players marking the team defenses.
+        profiles: Scoring profiles to apply.
+
+    Returns:
+        np.ndarray: (profiles, sims, players) points, NaN where a player had no scoring
+            event in a simulation (as in GameState.points).
+    """
+    stats = np.asarray(stats)
+    counts = event_counts(stats, defense)
+    points = counts.reshape(-1, counts.shape[-1]) @ scoring_matrix(profiles)
+    points = points.T.reshape(len(profiles), *stats.shape[:-1])
+    scored = np.delete(stats, _UNSCORED_STATS, axis=-1).any(axis=-1) | np.asarray(defense)
+    return np.where(scored, points, np.nan)
@@ -1,7 +1,7 @@
 import os
 import yaml
 from pydantic import BaseModel, Field
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 class ScoringSettings(BaseModel):
     """Configuration for Fantasy Scoring Rules."""
@@ -51,6 +51,22 @@ class ScoringSettings(BaseModel):
     pa_28_34: float = Field(-1.0, description="Points Allowed 28-34")
     pa_35_plus: float = Field(-4.0, description="Points Allowed 35+")
 
+    @classmethod
+    def load(cls, scoring_file: str) -> "ScoringSettings":
+        """
+        Loads scoring rules from a YAML file. Missing fields (or a missing file) use the defaults.
+        """
+        scoring_config = {}
+        if os.path.exists(scoring_file):
+            try:
+                with open(scoring_file, 'r') as f:
+                    scoring_config = yaml.safe_load(f) or {}
+            except Exception as e:
+                print(f"Warning: Failed to load {scoring_file}: {e}. Using defaults.")
+
+        # Create ScoringSettings from dict (merged with defaults by Pydantic)
+        return cls(**scoring_config)
+
 
 class RuntimeSettings(BaseModel):
     """Configuration for the Simulation Engine runtime."""
@@ -64,6 +80,28 @@ class RuntimeSettings(BaseModel):
     
     # Derived/Logic flags
     use_parallel: bool = Field(True, description="Use joblib for parallel execution")
+    seed: int = Field(0, description="Base seed for the per-simulation random streams (spawned per season/week/game/sim)")
+    use_lookup_tables: bool = Field(False, description="Replace playcall/completion/FG models with interpolated probability tables")
+    use_compiled_trees: bool = Field(False, description="Evaluate playcall/completion/FG XGBoost models as pure-NumPy tree ensembles")
+    use_batch_engine: bool = Field(False, description="Simulate all games of a matchup in lockstep with the vectorized batch engine")
+    use_batched_inference: bool = Field(False, description="Run scalar games as generators and batch their model calls across simulations")
+    record_stat_lines: bool = Field(False, description="Record per-player stat lines (yards, TDs, receptions, ...) and export their quantiles")
+    scoring_profiles: List[str] = Field(default_factory=list, description="Extra scoring YAML files scored from the same simulations' stat lines")
+    use_process_pool: bool = Field(False, description="Simulate in persistent worker processes that each load the models once")
+    pool_workers: Optional[int] = Field(None, description="Worker processes for the simulation pool (default: CPU count)")
+    pool_chunk_size: Optional[int] = Field(None, description="Simulations per pool task (default: each game split evenly across workers)")
+    use_slate_scheduler: bool = Field(False, description="Queue the games of every week (or backtest slice) on the worker pool at once")
+    sample_buffer_dtype: str = Field("float32", description="dtype of the KDE sample buffers shared with pool workers")
+    sample_buffer_path: Optional[str] = Field(None, description="Back the shared sample buffers with a memmap file here instead of shared memory")
+    cache_week_stats: bool = Field(False, description="Reuse team/player stats across weeks with the same as-of data, and load each season's schedule once")
+    incremental_estimators: bool = Field(False, description="Advance the play-level EWMA estimators week by week instead of recomputing them for every week's stats")
+    result_sketches: bool = Field(False, description="Fold ROS simulations into per-player t-digest sketches instead of keeping every simulation")
+    sketch_compression: int = Field(200, description="Centroids per player in each quantile sketch")
+    export_format: str = Field("csv", description="Projection output: 'csv', 'parquet' (one dataset partitioned by position) or 'both'")
+    export_simulations: bool = Field(False, description="Also store every player's float32 simulations in the Parquet output")
+    pbp_source: Optional[str] = Field(None, description="Directory of pbp_<season>.parquet/.csv.gz files that fills the PBP store instead of nflreadpy")
+    compact_pbp: bool = Field(False, description="Downcast PBP flags/ints to int8/int16 and floats to float32 when loading")
+    lazy_pbp: bool = Field(False, description="Keep PBP as a lazy polars scan and read only each week's plays instead of loading every season into pandas")
 
 
 class AppConfig(BaseModel):
@@ -76,18 +114,7 @@ class AppConfig(BaseModel):
         """
         Loads configuration. Prioritizes loading scoring rules from a YAML file.
         """
-        scoring_config = {}
-        if os.path.exists(scoring_file):
-            try:
-                with open(scoring_file, 'r') as f:
-                    scoring_config = yaml.safe_load(f) or {}
-            except Exception as e:
-                print(f"Warning: Failed to load {scoring_file}: {e}. Using defaults.")
-        
-        # Create ScoringSettings from dict (merged with defaults by Pydantic)
-        scoring = ScoringSettings(**scoring_config)
-        
-        return cls(scoring=scoring)
+        return cls(scoring=ScoringSettings.load(scoring_file))
 
 # Define the Benchmark Suite
 BENCHMARK_SUITE = [
@@ -0,0 +1,104 @@
+import hashlib
+from typing import Dict, Hashable, Optional, Tuple
+import pandas as pd
+from data import nfl_client as nfl_data_py
+from stats import players, teams
+from stats.estimator_state import EstimatorState
+
+# Columns identifying the rows of a PBP or snap count frame. Only these are hashed, so a
+# fingerprint tells which plays a frame holds, not whether their values were edited.
+FINGERPRINT_COLUMNS = ["season", "week", "game_id", "play_id", "pfr_player_id", "player_id"]
+
+# (season, as-of week, PBP fingerprint, snap fingerprint, depth chart week, estimator
+# state used) -> (team stats, player stats).
+_STATS: Dict[Tuple[Hashable, ...], Tuple[pd.DataFrame, pd.DataFrame]] = {}
+# Season -> full schedule.
+_SCHEDULES: Dict[int, pd.DataFrame] = {}
+# The play-level estimators of the last week stats were computed for.
+_ESTIMATORS = EstimatorState()
+
+
+def fingerprint(frame: pd.DataFrame) -> str:
+    """Hash of a frame's columns and the FINGERPRINT_COLUMNS of its rows."""
+    columns = [column for column in FINGERPRINT_COLUMNS if column in frame.columns] or list(frame.columns)
+    digest = hashlib.sha1(repr(list(frame.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(frame[columns], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def as_of_week(data: pd.DataFrame, season: int) -> int:
+    """The week after the last one of `season` played in `data` (1 before the season starts)."""
+    weeks = data.loc[data.season == season, "week"]
+    return int(weeks.max()) + 1 if len(weeks) else 1
+
+
+def depth_chart_week(season: int, week: int) -> Optional[int]:
+    """The week players.calculate reads depth charts for, or None when it reads all of them.
+
+    Historical depth charts have a week column and players.calculate only keeps `week`'s
+    rows; the live format has no week column. Weeks missing from the charts all give the
+    same (empty) starters, so they share None too.
+    """
+    depth_charts = nfl_data_py.depth_chart(season, week)
+    return week if "week" in depth_charts.columns and len(depth_charts) else None
+
+
+def estimator_state(data: pd.DataFrame, season: int, week: int) -> EstimatorState:
+    """The estimator state, advanced to a week's data.
+
+    Projecting the weeks of a run in order, each call only applies the plays of the weeks
+    since the last one; going back to an earlier week reseeds the state from its data.
+
+    Args:
+        data: PBP rows the week is projected from (see week_stats).
+        season: Season being projected.
+        week: Week being projected.
+    """
+    _ESTIMATORS.advance_to(data, season, week)
+    return _ESTIMATORS
+
+
+def week_stats(data: pd.DataFrame, snap_data: pd.DataFrame, season: int, week: int,
+               estimators: Optional[EstimatorState] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Memoized teams.calculate and players.calculate for a week's data.
+
+    Every week after the last one played sees the same plays, so a rest-of-season run
+    computes the current stats once and reuses them for all of its weeks. Backtest weeks
+    and repeated runs in one process hit the cache whenever their inputs match.
+
+    Args:
+        data: PBP rows the week is projected from (the previous season and this season
+            before `week`).
+        snap_data: Snap counts passed to players.calculate.
+        season: Season being projected.
+        week: Week being projected.
+        estimators: An estimator state advanced to `data`, passed to calculate.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Copies of the (team stats, player stats) frames,
+            which callers may modify.
+    """
+    key = (
+        season, as_of_week(data, season), fingerprint(data), fingerprint(snap_data),
+        depth_chart_week(season, week), estimators is not None,
+    )
+    if key not in _STATS:
+        team_stats = teams.calculate(data, season, estimators)
+        _STATS[key] = team_stats, players.calculate(data, snap_data, team_stats, season, week, estimators)
+    team_stats, player_stats = _STATS[key]
+    return team_stats.copy(), player_stats.copy()
+
+
+def schedule(season: int) -> pd.DataFrame:
+    """A season's schedule, loaded once per season."""
+    if season not in _SCHEDULES:
+        _SCHEDULES[season] = nfl_data_py.import_schedules([season])
+    return _SCHEDULES[season].copy()
+
+
+def clear():
+    """Drops every cached frame (e.g. after reloading the PBP data)."""
+    global _ESTIMATORS
+    _STATS.clear()
+    _SCHEDULES.clear()
+    _ESTIMATORS = EstimatorState()
@@ -3,10 +3,15 @@ import numpy as np
 from data import loader
 from settings import AppConfig
 
+PBP_COLUMNS = [
+    "game_id", "play_id", "qtr", "quarter_seconds_remaining", "score_differential",
+    "play_type", "incomplete_pass", "interception",
+]
+
 def analyze_clock_runoff() -> None:
     print("Loading data...")
     # Load 2023 data for analysis
-    data = loader.load_data([2023, 2022])
+    data = loader.load_data([2023, 2022], columns=PBP_COLUMNS, downcast=True)
     
     # Filter to relevant plays
     data = data.loc[data.play_type.isin(['pass', 'run', 'punt', 'field_goal'])]
@@ -0,0 +1,317 @@
+import pickle
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+from stats import players, teams
+from stats.util import EwmaTarget
+
+
+def _team_plays(data: pd.DataFrame) -> pd.DataFrame:
+    return teams.with_estimator_columns(data.loc[data.play_type.isin(teams.PLAY_TYPES)])
+
+
+def _player_plays(data: pd.DataFrame) -> pd.DataFrame:
+    return players.with_estimator_columns(data.loc[data.play_type.isin(players.PLAY_TYPES)])
+
+
+# An empty PBP frame, to read the span and names of a builder without any plays.
+_NO_PLAYS = pd.DataFrame({
+    column: pd.Series(dtype=float) for column in dict.fromkeys(teams.PBP_COLUMNS + players.PBP_COLUMNS + ["position_receiver"])
+})
+
+
+class Estimator(NamedTuple):
+    """A play-level EWMA estimator of teams.calculate or players.calculate.
+
+    The target builder defines the span, mask and prior, so the state stays in step with
+    calculate when they change.
+
+    Attributes:
+        group_col: Id column calculate runs the target over (e.g. 'defteam').
+        target: The teams or players *_target builder (e.g. teams.defense_ypc_target).
+        plays: The rows calculate gives the builder: its PLAY_TYPES plays, with the
+            derived target columns.
+    """
+    group_col: str
+    target: Callable[[pd.DataFrame], EwmaTarget]
+    plays: Callable[[pd.DataFrame], pd.DataFrame]
+
+    def build(self, data: pd.DataFrame) -> EwmaTarget:
+        """The estimator's target over PBP rows `data`, with its mask and prior from them."""
+        return self.target(self.plays(data))
+
+    @property
+    def definition(self) -> EwmaTarget:
+        """The target without plays, for its result column, target column and span."""
+        return self.build(_NO_PLAYS)
+
+
+# The estimators teams.calculate and players.calculate run on plays. The weekly share
+# estimators run on players.calculate_weekly's per-week totals and are not tracked.
+ESTIMATORS = [
+    Estimator("posteam", teams.offense_poe_target, _team_plays),
+    Estimator("defteam", teams.defense_poe_target, _team_plays),
+    Estimator("defteam", teams.defense_cpoe_target, _team_plays),
+    Estimator("defteam", teams.defense_yac_target, _team_plays),
+    Estimator("defteam", teams.defense_ypc_target, _team_plays),
+    Estimator("defteam", teams.defense_int_rate_target, _team_plays),
+    Estimator("defteam", teams.defense_sack_rate_target, _team_plays),
+    Estimator("posteam", teams.offense_sack_rate_target, _team_plays),
+    Estimator("posteam", teams.offense_go_for_it_rate_target, _team_plays),
+    Estimator("passer_player_id", players.cpoe_target, _player_plays),
+    Estimator("passer_id", players.scramble_rate_target, _player_plays),
+    Estimator("passer_id", players.yards_per_scramble_target, _player_plays),
+    Estimator("receiver_player_id", players.air_yards_target, _player_plays),
+    Estimator("receiver_player_id", players.yac_target, _player_plays),
+    Estimator("receiver_player_id", players.receiver_cpoe_target, _player_plays),
+    Estimator("receiver_player_id", players.deep_target_rate_target, _player_plays),
+    Estimator("rusher_player_id", players.ypc_target, _player_plays),
+    Estimator("rusher_player_id", players.ypc_middle_target, _player_plays),
+    Estimator("rusher_player_id", players.big_carry_rate_target, _player_plays),
+]
+
+
+def _advance(values: np.ndarray, weights: np.ndarray, codes: np.ndarray, observations: np.ndarray, span: int):
+    # One step of pandas' ewm(span, adjust=False).mean() per observation, with the same
+    # arithmetic, for ids whose EWMA starts without a prior (NaN): the first observation
+    # becomes the value. weights holds the decayed weight of each id's value (1 unless
+    # NaNs followed it).
+    alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+    old_wt_factor = 1.0 - alpha
+    for code, cur in zip(codes.tolist(), observations.tolist()):
+        weighted = values[code]
+        if weighted == weighted:
+            old_wt = weights[code] * old_wt_factor
+            if cur == cur:
+                if weighted != cur:
+                    values[code] = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+            weights[code] = old_wt
+        elif cur == cur:
+            values[code] = cur
+
+
+def _advance_from_prior(offsets: np.ndarray, scales: np.ndarray, weights: np.ndarray, codes: np.ndarray, observations: np.ndarray, span: int):
+    # The same recurrence for ids that start at a (not NaN) prior, whose value is not
+    # known yet: every step is linear in the prior, so each id keeps its value as
+    # offset + scale * prior, from offset 0 and scale 1.
+    alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+    old_wt_factor = 1.0 - alpha
+    for code, cur in zip(codes.tolist(), observations.tolist()):
+        old_wt = weights[code] * old_wt_factor
+        if cur == cur:
+            total = old_wt + alpha
+            offsets[code] = (old_wt * offsets[code] + alpha * cur) / total
+            scales[code] = old_wt * scales[code] / total
+            old_wt = 1.0
+        weights[code] = old_wt
+
+
+class EstimatorState:
+    """Running EWMA estimators, keyed by (estimator, id), advanced one week at a time.
+
+    An adjust=False EWMA only needs each id's last value to take the next observation, so
+    `update` with a new week's plays advances every estimator in O(new plays) instead of
+    recomputing it over the whole history. The prior of an estimator (e.g. the league YPC,
+    or each receiver's position average) comes from all the plays applied so far, and
+    changes with every week. Each id therefore keeps its value as offset + scale * prior,
+    plus the value it has without a prior, and `estimates` fills in the current prior.
+
+    Like the stats of a week, which come from last season's plays and this season's so far,
+    the state covers at most two seasons: the first plays of a new season reseed it from
+    the previous season's plays. Fed the plays calculate gets, in the same order, the
+    estimates equal teams.calculate's and players.calculate's to float rounding, and
+    calculate uses them instead of recomputing when it is passed the state.
+
+    Attributes:
+        estimators (Dict[str, Estimator]): Tracked estimators by result column name.
+        definitions (Dict[str, EwmaTarget]): Each estimator's target without plays (its
+            target column and span).
+        states (Dict[str, pd.DataFrame]): Per estimator, indexed by id: offset, scale and
+            weight (decay from trailing NaN observations) of the value from the prior,
+            value and weight without a prior, season and week of the id's last play, and
+            span.
+        plays (Optional[pd.DataFrame]): The plays applied since the state was seeded,
+            which the priors are computed from.
+        last_week (Optional[tuple]): (season, week) of the latest plays applied.
+    """
+
+    def __init__(self, estimators: Sequence[Estimator] = ESTIMATORS):
+        self.definitions = {}
+        self.estimators = {}
+        for estimator in estimators:
+            definition = estimator.definition
+            self.definitions[definition.result_col_name] = definition
+            self.estimators[definition.result_col_name] = estimator
+        self.states: Dict[str, pd.DataFrame] = {}
+        self.plays = None
+        self.last_week = None
+        self._priors: Dict[str, Union[float, pd.Series]] = {}
+        self._rows: Dict[Callable, pd.DataFrame] = {}
+
+    def seed(self, history: pd.DataFrame):
+        """Resets every estimator and runs it over `history` (e.g. last season's plays)."""
+        self.states = {}
+        self.plays = history.iloc[:0]
+        self.last_week = None
+        self._priors = {}
+        self._rows = {}
+        if not history.empty:
+            self._apply(history.sort_values(["season", "week"], kind="mergesort"))
+
+    def update(self, plays: pd.DataFrame):
+        """Advances every estimator with plays after the last applied week.
+
+        Args:
+            plays: PBP rows of one or more new weeks, with season and week columns.
+                Rows are applied in (season, week) order, keeping their order within a
+                week, as _compute_estimators_vectorized does.
+
+        Raises:
+            ValueError: Some plays are not after the last applied week, the state was not
+                seeded, or the plays skip a season (there is nothing to reseed from).
+        """
+        if self.plays is None:
+            raise ValueError("Seed the estimator state before updating it")
+        if plays.empty:
+            return
+        plays = plays.sort_values(["season", "week"], kind="mergesort")
+        first = (plays.season.iloc[0], plays.week.iloc[0])
+        if self.last_week is not None and first <= self.last_week:
+            raise ValueError("Plays of %s are not after the last applied week %s" % (first, self.last_week))
+        for season, season_plays in plays.groupby("season", sort=True):
+            if self.last_week is not None and season != self.last_week[0]:
+                if season != self.last_week[0] + 1:
+                    raise ValueError("Plays of %d follow %d; seed the state with %d's plays" % (season, self.last_week[0], season - 1))
+                self.seed(self.plays.loc[self.plays.season == self.last_week[0]])
+            self._apply(season_plays)
+
+    def advance_to(self, plays: pd.DataFrame, season: int, week: int):
+        """Brings the state to the plays a week's stats are computed from.
+
+        Applies the rows of `plays` after the last applied week, or reseeds from last
+        season's when the state is past `week` or more than a season behind.
+
+        Args:
+            plays: The week's plays: last season and this season before `week` (see
+                main.history_plays), in PBP order.
+            season: Season being projected.
+            week: Week being projected.
+        """
+        if self.last_week is None or self.last_week > (season, week - 1) or self.last_week[0] < season - 1:
+            self.seed(plays.loc[plays.season == season - 1])
+        if self.last_week is not None:
+            plays = plays.loc[(plays.season > self.last_week[0]) | ((plays.season == self.last_week[0]) & (plays.week > self.last_week[1]))]
+        self.update(plays)
+        if len(self.plays) and self.plays.season.min() < season - 1:
+            # Two seasons back, with none of this season's plays yet to roll over with.
+            self.seed(self.plays.loc[self.plays.season == season - 1])
+
+    def _apply(self, plays: pd.DataFrame):
+        # plays are sorted by (season, week) and come after last_week.
+        for name, estimator in self.estimators.items():
+            rows = estimator.plays(plays)
+            mask = estimator.target(rows).mask
+            self._update_estimator(name, estimator.group_col, rows if mask is None else rows.loc[mask])
+        self.plays = pd.concat([self.plays, plays]) if len(self.plays) else plays
+        self.last_week = (int(plays.season.iloc[-1]), int(plays.week.iloc[-1]))
+        self._priors = {}
+        self._rows = {}
+
+    def _update_estimator(self, name: str, group_col: str, plays: pd.DataFrame):
+        definition = self.definitions[name]
+        plays = plays.loc[plays[group_col].notna()]
+        ids = plays[group_col].astype(object)
+        state = self.states.get(name)
+        if state is None:
+            state = pd.DataFrame(columns=["offset", "scale", "weight", "value", "free_weight", "season", "week", "span"])
+        new_ids = pd.Index(ids.unique()).difference(state.index, sort=False)
+        if len(new_ids):
+            # New ids start from the prior, like the prior rows of a full recompute.
+            added = pd.DataFrame({
+                "offset": 0.0, "scale": 1.0, "weight": 1.0, "value": np.nan, "free_weight": 1.0,
+                "season": -1, "week": -1, "span": definition.span,
+            }, index=new_ids)
+            state = pd.concat([state, added]) if len(state) else added
+        codes = state.index.get_indexer(ids)
+        observations = plays[definition.target_col].to_numpy(dtype=float)
+        offsets = state.offset.to_numpy(dtype=float)
+        scales = state.scale.to_numpy(dtype=float)
+        weights = state.weight.to_numpy(dtype=float)
+        _advance_from_prior(offsets, scales, weights, codes, observations, definition.span)
+        values = state.value.to_numpy(dtype=float)
+        free_weights = state.free_weight.to_numpy(dtype=float)
+        _advance(values, free_weights, codes, observations, definition.span)
+        state = state.assign(offset=offsets, scale=scales, weight=weights, value=values, free_weight=free_weights)
+        last = plays[["season", "week"]].groupby(ids).last()
+        state.loc[last.index, "season"] = last.season
+        state.loc[last.index, "week"] = last.week
+        self.states[name] = state
+
+    def prior(self, name: str) -> Union[float, pd.Series]:
+        """An estimator's prior over the applied plays, computed as calculate does: a number,
+        or a Series by id."""
+        if name not in self._priors:
+            estimator = self.estimators[name]
+            if estimator.plays not in self._rows:
+                # calculate sorts its plays by week (stably) before building its targets.
+                self._rows[estimator.plays] = estimator.plays(self.plays.sort_values("week", kind="mergesort"))
+            self._priors[name] = estimator.target(self._rows[estimator.plays]).prior
+        return self._priors[name]
+
+    def estimates(self, name: str, prior: Union[None, float, pd.Series] = None) -> pd.DataFrame:
+        """An estimator's current values, as `group_col` and `name` columns.
+
+        Args:
+            name: The estimator's result column name.
+            prior: The prior to fill in, when the caller already has it from the same
+                plays (calculate's targets do); `prior(name)` by default.
+        """
+        estimator = self.estimators[name]
+        state = self.states.get(name)
+        if state is None:
+            return pd.DataFrame({estimator.group_col: pd.Series(dtype=object), name: pd.Series(dtype=float)})
+        if prior is None:
+            prior = self.prior(name)
+        if isinstance(prior, pd.Series):
+            prior = prior.reindex(state.index).to_numpy(dtype=float)
+        prior = np.broadcast_to(np.asarray(prior, dtype=float), len(state))
+        offsets = state.offset.to_numpy(dtype=float)
+        scales = state.scale.to_numpy(dtype=float)
+        # Without a prior, an id's EWMA starts at its first observation.
+        values = np.where(np.isnan(prior), state.value.to_numpy(dtype=float), offsets + scales * prior)
+        return pd.DataFrame({estimator.group_col: state.index, name: values})
+
+    def table(self, group_col: str, names: List[str], priors: Optional[Dict[str, Union[float, pd.Series]]] = None) -> pd.DataFrame:
+        """Estimates of several estimators of one id column, shaped like the frame
+        _compute_estimators_vectorized returns: one row per id, sorted, NaN where an
+        estimator has no plays of the id. `priors` optionally gives the priors by name."""
+        priors = priors or {}
+        result = pd.DataFrame({group_col: pd.Series(dtype=object)})
+        for name in names:
+            result = result.merge(self.estimates(name, priors.get(name)), on=group_col, how="outer")
+        return result.sort_values(group_col, ignore_index=True)
+
+    def save(self, path: str):
+        """Writes the state, with its plays, to `path` (pickle); estimator definitions are not saved."""
+        with open(path, "wb") as f:
+            pickle.dump({"states": self.states, "plays": self.plays, "last_week": self.last_week}, f)
+
+    @classmethod
+    def load(cls, path: str, estimators: Sequence[Estimator] = ESTIMATORS) -> "EstimatorState":
+        """Reads a state written by `save`.
+
+        Raises:
+            ValueError: A saved estimator's span differs from its current definition; the
+                state has to be seeded again.
+        """
+        with open(path, "rb") as f:
+            saved = pickle.load(f)
+        state = cls(estimators)
+        for name, frame in saved["states"].items():
+            if name in state.definitions and len(frame) and (frame.span != state.definitions[name].span).any():
+                raise ValueError("Span of %s changed since the state was saved; seed it again" % name)
+        state.states = {name: frame for name, frame in saved["states"].items() if name in state.estimators}
+        state.plays = saved["plays"]
+        state.last_week = saved["last_week"]
+        return state
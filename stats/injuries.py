@@ -22,9 +22,7 @@ def get_injury_data(season: int, week: int) -> Optional[pd.DataFrame]:
         if (season, week) in cached_inj_data:
             return cached_inj_data[(season, week)]
         full_url = INJURY_API_URL % (season, week)
-        id_map = nfl_data_py.import_ids(
-            columns=["gsis_id", "mfl_id"], ids=["gsis", "mfl"]
-        )
+        id_map = nfl_data_py.gsis_ids("mfl_id").reset_index()
         response = requests.get(full_url)
         data = json.loads(response.content.decode(response.encoding))
         df = pd.DataFrame(data["injuries"]["injury"]).rename(columns={"id": "mfl_id"})
@@ -1,11 +1,24 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from data import nfl_client as nfl_data_py
 from statsmodels.formula.api import mixedlm
 from collections import defaultdict
 from stats import injuries, teams
-from stats.util import _compute_estimator_vectorized
+from stats.util import EwmaTarget, _compute_estimators_vectorized, _compute_or_read_estimators
+
+# PBP columns calculate and calculate_weekly read, besides the position_receiver column
+# loader.load_data adds.
+PBP_COLUMNS = [
+    "season", "week", "game_id", "posteam", "defteam", "play_type", "pass", "rush",
+    "pass_attempt", "qb_scramble", "air_yards", "yards_after_catch", "rushing_yards",
+    "run_gap", "cpoe", "yardline_100", "passer_id", "passer_player_id", "passer_player_name",
+    "receiver_player_id", "receiver_player_name", "rusher_player_id", "rusher_player_name",
+    "field_goal_attempt", "field_goal_result", "fg_prob", "kicker_player_id", "kicker_player_name",
+]
+
+# Play types calculate and calculate_weekly keep (a subset of teams.PLAY_TYPES).
+PLAY_TYPES = ["no_play", "pass", "run", "field_goal"]
 
 # Use previous 1000 passes to judge passers
 passer_span = 1000
@@ -15,7 +28,10 @@ receiver_span = 150
 rusher_span = 150
 
 
-def calculate(data: pd.DataFrame, snap_counts: pd.DataFrame, team_stats: pd.DataFrame, season: int, week: int) -> pd.DataFrame:
+def calculate(
+    data: pd.DataFrame, snap_counts: pd.DataFrame, team_stats: pd.DataFrame, season: int, week: int,
+    estimators: Optional[Any] = None,
+) -> pd.DataFrame:
     """Calculates comprehensive player statistics and estimators for a given season and week.
 
     This function processes raw play-by-play data, merges roster and depth chart information,
@@ -33,6 +49,9 @@ def calculate(data: pd.DataFrame, snap_counts: pd.DataFrame, team_stats: pd.Data
             'offense_sack_rate_est', 'defense_sack_rate_est', etc.
         season (int): The current season for which to calculate player stats.
         week (int): The current week within the season.
+        estimators (Optional[stats.estimator_state.EstimatorState]): A state advanced
+            over `data`. The play-level EWMA estimators are read from it instead of
+            recomputed; the weekly share estimators are always computed.
 
     Returns:
         pd.DataFrame: A DataFrame containing calculated player statistics and estimators,
@@ -40,18 +59,16 @@ def calculate(data: pd.DataFrame, snap_counts: pd.DataFrame, team_stats: pd.Data
                       indicators, merged with player metadata (name, position, team).
     """
     data = data.copy() # Ensure data is a copy to prevent SettingWithCopyWarning
-    data = data.loc[(data.play_type.isin(["no_play", "pass", "run", "field_goal"]))]
-    data = data.sort_values('week') # Ensure data is sorted by week for EWMA calculations
+    data = data.loc[(data.play_type.isin(PLAY_TYPES))]
+    data = data.sort_values('week', kind='mergesort') # Ensure data is sorted by week for EWMA calculations, keeping play order within a week
 
     # Load roster data for current season (only needed for player metadata)
-    roster_data = nfl_data_py.import_seasonal_rosters(
-        [season], columns=["player_id", "position", "player_name", "team"]
-    ).drop_duplicates(subset="player_id")
+    roster_data = nfl_data_py.season_roster(season).reset_index()
 
-    depth_charts = nfl_data_py.import_depth_charts([season])
+    depth_charts = nfl_data_py.depth_chart(season, week)
     
     if "week" in depth_charts.columns:
-        depth_charts = depth_charts.loc[depth_charts.week == week]
+        depth_charts = depth_charts.copy()
     else:
         # Handle Live Data Format (Missing week, different column names)
         depth_charts = depth_charts.rename(columns={
@@ -122,6 +139,37 @@ def calculate(data: pd.DataFrame, snap_counts: pd.DataFrame, team_stats: pd.Data
     weekly_team_stats = teams.calculate_weekly(data, season)
     weekly_player_stats = calculate_weekly(data, snap_counts, weekly_team_stats, season)
 
+    # All EWMA estimators, from one sort of the plays (or weeks) per id column.
+    plays = with_estimator_columns(data)
+    receiver_est = _compute_or_read_estimators(
+        plays,
+        "receiver_player_id",
+        [air_yards_target(plays), yac_target(plays), receiver_cpoe_target(plays), deep_target_rate_target(plays)],
+        estimators,
+    ).rename(columns={"receiver_player_id": "player_id"})
+    rusher_est = _compute_or_read_estimators(
+        plays, "rusher_player_id", [ypc_target(plays), ypc_middle_target(plays), big_carry_rate_target(plays)], estimators
+    ).rename(columns={"rusher_player_id": "player_id"})
+    passer_est = _compute_or_read_estimators(
+        plays, "passer_player_id", [cpoe_target(plays)], estimators
+    ).rename(columns={"passer_player_id": "player_id"})
+    scramble_est = _compute_or_read_estimators(
+        plays, "passer_id", [scramble_rate_target(plays), yards_per_scramble_target(plays)], estimators
+    ).rename(columns={"passer_id": "player_id"})
+    weekly_est = _compute_estimators_vectorized(
+        weekly_player_stats,
+        "player_id",
+        [
+            weekly_target_share_target(weekly_player_stats),
+            weekly_carry_share_target(weekly_player_stats),
+            weekly_snap_share_target(weekly_player_stats),
+            weekly_fgoe_target(weekly_player_stats),
+            weekly_goal_line_carry_share_target(weekly_player_stats),
+            weekly_redzone_target_share_target(weekly_player_stats),
+            weekly_redzone_carry_share_target(weekly_player_stats),
+        ],
+    )
+
     receiver_targets = (
         data.groupby("receiver_player_id")["receiver_player_id"]
         .count()
@@ -169,7 +217,7 @@ def calculate(data: pd.DataFrame, snap_counts: pd.DataFrame, team_stats: pd.Data
         .reset_index()
         .rename(columns={"receiver_player_id": "player_id"})
     )
-    air_yards_est = compute_air_yards_estimator(receiver_data)
+    air_yards_est = receiver_est[["player_id", "air_yards_est"]]
     receiver_yac = (
         data.groupby("receiver_player_id")["yards_after_catch"]
         .mean()
@@ -178,9 +226,9 @@ def calculate(data: pd.DataFrame, snap_counts: pd.DataFrame, team_stats: pd.Data
         .reset_index()
         .rename(columns={"receiver_player_id": "player_id"})
     )
-    yac_est = compute_yac_estimator(receiver_data)
-    receiver_cpoe_est = compute_receiver_cpoe_estimator(data)
-    deep_target_rate_est = compute_deep_target_rate_estimator(data)
+    yac_est = receiver_est[["player_id", "yac_est"]]
+    receiver_cpoe_est = receiver_est[["player_id", "receiver_cpoe_est"]]
+    deep_target_rate_est = receiver_est[["player_id", "deep_target_rate_est"]]
     rushing_carries = (
         data.loc[data.rush == 1]
         .groupby("rusher_player_id")["rusher_player_id"]
@@ -197,7 +245,7 @@ def calculate(data: pd.DataFrame, snap_counts: pd.DataFrame, team_stats: pd.Data
         .reset_index()
         .rename(columns={"rusher_player_id": "player_id"})
     )
-    ypc_est = compute_ypc_estimator(data)
+    ypc_est = rusher_est[["player_id", "ypc_est"]]
     yards_per_carry_middle = (
         data.loc[data.rush == 1 & data.run_gap.isin(["guard", "tackle"])]
         .groupby("rusher_player_id")["rushing_yards"]
@@ -206,7 +254,7 @@ def calculate(data: pd.DataFrame, snap_counts: pd.DataFrame, team_stats: pd.Data
         .reset_index()
         .rename(columns={"rusher_player_id": "player_id"})
     )
-    ypc_middle_est = compute_ypc_middle_estimator(data)
+    ypc_middle_est = rusher_est[["player_id", "ypc_middle_est"]]
     red_zone_carries = (
         data.loc[data.rush == 1]
         .loc[data.yardline_100 <= 10]
@@ -227,7 +275,7 @@ def calculate(data: pd.DataFrame, snap_counts: pd.DataFrame, team_stats: pd.Data
         .reset_index()
         .rename(columns={"rusher_player_id": "player_id"})
     )
-    big_carry_rate_est = compute_big_carry_rate_estimator(data)
+    big_carry_rate_est = rusher_est[["player_id", "big_carry_rate_est"]]
     cpoe = (
         data.groupby("passer_player_id")["cpoe"]
         .mean()
@@ -235,7 +283,7 @@ def calculate(data: pd.DataFrame, snap_counts: pd.DataFrame, team_stats: pd.Data
         .reset_index()
         .rename(columns={"passer_player_id": "player_id"})
     )
-    cpoe_est = compute_cpoe_estimator(data)
+    cpoe_est = passer_est
     (
         data.groupby("passer_player_id")
         .size()
@@ -250,8 +298,8 @@ def calculate(data: pd.DataFrame, snap_counts: pd.DataFrame, team_stats: pd.Data
         .reset_index()
         .rename(columns={"passer_player_id": "player_id"})
     )
-    scramble_rate_estimator = compute_scramble_rate_estimator(data)
-    yards_per_scramble_estimator = compute_yards_per_scramble_estimator(data)
+    scramble_rate_estimator = scramble_est[["player_id", "scramble_rate_est"]]
+    yards_per_scramble_estimator = scramble_est[["player_id", "yards_per_scramble_est"]]
     kick_attempts = (
         data.loc[data.field_goal_attempt == 1]
         .groupby("kicker_player_id")
@@ -321,11 +369,11 @@ def calculate(data: pd.DataFrame, snap_counts: pd.DataFrame, team_stats: pd.Data
     offense_stats["carry_percentage"] = offense_stats.apply(
         lambda row: row["carries"] / row["carries_team"], axis=1
     )
-    targets_est = weekly_target_share_estimator(weekly_player_stats)
-    carries_est = weekly_carry_share_estimator(weekly_player_stats)
-    snaps_est = weekly_snap_share_estimator(weekly_player_stats)
-    fgoe_est = weekly_fgoe_estimator(weekly_player_stats)
-    gl_carries_est = weekly_goal_line_carry_share_estimator(weekly_player_stats) # Added
+    targets_est = weekly_est[["player_id", "target_share_est"]]
+    carries_est = weekly_est[["player_id", "carry_share_est"]]
+    snaps_est = weekly_est[["player_id", "snap_share_est"]]
+    fgoe_est = weekly_est[["player_id", "fgoe_est"]]
+    gl_carries_est = weekly_est[["player_id", "goal_line_carry_share_est"]] # Added
     
     offense_stats = offense_stats.merge(targets_est, how="outer", on="player_id")
     offense_stats = offense_stats.merge(carries_est, how="outer", on="player_id")
@@ -339,8 +387,8 @@ def calculate(data: pd.DataFrame, snap_counts: pd.DataFrame, team_stats: pd.Data
     offense_stats["fgoe_est"].fillna(0, inplace=True)
     offense_stats["goal_line_carry_share_est"].fillna(0, inplace=True) # Added
     
-    rz_targets_est = weekly_redzone_target_share_estimator(weekly_player_stats)
-    rz_carries_est = weekly_redzone_carry_share_estimator(weekly_player_stats)
+    rz_targets_est = weekly_est[["player_id", "redzone_target_share_est"]]
+    rz_carries_est = weekly_est[["player_id", "redzone_carry_share_est"]]
     offense_stats = offense_stats.merge(rz_targets_est, how="outer", on="player_id")
     offense_stats = offense_stats.merge(rz_carries_est, how="outer", on="player_id")
     offense_stats["redzone_target_share_est"].fillna(0, inplace=True)
@@ -411,181 +459,89 @@ def estimate_cpoe_attribution(data: pd.DataFrame) -> None:
     print(mdf.random_effects)
 
 
-def compute_cpoe_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    cpoe_prior = 0
-    priors_df = data[['passer_player_id']].drop_duplicates()
-    priors_df['cpoe'] = cpoe_prior
+# EWMA estimator targets for player stats, computed together in calculate with one
+# _compute_estimators_vectorized call per id column. Like the teams builders, each takes
+# the plays calculate runs the estimators over (PLAY_TYPES plays, with
+# with_estimator_columns), even when its prior and mask don't depend on them.
 
-    return _compute_estimator_vectorized(
-        data,
-        'passer_player_id',
-        'cpoe',
-        passer_span,
-        priors_df,
-        'cpoe_est'
-    ).rename(columns={'passer_player_id': 'player_id'})
+def with_estimator_columns(data: pd.DataFrame) -> pd.DataFrame:
+    """Adds the derived columns the EWMA targets read: 'deep_target' (1.0 for 30+ air yards)
+    and 'big_carry' (1.0 for 10+ rushing yards), else 0.0."""
+    return data.assign(
+        deep_target=(data.air_yards >= 30).astype(float),
+        big_carry=(data.rushing_yards >= 10).astype(float),
+    )
 
 
-def compute_scramble_rate_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    data = data.loc[data["pass"] == 1]
-    scramble_prior = data.loc[data.qb_scramble == 1].shape[0] / data.shape[0] if not data.empty else 0
+def cpoe_target(data: pd.DataFrame) -> EwmaTarget:
+    # By passer_player_id, from 0 over every play.
+    return EwmaTarget('cpoe', passer_span, 'cpoe_est', prior=0)
 
-    priors_df = data[['passer_id']].drop_duplicates()
-    priors_df['qb_scramble'] = scramble_prior
 
-    return _compute_estimator_vectorized(
-        data,
-        'passer_id',
-        'qb_scramble',
-        passer_span,
-        priors_df,
-        'scramble_rate_est'
-    ).rename(columns={'passer_id': 'player_id'})
+def scramble_rate_target(data: pd.DataFrame) -> EwmaTarget:
+    # By passer_id, over dropbacks.
+    passes = data["pass"] == 1
+    n_passes = passes.sum()
+    scramble_prior = data.loc[passes & (data.qb_scramble == 1)].shape[0] / n_passes if n_passes > 0 else 0
+    return EwmaTarget('qb_scramble', passer_span, 'scramble_rate_est', prior=scramble_prior, mask=passes)
 
 
-def compute_big_carry_rate_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    # Only use rushes, avoid QB scrambles.
-    data = data.loc[data["rush"] == 1].copy()
-    data.loc[data.rushing_yards >= 10, "big_carry"] = 1
-    data["big_carry"].fillna(0, inplace=True)
-    
-    big_carry_prior = data.loc[data.big_carry == 1].shape[0] / data.shape[0] if not data.empty else 0
-    
-    priors_df = data[['rusher_player_id']].drop_duplicates()
-    priors_df['big_carry'] = big_carry_prior
-    
-    return _compute_estimator_vectorized(
-        data, 
-        'rusher_player_id', 
-        'big_carry', 
-        rusher_span, 
-        priors_df, 
-        'big_carry_rate_est'
-    ).rename(columns={'rusher_player_id': 'player_id'})
-
-
-def compute_deep_target_rate_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    data = data.copy()
-    data.loc[data.air_yards >= 30, "deep_target"] = 1
-    data["deep_target"].fillna(0, inplace=True)
-    deep_target_prior = 0
-    
-    priors_df = data[['receiver_player_id']].drop_duplicates()
-    priors_df['deep_target'] = deep_target_prior
-    
-    return _compute_estimator_vectorized(
-        data, 
-        'receiver_player_id', 
-        'deep_target', 
-        receiver_span, 
-        priors_df, 
-        'deep_target_rate_est'
-    ).rename(columns={'receiver_player_id': 'player_id'})
-
-
-def compute_yards_per_scramble_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    data = data.loc[data["qb_scramble"] == 1]
-    scramble_prior = data["rushing_yards"].mean()
-    
-    priors_df = data[['passer_id']].drop_duplicates()
-    priors_df['rushing_yards'] = scramble_prior
-    
-    return _compute_estimator_vectorized(
-        data, 
-        'passer_id', 
-        'rushing_yards', 
-        rusher_span, 
-        priors_df, 
-        'yards_per_scramble_est'
-    ).rename(columns={'passer_id': 'player_id'})
-
-
-def compute_receiver_cpoe_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    cpoe_prior = 0
-    priors_df = data[['receiver_player_id']].drop_duplicates()
-    priors_df['cpoe'] = cpoe_prior
-    
-    return _compute_estimator_vectorized(
-        data, 
-        'receiver_player_id', 
-        'cpoe', 
-        receiver_span, 
-        priors_df, 
-        'receiver_cpoe_est'
-    ).rename(columns={'receiver_player_id': 'player_id'})
-
-
-def compute_air_yards_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    air_yards_priors = {
-        "RB": data.loc[data.position_receiver == "RB"]["air_yards"].mean(),
-        "WR": data.loc[data.position_receiver == "WR"]["air_yards"].mean(),
-        "TE": data.loc[data.position_receiver == "TE"]["air_yards"].mean(),
-        "ALL": data["air_yards"].mean(),
+def big_carry_rate_target(data: pd.DataFrame) -> EwmaTarget:
+    # By rusher_player_id. Only use rushes, avoid QB scrambles. Reads 'big_carry'.
+    rushes = data["rush"] == 1
+    n_rushes = rushes.sum()
+    big_carry_prior = data.loc[rushes & (data.big_carry == 1)].shape[0] / n_rushes if n_rushes > 0 else 0
+    return EwmaTarget('big_carry', rusher_span, 'big_carry_rate_est', prior=big_carry_prior, mask=rushes)
+
+
+def deep_target_rate_target(data: pd.DataFrame) -> EwmaTarget:
+    # By receiver_player_id, from 0 over every play. Reads 'deep_target'.
+    return EwmaTarget('deep_target', receiver_span, 'deep_target_rate_est', prior=0)
+
+
+def yards_per_scramble_target(data: pd.DataFrame) -> EwmaTarget:
+    # By passer_id, over scrambles.
+    scrambles = data["qb_scramble"] == 1
+    return EwmaTarget('rushing_yards', rusher_span, 'yards_per_scramble_est', prior=data.loc[scrambles, "rushing_yards"].mean(), mask=scrambles)
+
+
+def receiver_cpoe_target(data: pd.DataFrame) -> EwmaTarget:
+    # By receiver_player_id, from 0 over every play.
+    return EwmaTarget('cpoe', receiver_span, 'receiver_cpoe_est', prior=0)
+
+
+def _position_priors(data: pd.DataFrame, target_col: str) -> pd.Series:
+    # League average of target_col for each receiver's position (their first play's), by receiver.
+    position_priors = {
+        "RB": data.loc[data.position_receiver == "RB"][target_col].mean(),
+        "WR": data.loc[data.position_receiver == "WR"][target_col].mean(),
+        "TE": data.loc[data.position_receiver == "TE"][target_col].mean(),
+        "ALL": data[target_col].mean(),
     }
 
-    def get_prior(pos):
-        return air_yards_priors.get(pos, air_yards_priors["ALL"])
+    def get_prior(pos: str) -> float:
+        return position_priors.get(pos, position_priors["ALL"])
 
-    # Generate Priors DataFrame
-    priors_df = data[['receiver_player_id', 'position_receiver']].drop_duplicates('receiver_player_id')
-    priors_df['air_yards'] = priors_df['position_receiver'].map(get_prior)
-    
-    # DEBUG
-    neg_air = data[data['air_yards'] < -10]
-    if not neg_air.empty:
-        print(f"DEBUG: Found {len(neg_air)} plays with air_yards < -10")
-        print(neg_air[['receiver_player_name', 'air_yards', 'season', 'week']].head())
-
-    res = _compute_estimator_vectorized(
-        data, 
-        'receiver_player_id', 
-        'air_yards', 
-        receiver_span, 
-        priors_df, 
-        'air_yards_est'
-    )
-    
-    # DEBUG Result
-    neg_est = res[res['air_yards_est'] < -5]
-    if not neg_est.empty:
-        print(f"DEBUG: Found {len(neg_est)} players with air_yards_est < -5")
-        print(neg_est.head())
+    receivers = data[['receiver_player_id', 'position_receiver']].drop_duplicates('receiver_player_id')
+    return pd.Series(receivers['position_receiver'].map(get_prior).to_numpy(), index=receivers['receiver_player_id'])
 
-    return res.rename(columns={'receiver_player_id': 'player_id'})
 
+def air_yards_target(data: pd.DataFrame) -> EwmaTarget:
+    # By receiver_player_id, over pass attempts.
+    attempts = data.pass_attempt == 1
+    return EwmaTarget('air_yards', receiver_span, 'air_yards_est', prior=_position_priors(data.loc[attempts], 'air_yards'), mask=attempts)
 
-def compute_ypc_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    data = data.loc[data.rush == 1]
-    ypc_prior = data["rushing_yards"].mean()
-    
-    priors_df = data[['rusher_player_id']].drop_duplicates()
-    priors_df['rushing_yards'] = ypc_prior
-    
-    return _compute_estimator_vectorized(
-        data, 
-        'rusher_player_id', 
-        'rushing_yards', 
-        rusher_span, 
-        priors_df, 
-        'ypc_est'
-    ).rename(columns={'rusher_player_id': 'player_id'})
-
-
-def compute_ypc_middle_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    data = data.loc[data.rush == 1 & data.run_gap.isin(["guard", "tackle"])]
-    ypc_prior = data["rushing_yards"].mean()
-    
-    priors_df = data[['rusher_player_id']].drop_duplicates()
-    priors_df['rushing_yards'] = ypc_prior
-    
-    return _compute_estimator_vectorized(
-        data, 
-        'rusher_player_id', 
-        'rushing_yards', 
-        rusher_span, 
-        priors_df, 
-        'ypc_middle_est'
-    ).rename(columns={'rusher_player_id': 'player_id'})
+
+def ypc_target(data: pd.DataFrame) -> EwmaTarget:
+    # By rusher_player_id, over rushes.
+    rushes = data.rush == 1
+    return EwmaTarget('rushing_yards', rusher_span, 'ypc_est', prior=data.loc[rushes, "rushing_yards"].mean(), mask=rushes)
+
+
+def ypc_middle_target(data: pd.DataFrame) -> EwmaTarget:
+    # By rusher_player_id.
+    middle = data.rush == 1 & data.run_gap.isin(["guard", "tackle"])
+    return EwmaTarget('rushing_yards', rusher_span, 'ypc_middle_est', prior=data.loc[middle, "rushing_yards"].mean(), mask=middle)
 
 
 # Use an ewma with a bias to estimate a player's chance of receiving checkdowns.
@@ -597,28 +553,10 @@ def compute_big_carry_estimator(data: pd.DataFrame) -> None:
     pass
 
 
-def compute_yac_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    yac_priors = {
-        "RB": data.loc[data.position_receiver == "RB"]["yards_after_catch"].mean(),
-        "WR": data.loc[data.position_receiver == "WR"]["yards_after_catch"].mean(),
-        "TE": data.loc[data.position_receiver == "TE"]["yards_after_catch"].mean(),
-        "ALL": data["yards_after_catch"].mean(),
-    }
-
-    def get_prior(pos: str) -> float:
-        return yac_priors.get(pos, yac_priors["ALL"])
-
-    priors_df = data[['receiver_player_id', 'position_receiver']].drop_duplicates('receiver_player_id')
-    priors_df['yards_after_catch'] = priors_df['position_receiver'].map(get_prior)
-    
-    return _compute_estimator_vectorized(
-        data, 
-        'receiver_player_id', 
-        'yards_after_catch', 
-        receiver_span, 
-        priors_df, 
-        'yac_est'
-    ).rename(columns={'receiver_player_id': 'player_id'})
+def yac_target(data: pd.DataFrame) -> EwmaTarget:
+    # By receiver_player_id, over pass attempts.
+    attempts = data.pass_attempt == 1
+    return EwmaTarget('yards_after_catch', receiver_span, 'yac_est', prior=_position_priors(data.loc[attempts], 'yards_after_catch'), mask=attempts)
 
 
 def calculate_weekly(data: pd.DataFrame, snap_counts: pd.DataFrame, weekly_team_stats: pd.DataFrame, season: int) -> pd.DataFrame:
@@ -642,7 +580,7 @@ def calculate_weekly(data: pd.DataFrame, snap_counts: pd.DataFrame, weekly_team_
         pd.DataFrame: A DataFrame containing weekly player statistics, including
                       target/carry percentages, and merged roster information.
     """
-    data = data.loc[(data.play_type.isin(["no_play", "pass", "run", "field_goal"]))]
+    data = data.loc[(data.play_type.isin(PLAY_TYPES))]
     data = data.sort_values(['season', 'week']) # Ensure data is sorted for multi-year EWMA calculation
     all_players = build_player_id_map(data)
     build_player_team_map(data)
@@ -760,8 +698,7 @@ def calculate_weekly(data: pd.DataFrame, snap_counts: pd.DataFrame, weekly_team_
 
     # --- Snap Count Integration ---
     # 1. Load ID Map to link PFR ID to GSIS ID
-    id_map = nfl_data_py.import_ids(columns=["gsis_id", "pfr_id"])
-    id_map = id_map.dropna(subset=["pfr_id", "gsis_id"]).rename(columns={"pfr_id": "pfr_player_id", "gsis_id": "player_id"})
+    id_map = nfl_data_py.gsis_ids("pfr_id").rename_axis("pfr_player_id").rename("player_id").reset_index()
     
     # 2. Merge IDs into Snap Counts
     snap_counts = snap_counts.merge(id_map, on="pfr_player_id", how="inner")
@@ -779,9 +716,7 @@ def calculate_weekly(data: pd.DataFrame, snap_counts: pd.DataFrame, weekly_team_
     weekly_stats["available"] = weekly_stats["available"].fillna(True)
     
     # Roster merge for name/position/team
-    roster_data = nfl_data_py.import_seasonal_rosters(
-        [season], columns=["player_id", "position", "team"]
-    )
+    roster_data = nfl_data_py.season_roster(season)[["position", "team"]].reset_index()
     weekly_stats = weekly_stats.merge(roster_data, on="player_id", how="left")
     
     weekly_team_targets = weekly_team_stats[
@@ -875,153 +810,76 @@ def get_weekly_injuries(season: int) -> pd.DataFrame:
     return all_injuries[["week", "player_id", "available"]]
 
 
-def weekly_target_share_estimator(weekly_data: pd.DataFrame) -> pd.DataFrame:
+def weekly_target_share_target(weekly_data: pd.DataFrame) -> EwmaTarget:
     # assume shared 1/8th
     target_prior = 0
     # Temporarily shorten span for early season.
     target_span = 17
-    
-    priors_df = weekly_data[['player_id']].drop_duplicates()
-    priors_df['target_percentage_wk'] = target_prior
-    
-    return _compute_estimator_vectorized(
-        weekly_data, 
-        'player_id', 
-        'target_percentage_wk', 
-        target_span, 
-        priors_df, 
-        'target_share_est'
-    )
+    return EwmaTarget('target_percentage_wk', target_span, 'target_share_est', prior=target_prior)
 
 
-def weekly_snap_share_estimator(weekly_data: pd.DataFrame) -> pd.DataFrame:
-    """Computes an EWMA estimator for player snap share.
+def weekly_snap_share_target(weekly_data: pd.DataFrame) -> EwmaTarget:
+    """EWMA target for player snap share.
 
     Args:
         weekly_data (pd.DataFrame): Weekly player stats including 'offense_pct'.
 
     Returns:
-        pd.DataFrame: DataFrame with 'player_id' and 'snap_share_est'.
+        EwmaTarget: The 'snap_share_est' estimator.
     """
     # Assume 10% snap share for new players
     snap_prior = 0.1
     # Short span to adapt quickly to role changes
     snap_span = 4
-    
-    priors_df = weekly_data[['player_id']].drop_duplicates()
-    priors_df['offense_pct'] = snap_prior
-    
-    return _compute_estimator_vectorized(
-        weekly_data, 
-        'player_id', 
-        'offense_pct', 
-        snap_span, 
-        priors_df, 
-        'snap_share_est'
-    )
+    return EwmaTarget('offense_pct', snap_span, 'snap_share_est', prior=snap_prior)
 
 
-def weekly_redzone_target_share_estimator(weekly_data: pd.DataFrame) -> pd.DataFrame:
+def weekly_redzone_target_share_target(weekly_data: pd.DataFrame) -> EwmaTarget:
     # assume shared 1/8th
     target_prior = 0
     # Temporarily shorten span for early season.
     target_span = 17
-    
-    priors_df = weekly_data[['player_id']].drop_duplicates()
-    priors_df['redzone_target_percentage_wk'] = target_prior
-    
-    return _compute_estimator_vectorized(
-        weekly_data, 
-        'player_id', 
-        'redzone_target_percentage_wk', 
-        target_span, 
-        priors_df, 
-        'redzone_target_share_est'
-    )
+    return EwmaTarget('redzone_target_percentage_wk', target_span, 'redzone_target_share_est', prior=target_prior)
 
 
-def weekly_carry_share_estimator(weekly_data: pd.DataFrame) -> pd.DataFrame:
+def weekly_carry_share_target(weekly_data: pd.DataFrame) -> EwmaTarget:
     # Assume rookies part of a committee of 4 backs
     carry_prior = 0
     # Temporarily shorten span for early season.
     carry_span = 17
-    
-    priors_df = weekly_data[['player_id']].drop_duplicates()
-    priors_df['carry_percentage_wk'] = carry_prior
-    
-    return _compute_estimator_vectorized(
-        weekly_data, 
-        'player_id', 
-        'carry_percentage_wk', 
-        carry_span, 
-        priors_df, 
-        'carry_share_est'
-    )
+    return EwmaTarget('carry_percentage_wk', carry_span, 'carry_share_est', prior=carry_prior)
 
 
-def weekly_redzone_carry_share_estimator(weekly_data: pd.DataFrame) -> pd.DataFrame:
+def weekly_redzone_carry_share_target(weekly_data: pd.DataFrame) -> EwmaTarget:
     # Assume part of a committee of 4 backs
     carry_prior = 0
     # Temporarily shorten span for early season.
     carry_span = 17
-    
-    priors_df = weekly_data[['player_id']].drop_duplicates()
-    priors_df['redzone_carry_percentage_wk'] = carry_prior
-    
-    return _compute_estimator_vectorized(
-        weekly_data, 
-        'player_id', 
-        'redzone_carry_percentage_wk', 
-        carry_span, 
-        priors_df, 
-        'redzone_carry_share_est'
-    )
+    return EwmaTarget('redzone_carry_percentage_wk', carry_span, 'redzone_carry_share_est', prior=carry_prior)
 
 
-def weekly_goal_line_carry_share_estimator(weekly_data: pd.DataFrame) -> pd.DataFrame:
+def weekly_goal_line_carry_share_target(weekly_data: pd.DataFrame) -> EwmaTarget:
     # Assume part of a committee of 4 backs
     carry_prior = 0
     # Temporarily shorten span for early season.
     carry_span = 17
-    
-    priors_df = weekly_data[['player_id']].drop_duplicates()
-    priors_df['goal_line_carry_percentage_wk'] = carry_prior
-    
-    return _compute_estimator_vectorized(
-        weekly_data, 
-        'player_id', 
-        'goal_line_carry_percentage_wk', 
-        carry_span, 
-        priors_df, 
-        'goal_line_carry_share_est'
-    )
+    return EwmaTarget('goal_line_carry_percentage_wk', carry_span, 'goal_line_carry_share_est', prior=carry_prior)
 
 
-def weekly_fgoe_estimator(weekly_data: pd.DataFrame) -> pd.DataFrame:
-    """Computes an EWMA estimator for Field Goal Over Expected (FGOE).
+def weekly_fgoe_target(weekly_data: pd.DataFrame) -> EwmaTarget:
+    """EWMA target for Field Goal Over Expected (FGOE).
 
     Args:
         weekly_data (pd.DataFrame): Weekly player stats including 'fgoe_wk'.
 
     Returns:
-        pd.DataFrame: DataFrame with 'player_id' and 'fgoe_est'.
+        EwmaTarget: The 'fgoe_est' estimator.
     """
     # Assume average kicker (0.0)
     fgoe_prior = 0.0
     # Span of 16 weeks (one season)
     fgoe_span = 16
-    
-    priors_df = weekly_data[['player_id']].drop_duplicates()
-    priors_df['fgoe_wk'] = fgoe_prior
-    
-    return _compute_estimator_vectorized(
-        weekly_data, 
-        'player_id', 
-        'fgoe_wk', 
-        fgoe_span, 
-        priors_df, 
-        'fgoe_est'
-    )
+    return EwmaTarget('fgoe_wk', fgoe_span, 'fgoe_est', prior=fgoe_prior)
 
 
 def build_player_id_map(data: pd.DataFrame) -> Dict[str, str]:
@@ -1,183 +1,146 @@
 import pandas as pd
-from stats.util import _compute_estimator_vectorized
+from typing import Any, Optional
+from stats.util import EwmaTarget, _compute_or_read_estimators
 
+# PBP columns calculate and calculate_weekly read (loader.load_data reads only the ones its callers list).
+PBP_COLUMNS = [
+    "season", "week", "posteam", "defteam", "play_type", "down", "pass", "rush",
+    "pass_oe", "cpoe", "air_yards", "yards_after_catch", "rushing_yards", "interception",
+    "sack", "qb_hit", "qb_scramble", "tackled_for_loss", "penalty", "penalty_type",
+    "yardline_100", "receiver_player_id", "rusher_player_id",
+]
+# Play types calculate keeps; players.calculate keeps a subset of them. A lazy PBP scan
+# (loader.PbpScan) reads only these plays for a week's stats.
+PLAY_TYPES = ["no_play", "pass", "run", "field_goal", "punt"]
 
-# Helper functions to compute EWMA estimators for team stats.
-# These must be defined before `calculate` calls them.
 
-def compute_offense_poe_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    """Computes an EWMA estimator for offensive Pass Over Expectation (POE).
+# EWMA estimator targets for team stats. calculate computes the offense and defense ones
+# together with _compute_estimators_vectorized, one call per team column. Every builder
+# takes the plays calculate runs the estimators over (PLAY_TYPES plays, with
+# with_estimator_columns), even when its prior and mask don't depend on them, so callers
+# such as stats.estimator_state can build any of them the same way.
+
+def with_estimator_columns(data: pd.DataFrame) -> pd.DataFrame:
+    """Adds the derived columns the EWMA targets read: 'go_for_it' (1 for a pass or run play, else 0)."""
+    return data.assign(go_for_it=data.play_type.isin(["pass", "run"]).astype(int))
+
+
+def offense_poe_target(data: pd.DataFrame) -> EwmaTarget:
+    """EWMA target for offensive Pass Over Expectation (POE), grouped by 'posteam'.
 
     Args:
-        data (pd.DataFrame): Play-by-play data including 'posteam' and 'pass_oe'.
+        data (pd.DataFrame): Play-by-play data including 'pass_oe'.
 
     Returns:
-        pd.DataFrame: DataFrame with 'team' and 'offense_pass_oe_est' columns.
+        EwmaTarget: The 'offense_pass_oe_est' estimator over every play, from 0.
     """
-    poe_prior = 0
-    poe_span = 500
-    priors_df = data[['posteam']].drop_duplicates().copy()
-    priors_df['pass_oe'] = poe_prior
-    return _compute_estimator_vectorized(data, 'posteam', 'pass_oe', poe_span, priors_df, 'offense_pass_oe_est', time_col='week').rename(columns={'posteam': 'team'})
+    return EwmaTarget('pass_oe', 500, 'offense_pass_oe_est', prior=0)
 
-def compute_defense_poe_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    """Computes an EWMA estimator for defensive Pass Over Expectation (POE).
+def defense_poe_target(data: pd.DataFrame) -> EwmaTarget:
+    """EWMA target for defensive Pass Over Expectation (POE), grouped by 'defteam'.
 
     Args:
-        data (pd.DataFrame): Play-by-play data including 'defteam' and 'pass_oe'.
+        data (pd.DataFrame): Play-by-play data including 'pass_oe'.
 
     Returns:
-        pd.DataFrame: DataFrame with 'team' and 'defense_pass_oe_est' columns.
+        EwmaTarget: The 'defense_pass_oe_est' estimator over every play, from 0.
     """
-    poe_prior = 0
-    poe_span = 500
-    priors_df = data[['defteam']].drop_duplicates().copy()
-    priors_df['pass_oe'] = poe_prior
-    return _compute_estimator_vectorized(data, 'defteam', 'pass_oe', poe_span, priors_df, 'defense_pass_oe_est', time_col='week').rename(columns={'defteam': 'team'})
+    return EwmaTarget('pass_oe', 500, 'defense_pass_oe_est', prior=0)
 
-def compute_defense_cpoe_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    """Computes an EWMA estimator for defensive Completion Percentage Over Expectation (CPOE).
+def defense_cpoe_target(data: pd.DataFrame) -> EwmaTarget:
+    """EWMA target for defensive Completion Percentage Over Expectation (CPOE), grouped by 'defteam'.
 
     Args:
-        data (pd.DataFrame): Play-by-play data including 'defteam' and 'cpoe'.
+        data (pd.DataFrame): Play-by-play data including 'cpoe'.
 
     Returns:
-        pd.DataFrame: DataFrame with 'team' and 'defense_cpoe_est' columns.
+        EwmaTarget: The 'defense_cpoe_est' estimator over every play, from 0.
     """
-    cpoe_prior = 0
-    cpoe_span = 500
-    priors_df = data[['defteam']].drop_duplicates().copy()
-    priors_df['cpoe'] = cpoe_prior
-    return _compute_estimator_vectorized(data, 'defteam', 'cpoe', cpoe_span, priors_df, 'defense_cpoe_est', time_col='week').rename(columns={'defteam': 'team'})
+    return EwmaTarget('cpoe', 500, 'defense_cpoe_est', prior=0)
 
-def compute_defense_yac_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    """Computes an EWMA estimator for defensive Yards After Catch (YAC) allowed.
+def defense_yac_target(data: pd.DataFrame) -> EwmaTarget:
+    """EWMA target for defensive Yards After Catch (YAC) allowed, grouped by 'defteam'.
 
     Args:
-        data (pd.DataFrame): Play-by-play data including 'defteam' and 'yards_after_catch'.
+        data (pd.DataFrame): Play-by-play data including 'yards_after_catch'.
 
     Returns:
-        pd.DataFrame: DataFrame with 'team' and 'defense_yac_est' columns.
+        EwmaTarget: The 'defense_yac_est' estimator over every play, from the league YAC.
     """
-    yac_prior = data["yards_after_catch"].mean()
-    yac_span = 500
-    priors_df = data[['defteam']].drop_duplicates().copy()
-    priors_df['yards_after_catch'] = yac_prior
-    return _compute_estimator_vectorized(data, 'defteam', 'yards_after_catch', yac_span, priors_df, 'defense_yac_est', time_col='week').rename(columns={'defteam': 'team'})
+    return EwmaTarget('yards_after_catch', 500, 'defense_yac_est', prior=data["yards_after_catch"].mean())
 
-def compute_defense_ypc_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    """Computes an EWMA estimator for defensive Yards Per Carry (YPC) allowed.
+def defense_ypc_target(data: pd.DataFrame) -> EwmaTarget:
+    """EWMA target for defensive Yards Per Carry (YPC) allowed, grouped by 'defteam'.
 
     Args:
-        data (pd.DataFrame): Play-by-play data including 'defteam' and 'rushing_yards'.
+        data (pd.DataFrame): Play-by-play data including 'rush' and 'rushing_yards'.
 
     Returns:
-        pd.DataFrame: DataFrame with 'team' and 'defense_ypc_est' columns.
+        EwmaTarget: The 'defense_ypc_est' estimator over rushes, from the league YPC.
     """
-    data_filtered = data.loc[data.rush == 1].copy()
-    ypc_prior = data_filtered["rushing_yards"].mean()
-    ypc_span = 500
-    priors_df = data_filtered[['defteam']].drop_duplicates().copy()
-    priors_df['rushing_yards'] = ypc_prior
-    return _compute_estimator_vectorized(data_filtered, 'defteam', 'rushing_yards', ypc_span, priors_df, 'defense_ypc_est', time_col='week').rename(columns={'defteam': 'team'})
+    rushes = data.rush == 1
+    return EwmaTarget('rushing_yards', 500, 'defense_ypc_est', prior=data.loc[rushes, "rushing_yards"].mean(), mask=rushes)
 
-def compute_defense_int_rate_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    """Computes an EWMA estimator for defensive Interception Rate.
+def _pass_rate_target(data: pd.DataFrame, target_col: str, result_col_name: str) -> EwmaTarget:
+    passes = data["pass"] == 1
+    n_passes = passes.sum()
+    prior = (data.loc[passes & (data[target_col] == 1)].shape[0] / n_passes) if n_passes > 0 else 0
+    return EwmaTarget(target_col, 1000, result_col_name, prior=prior, mask=passes)
+
+def defense_int_rate_target(data: pd.DataFrame) -> EwmaTarget:
+    """EWMA target for defensive Interception Rate, grouped by 'defteam'.
 
     Args:
-        data (pd.DataFrame): Play-by-play data including 'defteam', 'pass', and 'interception'.
+        data (pd.DataFrame): Play-by-play data including 'pass' and 'interception'.
 
     Returns:
-        pd.DataFrame: DataFrame with 'team' and 'defense_int_rate_est' columns.
+        EwmaTarget: The 'defense_int_rate_est' estimator over passes, from the league rate.
     """
-    pass_plays = data.loc[data["pass"] == 1].copy()
-    int_prior = (pass_plays.loc[pass_plays.interception == 1].shape[0] / pass_plays.shape[0]) if pass_plays.shape[0] > 0 else 0
-    int_span = 1000
-    priors_df = pass_plays[['defteam']].drop_duplicates().copy()
-    priors_df['interception'] = int_prior
-    return _compute_estimator_vectorized(pass_plays, 'defteam', 'interception', int_span, priors_df, 'defense_int_rate_est', time_col='week').rename(columns={'defteam': 'team'})
+    return _pass_rate_target(data, 'interception', 'defense_int_rate_est')
 
-def compute_defense_sack_rate_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    """Computes an EWMA estimator for defensive Sack Rate.
+def defense_sack_rate_target(data: pd.DataFrame) -> EwmaTarget:
+    """EWMA target for defensive Sack Rate, grouped by 'defteam'.
 
     Args:
-        data (pd.DataFrame): Play-by-play data including 'defteam', 'pass', and 'sack'.
+        data (pd.DataFrame): Play-by-play data including 'pass' and 'sack'.
 
     Returns:
-        pd.DataFrame: DataFrame with 'team' and 'defense_sack_rate_est' columns.
+        EwmaTarget: The 'defense_sack_rate_est' estimator over passes, from the league rate.
     """
-    pass_plays = data.loc[data["pass"] == 1].copy()
-    sack_prior = (pass_plays.loc[pass_plays.sack == 1].shape[0] / pass_plays.shape[0]) if pass_plays.shape[0] > 0 else 0
-    sack_span = 1000
-    priors_df = pass_plays[['defteam']].drop_duplicates().copy()
-    priors_df['sack'] = sack_prior
-    return _compute_estimator_vectorized(pass_plays, 'defteam', 'sack', sack_span, priors_df, 'defense_sack_rate_est', time_col='week').rename(columns={'defteam': 'team'})
+    return _pass_rate_target(data, 'sack', 'defense_sack_rate_est')
 
-def compute_offense_sack_rate_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    """Computes an EWMA estimator for offensive Sack Rate.
+def offense_sack_rate_target(data: pd.DataFrame) -> EwmaTarget:
+    """EWMA target for offensive Sack Rate, grouped by 'posteam'.
 
     Args:
-        data (pd.DataFrame): Play-by-play data including 'posteam', 'pass', and 'sack'.
+        data (pd.DataFrame): Play-by-play data including 'pass' and 'sack'.
 
     Returns:
-        pd.DataFrame: DataFrame with 'team' and 'offense_sack_rate_est' columns.
+        EwmaTarget: The 'offense_sack_rate_est' estimator over passes, from the league rate.
     """
-    pass_plays = data.loc[data["pass"] == 1].copy()
-    sack_prior = (pass_plays.loc[pass_plays.sack == 1].shape[0] / pass_plays.shape[0]) if pass_plays.shape[0] > 0 else 0
-    sack_span = 1000
-    priors_df = pass_plays[['posteam']].drop_duplicates().copy()
-    priors_df['sack'] = sack_prior
-    return _compute_estimator_vectorized(pass_plays, 'posteam', 'sack', sack_span, priors_df, 'offense_sack_rate_est', time_col='week').rename(columns={'posteam': 'team'})
+    return _pass_rate_target(data, 'sack', 'offense_sack_rate_est')
 
-def compute_offense_go_for_it_rate_estimator(data: pd.DataFrame) -> pd.DataFrame:
-    """Computes an EWMA estimator for offensive 'Go For It' Rate Over Expected.
+def offense_go_for_it_rate_target(data: pd.DataFrame) -> EwmaTarget:
+    """EWMA target for the offensive 'Go For It' Rate on 4th downs, grouped by 'posteam'.
 
-    This captures a team's aggressiveness on 4th downs, relative to the league average.
+    This captures a team's aggressiveness on 4th downs. calculate reports it relative to
+    the league average (the prior), as 'offense_go_for_it_rate_est'.
 
     Args:
-        data (pd.DataFrame): Play-by-play data including 'posteam', 'down', 'play_type', 'week'.
+        data (pd.DataFrame): Play-by-play data including 'down' and 'go_for_it' (1 for a
+            pass or run play, else 0).
 
     Returns:
-        pd.DataFrame: DataFrame with 'team' and 'offense_go_for_it_rate_est' columns.
+        EwmaTarget: The 'offense_go_for_it_rate_est_raw' estimator over 4th downs, from
+                    the league 'go for it' rate.
     """
-    fourth_down_plays = data.loc[data.down == 4].copy()
-    
-    if fourth_down_plays.empty:
-        # Return an empty DataFrame with the correct columns if no 4th down plays exist
-        return pd.DataFrame(columns=['team', 'offense_go_for_it_rate_est'])
-
-    # Calculate actual 'go_for_it' for each 4th down play
-    fourth_down_plays['go_for_it'] = fourth_down_plays['play_type'].apply(lambda x: 1 if x in ['pass', 'run'] else 0)
-    
-    # League average 'go_for_it' rate on 4th down
-    lg_go_rate = fourth_down_plays['go_for_it'].mean()
-    
-    go_prior = lg_go_rate
+    fourth_downs = data.down == 4
     go_span = 50 # Adjust faster for coaching changes (e.g., ~3 seasons of 16 games)
-    
-    # Ensure 'posteam' and 'go_for_it' are present for priors_df
-    priors_df = fourth_down_plays[['posteam']].drop_duplicates().copy()
-    priors_df['go_for_it'] = go_prior
-    
-    go_for_it_est = _compute_estimator_vectorized(
-        fourth_down_plays,
-        'posteam',
-        'go_for_it',
-        go_span,
-        priors_df,
-        'offense_go_for_it_rate_est_raw', # Raw value
-        time_col='week'
-    ).rename(columns={'posteam': 'team'})
-
-    # Calculate "Over Expected" relative to league average
-    # A positive value means the team goes for it more than the league average.
-    go_for_it_est['offense_go_for_it_rate_est'] = go_for_it_est['offense_go_for_it_rate_est_raw'] - lg_go_rate
-    
-    return go_for_it_est[['team', 'offense_go_for_it_rate_est']]
+    return EwmaTarget('go_for_it', go_span, 'offense_go_for_it_rate_est_raw', prior=data.loc[fourth_downs, "go_for_it"].mean(), mask=fourth_downs)
 
 
 # Calculate team statistics that are used to determine tendencies.
-def calculate(data: pd.DataFrame, season: int) -> pd.DataFrame:
+def calculate(data: pd.DataFrame, season: int, estimators: Optional[Any] = None) -> pd.DataFrame:
     """Calculates various team-level statistics and EWMA-smoothed estimators.
 
     Args:
@@ -187,14 +150,16 @@ def calculate(data: pd.DataFrame, season: int) -> pd.DataFrame:
             'cpoe', 'yardline_100', 'receiver_player_id', 'rusher_player_id',
             'qb_hit', 'tackled_for_loss', 'penalty_type', 'penalty', 'week'.
         season (int): The current season for which to calculate team stats.
+        estimators (Optional[stats.estimator_state.EstimatorState]): A state advanced
+            over `data`. The EWMA estimators are read from it instead of recomputed.
 
     Returns:
         pd.DataFrame: A DataFrame containing calculated team statistics and estimators,
                       including offensive/defensive efficiency, pressure rates, and
                       relative metrics compared to league averages.
     """
-    data = data.loc[(data.play_type.isin(["no_play", "pass", "run", "field_goal", "punt"]))] # Include punt for 4th down plays
-    data = data.sort_values('week') # Ensure data is sorted by week for EWMA calculations
+    data = data.loc[(data.play_type.isin(PLAY_TYPES))] # Include punt for 4th down plays
+    data = data.sort_values('week', kind='mergesort') # Ensure data is sorted by week for EWMA calculations, keeping play order within a week
 
     lg_avg_ypc = data.loc[data.rush == 1]["rushing_yards"].mean()
     lg_avg_yac = data["yards_after_catch"].mean()
@@ -207,6 +172,26 @@ def calculate(data: pd.DataFrame, season: int) -> pd.DataFrame:
         lvg_avg_int_rate = 0.0
         lvg_avg_sack_rate = 0.0
 
+    # All EWMA estimators, from one sort of the plays per team column.
+    data = with_estimator_columns(data)
+    go_for_it_target = offense_go_for_it_rate_target(data)
+    offense_est = _compute_or_read_estimators(
+        data, "posteam", [offense_poe_target(data), offense_sack_rate_target(data), go_for_it_target], estimators
+    ).rename(columns={"posteam": "team"})
+    defense_est = _compute_or_read_estimators(
+        data,
+        "defteam",
+        [
+            defense_poe_target(data),
+            defense_yac_target(data),
+            defense_cpoe_target(data),
+            defense_ypc_target(data),
+            defense_int_rate_target(data),
+            defense_sack_rate_target(data),
+        ],
+        estimators,
+    ).rename(columns={"defteam": "team"})
+
     pass_happiness_offense = (
         data.groupby("posteam")["pass_oe"]
         .mean()
@@ -215,7 +200,7 @@ def calculate(data: pd.DataFrame, season: int) -> pd.DataFrame:
         .reset_index()
         .rename(columns={"posteam": "team"})
     )
-    pass_happiness_offense_est = compute_offense_poe_estimator(data)
+    pass_happiness_offense_est = offense_est[["team", "offense_pass_oe_est"]]
     pass_suppression_defense = (
         data.groupby("defteam")["pass_oe"]
         .mean()
@@ -224,7 +209,7 @@ def calculate(data: pd.DataFrame, season: int) -> pd.DataFrame:
         .reset_index()
         .rename(columns={"defteam": "team"})
     )
-    pass_suppression_defense_est = compute_defense_poe_estimator(data)
+    pass_suppression_defense_est = defense_est[["team", "defense_pass_oe_est"]]
     goal_line_pass_happiness_offense = (
         data.loc[data.yardline_100 <= 10]
         .groupby("posteam")["pass_oe"]
@@ -276,7 +261,7 @@ def calculate(data: pd.DataFrame, season: int) -> pd.DataFrame:
         .reset_index()
         .rename(columns={"defteam": "team"})
     )
-    yac_est = compute_defense_yac_estimator(data)
+    yac_est = defense_est[["team", "defense_yac_est"]]
     mean_cpoe = (
         data.loc[(data.play_type.isin(["no_play", "pass", "run"]))]
         .groupby("defteam")["cpoe"]
@@ -286,7 +271,7 @@ def calculate(data: pd.DataFrame, season: int) -> pd.DataFrame:
         .reset_index()
         .rename(columns={"defteam": "team"})
     )
-    cpoe_est = compute_defense_cpoe_estimator(data)
+    cpoe_est = defense_est[["team", "defense_cpoe_est"]]
     mean_air_yards = (
         data.groupby("defteam")["air_yards"]
         .mean()
@@ -304,7 +289,7 @@ def calculate(data: pd.DataFrame, season: int) -> pd.DataFrame:
         .reset_index()
         .rename(columns={"defteam": "team"})
     )
-    ypc_est = compute_defense_ypc_estimator(data)
+    ypc_est = defense_est[["team", "defense_ypc_est"]]
     targets = (
         data.groupby("posteam")["receiver_player_id"]
         .count()
@@ -443,7 +428,10 @@ def calculate(data: pd.DataFrame, season: int) -> pd.DataFrame:
         .reset_index()
         .rename(columns={"posteam": "team"})
     )
-    go_for_it_est = compute_offense_go_for_it_rate_estimator(data)
+    # Relative to the league average: a positive value means the team goes for it more often.
+    go_for_it_est = offense_est[["team"]].assign(
+        offense_go_for_it_rate_est=offense_est["offense_go_for_it_rate_est_raw"] - go_for_it_target.prior
+    )
 
     all_teams = pd.DataFrame(
         pd.concat([data["posteam"], data["defteam"]]).dropna().unique(),
@@ -501,7 +489,8 @@ def calculate(data: pd.DataFrame, season: int) -> pd.DataFrame:
     team_stats["offense_sacks_per_dropback"] = (
         team_stats["offense_sacks"] / team_stats["dropbacks"]
     )
-    team_stats = team_stats.merge(compute_offense_sack_rate_estimator(data), on="team")
+    # Inner merges: teams without a pass play (NaN pass rate estimate) are dropped.
+    team_stats = team_stats.merge(offense_est[["team", "offense_sack_rate_est"]].dropna(), on="team")
     team_stats["offense_qb_hits_per_dropback"] = (
         team_stats["offense_qb_hits"] / team_stats["dropbacks"]
     )
@@ -511,11 +500,11 @@ def calculate(data: pd.DataFrame, season: int) -> pd.DataFrame:
     team_stats["defense_int_rate"] = (
         team_stats["def_ints"] / team_stats["dropbacks_def"]
     )
-    team_stats = team_stats.merge(compute_defense_int_rate_estimator(data), on="team")
+    team_stats = team_stats.merge(defense_est[["team", "defense_int_rate_est"]].dropna(), on="team")
     team_stats["defense_sacks_per_dropback"] = (
         team_stats["defense_sacks"] / team_stats["dropbacks_def"]
     )
-    team_stats = team_stats.merge(compute_defense_sack_rate_estimator(data), on="team")
+    team_stats = team_stats.merge(defense_est[["team", "defense_sack_rate_est"]].dropna(), on="team")
     team_stats["defense_relative_ypc"] = team_stats["defense_ypc"] / lg_avg_ypc
     team_stats["defense_relative_yac"] = team_stats["defense_yac"] / lg_avg_yac
     team_stats["defense_relative_ypc_est"] = team_stats["defense_ypc_est"] / lg_avg_ypc
@@ -1,3 +1,5 @@
+from typing import Any, NamedTuple, Optional, Sequence, Union
+import numpy as np
 import pandas as pd
 
 def _compute_estimator_vectorized(
@@ -70,3 +72,138 @@ def _compute_estimator_vectorized(
     # 7. Extract latest estimate (tail 1)
     result = combined.groupby(group_col).tail(1)[[group_col, result_col_name]]
     return result
+
+
+class EwmaTarget(NamedTuple):
+    """One estimator of _compute_estimators_vectorized.
+
+    Attributes:
+        target_col (str): The column of observed values.
+        span (int): The span parameter for the EWMA calculation.
+        result_col_name (str): The name of the estimator column in the result.
+        prior (float | pd.Series): The value every group starts from, or a Series of
+            them indexed by group.
+        mask (pd.Series, optional): Rows of the data the estimator uses (all if None).
+            Rows outside it are skipped, whereas NaN values in rows it uses decay the
+            weight of the estimate, as they do in `ewm(adjust=False)`.
+    """
+    target_col: str
+    span: int
+    result_col_name: str
+    prior: Union[float, pd.Series] = 0
+    mask: Optional[pd.Series] = None
+
+
+def _compute_estimators_vectorized(
+    data: pd.DataFrame,
+    group_col: str,
+    targets: Sequence[EwmaTarget],
+    time_col: str = 'week'
+) -> pd.DataFrame:
+    """Several prior-seeded EWMA estimators over one grouping, from a single sort.
+
+    Gives each target the same result as `_compute_estimator_vectorized` with that
+    target's rows (`mask`), span and prior, bit for bit. The rows are sorted once by
+    group, season and `time_col`, and each (target, group) pair becomes a segment of its
+    observations. The EWMA recurrence then advances the i-th observation of every segment
+    in one NumPy step, with pandas' arithmetic, so there are as many steps as the longest
+    segment has observations.
+
+    Args:
+        data (pd.DataFrame): The input DataFrame containing historical data.
+            Must contain `group_col`, `time_col` and every `target_col`.
+            Optionally contains 'season'.
+        group_col (str): The column to group by (e.g., 'player_id', 'posteam').
+        targets (Sequence[EwmaTarget]): The estimators to compute.
+        time_col (str, optional): The column representing the time unit for sorting (default 'week').
+
+    Returns:
+        pd.DataFrame: `group_col` and one column per target's `result_col_name`, with a
+                      row for each group any target has rows for, sorted by group. A
+                      group without rows for a target gets NaN in its column.
+    """
+    codes, groups = pd.factorize(data[group_col], sort=True)
+    keep = codes >= 0
+    sort_keys = [data[time_col].to_numpy()[keep]]
+    if 'season' in data.columns:
+        sort_keys.append(data['season'].to_numpy()[keep])
+    # np.lexsort is stable and sorts by its last key first: group, season, time.
+    rows = np.flatnonzero(keep)[np.lexsort(sort_keys + [codes[keep]])]
+    n_groups = len(groups)
+
+    values = np.empty(len(targets) * n_groups)
+    seen = np.zeros(len(targets) * n_groups, dtype=bool)
+    alphas = np.empty(len(targets) * n_groups)
+    segments, observations, ranks = [], [], []
+    for i, target in enumerate(targets):
+        target_rows = rows if target.mask is None else rows[target.mask.to_numpy(dtype=bool)[rows]]
+        target_codes = codes[target_rows]
+        segment = slice(i * n_groups, (i + 1) * n_groups)
+        if isinstance(target.prior, pd.Series):
+            values[segment] = target.prior.reindex(groups).to_numpy(dtype=float)
+        else:
+            values[segment] = target.prior
+        seen[segment] = np.bincount(target_codes, minlength=n_groups) > 0
+        # Same weights as pandas: alpha = 1 / (1 + com), com = (span - 1) / 2.
+        alphas[segment] = 1. / (1. + (target.span - 1) / 2)
+        starts = np.flatnonzero(np.diff(target_codes, prepend=-1))
+        segments.append(i * n_groups + target_codes)
+        observations.append(data[target.target_col].to_numpy(dtype=float)[target_rows])
+        ranks.append(np.arange(len(target_rows)) - np.repeat(starts, np.diff(np.append(starts, len(target_rows)))))
+
+    segments = np.concatenate(segments)
+    observations = np.concatenate(observations)
+    ranks = np.concatenate(ranks)
+    step_order = np.argsort(ranks, kind='stable')
+    segments = segments[step_order]
+    observations = observations[step_order]
+    bounds = np.cumsum(np.bincount(ranks)) if len(ranks) else []
+    weights = np.ones(len(values))
+    factors = 1. - alphas
+
+    # One step of ewm(adjust=False).mean() for the rank-th observation of each segment.
+    start = 0
+    for stop in bounds:
+        segment = segments[start:stop]
+        cur = observations[start:stop]
+        start = stop
+        weighted = values[segment]
+        old_wt = weights[segment]
+        alpha = alphas[segment]
+        live = weighted == weighted
+        observed = cur == cur
+        old_wt = np.where(live, old_wt * factors[segment], old_wt)
+        update = live & observed & (weighted != cur)
+        weighted = np.where(update, (old_wt * weighted + alpha * cur) / (old_wt + alpha), weighted)
+        values[segment] = np.where(live | ~observed, weighted, cur)
+        weights[segment] = np.where(live & observed, 1., old_wt)
+
+    values[~seen] = np.nan
+    values = values.reshape(len(targets), n_groups)
+    present = seen.reshape(len(targets), n_groups).any(axis=0)
+    result = pd.DataFrame({group_col: groups[present]})
+    for i, target in enumerate(targets):
+        result[target.result_col_name] = values[i, present]
+    return result
+
+
+def _compute_or_read_estimators(
+    data: pd.DataFrame,
+    group_col: str,
+    targets: Sequence[EwmaTarget],
+    state: Optional[Any] = None,
+) -> pd.DataFrame:
+    """`_compute_estimators_vectorized`, or the same table from an estimator state.
+
+    Args:
+        data (pd.DataFrame): As for `_compute_estimators_vectorized`.
+        group_col (str): The column to group by.
+        targets (Sequence[EwmaTarget]): The estimators to compute.
+        state (Optional[stats.estimator_state.EstimatorState]): A state advanced over the
+            same plays. Its estimates are read, with the targets' priors, instead of
+            recomputing the EWMAs.
+    """
+    if state is None:
+        return _compute_estimators_vectorized(data, group_col, targets)
+    names = [target.result_col_name for target in targets]
+    return state.table(group_col, names, {target.result_col_name: target.prior for target in targets})
@@ -217,4 +217,30 @@ def mock_models_for_game_state():
         "yac_TE_rz_samples": mock_samples,
         "yac_ALL_open_samples": mock_samples,
         "yac_ALL_rz_samples": mock_samples,
-    }
\ No newline at end of file
+    }
+
+
+class FixedProbaModel:
+    """Stand-in for a fitted classifier that returns the same probabilities for every row."""
+
+    def __init__(self, classes, probs):
+        self.classes_ = classes
+        self.probs = np.array(probs, dtype=float)
+
+    def predict_proba(self, X):
+        return np.tile(self.probs, (len(X), 1))
+
+
+@pytest.fixture
+def vector_models(mock_models_for_game_state):
+    """Mock models that answer batched predict_proba calls, with spread-out sample buffers."""
+    models = dict(mock_models_for_game_state)
+    models["playcall_model"] = FixedProbaModel(['field_goal', 'pass', 'punt', 'run'], [0.1, 0.5, 0.1, 0.3])
+    models["field_goal_model"] = FixedProbaModel(['made', 'missed'], [0.8, 0.2])
+    models["completion_model"] = FixedProbaModel([0, 1], [0.35, 0.65])
+    rng = np.random.default_rng(0)
+    for key in list(models):
+        if key.endswith("_samples"):
+            models[key] = rng.normal(5.0, 6.0, 1000)
+    models["int_return_samples"] = rng.normal(10.0, 5.0, 1000)
+    return models
@@ -1,7 +1,7 @@
 import unittest
 import pandas as pd
 import os
-from stats import players
+from stats import util
 
 class TestRegression(unittest.TestCase):
     def test_vectorized_sorting(self):
@@ -21,7 +21,7 @@ class TestRegression(unittest.TestCase):
         
         # Compute Estimate
         # Span = 3 (Fast adaptation)
-        result = players._compute_estimator_vectorized(
+        result = util._compute_estimator_vectorized(
             data, 'player_id', 'value', 3, prior, 'est', time_col='week'
         )
         
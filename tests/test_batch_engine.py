@@ -0,0 +1,192 @@
+import copy
+import random
+import numpy as np
+import pandas as pd
+from engine.batch import BatchGameState, PASS, RUN
+from engine.context import MatchupContext
+from engine.game import GameState
+from engine.rng import sim_seed
+from settings import ScoringSettings
+from enums import PlayType
+from main import project_game_batch
+
+
+def _game_args(models, player_stats, team_stats, home="BUF", away="MIA"):
+    return dict(
+        models=models,
+        home_team=home,
+        away_team=away,
+        home_player_stats=player_stats[player_stats['team'] == home],
+        away_player_stats=player_stats[player_stats['team'] == away],
+        home_team_stats=team_stats[team_stats['team'] == home],
+        away_team_stats=team_stats[team_stats['team'] == away],
+        rules=ScoringSettings(),
+    )
+
+
+def test_batch_games_complete(vector_models, mock_player_stats, mock_team_stats):
+    """Every simulated game should finish and export one column per simulation."""
+    batch = BatchGameState(**_game_args(vector_models, mock_player_stats, mock_team_stats), n_simulations=64, seed=1)
+    points = batch.play_games()
+
+    assert batch.game_over.all()
+    assert list(points.columns) == list(range(64))
+    assert points.loc["BUF"].notna().all()
+    assert points.loc["MIA"].notna().all()
+    assert "QB_BUF" in points.index
+    # Regulation ends with a winner unless overtime ran.
+    regulation = batch.quarter <= 4
+    assert (batch.home_score[regulation] != batch.away_score[regulation]).all()
+
+
+def test_advance_clock_matches_scalar(vector_models, mock_player_stats, mock_team_stats):
+    """The vectorized clock must apply the same runoff, two-minute warning and quarter logic."""
+    vector_models = dict(vector_models)
+    vector_models["clock_model"] = {
+        ("regulation", "high", "tied", "run"): 40.0,
+        ("Q4", "low", "leading_close", "pass_complete"): 30.0,
+        ("OT", "mid", "tied", "pass_incomplete"): 6.0,
+    }
+    args = _game_args(vector_models, mock_player_stats, mock_team_stats)
+    states = []
+    for quarter in [1, 2, 3, 4, 5]:
+        for sec in [1, 20, 125, 130, 301, 600]:
+            for home_score, away_score in [(0, 0), (3, 0), (0, 17)]:
+                for playcall, sack, complete, scramble in [
+                    (RUN, False, 0, False),
+                    (PASS, False, 1, False),
+                    (PASS, False, 0, False),
+                    (PASS, True, 0, False),
+                    (PASS, False, 0, True),
+                ]:
+                    states.append((quarter, sec, home_score, away_score, playcall, sack, complete, scramble))
+
+    n = len(states)
+    batch = BatchGameState(**args, n_simulations=n, seed=0)
+    batch.quarter[:] = [s[0] for s in states]
+    batch.sec_remaining[:] = [s[1] for s in states]
+    batch.home_score[:] = [s[2] for s in states]
+    batch.away_score[:] = [s[3] for s in states]
+    batch.in_overtime[:] = batch.quarter >= 5
+    playcall = np.array([s[4] for s in states])
+    batch.advance_clock(
+        np.ones(n, dtype=bool),
+        playcall,
+        np.array([s[5] for s in states]),
+        np.array([bool(s[6]) for s in states]),
+        np.array([s[7] for s in states]),
+    )
+
+    template = GameState(**args)
+    for i, (quarter, sec, home_score, away_score, call, sack, complete, scramble) in enumerate(states):
+        game = copy.copy(template)
+        game.posteam = "BUF"
+        game.second_half_posteam = "MIA"
+        game.quarter, game.sec_remaining = quarter, sec
+        game.home_score, game.away_score = home_score, away_score
+        game.in_overtime = quarter >= 5
+        game.advance_clock(PlayType.RUN if call == RUN else PlayType.PASS, sack, complete, scramble)
+
+        assert batch.sec_remaining[i] == game.sec_remaining, states[i]
+        assert batch.quarter[i] == game.quarter, states[i]
+        assert batch.game_over[i] == game.game_over, states[i]
+        assert batch.in_overtime[i] == game.in_overtime, states[i]
+
+
+def test_scoring_helpers(vector_models, mock_player_stats, mock_team_stats):
+    """Safeties, turnovers on downs and OT touchdowns update only the masked games."""
+    batch = BatchGameState(**_game_args(vector_models, mock_player_stats, mock_team_stats), n_simulations=3, seed=0)
+    batch.opening_kickoff()
+    batch.pos_home[:] = True
+    batch.yard_line[:] = 40
+
+    batch.safety(np.array([True, False, False]))
+    assert list(batch.away_score) == [2, 0, 0]
+    assert list(batch.pos_home) == [False, True, True]
+    assert batch.yard_line[0] == 75
+
+    batch.turnover_on_downs(np.array([False, True, False]))
+    assert list(batch.pos_home) == [False, False, True]
+    assert batch.yard_line[1] == 60
+    assert batch.down[1] == 1 and batch.yds_to_go[1] == 10
+
+    batch.in_overtime[2] = True
+    batch.touchdown(np.array([False, False, True]))
+    assert list(batch.home_score) == [0, 0, 6]
+    assert list(batch.game_over) == [False, False, True]
+
+
+def test_batch_scores_match_scalar_engine(vector_models, mock_player_stats, mock_team_stats):
+    """The batch engine should reproduce the scalar engine's scoring distribution."""
+    args = _game_args(vector_models, mock_player_stats, mock_team_stats)
+    n = 300
+
+    random.seed(7)
+    template = GameState(**args)
+    scalar_scores = []
+    for _ in range(n):
+        game = copy.copy(template)
+        game.reset_points()
+        game.play_game()
+        scalar_scores.append(game.home_score + game.away_score)
+    scalar_scores = np.array(scalar_scores)
+
+    batch = BatchGameState(**args, n_simulations=n, seed=7)
+    batch.play_games()
+    batch_scores = batch.home_score + batch.away_score
+
+    stderr = np.sqrt(scalar_scores.var() / n + batch_scores.var() / n)
+    assert abs(scalar_scores.mean() - batch_scores.mean()) < 4 * stderr
+
+
+def test_project_game_batch_questionable_scenarios(vector_models, mock_player_stats, mock_team_stats, mock_app_config):
+    """Simulations are grouped by injury scenario and returned in simulation order."""
+    player_stats = mock_player_stats.copy()
+    player_stats.loc[player_stats.player_id == "WR_MIA", "status"] = "Questionable"
+    np.random.seed(3)
+
+    points = project_game_batch(
+        vector_models, player_stats, mock_team_stats, "BUF", "MIA", 1, mock_app_config, n=200
+    )
+
+    assert list(points.columns) == list(range(200))
+    assert points.loc["MIA"].notna().all()
+    # WR_MIA is scratched in roughly a quarter of the simulations.
+    scratched = points.loc["WR_MIA"].isna().mean()
+    assert 0.1 < scratched < 0.4
+
+
+def test_project_game_batch_scenarios_follow_seeds(vector_models, mock_player_stats, mock_team_stats, mock_app_config):
+    """With seeds, a simulation's scenario is the one the scalar engine draws for that seed."""
+    player_stats = mock_player_stats.copy()
+    player_stats.loc[player_stats.player_id == "WR_MIA", "status"] = "Questionable"
+    seeds = [sim_seed(2024, 1, 0, sim) for sim in range(60)]
+
+    points = project_game_batch(
+        vector_models, player_stats, mock_team_stats, "BUF", "MIA", 1, mock_app_config, seeds=seeds
+    )
+
+    context = MatchupContext(vector_models, "BUF", "MIA", player_stats, mock_team_stats, ScoringSettings())
+    scratched = context.sample_scenarios(seeds)[:, 0]
+    assert list(points.columns) == list(range(60))
+    assert scratched.any()
+    # A scratched WR_MIA never scores.
+    assert points.loc["WR_MIA", scratched].isna().all()
+
+
+def test_project_game_batch_replays_seeds(vector_models, mock_player_stats, mock_team_stats, mock_app_config):
+    """The same seeds give the same points, whatever the global RNG state."""
+    player_stats = mock_player_stats.copy()
+    player_stats.loc[player_stats.player_id == "WR_MIA", "status"] = "Questionable"
+    seeds = [sim_seed(2024, 1, 0, sim) for sim in range(40)]
+
+    def project(seeds):
+        return project_game_batch(
+            vector_models, player_stats, mock_team_stats, "BUF", "MIA", 1, mock_app_config, seeds=seeds
+        )
+
+    points = project(seeds)
+    np.random.seed(11)
+    random.seed(11)
+    pd.testing.assert_frame_equal(project(seeds), points)
+    assert not project([sim_seed(2024, 1, 1, sim) for sim in range(40)]).equals(points)
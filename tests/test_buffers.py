@@ -0,0 +1,52 @@
+import functools
+import numpy as np
+import pytest
+from engine.buffers import SampleBuffers, sample_keys
+from engine.context import MatchupContext
+from engine.pool import SimulationPool
+from engine.rng import sim_seed
+from main import simulate_matchup
+from settings import ScoringSettings
+
+
+@pytest.fixture
+def models(vector_models):
+    rng = np.random.default_rng(0)
+    models = dict(vector_models)
+    for key in sample_keys(vector_models):
+        models[key] = rng.gamma(2.0, 3.0, 1000) - 1.0
+    return models
+
+
+def _without_samples(models):
+    return {key: value for key, value in models.items() if key not in sample_keys(models)}
+
+
+@pytest.mark.parametrize("memmap", [False, True])
+def test_buffers_pack_every_sample_array(models, memmap, tmp_path):
+    path = str(tmp_path / "samples.f32") if memmap else None
+    buffers = SampleBuffers.create(models, path=path)
+    attached = SampleBuffers.attach(buffers.spec)
+
+    assert "scramble_samples_mobile" in buffers.arrays and "rush_open_model" not in buffers.arrays
+    assert set(buffers.arrays) == set(sample_keys(models))
+    assert buffers.nbytes == 4 * sum(len(models[key]) for key in sample_keys(models))
+    for key, array in attached.arrays.items():
+        np.testing.assert_array_equal(array, models[key].astype(np.float32))
+        assert not array.flags.writeable
+    with pytest.raises(ValueError):
+        attached.arrays["rush_open_samples"][0] = 1.0
+    attached.close()
+    buffers.close()
+
+
+def test_pool_workers_share_the_parent_buffers(models, mock_player_stats, mock_team_stats):
+    buffers = SampleBuffers.create(models)
+    shared = dict(models, **buffers.arrays)
+    # Workers load everything but the samples, which they attach from the parent.
+    loader = functools.partial(_without_samples, models)
+    with SimulationPool(loader, processes=2, sample_buffers=buffers) as pool:
+        context = MatchupContext(shared, "BUF", "MIA", mock_player_stats, mock_team_stats, ScoringSettings())
+        seeds = [sim_seed(2024, 3, 0, sim) for sim in range(6)]
+        points, _ = pool.simulate(context, seeds)
+    np.testing.assert_array_equal(points, np.vstack([simulate_matchup(context, seed)[0] for seed in seeds]))
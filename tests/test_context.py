@@ -0,0 +1,125 @@
+import itertools
+import random
+import pandas as pd
+import pytest
+from engine.context import MatchupContext
+from engine.game import GameState
+from engine.rng import SimRandom, sim_seed
+from main import _apply_injury_scenario
+from settings import ScoringSettings
+
+ROSTER_ATTRS = [
+    "%s_%s" % (side, attr)
+    for side in ["home", "away"]
+    for attr in [
+        "qbs", "kickers", "carriers", "carry_weights", "rz_carriers", "rz_carry_weights",
+        "gl_carriers", "gl_carry_weights", "targets", "target_weights",
+    ]
+]
+
+
+@pytest.fixture
+def questionable_stats(mock_player_stats):
+    """Both teams with questionable players, including a starting QB who has a backup."""
+    backup = mock_player_stats[mock_player_stats.player_id == "QB_BUF"].assign(player_id="QB2_BUF")
+    stats = pd.concat([mock_player_stats, backup], ignore_index=True)
+    stats["starting_qb"] = 0
+    stats["pass_attempts"] = 0
+    stats.loc[stats.player_id == "QB_BUF", "pass_attempts"] = 300
+    stats.loc[stats.player_id == "QB2_BUF", "pass_attempts"] = 40
+    stats.loc[stats.player_id.isin(["QB_BUF", "RB_BUF", "WR_MIA"]), "status"] = "Questionable"
+    return stats
+
+
+def _roster(game, attr):
+    # Candidate lists hold PlayerTable indices; compare them by player id.
+    value = getattr(game, attr)
+    return value if attr.endswith("weights") else [game.players.ids[i] for i in value]
+
+
+def _dataframe_game(models, player_stats, team_stats, scratched):
+    # The per-simulation construction that MatchupContext replaces.
+    q_indices = player_stats.index[player_stats["status"] == "Questionable"]
+    player_stats = _apply_injury_scenario(player_stats, q_indices, scratched)
+    return GameState(
+        models, "BUF", "MIA",
+        player_stats[player_stats["team"].isin(["BUF"])],
+        player_stats[player_stats["team"].isin(["MIA"])],
+        team_stats[team_stats["team"].isin(["BUF"])],
+        team_stats[team_stats["team"].isin(["MIA"])],
+        rules=ScoringSettings(),
+    )
+
+
+def test_context_matches_dataframe_construction(vector_models, questionable_stats, mock_team_stats):
+    context = MatchupContext(vector_models, "BUF", "MIA", questionable_stats, mock_team_stats, ScoringSettings())
+    assert len(context.questionable) == 3
+
+    for scratched in itertools.product([False, True], repeat=3):
+        expected = _dataframe_game(vector_models, questionable_stats, mock_team_stats, scratched)
+        game = context.game_state(scratched)
+
+        for attr in ROSTER_ATTRS:
+            assert _roster(game, attr) == _roster(expected, attr), (attr, scratched)
+        assert game.home_team_stats_dict == expected.home_team_stats_dict
+        assert game.away_team_stats_dict == expected.away_team_stats_dict
+        assert game.vegas_total == expected.vegas_total
+
+
+def test_scratched_starter_falls_back_to_backup(vector_models, questionable_stats, mock_team_stats):
+    context = MatchupContext(vector_models, "BUF", "MIA", questionable_stats, mock_team_stats, ScoringSettings())
+
+    assert _roster(context.game_state([False, False, False]), "home_qbs") == ["QB_BUF"]
+    assert _roster(context.game_state([True, False, False]), "home_qbs") == ["QB2_BUF"]
+
+
+def test_rosters_are_cached_and_shared_records_untouched(vector_models, questionable_stats, mock_team_stats):
+    context = MatchupContext(vector_models, "BUF", "MIA", questionable_stats, mock_team_stats, ScoringSettings())
+
+    limited = context.roster([False, False, False])
+    assert context.roster([False, False, False]) is limited
+    assert context.roster(None) is limited
+    # Limited players get reduced shares without modifying the compiled records.
+    rb = limited["home_carriers"].index(context.players.index["RB_BUF"])
+    assert limited["home_carry_weights"][rb] == pytest.approx(0.4)
+    assert context._teams["home"].records[1]["carry_share_est"] == 0.5
+
+
+def test_sampled_games_are_independent(vector_models, questionable_stats, mock_team_stats):
+    context = MatchupContext(vector_models, "BUF", "MIA", questionable_stats, mock_team_stats, ScoringSettings())
+
+    random.seed(4)
+    first = context.sample_game_state()
+    first.play_game()
+    second = context.sample_game_state()
+
+    assert first.game_over and not second.game_over
+    assert second.fantasy_points == {}
+    assert second.home_score == second.away_score == 0
+
+
+def test_scenario_matrix_matches_per_sim_draws(vector_models, questionable_stats, mock_team_stats):
+    context = MatchupContext(vector_models, "BUF", "MIA", questionable_stats, mock_team_stats, ScoringSettings())
+    seeds = [sim_seed(2024, 5, 0, sim) for sim in range(400)]
+    scenarios = context.sample_scenarios(seeds)
+
+    assert scenarios.shape == (400, 3) and scenarios.dtype == bool
+    for seed, row in zip(seeds[:50], scenarios):
+        assert context.sample_scenario(SimRandom(seed)) == row.tolist()
+    assert 0.15 < scenarios.mean() < 0.35
+    assert context.sample_scenarios([]).shape == (0, 3)
+
+
+def test_injury_scenario_frame(questionable_stats):
+    q_indices = questionable_stats.index[questionable_stats["status"] == "Questionable"]
+    scenario = _apply_injury_scenario(questionable_stats, q_indices, [True, False, False])
+
+    assert "QB_BUF" not in set(scenario.player_id)
+    assert len(scenario) == len(questionable_stats) - 1
+    limited = scenario.set_index("player_id").loc["RB_BUF"]
+    original = questionable_stats.set_index("player_id").loc["RB_BUF"]
+    assert limited.carry_share_est == pytest.approx(0.8 * original.carry_share_est)
+    assert limited.target_share_est == pytest.approx(0.8 * original.target_share_est)
+    assert limited.redzone_carry_share_est == original.redzone_carry_share_est
+    # The input frame is left alone.
+    assert "QB_BUF" in set(questionable_stats.player_id)
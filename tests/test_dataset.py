@@ -0,0 +1,44 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from reporting.dataset import POSITION_VIEWS, write_csv_views, write_projection_dataset
+
+
+@pytest.fixture
+def projections():
+    return pd.DataFrame({
+        "player_id": ["QB_BUF", "RB_BUF", "WR_BUF", "TE_MIA", "K_MIA", "BUF"],
+        "player_name": ["Josh Allen", "James Cook", "Stefon Diggs", "Mike Gesicki", "Jason Sanders", None],
+        "team": ["BUF", "BUF", "BUF", "MIA", "MIA", None],
+        "position": ["QB", "RB", "WR", "TE", "K", None],
+        "median": [22.0, 14.5, 12.0, 6.0, 8.0, 5.0],
+    }, index=[4, 0, 2, 1, 3, 5])
+
+
+def test_csv_views_match_position_filters(projections, tmp_path):
+    write_csv_views(projections, str(tmp_path))
+    for name, positions in POSITION_VIEWS.items():
+        expected = projections.loc[projections.position.isin(positions)]
+        pd.testing.assert_frame_equal(pd.read_csv(tmp_path / ("%s.csv" % name), index_col=0), expected)
+    with open(tmp_path / "summary.csv") as summary, open(tmp_path / "all.csv") as all_csv:
+        assert summary.read() == all_csv.read()
+
+
+def test_dataset_round_trips_with_simulations(projections, tmp_path):
+    pytest.importorskip("pyarrow.parquet", exc_type=ImportError)
+    simulations = np.arange(len(projections) * 4, dtype=np.float32).reshape(len(projections), 4)
+    path = write_projection_dataset(projections, str(tmp_path), simulations)
+
+    assert sorted(os.listdir(path)) == sorted(
+        ["position=%s" % p for p in ["QB", "RB", "WR", "TE", "K"]] + ["position=NONE"]
+    )
+    table = pd.read_parquet(path)
+    table["position"] = table.position.astype(object)
+    table = table.set_index("player_id").loc[projections.player_id]
+    np.testing.assert_array_equal(np.stack(table.simulations.to_numpy()), simulations)
+    assert table.simulations.iloc[0].dtype == np.float32
+    assert list(table["median"]) == list(projections["median"])
+
+    qbs = pd.read_parquet(path, filters=[("position", "=", "QB")])
+    assert list(qbs.player_id) == ["QB_BUF"]
@@ -0,0 +1,189 @@
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+import pytest
+from stats import players, teams
+from stats.estimator_state import ESTIMATORS, EstimatorState
+from stats.util import _compute_estimators_vectorized
+
+
+# Receivers and their positions; None gets the all-receiver prior.
+RECEIVER_POSITIONS = {"R%d" % i: ["WR", "RB", "TE", None][i % 4] for i in range(12)}
+
+
+def random_plays(seed=0, seasons=(2022, 2023), weeks=6, plays_per_week=120):
+    """Synthetic PBP rows with every column the tracked estimators read, NaNs included."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for season in seasons:
+        for week in range(1, weeks + 1):
+            n = plays_per_week
+            play_type = rng.choice(["pass", "run", "punt", "field_goal", "no_play", "kickoff"], n)
+            is_pass = (play_type == "pass").astype(int)
+            scramble = is_pass * (rng.random(n) < 0.1)
+            is_fg = (play_type == "field_goal").astype(int)
+            receivers = np.where(is_pass == 1, rng.choice(list(RECEIVER_POSITIONS)[:season - 2012], n), None)
+            frames.append(pd.DataFrame({
+                "season": season,
+                "week": week,
+                "play_type": play_type,
+                "posteam": rng.choice(["BUF", "MIA", "NYJ", "NE"], n),
+                "defteam": rng.choice(["BUF", "MIA", "NYJ", "NE", None], n),
+                "down": rng.integers(1, 5, n),
+                "pass": is_pass,
+                "rush": (play_type == "run").astype(int),
+                "pass_oe": np.where(rng.random(n) < 0.1, np.nan, rng.normal(0, 40, n)),
+                "cpoe": np.where(is_pass == 1, rng.normal(0, 30, n), np.nan),
+                "yards_after_catch": np.where(rng.random(n) < 0.5, rng.normal(5, 4, n), np.nan),
+                "rushing_yards": rng.normal(4, 6, n).round(),
+                "run_gap": np.where(play_type == "run", rng.choice(["guard", "tackle", "end", None], n), None),
+                "air_yards": np.where(is_pass == 1, rng.normal(8, 12, n), np.nan),
+                "interception": is_pass * (rng.random(n) < 0.03),
+                "sack": is_pass * (rng.random(n) < 0.07),
+                "qb_scramble": scramble,
+                "passer_player_id": np.where(is_pass == 1, rng.choice(["QB1", "QB2", "QB3"], n), None),
+                "passer_id": np.where(is_pass == 1, rng.choice(["QB1", "QB2", "QB3"], n), None),
+                "receiver_player_id": receivers,
+                "rusher_player_id": np.where(play_type == "run", rng.choice(["RB1", "RB2", "RB%d" % week], n), None),
+                # Read by teams.calculate and players.calculate only.
+                "game_id": "%d_%02d" % (season, week),
+                "pass_attempt": is_pass,
+                "qb_hit": is_pass * (rng.random(n) < 0.15),
+                "tackled_for_loss": (play_type == "run") * (rng.random(n) < 0.1),
+                "penalty": (rng.random(n) < 0.05).astype(int),
+                "penalty_type": None,
+                "yardline_100": rng.integers(1, 100, n),
+                "passer_player_name": None,
+                "receiver_player_name": None,
+                "rusher_player_name": None,
+                "field_goal_attempt": is_fg,
+                "field_goal_result": np.where(is_fg == 1, rng.choice(["made", "missed"], n), None),
+                "fg_prob": np.where(is_fg == 1, rng.random(n), np.nan),
+                "kicker_player_id": np.where(is_fg == 1, "K1", None),
+                "kicker_player_name": None,
+                "position_receiver": [RECEIVER_POSITIONS.get(receiver) for receiver in receivers],
+            }))
+    # Shuffled within each week: estimators keep the row order inside a week.
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=seed).sort_values(["season", "week"], kind="mergesort")
+
+
+def full_recompute(state, name, plays):
+    # What calculate computes from `plays`: its rows sorted by week, with the builder's
+    # prior and mask from them.
+    estimator = state.estimators[name]
+    rows = estimator.plays(plays.sort_values("week", kind="mergesort"))
+    return _compute_estimators_vectorized(rows, estimator.group_col, [estimator.target(rows)])
+
+
+def assert_matches_full_recompute(state, plays):
+    for name, estimator in state.estimators.items():
+        expected = full_recompute(state, name, plays)
+        result = state.table(estimator.group_col, [name])
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_weekly_updates_match_full_recompute(seed):
+    plays = random_plays(seed)
+    history = plays.loc[plays.season == 2022]
+    state = EstimatorState()
+    state.seed(history)
+    assert len(state.estimators) == len(ESTIMATORS)
+    assert_matches_full_recompute(state, history)
+
+    for week in range(1, 7):
+        state.update(plays.loc[(plays.season == 2023) & (plays.week == week)])
+        assert_matches_full_recompute(state, plays.loc[(plays.season < 2023) | (plays.week <= week)])
+    assert state.last_week == (2023, 6)
+    assert isinstance(state.prior("air_yards_est"), pd.Series)
+
+
+def test_update_rejects_applied_weeks():
+    plays = random_plays(seasons=(2022,), weeks=3)
+    state = EstimatorState()
+    with pytest.raises(ValueError):
+        state.update(plays)
+    state.seed(plays.loc[plays.week <= 2])
+    with pytest.raises(ValueError):
+        state.update(plays.loc[plays.week >= 2])
+
+
+def test_save_and_load_round_trip(tmp_path):
+    plays = random_plays(seasons=(2022,), weeks=4)
+    state = EstimatorState()
+    state.seed(plays.loc[plays.week <= 3])
+    path = str(tmp_path / "estimators.pkl")
+    state.save(path)
+
+    loaded = EstimatorState.load(path)
+    assert loaded.last_week == (2022, 3)
+    state.update(plays.loc[plays.week == 4])
+    loaded.update(plays.loc[plays.week == 4])
+    for name in state.estimators:
+        pd.testing.assert_frame_equal(loaded.estimates(name), state.estimates(name))
+
+    def longer_span(target):
+        return lambda data: target(data)._replace(span=target(data).span + 1)
+
+    changed = [estimator._replace(target=longer_span(estimator.target)) for estimator in ESTIMATORS]
+    with pytest.raises(ValueError):
+        EstimatorState.load(path, changed)
+
+
+def test_new_season_reseeds_from_the_previous_one():
+    plays = random_plays(2, seasons=(2022, 2023, 2024), weeks=4)
+    state = EstimatorState()
+    state.seed(plays.loc[plays.season == 2022])
+    for season in (2023, 2024):
+        for week in range(1, 5):
+            state.update(plays.loc[(plays.season == season) & (plays.week == week)])
+        assert state.last_week == (season, 4)
+        assert state.plays.season.unique().tolist() == [season - 1, season]
+
+    # At 2024 the state covers 2023 and 2024 only.
+    assert_matches_full_recompute(state, plays.loc[plays.season >= 2023])
+
+    with pytest.raises(ValueError):
+        state.update(random_plays(seasons=(2026,), weeks=1))
+
+
+def test_advance_to_follows_the_projected_week():
+    plays = random_plays(4, seasons=(2022, 2023, 2024), weeks=4)
+    state = EstimatorState()
+    # Weeks in order, a season rollover, then back to an earlier week (reseeded).
+    for season, week in [(2023, 1), (2023, 2), (2023, 4), (2024, 1), (2024, 3), (2023, 3)]:
+        as_of = plays.loc[(plays.season == season - 1) | ((plays.season == season) & (plays.week < week))]
+        state.advance_to(as_of, season, week)
+        assert_matches_full_recompute(state, as_of)
+
+
+def test_calculate_reads_the_state(tmp_path, monkeypatch):
+    # teams.calculate writes team_stats.csv to the working directory.
+    monkeypatch.chdir(tmp_path)
+    plays = random_plays(3, seasons=(2022, 2023, 2024), weeks=4)
+    ids = sorted(set(plays.passer_player_id.dropna()) | set(plays.receiver_player_id.dropna()) | set(plays.rusher_player_id.dropna()))
+    roster = pd.DataFrame({"player_id": ids, "position": "WR", "team": "BUF", "player_name": ids}).set_index("player_id")
+    depth = pd.DataFrame({"week": 4, "gsis_id": ["QB1"], "position": ["QB"], "depth_team": ["1"]})
+    snaps = pd.DataFrame({"season": 2024, "week": [1, 2, 3], "pfr_player_id": "P1", "offense_pct": 0.5, "offense_snaps": 30.0})
+
+    state = EstimatorState()
+    state.seed(plays.loc[plays.season == 2022])
+    # Week 4 of 2024 is projected from 2023's plays and 2024's so far.
+    as_of = plays.loc[(plays.season == 2023) | ((plays.season == 2024) & (plays.week < 4))]
+    state.advance_to(as_of, 2024, 4)
+    with (patch("data.nfl_client.season_roster", return_value=roster),
+          patch("data.nfl_client.depth_chart", return_value=depth),
+          patch("data.nfl_client.gsis_ids", return_value=pd.Series(["QB1"], index=["P1"])),
+          patch("stats.injuries.load_historical_data", return_value=pd.DataFrame())):
+        team_stats = teams.calculate(as_of, 2024)
+        player_stats = players.calculate(as_of, snaps, team_stats, 2024, 4)
+        state_team_stats = teams.calculate(as_of, 2024, estimators=state)
+        state_player_stats = players.calculate(as_of, snaps, state_team_stats, 2024, 4, estimators=state)
+
+    pd.testing.assert_frame_equal(state_team_stats, team_stats, rtol=1e-9)
+    pd.testing.assert_frame_equal(state_player_stats, player_stats, rtol=1e-9)
+    # Every tracked estimator has values to compare (calculate reports go-for-it relative to the prior).
+    for name in state.estimators:
+        name = name.removesuffix("_raw")
+        stats = team_stats if name in team_stats.columns else player_stats
+        assert stats[name].notna().any(), name
@@ -0,0 +1,117 @@
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+from data import loader, pbp_store
+from main import PBP_COLUMNS, calculate_fantasy_leaders, history_plays
+from stats import teams
+
+
+def test_downcast_columns():
+    data = pd.DataFrame({
+        "season": [2023.0, 2023.0, 2024.0],
+        "play_id": [1, 40000, 2],
+        "rush": [1.0, 0.0, 1.0],
+        "air_yards": [5.0, np.nan, 12.0],
+        "spread_line": [-2.5, 3.0, 7.0],
+        "total_home_score": [0, 130, 3],
+        "posteam": ["BUF", "MIA", "BUF"],
+        "rusher_player_id": ["RB1", None, "RB1"],
+        "play_type": ["run", "pass", "run"],
+    })
+    loader.downcast_columns(data)
+    assert data.dtypes.to_dict() == {
+        "season": np.int16, "play_id": np.int32, "rush": np.int8, "air_yards": np.float32,
+        "spread_line": np.float32, "total_home_score": np.int16, "posteam": object,
+        "rusher_player_id": object, "play_type": object,
+    }
+    assert data.play_id.tolist() == [1, 40000, 2]
+
+    loader.downcast_columns(data, categorical_ids=True)
+    assert data.posteam.dtype == "category" and data.rusher_player_id.dtype == "category"
+    assert data.play_type.dtype == object
+
+
+def test_projected_columns_score_the_same(mock_pbp_data, mock_app_config):
+    projected = mock_pbp_data[[column for column in mock_pbp_data.columns if column in PBP_COLUMNS]]
+    assert len(projected.columns) == len(mock_pbp_data.columns)
+    pd.testing.assert_frame_equal(
+        calculate_fantasy_leaders(projected, 2024, 1, mock_app_config),
+        calculate_fantasy_leaders(mock_pbp_data, 2024, 1, mock_app_config),
+    )
+
+
+def test_load_data_reads_only_requested_columns(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow", exc_type=ImportError)
+    monkeypatch.setattr(pbp_store, "STORE_DIR", str(tmp_path))
+    pl.DataFrame({
+        "season": [2023, 2023, 2023],
+        "season_type": ["REG", "REG", "POST"],
+        "week": [1, 2, 19],
+        "receiver_player_id": ["WR1", None, "WR1"],
+        "air_yards": [8.0, 3.0, None],
+        "desc": ["pass deep", "pass short", "pass short"],
+    }).write_parquet(pbp_store.season_path(2023))
+    rosters = pd.DataFrame({"player_id": ["WR1"], "position": ["WR"], "season": [2023]})
+    with (patch("data.nfl_client.import_seasonal_rosters", return_value=rosters),
+          patch("nflreadpy.get_current_season", return_value=2024)):
+        data = loader.load_data([2023], columns=["week", "air_yards", "not_in_pbp"], downcast=True)
+    assert list(data.columns) == ["season", "season_type", "receiver_player_id", "week", "air_yards", "position_receiver"]
+    assert data.week.tolist() == [1, 2] and data.week.dtype == np.int16
+    assert data.position_receiver.iloc[0] == "WR" and pd.isna(data.position_receiver.iloc[1])
+
+
+def test_pbp_scan_matches_load_data(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow", exc_type=ImportError)
+    monkeypatch.setattr(pbp_store, "STORE_DIR", str(tmp_path))
+    for season in [2022, 2023]:
+        pl.DataFrame({
+            "season": [season] * 6,
+            "season_type": ["REG"] * 5 + ["POST"],
+            "week": [1, 1, 2, 3, 3, 19],
+            "play_type": ["kickoff", "run", "pass", None, "punt", "pass"],
+            "receiver_player_id": [None, None, "WR1", None, None, "WR1"],
+            "air_yards": [None, None, 8.0, None, None, 3.0],
+        }).write_parquet(pbp_store.season_path(season))
+    rosters = pd.DataFrame({"player_id": ["WR1", "WR1"], "position": ["WR", "WR"], "season": [2022, 2023]})
+    with (patch("data.nfl_client.import_seasonal_rosters", return_value=rosters),
+          patch("nflreadpy.get_current_season", return_value=2024)):
+        data = loader.load_data([2022, 2023])
+        scan = loader.PbpScan([2022, 2023], columns=["week", "play_type", "air_yards"])
+
+        history = history_plays(scan, 2023, 3)
+        expected = history_plays(data, 2023, 3)
+        expected = expected.loc[expected.play_type.isin(teams.PLAY_TYPES)].reset_index(drop=True)
+        assert len(history) == 5
+        pd.testing.assert_frame_equal(history, expected[history.columns])
+        # Other slices keep every play type, including untyped rows such as the end of a game.
+        week = scan.collect((pl.col("season") == 2023) & (pl.col("week") == 3))
+        assert week.play_type.tolist() == [None, "punt"]
+        expected = data.loc[(data.season == 2023) & (data.week == 3)].reset_index(drop=True)
+        pd.testing.assert_frame_equal(week, expected[week.columns])
+
+
+
+def test_training_readers_skip_postseason_plays(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow", exc_type=ImportError)
+    from models import int_return, receivers
+    monkeypatch.setattr(pbp_store, "STORE_DIR", str(tmp_path))
+    for season in [2022, 2023]:
+        pl.DataFrame({
+            "season": [season, season],
+            "season_type": ["REG", "POST"],
+            "receiver_player_id": ["WR1", "WR1"],
+            "air_yards": [8.0, 40.0],
+            "yards_after_catch": [3.0, 20.0],
+            "yardline_100": [60, 30],
+            "interception": [1.0, 1.0],
+            "return_yards": [12.0, 99.0],
+        }).write_parquet(pbp_store.season_path(season))
+    rosters = pd.DataFrame({"player_id": ["WR1"], "position": ["WR"], "player_name": ["Receiver"], "season": [2022]})
+    with (patch("data.nfl_client.import_seasonal_rosters", return_value=rosters),
+          patch("nflreadpy.get_current_season", return_value=2024)):
+        receiver_plays = receivers.receiver_data(fast=True)
+        return_plays = int_return.int_return_data(fast=True)
+    assert receiver_plays.air_yards.tolist() == [8.0, 8.0]
+    assert return_plays.return_yards.tolist() == [12.0, 12.0]
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from xgboost import XGBClassifier
+from engine.game import GameState
+from models.lookup import ProbabilityTable, build_lookup_tables, _refine
+from settings import ScoringSettings
+
+AXES = [
+    ("down", [1, 2, 3, 4], True),
+    ("ydstogo", [1, 5, 10, 20], False),
+    ("yardline_100", [1, 25, 50, 75, 99], False),
+]
+
+
+class SmoothModel:
+    """Logistic model with a smooth response surface, so interpolation error is small."""
+    classes_ = np.array(["a", "b"])
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=float)
+        p = 1 / (1 + np.exp(-(0.3 * X[:, 0] - 0.05 * X[:, 1] + 0.02 * X[:, 2] - 1)))
+        return np.column_stack([1 - p, p])
+
+
+@pytest.fixture
+def xgb_model():
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.integers(1, 5, 500), rng.integers(1, 20, 500), rng.integers(1, 100, 500)]).astype(float)
+    y = (X[:, 2] + rng.normal(0, 20, 500) > 50).astype(int)
+    model = XGBClassifier(n_estimators=10, max_depth=3)
+    model.fit(X, y)
+    return model
+
+
+def test_table_matches_model_on_grid_points(xgb_model):
+    table = ProbabilityTable.build(xgb_model, AXES)
+    grid = np.array([[d, t, y] for d in [1, 2, 3, 4] for t in [1, 5, 10, 20] for y in [1, 25, 50, 75, 99]], dtype=float)
+
+    np.testing.assert_allclose(table.predict_proba(grid), xgb_model.predict_proba(grid), atol=1e-6)
+    assert list(table.classes_) == list(xgb_model.classes_)
+
+
+def test_interpolation_error_is_reported_and_shrinks_with_resolution():
+    model = SmoothModel()
+    coarse = ProbabilityTable.build(model, AXES)
+    fine = ProbabilityTable.build(model, AXES, resolution=4)
+
+    coarse_report = coarse.measure_error(model)
+    fine_report = fine.measure_error(model)
+
+    assert coarse_report["max_abs_error"] < 0.05
+    assert fine_report["max_abs_error"] < coarse_report["max_abs_error"]
+    assert fine_report["grid_points"] > coarse_report["grid_points"]
+    assert "worst_ydstogo" in coarse_report
+
+
+def test_lookup_clamps_and_snaps_inputs():
+    table = ProbabilityTable.build(SmoothModel(), AXES)
+    model = SmoothModel()
+
+    # Out-of-range continuous values clamp to the grid edge; discrete values snap to the nearest.
+    np.testing.assert_allclose(table.predict_proba([[4, 40, 150]]), model.predict_proba([[4, 20, 99]]), atol=1e-6)
+    np.testing.assert_allclose(table.predict_proba([[2.2, 5, 25]]), model.predict_proba([[2, 5, 25]]), atol=1e-6)
+    assert table.predict_proba([1, 7.5, 30]).shape == (1, 2)
+    np.testing.assert_allclose(table.predict_proba(np.tile([1, 7.5, 30], (5, 1))).sum(axis=1), 1.0, atol=1e-6)
+
+
+def test_refine_keeps_original_points():
+    grid = _refine(np.array([0.0, 10.0, 30.0]), 2)
+    assert list(grid) == [0.0, 5.0, 10.0, 20.0, 30.0]
+
+
+def test_game_state_runs_with_lookup_tables(vector_models, mock_player_stats, mock_team_stats):
+    models = build_lookup_tables(vector_models, verbose=False)
+
+    assert isinstance(models["playcall_model"], ProbabilityTable)
+    assert models["playcall_model_source"] is not models["playcall_model"]
+    game = GameState(
+        models, "BUF", "MIA",
+        mock_player_stats[mock_player_stats.team == "BUF"],
+        mock_player_stats[mock_player_stats.team == "MIA"],
+        mock_team_stats[mock_team_stats.team == "BUF"],
+        mock_team_stats[mock_team_stats.team == "MIA"],
+        rules=ScoringSettings(),
+    )
+    fantasy_points, _ = game.play_game()
+    assert game.game_over
+    assert len(fantasy_points) > 0
@@ -0,0 +1,89 @@
+import os
+from unittest.mock import patch
+import pandas as pd
+import pytest
+from data import nfl_client
+
+ROSTERS = pd.DataFrame({
+    "season": [2023, 2023, 2023],
+    "gsis_id": ["QB1", "RB1", "RB1"],
+    "full_name": ["Quarter Back", "Running Back", "Running Back"],
+    "position": ["QB", "RB", "RB"],
+    "team": ["BUF", "MIA", "MIA"],
+})
+PLAYERS = pd.DataFrame({
+    "gsis_id": ["QB1", "RB1", None],
+    "pfr_id": ["BackQu00", None, "NoGsis00"],
+    "display_name": ["Quarter Back", "Running Back", "No Gsis"],
+    "latest_team": ["BUF", "MIA", "NYJ"],
+})
+DEPTH_CHARTS = pd.DataFrame({
+    "week": [1, 1, 2],
+    "gsis_id": ["QB1", "RB1", "QB1"],
+    "position": ["QB", "RB", "QB"],
+    "depth_team": ["1", "1", "1"],
+})
+
+
+@pytest.fixture(autouse=True)
+def registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(nfl_client, "SNAPSHOT_DIR", str(tmp_path))
+    nfl_client.clear()
+    with (patch("nflreadpy.load_rosters", return_value=ROSTERS) as rosters,
+          patch("nflreadpy.load_players", return_value=PLAYERS) as players,
+          patch("nflreadpy.load_depth_charts", return_value=DEPTH_CHARTS) as depth_charts,
+          patch("nflreadpy.get_current_season", return_value=2024)):
+        yield rosters, players, depth_charts
+    nfl_client.clear()
+
+
+def test_tables_load_once_and_callers_get_copies(registry):
+    rosters, _, _ = registry
+    first = nfl_client.import_seasonal_rosters([2023])
+    first["position"] = "K"
+    second = nfl_client.import_seasonal_rosters([2023], columns=["player_id", "position"])
+    assert rosters.call_count == 1
+    assert list(second.columns) == ["player_id", "position"]
+    assert list(second.position) == ["QB", "RB", "RB"]
+
+
+def test_snapshots_serve_cold_starts(registry, tmp_path):
+    rosters, players, _ = registry
+    nfl_client.import_seasonal_rosters([2023])
+    nfl_client.import_ids()
+    nfl_client.clear()
+
+    # A past season's snapshot is read back instead of loading the table again.
+    pd.testing.assert_frame_equal(nfl_client.import_seasonal_rosters([2023]), nfl_client._load_rosters([2023]))
+    assert rosters.call_count == 2  # Once for the snapshot, once for _load_rosters above.
+
+    # The player table can change, so an old snapshot is reloaded.
+    path = os.path.join(tmp_path, "players.pkl")
+    os.utime(path, (0, 0))
+    nfl_client.import_ids()
+    assert players.call_count == 2
+    assert os.path.getmtime(path) > 0
+
+
+def test_views(registry):
+    _, players, depth_charts = registry
+    roster = nfl_client.season_roster(2023)
+    assert list(roster.index) == ["QB1", "RB1"]
+    assert roster.loc["RB1", "player_name"] == "Running Back"
+
+    pfr = nfl_client.gsis_ids("pfr_id")
+    assert pfr.to_dict() == {"BackQu00": "QB1"}
+    assert nfl_client.gsis_ids("pfr_id") is pfr
+    assert players.call_count == 1
+
+    assert list(nfl_client.depth_chart(2023, 1).gsis_id) == ["QB1", "RB1"]
+    assert list(nfl_client.depth_chart(2023, 2).gsis_id) == ["QB1"]
+    missing = nfl_client.depth_chart(2023, 3)
+    assert missing.empty and "week" in missing.columns
+    assert depth_charts.call_count == 1
+
+
+def test_live_depth_charts_are_not_split_by_week(registry):
+    _, _, depth_charts = registry
+    depth_charts.return_value = DEPTH_CHARTS.drop(columns="week")
+    assert len(nfl_client.depth_chart(2024, 5)) == 3
@@ -0,0 +1,91 @@
+import os
+from unittest.mock import patch
+import pandas as pd
+import polars as pl
+import pytest
+from data import pbp_store
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    """A directory source with a legacy CSV season and a Parquet season."""
+    path = tmp_path / "source"
+    path.mkdir()
+    pd.DataFrame({
+        "season": [2022, 2022],
+        "week": [1, 2],
+        "play_id": [1, 2],
+        "rusher_player_id": ["RB1", None],
+    }).to_csv(path / "pbp_2022.csv.gz", index=False, compression="gzip")
+    pl.DataFrame({
+        "season": [2023],
+        "week": [1],
+        "play_id": [1],
+        "rusher_player_id": ["RB2"],
+        "receiver_player_id": ["WR1"],
+    }).write_parquet(path / "pbp_2023.parquet")
+    return str(path)
+
+
+@pytest.fixture
+def store(tmp_path, source_dir, monkeypatch):
+    calls = []
+    source = pbp_store.DirectorySource(source_dir)
+
+    def counting_source(season):
+        calls.append(season)
+        return source(season)
+
+    monkeypatch.setattr(pbp_store, "STORE_DIR", str(tmp_path / "store"))
+    monkeypatch.setattr(pbp_store, "_source", counting_source)
+    with patch("nflreadpy.get_current_season", return_value=2023):
+        yield calls
+
+
+def test_missing_seasons_are_fetched_once(store):
+    plays = pbp_store.load_polars([2022, 2023])
+    assert plays.height == 3
+    assert plays["rusher_player_id"].to_list() == ["RB1", None, "RB2"]
+    # Seasons without a column get nulls for it.
+    assert plays["receiver_player_id"].to_list() == [None, None, "WR1"]
+    assert sorted(os.listdir(pbp_store.STORE_DIR)) == ["pbp_2022.parquet", "pbp_2023.parquet"]
+
+    pbp_store.load_polars([2022, 2023])
+    assert store == [2022, 2023]
+
+
+def test_current_season_is_fetched_again_when_stale(store):
+    pbp_store.load_polars([2022, 2023])
+    for season in [2022, 2023]:
+        os.utime(pbp_store.season_path(season), (0, 0))
+    pbp_store.load_polars([2022, 2023])
+    assert store == [2022, 2023, 2023]
+
+
+def test_refresh_overwrites_seasons(store, tmp_path):
+    pbp_store.load_polars([2022])
+    replacement = tmp_path / "replacement"
+    replacement.mkdir()
+    pl.DataFrame({"season": [2022], "week": [5], "play_id": [9]}).write_parquet(replacement / "pbp_2022.parquet")
+    assert pbp_store.refresh([2022], pbp_store.DirectorySource(str(replacement))) == [pbp_store.season_path(2022)]
+    assert pbp_store.load_polars([2022])["week"].to_list() == [5]
+
+
+def test_missing_source_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        pbp_store.DirectorySource(str(tmp_path))(2021)
+
+
+def test_load_returns_pandas(store):
+    pytest.importorskip("pyarrow", exc_type=ImportError)
+    plays = pbp_store.load([2022, 2023])
+    assert isinstance(plays, pd.DataFrame)
+    assert list(plays.week) == [1, 2, 1]
+
+
+def test_scan_pushes_filters_and_columns_down(store):
+    plays = pbp_store.scan([2022, 2023], ["week", "rusher_player_id", "receiver_player_id"])
+    assert plays.filter(pl.col("week") == 1).collect().to_dict(as_series=False) == {
+        "week": [1, 1], "rusher_player_id": ["RB1", "RB2"], "receiver_player_id": [None, "WR1"],
+    }
+
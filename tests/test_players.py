@@ -0,0 +1,58 @@
+import random
+import numpy as np
+import pandas as pd
+from engine.context import MatchupContext
+from engine.players import PlayerTable, PLAYER_PARAMETERS
+from main import simulate_matchup
+from settings import ScoringSettings
+
+
+def _table(player_stats):
+    return PlayerTable(
+        player_stats[player_stats.team == "BUF"], player_stats[player_stats.team == "MIA"], "BUF", "MIA"
+    )
+
+
+def test_table_matches_record_lookups(mock_player_stats):
+    stats = mock_player_stats.drop(columns=["relative_ypc_est"])
+    stats.loc[stats.player_id == "WR_BUF", "relative_yac_est"] = np.nan
+    table = _table(stats)
+    game_stats = stats[stats.team.isin(["BUF", "MIA"])]
+
+    assert len(table) == len(game_stats) + 7
+    assert list(table.ids[-7:]) == ["BUF", "MIA", "QB_BUF", "QB_MIA", "Kicker_BUF", "Kicker_MIA", "Team"]
+    for record in game_stats.to_dict('records'):
+        i = table.index[record["player_id"]]
+        assert table.position[i] == record["position"]
+        for column, default in PLAYER_PARAMETERS.items():
+            # Same value as record.get(column, default), NaN included.
+            np.testing.assert_equal(getattr(table, column)[i], float(record.get(column, default)))
+    assert table.position[table.index["BUF"]] is None
+
+
+def test_points_export_round_trips(mock_player_stats):
+    table = _table(mock_player_stats)
+    points = np.full((3, len(table)), np.nan)
+    points[0, table.index["QB_BUF"]] = 12.5
+    points[1, table.index["QB_BUF"]] = 0.0
+    points[2, table.index["MIA"]] = -1.0
+
+    assert table.to_dict(points[0]) == {"QB_BUF": 12.5}
+    frame = table.to_frame(points)
+    expected = pd.DataFrame([{"QB_BUF": 12.5}, {"QB_BUF": 0.0}, {"MIA": -1.0}]).transpose()
+    pd.testing.assert_frame_equal(frame.sort_index(), expected.sort_index(), check_dtype=False)
+
+
+def test_points_array_matches_fantasy_points(vector_models, mock_player_stats, mock_team_stats):
+    context = MatchupContext(vector_models, "BUF", "MIA", mock_player_stats, mock_team_stats, ScoringSettings())
+    random.seed(5)
+    game = context.sample_game_state()
+    points, _ = game.play_game()
+
+    assert points == game.fantasy_points
+    assert set(points) == {game.players.ids[i] for i in np.flatnonzero(~np.isnan(game.points))}
+    assert {"BUF", "MIA"} <= set(points)
+    # Every simulation of a matchup lines up on the same player index.
+    runs = np.vstack([simulate_matchup(context)[0] for _ in range(5)])
+    assert runs.shape == (5, len(context.players))
+    assert context.players.to_frame(runs).loc["BUF"].notna().all()
@@ -0,0 +1,40 @@
+import functools
+import numpy as np
+import pytest
+from engine.context import MatchupContext
+from engine.pool import SimulationPool
+from engine.rng import sim_seed
+from main import simulate_matchup
+from settings import ScoringSettings
+
+
+@pytest.fixture
+def pool(vector_models):
+    with SimulationPool(functools.partial(dict, vector_models), processes=2, chunk_size=3) as pool:
+        yield pool
+
+
+def test_pool_matches_in_process_simulations(pool, vector_models, mock_player_stats, mock_team_stats):
+    assert pool.startup_seconds > 0
+    # The same workers serve several games in turn.
+    for game, (home, away, record_stats) in enumerate([("BUF", "MIA", True), ("MIA", "BUF", False)]):
+        context = MatchupContext(
+            vector_models, home, away, mock_player_stats, mock_team_stats, ScoringSettings(), record_stats=record_stats
+        )
+        seeds = [sim_seed(2024, 1, game, sim) for sim in range(8)]
+        points, stats = pool.simulate(context, seeds)
+
+        expected = [simulate_matchup(context, seed) for seed in seeds]
+        np.testing.assert_array_equal(points, np.vstack([p for p, _ in expected]))
+        if record_stats:
+            np.testing.assert_array_equal(stats, np.stack([s for _, s in expected]))
+        else:
+            assert stats is None
+        assert context.models is vector_models
+
+
+def test_pool_handles_empty_games(pool, vector_models, mock_player_stats, mock_team_stats):
+    context = MatchupContext(vector_models, "BUF", "MIA", mock_player_stats, mock_team_stats, ScoringSettings())
+    points, stats = pool.simulate(context, [])
+    assert points.shape == (0, len(context.players))
+    assert stats is None
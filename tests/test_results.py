@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from engine.players import PlayerTable
+from engine.results import SimulationResults
+
+
+def _table(player_stats, home, away):
+    return PlayerTable(player_stats[player_stats.team == home], player_stats[player_stats.team == away], home, away)
+
+
+def _points(table, n_sims, seed):
+    rng = np.random.default_rng(seed)
+    points = np.full((n_sims, len(table)), np.nan)
+    scorers = rng.choice(len(table), size=len(table) // 2, replace=False)
+    points[:, scorers] = rng.normal(10, 5, (n_sims, len(scorers)))
+    points[rng.random(points.shape) < 0.2] = np.nan
+    return points
+
+
+def test_results_match_per_game_frames(mock_player_stats):
+    games = {
+        "g1": (_table(mock_player_stats, "BUF", "MIA"), 0),
+        "g2": (_table(mock_player_stats, "GEN", "ERI"), 1),
+    }
+    # Capacity 4 forces the matrix to grow while games are added.
+    results = SimulationResults(capacity=4)
+    frames = []
+    for game_id, (table, seed) in games.items():
+        points = _points(table, 50, seed)
+        results.add_game(game_id, table, points)
+        frames.append(table.to_frame(points))
+    expected = pd.concat(frames)
+
+    frame = results.frame()
+    pd.testing.assert_frame_equal(frame, expected.astype(np.float32))
+    assert np.shares_memory(frame.to_numpy(), results.points)
+    assert list(results.game_ids) == ["g1"] * len(frames[0]) + ["g2"] * len(frames[1])
+    assert list(results.player_ids[results.games["g2"]]) == list(frames[1].index)
+
+    quantiles = [0.125, 0.5, 0.875]
+    np.testing.assert_allclose(
+        results.quantiles(quantiles), expected.quantile(quantiles, axis=1).to_numpy(), rtol=1e-5
+    )
+
+
+def test_frames_and_mismatched_games(mock_player_stats):
+    results = SimulationResults()
+    assert results.frame().empty
+    batch = pd.DataFrame(np.arange(6.0).reshape(2, 3), index=["QB_BUF", "RB_BUF"])
+    results.add_frame("g1", batch)
+    pd.testing.assert_frame_equal(results.frame(), batch.astype(np.float32))
+
+    table = _table(mock_player_stats, "BUF", "MIA")
+    with pytest.raises(ValueError):
+        results.add_game("g2", table, _points(table, 4, 0))
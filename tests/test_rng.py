@@ -0,0 +1,108 @@
+import random
+import numpy as np
+import pytest
+from sklearn.neighbors import KernelDensity
+import main
+from engine.context import MatchupContext
+from engine.rng import SimRandom, sim_seed
+from main import get_models, simulate_matchup
+from settings import ScoringSettings
+
+
+class StreamRandom(random.Random):
+    """random.Random whose uniforms come from a SimRandom, to compare the choices logic."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        super().__init__(0)
+
+    def random(self):
+        return self.stream.random()
+
+
+def test_blocks_follow_the_generator_stream():
+    seed = sim_seed(2024, 3, 7, 11)
+    rng = SimRandom(seed, block_size=8)
+    draws = [rng.random() for _ in range(20)]
+
+    np.testing.assert_array_equal(draws, np.random.default_rng(seed).random(24)[:20])
+
+
+def test_choices_matches_random_module_semantics():
+    population = ["pass", "run", "punt", "field_goal"]
+    weights = np.array([0.55, 0.35, 0.07, 0.03], dtype=np.float32)
+    ours = SimRandom(5).choices(population, weights=weights, k=500)
+    reference = StreamRandom(SimRandom(5)).choices(population, weights=weights, k=500)
+
+    assert ours == reference
+    with pytest.raises(ValueError):
+        SimRandom(5).choices(population, weights=[0, 0, 0, 0])
+
+
+def test_choice_indexes_buffers_uniformly():
+    rng = SimRandom(1)
+    samples = np.arange(10.0)
+    counts = np.bincount([int(rng.choice(samples)) for _ in range(20000)], minlength=10)
+
+    assert counts.min() > 1800 and counts.max() < 2200
+
+
+def test_sim_seed_spawns_independent_streams():
+    first = SimRandom(sim_seed(2024, 1, "2024_01_BUF_MIA", 0)).random()
+
+    assert SimRandom(sim_seed(2024, 1, "2024_01_BUF_MIA", 0)).random() == first
+    assert SimRandom(sim_seed(2024, 1, "2024_01_BUF_MIA", 1)).random() != first
+    assert SimRandom(sim_seed(2024, 1, "2024_01_KC_DET", 0)).random() != first
+    assert SimRandom(sim_seed(2024, 1, "2024_01_BUF_MIA", 0, seed=9)).random() != first
+
+
+def test_single_simulation_replays_exactly(vector_models, mock_player_stats, mock_team_stats):
+    stats = mock_player_stats.copy()
+    stats.loc[stats.player_id == "WR_MIA", "status"] = "Questionable"
+    context = MatchupContext(vector_models, "BUF", "MIA", stats, mock_team_stats, ScoringSettings())
+    seeds = [sim_seed(2024, 1, "2024_01_BUF_MIA", sim) for sim in range(5)]
+
+    run = [context.players.to_dict(simulate_matchup(context, seed)[0]) for seed in seeds]
+    # Interleaving other draws on the global RNG must not change a seeded simulation.
+    random.random()
+    replay = context.players.to_dict(simulate_matchup(context, seeds[3])[0])
+
+    assert replay == run[3]
+    assert run[0] != run[1]
+
+
+@pytest.fixture
+def kde_loaders(monkeypatch, vector_models):
+    """Makes get_models build small fitted KDEs and the vector_models classifiers, without disk."""
+    def kde(mean):
+        return lambda: KernelDensity(bandwidth=2.0).fit(np.random.default_rng(0).normal(mean, 6.0, (200, 1)))
+
+    positions = ["RB", "WR", "TE", "ALL"]
+    monkeypatch.setattr(main.playcall, "build_or_load_playcall_model", lambda: vector_models["playcall_model"])
+    monkeypatch.setattr(main.completion, "build_or_load_completion_model", lambda: vector_models["completion_model"])
+    monkeypatch.setattr(main.kicking, "build_or_load_kicking_model", lambda: vector_models["field_goal_model"])
+    monkeypatch.setattr(main.rushers, "build_or_load_rush_open_kde", kde(5.0))
+    monkeypatch.setattr(main.rushers, "build_or_load_rush_rz_kde", kde(2.0))
+    monkeypatch.setattr(main.rushers, "build_or_load_scramble_kde", lambda: {key: kde(6.0)() for key in ["default", "mobile", "pocket"]})
+    monkeypatch.setattr(main.int_return, "build_or_load_int_return_kde", kde(10.0))
+    monkeypatch.setattr(main.receivers, "build_or_load_all_air_yards_kdes", lambda: {f"air_yards_{pos}": kde(8.0)() for pos in positions})
+    monkeypatch.setattr(main.receivers, "build_or_load_all_yac_kdes", lambda: {
+        f"yac_{pos}_{zone}": kde(5.0)() for pos in positions for zone in ["open", "rz"]
+    })
+
+
+def test_seeded_model_loads_replay(kde_loaders, mock_player_stats, mock_team_stats):
+    def run(seed):
+        models = get_models(seed=seed)
+        context = MatchupContext(models, "BUF", "MIA", mock_player_stats, mock_team_stats, ScoringSettings())
+        return models, [context.players.to_dict(simulate_matchup(context, sim_seed(2024, 1, "2024_01_BUF_MIA", sim))[0]) for sim in range(3)]
+
+    models, points = run(7)
+    reloaded, replay = run(7)
+    other, _ = run(8)
+
+    assert replay == points
+    for key in [key for key in models if key.endswith("_samples")]:
+        np.testing.assert_array_equal(reloaded[key], models[key])
+    assert not np.array_equal(other["rush_open_samples"], models["rush_open_samples"])
+    assert not np.array_equal(models["rush_open_samples"], models["rush_rz_samples"])
@@ -0,0 +1,77 @@
+import random
+from collections import Counter
+import numpy as np
+import pytest
+from scipy.stats import chisquare
+from engine.context import MatchupContext
+from engine.game import GameState
+from engine.sampling import AliasTable
+from settings import ScoringSettings
+
+
+def _frequencies(sampler, n):
+    counts = Counter(sampler.draw() for _ in range(n))
+    return np.array([counts[i] for i in range(sampler.n)])
+
+
+@pytest.mark.parametrize("weights", [
+    [0.5, 0.2, 0.2, 0.1],
+    [0.31, 0.0, 0.07, 0.44, 0.18, 0.002],
+    [3.0, 1.0],
+])
+def test_alias_frequencies_match_weights(weights):
+    random.seed(0)
+    sampler = AliasTable(weights)
+    expected = np.array(weights) / sum(weights)
+    observed = _frequencies(sampler, 100000)
+
+    np.testing.assert_allclose(sampler.probabilities(), expected, atol=1e-12)
+    nonzero = expected > 0
+    assert observed[~nonzero].sum() == 0
+    assert chisquare(observed[nonzero], expected[nonzero] * observed.sum()).pvalue > 0.001
+
+
+def test_alias_handles_nan_and_zero_weights():
+    assert AliasTable([float("nan"), 1.0, 1.0]).probabilities() == pytest.approx([0.0, 0.5, 0.5])
+    assert AliasTable([0.0, 0.0, 0.0, 0.0]).probabilities() == pytest.approx([0.25] * 4)
+    single = AliasTable([0.7])
+    assert all(single.draw() == 0 for _ in range(100))
+
+
+def test_game_state_selection_matches_weights(vector_models, mock_player_stats, mock_team_stats):
+    """Carrier and target picks follow the same weights random.choices used."""
+    game = GameState(
+        vector_models, "BUF", "MIA",
+        mock_player_stats[mock_player_stats.team == "BUF"],
+        mock_player_stats[mock_player_stats.team == "MIA"],
+        mock_team_stats[mock_team_stats.team == "BUF"],
+        mock_team_stats[mock_team_stats.team == "MIA"],
+        rules=ScoringSettings(),
+    )
+    game.posteam = "BUF"
+    game.yard_line = 50
+    random.seed(1)
+    n = 50000
+
+    counts = Counter(game.choose_target() for _ in range(n))
+    observed = np.array([counts[i] for i in game.home_targets])
+    expected = np.array(game.home_target_weights) * n
+    nonzero = expected > 0
+    assert observed[~nonzero].sum() == 0
+    assert chisquare(observed[nonzero], expected[nonzero]).pvalue > 0.001
+
+    counts = Counter(game.choose_carrier() for _ in range(1000))
+    assert set(counts) == set(game.home_carriers)
+
+
+def test_context_rebuilds_samplers_only_on_mask_change(vector_models, mock_player_stats, mock_team_stats):
+    stats = mock_player_stats.copy()
+    stats.loc[stats.player_id == "WR_BUF", "status"] = "Questionable"
+    context = MatchupContext(vector_models, "BUF", "MIA", stats, mock_team_stats, ScoringSettings())
+
+    active = context.game_state([False])
+    assert context.game_state([False]).home_target_sampler is active.home_target_sampler
+    scratched = context.game_state([True])
+    assert scratched.home_target_sampler is not active.home_target_sampler
+    assert scratched.home_target_sampler.n == active.home_target_sampler.n - 1
+    np.testing.assert_allclose(scratched.home_target_sampler.probabilities(), scratched.home_target_weights)
@@ -0,0 +1,97 @@
+import copy
+import random
+import numpy as np
+import pandas as pd
+from engine.game import GameState
+from engine.scheduler import InferenceScheduler
+from settings import ScoringSettings
+from engine.context import MatchupContext
+from main import project_game_scheduled
+
+
+class DownModel:
+    """Playcall model whose probabilities depend on the down, to catch rows sent to the wrong game."""
+    classes_ = ['field_goal', 'pass', 'punt', 'run']
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=float)
+        self.batch_sizes.append(len(X))
+        fourth = X[:, 0] == 4
+        probs = np.tile([0.0, 0.55, 0.0, 0.45], (len(X), 1))
+        probs[fourth] = [0.3, 0.1, 0.5, 0.1]
+        return probs
+
+
+def _template(models, player_stats, team_stats):
+    return GameState(
+        models, "BUF", "MIA",
+        player_stats[player_stats.team == "BUF"],
+        player_stats[player_stats.team == "MIA"],
+        team_stats[team_stats.team == "BUF"],
+        team_stats[team_stats.team == "MIA"],
+        rules=ScoringSettings(),
+    )
+
+
+def _copies(template, n):
+    games = []
+    for _ in range(n):
+        game = copy.copy(template)
+        game.reset_points()
+        games.append(game)
+    return games
+
+
+def test_single_game_matches_play_game(vector_models, mock_player_stats, mock_team_stats):
+    """With one game in flight the scheduler makes the same random draws as play_game."""
+    models = dict(vector_models, playcall_model=DownModel())
+    template = _template(models, mock_player_stats, mock_team_stats)
+
+    random.seed(11)
+    expected, _ = _copies(template, 1)[0].play_game()
+    random.seed(11)
+    [(points, _)] = InferenceScheduler().play_games(_copies(template, 1))
+
+    assert dict(points) == dict(expected)
+
+
+def test_model_calls_are_batched_across_games(vector_models, mock_player_stats, mock_team_stats):
+    playcall_model = DownModel()
+    models = dict(vector_models, playcall_model=playcall_model)
+    games = _copies(_template(models, mock_player_stats, mock_team_stats), 50)
+    scheduler = InferenceScheduler()
+
+    results = scheduler.play_games(games)
+
+    assert all(game.game_over for game in games)
+    assert [points for points, _ in results] == [game.fantasy_points for game in games]
+    # The first tick asks every game for a playcall at once.
+    assert playcall_model.batch_sizes[0] == 50
+    assert scheduler.model_calls <= 3 * scheduler.ticks
+    assert scheduler.rows / scheduler.model_calls > 5
+
+
+def test_max_active_limits_games_in_flight(vector_models, mock_player_stats, mock_team_stats):
+    playcall_model = DownModel()
+    models = dict(vector_models, playcall_model=playcall_model)
+    games = _copies(_template(models, mock_player_stats, mock_team_stats), 12)
+
+    results = InferenceScheduler(max_active=4).play_games(games)
+
+    assert all(game.game_over for game in games)
+    assert len(results) == 12
+    assert max(playcall_model.batch_sizes) <= 4
+
+
+def test_project_game_scheduled(vector_models, mock_player_stats, mock_team_stats, mock_app_config):
+    context = MatchupContext(
+        vector_models, "BUF", "MIA", mock_player_stats, mock_team_stats, mock_app_config.scoring
+    )
+    points = project_game_scheduled(context, n=20)
+
+    assert isinstance(points, pd.DataFrame)
+    assert list(points.columns) == list(range(20))
+    assert points.loc["BUF"].notna().all()
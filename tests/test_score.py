@@ -1,8 +1,10 @@
+import numpy as np
 import pytest
 import pandas as pd
 from types import SimpleNamespace
-from score import score_from_play, points_from_score
-from settings import ScoringSettings
+from main import calculate_fantasy_leaders, fantasy_leaders_by_week
+from score import fantasy_points, score_from_play, points_from_score
+from settings import AppConfig, ScoringSettings
 
 @pytest.fixture
 def default_scoring_rules():
@@ -184,3 +186,74 @@ def test_points_from_score_pa_35_plus(default_scoring_rules):
     assert points_from_score(35, default_scoring_rules) == default_scoring_rules.pa_35_plus
     assert points_from_score(40, default_scoring_rules) == default_scoring_rules.pa_35_plus
 
+
+def random_pbp(plays=3000, seed=0):
+    """Plays of two seasons x three weeks hitting every score_from_play branch, NaNs included."""
+    rng = np.random.default_rng(seed)
+    teams = np.array(["T%02d" % i for i in range(8)], dtype=object)
+    players = np.array(["P%02d" % i for i in range(40)] + [None, np.nan], dtype=object)
+
+    def flags(rate):
+        values = (rng.random(plays) < rate).astype(float)
+        values[rng.random(plays) < 0.02] = np.nan
+        return values
+
+    def yards():
+        values = rng.integers(-5, 40, plays).astype(float)
+        values[rng.random(plays) < 0.3] = 0
+        values[rng.random(plays) < 0.02] = np.nan
+        return values
+
+    data = pd.DataFrame({
+        "season": np.repeat([2022, 2023], plays // 2),
+        "week": np.tile(np.repeat([1, 2, 3], plays // 6), 2),
+        "play_type": rng.choice(np.array(["pass", "run", "no_play", "kickoff", None], dtype=object), plays),
+        "defteam": rng.choice(teams, plays),
+        "two_point_conv_result": rng.choice(np.array([None, "success", "failure"], dtype=object), plays, p=[0.9, 0.05, 0.05]),
+        "field_goal_result": rng.choice(np.array([None, "made", "missed", "blocked"], dtype=object), plays),
+        "extra_point_result": rng.choice(np.array([None, "made", "good"], dtype=object), plays),
+        "kick_distance": rng.integers(20, 60, plays).astype(float),
+        "passing_yards": yards(),
+        "receiving_yards": yards(),
+        "rushing_yards": yards(),
+    })
+    game = np.arange(plays) % 4
+    data["game_id"] = data.season.astype(str) + "_" + data.week.astype(str) + "_" + game.astype(str)
+    data["home_team"] = teams[game]
+    data["away_team"] = teams[4 + (game + data.week.to_numpy()) % 4]
+    data["total_home_score"] = rng.integers(0, 45, plays)
+    data["total_away_score"] = rng.integers(0, 45, plays)
+    for column in ["pass_touchdown", "rush_touchdown", "return_touchdown", "kickoff_attempt", "punt_attempt",
+                   "interception", "fumble_lost", "sack", "safety", "field_goal_attempt", "extra_point_attempt"]:
+        data[column] = flags(0.15)
+    for column in ["passer_player_id", "receiver_player_id", "rusher_player_id", "kickoff_returner_player_id",
+                   "punt_returner_player_id", "kicker_player_id", "fumbled_1_player_id"]:
+        data[column] = rng.choice(players, plays)
+    return data
+
+
+@pytest.mark.parametrize("reception", [1.0, 0.5, 0.0])
+def test_fantasy_points_match_score_from_play(reception):
+    config = AppConfig()
+    config.scoring.reception = reception
+    data = random_pbp()
+    leaders = fantasy_leaders_by_week(data, [(2022, 1), (2022, 3), (2023, 2), (2024, 1)], config)
+    assert sorted(leaders) == [(2022, 1), (2022, 3), (2023, 2)]
+    for (season, week), actual in leaders.items():
+        # Exact: same players, same order, and the same float sums.
+        pd.testing.assert_frame_equal(actual, calculate_fantasy_leaders(data, season, week, config), check_exact=True)
+
+
+def test_fantasy_points_drop_nan_points_per_play(default_scoring_rules, mock_play_base):
+    plays = pd.DataFrame([
+        {**vars(mock_play_base), "receiver_player_id": "WR1", "receiving_yards": 10.0, "pass_touchdown": 1.0, "passer_player_id": "QB1"},
+        # WR1's points on this play are NaN, so all of them are dropped; QB1's still count.
+        {**vars(mock_play_base), "receiver_player_id": "WR1", "receiving_yards": np.nan, "pass_touchdown": 1.0, "passer_player_id": "QB1"},
+    ]).assign(season=2023, week=1, play_type="pass", game_id="g1", home_team="HOME", away_team="AWAY",
+              total_home_score=0, total_away_score=0, field_goal_result=None, extra_point_result=None)
+    points = fantasy_points(plays, default_scoring_rules).set_index("player_id").score
+    rules = default_scoring_rules
+    assert points["WR1"] == rules.rec_td + 10 * rules.rec_yard + rules.reception
+    assert points["QB1"] == 2 * rules.pass_td
+    assert points["HOME"] == points["AWAY"] == rules.pa_0
+
@@ -0,0 +1,59 @@
+import random
+import numpy as np
+import pytest
+from engine.context import MatchupContext
+from enums import StatLine
+from score import PA_BRACKETS, event_counts, points_from_score, score_stat_lines, scoring_matrix
+from settings import ScoringSettings
+
+PROFILES = [
+    ScoringSettings(),
+    ScoringSettings(reception=1.0, pass_td=6.0, intercept=-2.0),
+    ScoringSettings(pass_yard=0.05, rec_yard=0.2, pa_0=15.0, pa_7_13=2.0, pa_35_plus=-10.0, def_sack=2.0),
+]
+
+
+def _stat_lines(context, seeds):
+    stats, points = [], []
+    for seed in seeds:
+        random.seed(seed)
+        game = context.sample_game_state()
+        game.play_game()
+        stats.append(game.stats)
+        points.append(game.points)
+    return np.stack(stats), np.stack(points)
+
+
+@pytest.mark.parametrize("score", [0, 1, 6, 7, 13, 14, 20, 21, 27, 28, 34, 35, 52])
+def test_brackets_match_points_from_score(score):
+    rules = PROFILES[2]
+    stats = np.zeros((1, 2, len(StatLine)), dtype=np.float32)
+    stats[0, 1, StatLine.POINTS_ALLOWED] = score
+    defense = np.array([False, True])
+
+    counts = event_counts(stats, defense)
+    assert counts[0, 1, len(StatLine):].sum() == 1
+    assert not counts[0, 0, len(StatLine):].any()
+    assert counts.shape[-1] == scoring_matrix([rules]).shape[0] == len(StatLine) + len(PA_BRACKETS)
+    points = score_stat_lines(stats, defense, [rules])
+    assert points[0, 0, 1] == pytest.approx(points_from_score(score, rules))
+    assert np.isnan(points[0, 0, 0])
+
+
+def test_profiles_match_rerunning_the_engine(vector_models, mock_player_stats, mock_team_stats):
+    contexts = [
+        MatchupContext(vector_models, "BUF", "MIA", mock_player_stats, mock_team_stats, rules, record_stats=True)
+        for rules in PROFILES
+    ]
+    seeds = range(8)
+    stats, _ = _stat_lines(contexts[0], seeds)
+    scores = score_stat_lines(stats, contexts[0].players.defense, PROFILES)
+
+    assert scores.shape == (len(PROFILES), len(seeds), len(contexts[0].players))
+    for k, context in enumerate(contexts):
+        rerun_stats, points = _stat_lines(context, seeds)
+        # Scoring never feeds back into the simulation.
+        np.testing.assert_array_equal(rerun_stats, stats)
+        np.testing.assert_array_equal(np.isnan(scores[k]), np.isnan(points))
+        np.testing.assert_allclose(scores[k], points, atol=1e-3)
+    assert not np.allclose(np.nan_to_num(scores[0]), np.nan_to_num(scores[1]))
@@ -0,0 +1,89 @@
+import functools
+import numpy as np
+import pandas as pd
+from engine.context import MatchupContext
+from engine.players import PlayerTable
+from engine.pool import SimulationPool
+from engine.rng import sim_seed
+from engine.sketch import QuantileSketch, SketchResults, SUMMARY_PERCENTILES
+from main import _weekly_projection, simulate_matchup
+from settings import ScoringSettings
+
+QUANTILES = [0.125, 0.25, 0.5, 0.75, 0.875, 0.9]
+
+
+def _points(n_sims, n_players, seed=0):
+    rng = np.random.default_rng(seed)
+    # Skewed, partly negative scores with players missing from a share of sims.
+    points = rng.gamma(2.0, 5.0, (n_sims, n_players)) - 3.0
+    points[rng.random(points.shape) < rng.uniform(0, 0.6, n_players)] = np.nan
+    return points
+
+
+def test_sketch_quantiles_match_exact():
+    points = _points(20000, 40)
+    ids = ["p%d" % i for i in range(40)]
+    sketch = QuantileSketch()
+    # Folded in chunks and merged, as pool workers' sketches are.
+    for start in range(0, len(points), 2500):
+        chunk = QuantileSketch()
+        chunk.update(ids, points[start:start + 2500])
+        sketch.merge(chunk)
+
+    assert sketch.n_sims == len(points)
+    np.testing.assert_array_equal(sketch.count, (~np.isnan(points)).sum(axis=0))
+    np.testing.assert_allclose(sketch.mean(), np.nanmean(points, axis=0))
+    spread = np.nanstd(points, axis=0)
+    exact = np.nanquantile(points, QUANTILES, axis=0)
+    assert (np.abs(sketch.quantiles(QUANTILES) - exact) < 0.02 * spread).all()
+    filled = np.quantile(np.nan_to_num(points), QUANTILES, axis=0)
+    assert (np.abs(sketch.quantiles(QUANTILES, fill=0.0) - filled) < 0.02 * spread).all()
+    assert sketch._weights.shape == (40, sketch.compression)
+
+
+def test_small_sketch_is_exact():
+    points = _points(60, 3, seed=1)
+    sketch = QuantileSketch()
+    sketch.update(["a", "b", "c"], points)
+    np.testing.assert_allclose(sketch.quantiles(QUANTILES), np.nanquantile(points, QUANTILES, axis=0))
+    np.testing.assert_allclose(
+        sketch.quantiles(QUANTILES, fill=0.0), np.quantile(np.nan_to_num(points), QUANTILES, axis=0)
+    )
+
+
+def test_summary_matches_weekly_projection(mock_player_stats):
+    table = PlayerTable(
+        mock_player_stats[mock_player_stats.team == "BUF"], mock_player_stats[mock_player_stats.team == "MIA"], "BUF", "MIA"
+    )
+    points = np.full((5000, len(table)), np.nan)
+    points[:, :6] = _points(5000, 6, seed=2)
+    results = SketchResults()
+    results.add_game("g1", table, points)
+    summary = results.summary(3).set_index("player_id")
+
+    weekly = _weekly_projection(table.to_frame(points), 3).set_index("player_id")
+    assert list(summary.index) == list(weekly.index)
+    np.testing.assert_allclose(summary["mean"], weekly["mean"])
+    np.testing.assert_allclose(summary["percentile_90"], weekly["percentile_90"], atol=0.2)
+    sims = weekly[list(range(5000))].to_numpy()
+    for column, q in SUMMARY_PERCENTILES.items():
+        np.testing.assert_allclose(summary[column], np.quantile(sims, q, axis=1), atol=0.2)
+    assert (summary.week == 3).all()
+
+
+def test_pool_workers_return_merged_sketch(vector_models, mock_player_stats, mock_team_stats):
+    context = MatchupContext(vector_models, "BUF", "MIA", mock_player_stats, mock_team_stats, ScoringSettings())
+    seeds = [sim_seed(2024, 1, 0, sim) for sim in range(8)]
+    with SimulationPool(functools.partial(dict, vector_models), processes=2, chunk_size=3) as pool:
+        sketch, stats = pool.simulate(context, seeds, sketch_compression=50)
+
+    points = np.vstack([simulate_matchup(context, seed)[0] for seed in seeds])
+    scored = ~np.isnan(points).all(axis=0)
+    assert stats is None
+    assert sketch.n_sims == len(seeds)
+    assert sorted(sketch.ids) == sorted(context.players.ids[scored])
+    order = [sketch.ids.index(player_id) for player_id in context.players.ids[scored]]
+    np.testing.assert_allclose(sketch.mean()[order], np.nanmean(points[:, scored], axis=0))
+    np.testing.assert_allclose(
+        sketch.quantiles(QUANTILES, fill=0.0)[:, order], np.quantile(np.nan_to_num(points[:, scored]), QUANTILES, axis=0)
+    )
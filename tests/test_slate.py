@@ -0,0 +1,31 @@
+import functools
+import numpy as np
+from engine.context import MatchupContext
+from engine.pool import SimulationPool
+from engine.rng import sim_seed
+from engine.slate import SlateScheduler
+from main import simulate_matchup
+from settings import ScoringSettings
+
+
+def test_slate_results_match_in_process(vector_models, mock_player_stats, mock_team_stats):
+    games = {}
+    for week in [1, 2]:
+        for game, (home, away) in enumerate([("BUF", "MIA"), ("MIA", "BUF")]):
+            context = MatchupContext(vector_models, home, away, mock_player_stats, mock_team_stats, ScoringSettings())
+            games[(week, game)] = (context, [sim_seed(2024, week, game, sim) for sim in range(3)])
+
+    with SimulationPool(functools.partial(dict, vector_models), processes=2, chunk_size=2) as pool:
+        scheduler = SlateScheduler(pool)
+        for key, (context, seeds) in games.items():
+            scheduler.submit(key, context, seeds)
+        results = scheduler.collect()
+
+    assert list(results) == list(games)
+    for key, (context, seeds) in games.items():
+        points, stats = results[key]
+        np.testing.assert_array_equal(points, np.vstack([simulate_matchup(context, seed)[0] for seed in seeds]))
+        assert stats is None
+    assert scheduler.wall_seconds > 0
+    assert 0 < scheduler.utilization <= 1
+    assert scheduler.collect() == {}
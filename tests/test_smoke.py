@@ -1,7 +1,12 @@
+import functools
 import pytest
 from unittest.mock import patch, MagicMock
 import pandas as pd
-from main import project_week, run_projections, run_backtest
+from main import project_slate, project_week, run_projections, run_backtest
+from engine.pool import SimulationPool
+from data import nfl_client
+from stats import cache as stats_cache, players, teams
+from stats.estimator_state import EstimatorState
 from settings import AppConfig, RuntimeSettings
 from types import SimpleNamespace
 
@@ -49,7 +54,10 @@ def mock_external_data_and_models(mock_models_for_game_state, mock_pbp_data, moc
         mock_players_calc.return_value = mock_player_stats
         mock_teams_calc.return_value = mock_team_stats
         
+        # Views built from the mocked tables must not outlive the patches.
+        nfl_client.clear()
         yield
+        nfl_client.clear()
 
 @pytest.fixture
 def mock_app_config_smoke():
@@ -114,3 +122,100 @@ def test_run_backtest_smoke_test(
         run_backtest(mock_pbp_data, mock_snap_data, config)
         # Check for metrics file
         assert (tmp_path / f"v{config.runtime.version}" / "calibration" / "metrics.csv").exists()
+
+def test_project_slate_matches_project_week(
+    mock_pbp_data, mock_snap_data, mock_models_for_game_state, mock_app_config_smoke, mock_external_data_and_models
+):
+    """project_slate queues every game on the pool and returns the same weekly frames."""
+    config = mock_app_config_smoke
+    config.runtime.n_simulations = 4
+    models = mock_models_for_game_state
+    # The first call fills in the shared mock stats frames in place; compare later calls.
+    project_week(mock_pbp_data, mock_snap_data, models, 2024, 1, config)
+    expected = project_week(mock_pbp_data, mock_snap_data, models, 2024, 1, config)
+    with SimulationPool(functools.partial(dict, models), processes=2, chunk_size=1) as pool:
+        slate = project_slate(mock_pbp_data, mock_snap_data, models, [(2024, 1)], config, pool)
+    pd.testing.assert_frame_equal(slate[(2024, 1)], expected)
+
+
+def test_cached_week_stats_match_project_week(
+    mock_pbp_data, mock_snap_data, mock_models_for_game_state, mock_app_config_smoke, mock_external_data_and_models
+):
+    """With cache_week_stats, later weeks reuse the stats and schedules and project the same."""
+    config = mock_app_config_smoke
+    models = mock_models_for_game_state
+    project_week(mock_pbp_data, mock_snap_data, models, 2024, 1, config)
+    expected = project_week(mock_pbp_data, mock_snap_data, models, 2024, 1, config)
+
+    config.runtime.cache_week_stats = True
+    stats_cache.clear()
+    nfl_client.clear()
+    with patch('data.nfl_client.import_depth_charts', return_value=pd.DataFrame({'position': []})):
+        first = project_week(mock_pbp_data, mock_snap_data, models, 2024, 1, config)
+        teams.calculate.reset_mock()
+        nfl_client.import_schedules.reset_mock()
+        second = project_week(mock_pbp_data, mock_snap_data, models, 2024, 1, config)
+    stats_cache.clear()
+    nfl_client.clear()
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(second, expected)
+    assert teams.calculate.call_count == 0
+    assert nfl_client.import_schedules.call_count == 0
+
+
+def test_incremental_estimators_reach_calculate(
+    mock_pbp_data, mock_snap_data, mock_models_for_game_state, mock_app_config_smoke, mock_external_data_and_models
+):
+    """With incremental_estimators, teams and players calculate get the state advanced to the week."""
+    config = mock_app_config_smoke
+    config.runtime.incremental_estimators = True
+    stats_cache.clear()
+    teams.calculate.reset_mock()
+    players.calculate.reset_mock()
+    # The mock plays lack the estimators' columns, so the state is not actually advanced.
+    with patch.object(EstimatorState, 'advance_to') as advance_to:
+        project_week(mock_pbp_data, mock_snap_data, mock_models_for_game_state, 2024, 1, config)
+    state = stats_cache._ESTIMATORS
+    stats_cache.clear()
+    assert advance_to.call_args.args[1:] == (2024, 1)
+    assert teams.calculate.call_args.args[2] is state
+    assert players.calculate.call_args.args[5] is state
+
+
+def test_run_projections_with_sketches(
+    mock_pbp_data, mock_snap_data, mock_app_config_smoke, mock_external_data_and_models, tmp_path
+):
+    """With result_sketches the ROS run exports the same summary columns from quantile sketches."""
+    config = mock_app_config_smoke
+    config.runtime.output_dir = str(tmp_path)
+    config.runtime.n_simulations = 3
+    config.runtime.result_sketches = True
+    with patch('main.plot_predictions'):
+        run_projections(mock_pbp_data, mock_snap_data, config)
+
+    summary = pd.read_csv(tmp_path / f"v{config.runtime.version}" / "week_1" / "summary.csv")
+    assert not summary.empty
+    assert {"percentile_12", "median", "percentile_88"} <= set(summary.columns)
+    assert (summary.percentile_12 <= summary.percentile_88).all()
+
+
+def test_run_projections_parquet_export(
+    mock_pbp_data, mock_snap_data, mock_app_config_smoke, mock_external_data_and_models, tmp_path
+):
+    """export_format="parquet" writes one position-partitioned dataset per week instead of the CSVs."""
+    pytest.importorskip("pyarrow.parquet", exc_type=ImportError)
+    config = mock_app_config_smoke
+    config.runtime.output_dir = str(tmp_path)
+    config.runtime.n_simulations = 3
+    config.runtime.export_format = "parquet"
+    config.runtime.export_simulations = True
+    with patch('main.plot_predictions'):
+        run_projections(mock_pbp_data, mock_snap_data, config)
+
+    week_dir = tmp_path / f"v{config.runtime.version}" / "week_1"
+    assert not (week_dir / "all.csv").exists()
+    week = pd.read_parquet(week_dir / "projections")
+    assert not week.empty
+    assert all(len(sims) == 3 for sims in week.simulations)
+    ros = pd.read_parquet(tmp_path / f"v{config.runtime.version}" / "ros" / "projections")
+    assert {"ros_mean", "ros_total", "playoffs_mean"} <= set(ros.columns)
@@ -0,0 +1,76 @@
+import random
+import numpy as np
+import pytest
+from engine.context import MatchupContext
+from enums import StatLine
+from score import STAT_RULES
+from settings import ScoringSettings
+
+
+@pytest.fixture
+def context(vector_models, mock_player_stats, mock_team_stats):
+    return MatchupContext(
+        vector_models, "BUF", "MIA", mock_player_stats, mock_team_stats, ScoringSettings(), record_stats=True
+    )
+
+
+def test_stat_lines_reproduce_fantasy_points(context):
+    rules = context.rules
+    for seed in range(5):
+        random.seed(seed)
+        game = context.sample_game_state()
+        game.play_game()
+        assert game.stats.dtype == np.float32
+
+        expected = sum(game.stats[:, stat].astype(float) * getattr(rules, rule) for stat, rule in STAT_RULES.items())
+        for team in ["BUF", "MIA"]:
+            i = context.players.index[team]
+            expected[i] += game.get_defense_score_points(game.stats[i, StatLine.POINTS_ALLOWED])
+        scored = ~np.isnan(game.points)
+        np.testing.assert_allclose(expected[scored], game.points[scored], atol=1e-3)
+        assert not expected[~scored].any()
+
+
+def test_stat_lines_are_consistent(context):
+    random.seed(2)
+    game = context.sample_game_state()
+    game.play_game()
+    stats = game.stats
+    home, away = context.players.index["BUF"], context.players.index["MIA"]
+
+    assert stats[home, StatLine.POINTS_ALLOWED] == game.away_score
+    assert stats[away, StatLine.POINTS_ALLOWED] == game.home_score
+    assert stats[:, StatLine.RECEPTIONS].sum() == stats[:, StatLine.COMPLETIONS].sum()
+    assert stats[:, StatLine.REC_YARDS].sum() == pytest.approx(stats[:, StatLine.PASS_YARDS].sum(), rel=1e-5)
+    assert stats[:, StatLine.TARGETS].sum() <= stats[:, StatLine.PASS_ATTEMPTS].sum()
+    assert (stats[:, StatLine.RECEPTIONS] <= stats[:, StatLine.TARGETS]).all()
+
+
+def test_recording_does_not_change_the_game(context, vector_models, mock_player_stats, mock_team_stats):
+    plain = MatchupContext(vector_models, "BUF", "MIA", mock_player_stats, mock_team_stats, ScoringSettings())
+    random.seed(9)
+    recorded = context.sample_game_state()
+    recorded.play_game()
+    random.seed(9)
+    game = plain.sample_game_state()
+    game.play_game()
+
+    assert game.stats is None
+    np.testing.assert_array_equal(game.points, recorded.points)
+
+
+def test_stat_frame_quantiles(context):
+    stats = []
+    for seed in range(20):
+        random.seed(seed)
+        game = context.sample_game_state()
+        game.play_game()
+        stats.append(game.stats)
+    stats = np.stack(stats)
+    frame = context.players.stat_frame(stats)
+
+    assert "QB_BUF" in frame.index and "Team" not in frame.index
+    assert "pass_yards_p12" in frame and "pat_made_p88" in frame and "rec_tds_mean" in frame
+    qb = stats[:, context.players.index["QB_BUF"], StatLine.PASS_YARDS]
+    assert frame.loc["QB_BUF", "pass_yards_p50"] == pytest.approx(np.quantile(qb, 0.5))
+    assert frame.loc["QB_BUF", "pass_yards_mean"] == pytest.approx(qb.mean())
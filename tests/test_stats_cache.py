@@ -0,0 +1,67 @@
+from unittest.mock import patch
+import pandas as pd
+import pytest
+from data import nfl_client
+from stats import cache as stats_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    stats_cache.clear()
+    nfl_client.clear()
+    yield
+    stats_cache.clear()
+    nfl_client.clear()
+
+
+@pytest.fixture
+def mock_calculators(mock_player_stats, mock_team_stats):
+    with (patch("stats.teams.calculate", return_value=mock_team_stats) as teams_calc,
+          patch("stats.players.calculate", return_value=mock_player_stats) as players_calc,
+          patch("data.nfl_client.import_depth_charts", return_value=pd.DataFrame({"position": ["QB"]})) as depth,
+          patch("data.nfl_client.import_schedules", return_value=pd.DataFrame({"week": [1, 2]})) as schedules):
+        yield teams_calc, players_calc, depth, schedules
+
+
+def _as_of(data, season, week):
+    return data.loc[(data.season == season - 1) | ((data.season == season) & (data.week < week))]
+
+
+def test_rest_of_season_weeks_share_stats(mock_pbp_data, mock_snap_data, mock_player_stats, mock_calculators):
+    teams_calc, players_calc, depth, _ = mock_calculators
+    for week in range(2, 19):
+        team_stats, player_stats = stats_cache.week_stats(_as_of(mock_pbp_data, 2024, week), mock_snap_data, 2024, week)
+        pd.testing.assert_frame_equal(player_stats, mock_player_stats)
+    assert teams_calc.call_count == players_calc.call_count == depth.call_count == 1
+
+    # Callers get copies, so filling in a column does not leak into later weeks.
+    player_stats["probe"] = 1.0
+    assert "probe" not in stats_cache.week_stats(_as_of(mock_pbp_data, 2024, 5), mock_snap_data, 2024, 5)[1]
+
+    # Different plays (e.g. week 1, before anything of 2024 was played) are a new entry.
+    stats_cache.week_stats(_as_of(mock_pbp_data, 2024, 1), mock_snap_data, 2024, 1)
+    assert teams_calc.call_count == 2
+
+
+def test_weekly_depth_charts_split_entries(mock_pbp_data, mock_snap_data, mock_calculators):
+    _, players_calc, depth, _ = mock_calculators
+    depth.return_value = pd.DataFrame({"week": [2, 3], "position": ["QB", "QB"]})
+    for week in [2, 3, 4, 5]:
+        stats_cache.week_stats(_as_of(mock_pbp_data, 2024, week), mock_snap_data, 2024, week)
+    # Weeks 2 and 3 read their own starters; weeks without charts share one entry.
+    assert [call.args[4] for call in players_calc.call_args_list] == [2, 3, 4]
+
+
+def test_schedule_loaded_once_per_season(mock_calculators):
+    *_, schedules = mock_calculators
+    for _ in range(3):
+        assert list(stats_cache.schedule(2024).week) == [1, 2]
+    stats_cache.schedule(2023)
+    assert schedules.call_count == 2
+
+
+def test_fingerprint_tracks_rows(mock_pbp_data):
+    assert stats_cache.fingerprint(mock_pbp_data) == stats_cache.fingerprint(mock_pbp_data.copy())
+    assert stats_cache.fingerprint(mock_pbp_data) != stats_cache.fingerprint(mock_pbp_data.iloc[1:])
+    assert stats_cache.as_of_week(mock_pbp_data, 2024) == 2
+    assert stats_cache.as_of_week(mock_pbp_data, 2025) == 1
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from stats.util import EwmaTarget, _compute_estimator_vectorized, _compute_estimators_vectorized
+
+
+def random_plays(seed, rows=3000, seasons=True):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        "week": rng.integers(1, 19, rows),
+        "player_id": rng.choice(np.array(["P%03d" % i for i in range(120)] + [None], dtype=object), rows),
+        "yards": np.where(rng.random(rows) < 0.15, np.nan, rng.normal(5, 8, rows).round()),
+        "flag": (rng.random(rows) < 0.2).astype(np.int8),
+        "share": rng.random(rows).astype(np.float32),
+        "rush": rng.integers(0, 2, rows),
+        "position": rng.choice(["RB", "WR", "TE", None], rows),
+    })
+    if seasons:
+        data.insert(0, "season", rng.choice([2022, 2023], rows))
+    return data
+
+
+def targets_for(data):
+    position_priors = data[["player_id", "position"]].drop_duplicates("player_id").set_index("player_id").position
+    position_priors = position_priors.map({"RB": 2.0, "WR": 9.5, "TE": 6.0}).fillna(7.25)
+    return [
+        EwmaTarget("yards", 150, "yards_est", prior=data.yards.mean()),
+        EwmaTarget("yards", 500, "rush_yards_est", prior=data.loc[data.rush == 1].yards.mean(), mask=data.rush == 1),
+        EwmaTarget("flag", 1000, "flag_rate_est", prior=0.2, mask=data.rush == 0),
+        EwmaTarget("share", 4, "share_est", prior=0.1),
+        EwmaTarget("yards", 17, "no_prior_est", prior=np.nan, mask=data.week > 9),
+        EwmaTarget("yards", 150, "position_yards_est", prior=position_priors),
+    ]
+
+
+@pytest.mark.parametrize("seed,seasons", [(0, True), (1, True), (2, False)])
+def test_matches_one_estimator_at_a_time(seed, seasons):
+    data = random_plays(seed, seasons=seasons)
+    targets = targets_for(data)
+    result = _compute_estimators_vectorized(data, "player_id", targets)
+    assert list(result.columns) == ["player_id"] + [target.result_col_name for target in targets]
+    assert result.player_id.is_monotonic_increasing and result.player_id.notna().all()
+
+    for target in targets:
+        rows = data if target.mask is None else data.loc[target.mask]
+        priors_df = rows[["player_id"]].drop_duplicates()
+        if isinstance(target.prior, pd.Series):
+            priors_df[target.target_col] = priors_df.player_id.map(target.prior)
+        else:
+            priors_df[target.target_col] = target.prior
+        expected = _compute_estimator_vectorized(rows, "player_id", target.target_col, target.span, priors_df, target.result_col_name)
+        estimates = result.loc[result.player_id.isin(rows.player_id), ["player_id", target.result_col_name]]
+        pd.testing.assert_frame_equal(estimates.reset_index(drop=True), expected.reset_index(drop=True), check_exact=True)
+        assert result.loc[~result.player_id.isin(rows.player_id), target.result_col_name].isna().all()
+
+
+def test_empty_data():
+    data = random_plays(0).iloc[:0]
+    result = _compute_estimators_vectorized(data, "player_id", targets_for(data))
+    assert result.empty and list(result.columns) == ["player_id"] + [target.result_col_name for target in targets_for(data)]
@@ -0,0 +1,111 @@
+import subprocess
+import sys
+import numpy as np
+import pytest
+from sklearn.preprocessing import LabelEncoder
+from xgboost import XGBClassifier
+from models.playcall import XGBPlayCaller
+from models.kicking import XGBKicker
+from models.tree_ensemble import TreeEnsemble, compile_models
+
+
+def _features(n, seed=0):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.integers(1, 5, n), rng.integers(1, 20, n), rng.integers(-21, 22, n),
+        rng.uniform(0, 900, n), rng.integers(1, 100, n), rng.normal(8, 9, n),
+    ]).astype(np.float32)
+    return X
+
+
+def _with_missing(X, seed=1):
+    X = X.copy()
+    X[np.random.default_rng(seed).random(X.shape) < 0.05] = np.nan
+    return X
+
+
+@pytest.fixture(scope="module")
+def multiclass_model():
+    X = _features(2000)
+    labels = np.where(X[:, 0] == 4, np.where(X[:, 4] < 35, "field_goal", "punt"),
+                      np.where(X[:, 1] + X[:, 5] > 15, "pass", "run"))
+    encoder = LabelEncoder()
+    model = XGBClassifier(n_estimators=30, max_depth=4, objective="multi:softprob")
+    model.fit(X, encoder.fit_transform(labels))
+    return XGBPlayCaller(model, encoder)
+
+
+@pytest.fixture(scope="module")
+def binary_model():
+    X = _features(2000)
+    y = (np.random.default_rng(2).random(2000) < 0.75 - 0.01 * X[:, 5]).astype(int)
+    model = XGBClassifier(n_estimators=30, max_depth=5, objective="binary:logistic")
+    model.fit(X, y)
+    return model
+
+
+@pytest.mark.parametrize("model_name", ["multiclass_model", "binary_model"])
+def test_matches_xgboost_predict_proba(model_name, request):
+    model = request.getfixturevalue(model_name)
+    ensemble = TreeEnsemble.from_xgboost(model)
+    X = _with_missing(_features(5000, seed=3))
+
+    np.testing.assert_allclose(ensemble.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-6)
+    assert list(ensemble.classes_) == list(model.classes_)
+
+
+def test_margins_are_exact(binary_model):
+    ensemble = TreeEnsemble.from_xgboost(binary_model)
+    X = _with_missing(_features(1000, seed=4))
+    margins = binary_model.get_booster().inplace_predict(X, predict_type="margin")
+
+    assert np.array_equal(ensemble.decision_function(X)[:, 0], margins)
+
+
+def test_single_row_matches_batch(multiclass_model):
+    ensemble = TreeEnsemble.from_xgboost(multiclass_model)
+    X = _with_missing(_features(50, seed=5))
+    batch = ensemble.predict_proba(X)
+
+    for i, row in enumerate(X):
+        assert np.array_equal(ensemble.predict_proba(row)[0], batch[i])
+        assert np.array_equal(ensemble.predict_proba([list(row)])[0], batch[i])
+
+
+def test_save_and_load_roundtrip(multiclass_model, tmp_path):
+    ensemble = TreeEnsemble.from_xgboost(multiclass_model)
+    path = tmp_path / "playcall.npz"
+    ensemble.save(path)
+    loaded = TreeEnsemble.load(path)
+    X = _features(200, seed=6)
+
+    assert np.array_equal(loaded.predict_proba(X), ensemble.predict_proba(X))
+    assert list(loaded.classes_) == list(ensemble.classes_)
+
+
+def test_compile_models_and_no_xgboost_import(multiclass_model, binary_model, tmp_path):
+    X = _features(500)
+    y = np.where(X[:, 5] > 20, "missed", np.where(X[:, 5] < -10, "blocked", "made"))
+    encoder = LabelEncoder()
+    kicker = XGBClassifier(n_estimators=10, max_depth=3).fit(X, encoder.fit_transform(y))
+    models = {
+        "playcall_model": multiclass_model,
+        "completion_model": binary_model,
+        "field_goal_model": XGBKicker(kicker, encoder),
+        "clock_model": {},
+    }
+    compiled = compile_models(models)
+
+    assert all(isinstance(compiled[k], TreeEnsemble) for k in ["playcall_model", "completion_model", "field_goal_model"])
+    assert compiled["clock_model"] is models["clock_model"]
+    assert not isinstance(models["playcall_model"], TreeEnsemble)
+
+    # Loading and evaluating a saved ensemble must not pull xgboost into the process.
+    path = tmp_path / "kicker.npz"
+    compiled["field_goal_model"].save(path)
+    script = (
+        "import sys; import numpy as np; from models.tree_ensemble import TreeEnsemble; "
+        "TreeEnsemble.load(%r).predict_proba(np.zeros((3, 6))); "
+        "assert 'xgboost' not in sys.modules" % str(path)
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)